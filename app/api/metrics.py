@@ -0,0 +1,145 @@
+"""Prometheus Metrics Route and Request Instrumentation.
+
+Serves /metrics in the Prometheus text format for a local scraping
+agent. Hot-path metrics are recorded where they happen (see
+app/services/metrics.py); queue depths and pool usage are read from
+their owners at scrape time.
+"""
+
+import time
+
+from fastapi import APIRouter, Response
+
+from app.database import pool_stats as db_pool_stats
+from app.scheduler import queue_stats
+from app.services.http_client import pool_stats as http_pool_stats
+from app.services.log_writer import get_log_writer
+from app.services.metrics import CONTENT_TYPE, HTTP_REQUEST_SECONDS, REGISTRY
+from app.services.schedule_monitor import get_schedule_monitor
+
+router = APIRouter(tags=["metrics"])
+
+
+def collect_runtime():
+    """Produce the scrape-time metric families."""
+    queue = queue_stats()
+    yield "autoai_scheduler_jobs", "gauge", "Jobs registered with the scheduler.", [({}, queue["jobs"])]
+    yield (
+        "autoai_scheduler_due_jobs", "gauge",
+        "Jobs past their next run time not yet submitted.", [({}, queue["due"])],
+    )
+    yield (
+        "autoai_scheduler_immediate_pending", "gauge",
+        "Immediate executions waiting to run.", [({}, queue["immediate"])],
+    )
+
+    writer = get_log_writer().stats()
+    yield (
+        "autoai_log_writer_queue_depth", "gauge",
+        "Execution logs buffered for the next batch.", [({}, writer["queue_depth"])],
+    )
+    yield (
+        "autoai_log_writer_dropped_total", "counter",
+        "Execution logs dropped after a failed retry.", [({}, writer["total_dropped"])],
+    )
+
+    monitor = get_schedule_monitor().stats()
+    for key, documentation in (
+        ("fires", "Trigger fires submitted by the scheduler."),
+        ("missed", "Fires skipped past the misfire grace time."),
+        ("coalesced", "Due fires merged into a later run."),
+        ("max_instances", "Fires dropped at the job's max_instances."),
+    ):
+        yield f"autoai_schedule_{key}_total", "counter", documentation, [({}, monitor[key])]
+    yield (
+        "autoai_schedule_lag_seconds", "summary",
+        "Scheduling lag of executed fires since startup.",
+        [
+            ({"quantile": quantile}, monitor["lag"][key] / 1000)
+            for quantile, key in (("0.5", "p50"), ("0.95", "p95"), ("0.99", "p99"))
+            if monitor["lag"][key] is not None
+        ] + [
+            ("_sum", {}, monitor["total_lag_ms"] / 1000),
+            ("_count", {}, monitor["lag"]["count"]),
+        ],
+    )
+
+    pools = db_pool_stats()
+    yield (
+        "autoai_db_pool_size", "gauge", "Database connection pool size.",
+        [({"engine": pool["engine"]}, pool["size"]) for pool in pools],
+    )
+    yield (
+        "autoai_db_pool_connections", "gauge", "Database connections by state.",
+        [
+            ({"engine": pool["engine"], "state": state}, pool[state])
+            for pool in pools for state in ("checked_out", "checked_in")
+        ],
+    )
+
+    http_pools = http_pool_stats()
+    yield (
+        "autoai_http_pool_connections", "gauge", "Outbound HTTP connections by origin and state.",
+        [
+            ({"origin": pool["origin"], "state": state}, pool[state])
+            for pool in http_pools for state in ("active", "idle")
+        ],
+    )
+    yield (
+        "autoai_http_pool_waiting", "gauge", "Outbound requests waiting for a connection.",
+        [({"origin": pool["origin"]}, pool["waiting"]) for pool in http_pools],
+    )
+
+
+REGISTRY.add_collector(collect_runtime)
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Expose metrics in the Prometheus text format."""
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
+def _router_of(path: str) -> str:
+    if path.startswith("/api/"):
+        return "api"
+    if path in ("/metrics", "/health"):
+        return "other"
+    return "web"
+
+
+class RequestMetricsMiddleware:
+    """ASGI middleware recording the latency of every HTTP request.
+
+    Labels use the matched route template, not the raw path, so the
+    number of label sets stays bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_status)
+        finally:
+            route = scope.get("route")
+            path = getattr(route, "path", None)
+            HTTP_REQUEST_SECONDS.labels(
+                _router_of(path) if path else "other",
+                scope["method"],
+                path or "unmatched",
+                str(status),
+            ).observe(time.perf_counter() - started)
@@ -3,16 +3,22 @@
 REST API endpoints for task management.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import select, desc
+from datetime import timedelta
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_session
-from app.models import Task, ExecutionLog
-from app.schemas import TaskCreate, TaskUpdate, TaskResponse, ExecutionLogResponse
-from app.services import task_service
+from app.database import get_read_session, get_session
+from app.models import Task
+from app.schemas import (
+    TaskCreate, TaskUpdate, TaskResponse, ExecutionLogResponse, TaskStatsResponse
+)
+from app.services import log_query, stats, task_service
+from app.services.schedule_monitor import get_schedule_monitor
 from app.web.auth import require_auth_api
-from app.scheduler import add_job, reschedule_job
+from app.scheduler import add_job, remove_job, reschedule_job
 from loguru import logger
 
 router = APIRouter(prefix="/api/tasks", tags=["tasks"])
@@ -39,7 +45,7 @@ async def create_task(
 
 @router.get("", response_model=list[TaskResponse])
 async def get_tasks(
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     _: bool = Depends(require_auth_api),
 ):
     """Get all tasks."""
@@ -49,7 +55,7 @@ async def get_tasks(
 @router.get("/{task_id}", response_model=TaskResponse)
 async def get_task(
     task_id: int,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     _: bool = Depends(require_auth_api),
 ):
     """Get a task by ID."""
@@ -129,6 +135,10 @@ async def delete_task(
     task = await task_service.get_task(session, task_id)
     if task is None:
         raise HTTPException(status_code=404, detail="Task not found")
+
+    # Remove from scheduler (and task cache) first
+    remove_job(task_id)
+
     await task_service.delete_task(session, task)
     return None
 
@@ -136,27 +146,90 @@ async def delete_task(
 @router.get("/{task_id}/logs", response_model=list[ExecutionLogResponse])
 async def get_task_logs(
     task_id: int,
+    response: Response,
     limit: int = Query(default=50, ge=1, le=100, description="Number of logs to return (1-100)"),
-    session: AsyncSession = Depends(get_session),
+    cursor: Optional[str] = Query(default=None, description="Cursor from X-Next-Cursor or X-Prev-Cursor"),
+    include_total: bool = Query(default=False, description="Return approximate total in X-Total-Count"),
+    start_date: Optional[str] = Query(default=None, description="First day included (YYYY-MM-DD, UTC)"),
+    end_date: Optional[str] = Query(default=None, description="Last day included (YYYY-MM-DD, UTC)"),
+    session: AsyncSession = Depends(get_read_session),
     _: bool = Depends(require_auth_api),
 ):
     """Get execution logs for a specific task.
 
     Returns logs ordered by execution time (newest first).
-    Default limit is 50 records, maximum is 100.
+    Default limit is 50 records, maximum is 100. Further pages are
+    fetched by passing back the cursor from the X-Next-Cursor or
+    X-Prev-Cursor response header. A start_date older than the
+    retention window also returns archived logs.
     """
     # Check task exists
     task = await session.get(Task, task_id)
     if task is None:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    # Query logs
-    result = await session.execute(
-        select(ExecutionLog)
-        .where(ExecutionLog.task_id == task_id)
-        .order_by(desc(ExecutionLog.executed_at))
-        .limit(limit)
+    page_cursor = None
+    if cursor:
+        try:
+            page_cursor = log_query.Cursor.decode(cursor)
+        except log_query.InvalidCursor:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    # Query logs (invalid dates are ignored, as on the web page)
+    start_at, end_at = log_query.parse_date_range(start_date, end_date)
+    log_page = await log_query.fetch_log_page(
+        session, task_id, start_at=start_at, end_at=end_at, cursor=page_cursor, limit=limit
     )
-    logs = result.scalars().all()
 
-    return logs
+    if log_page.next_cursor:
+        response.headers["X-Next-Cursor"] = log_page.next_cursor
+    if log_page.prev_cursor:
+        response.headers["X-Prev-Cursor"] = log_page.prev_cursor
+    if include_total:
+        total = await log_query.count_logs(
+            session, task_id, start_at=start_at, end_at=end_at
+        )
+        response.headers["X-Total-Count"] = str(total)
+
+    return log_page.logs
+
+
+@router.get("/{task_id}/stats", response_model=TaskStatsResponse)
+async def get_task_stats(
+    task_id: int,
+    days: int = Query(default=7, ge=1, le=366, description="Window in days, including today (China time)"),
+    session: AsyncSession = Depends(get_read_session),
+    _: bool = Depends(require_auth_api),
+):
+    """Get execution counts and latency percentiles of a task.
+
+    Percentiles (p50, p95, p99) of total, connect and time-to-first-byte
+    latency and of scheduling lag are merged from the daily latency
+    histograms, for the task and for all tasks sharing its API endpoint.
+    Dropped fire counts come from this node's scheduler.
+    """
+    task = await session.get(Task, task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    since = stats.today() - timedelta(days=days - 1)
+    success, failed = await stats.get_day_totals(session, since, task_id=task_id)
+
+    endpoint_task_ids = list((await session.execute(
+        select(Task.id).where(Task.api_endpoint == task.api_endpoint)
+    )).scalars().all())
+    task_latency = await stats.get_latency_histograms(session, [task_id], since)
+    endpoint_latency = await stats.get_latency_histograms(session, endpoint_task_ids, since)
+
+    return TaskStatsResponse(
+        task_id=task_id,
+        days=days,
+        since=since,
+        success=success,
+        failed=failed,
+        latency={metric: h.summary() for metric, h in task_latency.items()},
+        api_endpoint=task.api_endpoint,
+        endpoint_tasks=len(endpoint_task_ids),
+        endpoint_latency={metric: h.summary() for metric, h in endpoint_latency.items()},
+        misfires=get_schedule_monitor().task_stats(task_id),
+    )
@@ -0,0 +1,4 @@
+"""Local load testing: an OpenAI-compatible stub server and a scheduler harness.
+
+Run with `python -m app.bench --help`.
+"""
@@ -0,0 +1,127 @@
+"""Command line entry point: python -m app.bench.
+
+Runs the scheduler against the in-process stub server on a throwaway
+SQLite database and prints a report. Other settings (BULKHEAD_*,
+LOG_WRITER_*, RATE_LIMIT_* ...) are read from the environment as usual.
+
+Examples:
+    python -m app.bench --tasks 1000 --intervals 10,30,60 --duration 60
+    python -m app.bench --tasks 200 --latency exponential --latency-ms 800 \\
+        --error-rate 0.05 --rate-limit-rate 0.02 --image-rate 0.1 --json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+from cryptography.fernet import Fernet
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.bench",
+        description="Load-test the scheduler against a local OpenAI-compatible stub.",
+    )
+    workload = parser.add_argument_group("workload")
+    workload.add_argument("--tasks", type=int, default=100, help="tasks to seed (default: 100)")
+    workload.add_argument(
+        "--intervals", default="60",
+        help="comma-separated task intervals in seconds, assigned round-robin (default: 60)",
+    )
+    workload.add_argument("--keys", type=int, default=10, help="distinct API keys (default: 10)")
+    workload.add_argument("--task-rpm", type=int, default=None, help="rate_limit_per_minute of each task")
+    workload.add_argument("--duration", type=float, default=60.0, help="seconds to run (default: 60)")
+    workload.add_argument(
+        "--database", default=None,
+        help="SQLite file to use (default: a temporary file); must not hold real data",
+    )
+    workload.add_argument(
+        "--logs-database", action="store_true",
+        help="store execution logs in a separate SQLite file",
+    )
+
+    stub = parser.add_argument_group("stub server")
+    stub.add_argument(
+        "--latency", choices=("fixed", "uniform", "exponential", "lognormal"), default="lognormal",
+        help="response latency distribution (default: lognormal)",
+    )
+    stub.add_argument("--latency-ms", type=float, default=200.0, help="mean latency, median for lognormal")
+    stub.add_argument("--latency-spread", type=float, default=0.5, help="uniform half-width ratio or lognormal sigma")
+    stub.add_argument("--error-rate", type=float, default=0.0, help="fraction of HTTP 500 responses")
+    stub.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction of HTTP 429 responses")
+    stub.add_argument("--retry-after", type=float, default=1.0, help="Retry-After of random 429s, seconds")
+    stub.add_argument("--rpm-per-key", type=int, default=0, help="answer 429 above this many requests per key per minute")
+    stub.add_argument("--response-chars", type=int, default=200, help="length of text responses")
+    stub.add_argument("--image-rate", type=float, default=0.0, help="fraction of image responses")
+    stub.add_argument("--image-kb", type=int, default=64, help="size of each image payload")
+    stub.add_argument("--seed", type=int, default=None, help="random seed of the stub")
+
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--log-level", default="WARNING", help="application log level (default: WARNING)")
+    return parser.parse_args(argv)
+
+
+def configure_environment(args: argparse.Namespace, workdir: Path) -> None:
+    """Point settings at a throwaway database before the app reads them.
+
+    ENCRYPTION_KEY is generated when missing so no .env is written.
+    """
+    database = Path(args.database) if args.database else workdir / "bench.db"
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{database}"
+    os.environ["LOGS_DATABASE_URL"] = (
+        f"sqlite+aiosqlite:///{database.with_name(database.stem + '-logs.db')}"
+        if args.logs_database else ""
+    )
+    os.environ["CLUSTER_ENABLED"] = "false"
+    os.environ.setdefault("ADMIN_PASSWORD", "bench")
+    os.environ.setdefault("ENCRYPTION_KEY", Fernet.generate_key().decode())
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    intervals = tuple(int(value) for value in args.intervals.split(",") if value.strip())
+    if not intervals or min(intervals) <= 0 or args.tasks <= 0:
+        print("--tasks and --intervals must be positive", file=sys.stderr)
+        return 2
+
+    with tempfile.TemporaryDirectory(prefix="autoai-bench-") as workdir:
+        configure_environment(args, Path(workdir))
+
+        # Imported after the environment is set: settings are read on first use
+        from app.bench.harness import BenchConfig, configure_logging, format_report, run_bench
+        from app.bench.stub import StubConfig
+
+        configure_logging(args.log_level)
+        report = asyncio.run(run_bench(
+            BenchConfig(
+                tasks=args.tasks,
+                intervals=intervals,
+                keys=args.keys,
+                rate_limit_per_minute=args.task_rpm,
+                duration=args.duration,
+            ),
+            StubConfig(
+                latency=args.latency,
+                latency_ms=args.latency_ms,
+                latency_spread=args.latency_spread,
+                error_rate=args.error_rate,
+                rate_limit_rate=args.rate_limit_rate,
+                retry_after_seconds=args.retry_after,
+                rpm_per_key=args.rpm_per_key,
+                response_chars=args.response_chars,
+                image_rate=args.image_rate,
+                image_kb=args.image_kb,
+                seed=args.seed,
+            ),
+        ))
+
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
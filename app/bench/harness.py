@@ -0,0 +1,211 @@
+"""Load-Test Harness.
+
+Seeds a database with interval tasks pointing at the stub server and
+runs the real scheduler, execute_task, send_message and log writer
+against it for a fixed duration, then reports throughput, scheduling
+lag, database write rate and resource usage.
+
+The database is whatever DATABASE_URL resolves to; `python -m app.bench`
+points it at a temporary file first. Settings such as BULKHEAD_* or
+LOG_WRITER_* are read from the environment as usual, so their effect
+can be compared between runs.
+"""
+
+import asyncio
+import os
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from loguru import logger
+
+from app.bench.stub import StubConfig, StubServer
+from app.database import get_engine, get_logs_engine, get_session_maker, init_db
+from app.models import Task
+from app.scheduler import scheduler, shutdown_scheduler, start_scheduler
+from app.services.http_client import close_http_clients
+from app.services.log_writer import get_log_writer, start_log_writer, stop_log_writer
+from app.services.metrics import EXECUTIONS
+from app.services.schedule_monitor import get_schedule_monitor
+from app.services.task_cache import clear_snapshots
+from app.utils.security import encrypt_api_key, fingerprint_api_key
+
+
+@dataclass
+class BenchConfig:
+    """Workload seeded by the harness."""
+
+    tasks: int = 100
+    intervals: tuple[int, ...] = (60,)  # Seconds, assigned round-robin
+    keys: int = 10  # Distinct API keys, assigned round-robin
+    rate_limit_per_minute: int | None = None  # Per task, None uses the default
+    duration: float = 60.0  # Seconds
+    model: str = "gpt-4o-mini"
+    message: str = "ping"
+
+
+def _rss_bytes() -> int:
+    """Current resident set size, 0 where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _peak_rss_bytes() -> int:
+    """Peak resident set size of the process, 0 where resource is unavailable (Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # Linux reports KiB
+
+
+def _executions() -> dict[str, int]:
+    """Execution counts by status since startup."""
+    return {values[0]: int(child.value) for values, child in EXECUTIONS.children().items()}
+
+
+async def seed_tasks(config: BenchConfig, endpoint: str) -> int:
+    """Insert the benchmark tasks.
+
+    Returns:
+        Number of tasks created.
+    """
+    keys = [f"sk-bench-{i:04d}" for i in range(max(config.keys, 1))]
+    credentials = [(encrypt_api_key(key), fingerprint_api_key(key)) for key in keys]
+
+    session_maker = get_session_maker()
+    async with session_maker() as session:
+        for i in range(config.tasks):
+            encrypted, fingerprint = credentials[i % len(credentials)]
+            interval = config.intervals[i % len(config.intervals)]
+            session.add(Task(
+                name=f"bench-{i}",
+                api_endpoint=endpoint,
+                api_key=encrypted,
+                api_key_fingerprint=fingerprint,
+                rate_limit_per_minute=config.rate_limit_per_minute,
+                schedule_type="interval",
+                interval_minutes=interval // 60,
+                interval_seconds=interval % 60,
+                message_content=config.message,
+                model=config.model,
+                enabled=True,
+            ))
+        await session.commit()
+    return config.tasks
+
+
+async def run_bench(config: BenchConfig, stub_config: StubConfig | None = None) -> dict[str, Any]:
+    """Run one benchmark and report what happened.
+
+    Args:
+        config: Tasks to seed and how long to run.
+        stub_config: Behavior of the stub provider.
+
+    Returns:
+        Report with fires, lag, database writes and resource usage.
+        CPU covers the whole process, including the stub server.
+    """
+    stub = StubServer(stub_config)
+    await stub.start()
+
+    await init_db()
+    await seed_tasks(config, stub.url)
+    await start_log_writer()
+
+    writer = get_log_writer()
+    monitor = get_schedule_monitor()
+    executions_before = _executions()
+    written_before = writer.total_written
+    batches_before = writer.total_batches
+    fires_before = monitor.total_fires
+    rss_before = _rss_bytes()
+
+    cpu_started = time.process_time()
+    started = time.perf_counter()
+    try:
+        await start_scheduler()
+        await asyncio.sleep(config.duration)
+    finally:
+        # Waits for running fires before the HTTP clients close under them
+        await shutdown_scheduler()
+        scheduler.remove_all_jobs()
+        await stop_log_writer()
+        elapsed = time.perf_counter() - started
+        cpu = time.process_time() - cpu_started
+        await close_http_clients()
+        await stub.close()
+        clear_snapshots()
+        await get_logs_engine().dispose()
+        await get_engine().dispose()
+
+    executions = {
+        status: count - executions_before.get(status, 0)
+        for status, count in _executions().items()
+    }
+    executions = {status: count for status, count in executions.items() if count}
+    completed = sum(executions.values())
+    written = writer.total_written - written_before
+    stats = monitor.stats()
+    lag = stats["lag"]
+
+    return {
+        "tasks": config.tasks,
+        "duration_s": round(elapsed, 2),
+        "fires": monitor.total_fires - fires_before,
+        "fires_per_s": round((monitor.total_fires - fires_before) / elapsed, 2),
+        "executions": executions,
+        "executions_per_s": round(completed / elapsed, 2),
+        "lag_ms": {key: lag[key] for key in ("p50", "p95", "p99")} | {"max": stats["max_lag_ms"]},
+        "missed": stats["missed"],
+        "coalesced": stats["coalesced"],
+        "max_instances": stats["max_instances"],
+        "db_rows_written": written,
+        "db_rows_per_s": round(written / elapsed, 2),
+        "db_batches": writer.total_batches - batches_before,
+        "db_max_flush_ms": round(writer.max_flush_ms, 2),
+        "db_dropped": writer.total_dropped,
+        "stub": stub.stats(),
+        "cpu_percent": round(cpu / elapsed * 100, 1),
+        "rss_mb": round(_rss_bytes() / 2**20, 1),
+        "rss_growth_mb": round((_rss_bytes() - rss_before) / 2**20, 1),
+        "peak_rss_mb": round(_peak_rss_bytes() / 2**20, 1),
+    }
+
+
+def format_report(report: dict[str, Any]) -> str:
+    """Render a report as aligned text lines."""
+    lag = report["lag_ms"]
+    executions = ", ".join(f"{status} {count}" for status, count in sorted(report["executions"].items()))
+    stub = report["stub"]
+    rows = [
+        ("tasks", report["tasks"]),
+        ("duration", f"{report['duration_s']} s"),
+        ("fires", f"{report['fires']} ({report['fires_per_s']}/s)"),
+        ("executions", f"{executions or 'none'} ({report['executions_per_s']}/s)"),
+        ("lag p50/p95/p99/max", " / ".join(
+            "-" if lag[key] is None else f"{lag[key]} ms" for key in ("p50", "p95", "p99", "max")
+        )),
+        ("missed / coalesced / max_instances",
+         f"{report['missed']} / {report['coalesced']} / {report['max_instances']}"),
+        ("db writes", f"{report['db_rows_written']} rows ({report['db_rows_per_s']}/s) "
+                      f"in {report['db_batches']} batches, max flush {report['db_max_flush_ms']} ms, "
+                      f"dropped {report['db_dropped']}"),
+        ("stub", f"{stub['requests']} requests: {stub['success']} ok, {stub['errors']} errors, "
+                 f"{stub['rate_limited']} 429, {stub['images']} images"),
+        ("cpu", f"{report['cpu_percent']}% (process, including the stub)"),
+        ("rss", f"{report['rss_mb']} MB (+{report['rss_growth_mb']} MB), peak {report['peak_rss_mb']} MB"),
+    ]
+    width = max(len(name) for name, _ in rows)
+    return "\n".join(f"{name.ljust(width)}  {value}" for name, value in rows)
+
+
+def configure_logging(level: str) -> None:
+    """Send application logs to stderr at the given level."""
+    logger.remove()
+    logger.add(sys.stderr, level=level.upper())
@@ -0,0 +1,227 @@
+"""In-Process OpenAI-Compatible Stub Server.
+
+A minimal HTTP/1.1 server answering chat completion requests with
+configurable latency, errors, 429s and response sizes, so the real
+send_message path (connection pool, rate-limit header parsing, retries)
+can be exercised without network access or API keys.
+
+Built on asyncio streams with keep-alive, so it adds no dependency and
+runs on the same event loop as the scheduler under test.
+"""
+
+import asyncio
+import base64
+import json
+import math
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Literal
+
+LatencyDistribution = Literal["fixed", "uniform", "exponential", "lognormal"]
+
+# Requests per key are counted in fixed windows of this many seconds
+RPM_WINDOW_SECONDS = 60
+
+_REASONS = {200: "OK", 404: "Not Found", 429: "Too Many Requests", 500: "Internal Server Error"}
+
+
+@dataclass
+class StubConfig:
+    """Behavior of the stub server.
+
+    Rates are probabilities per request, drawn independently in the
+    order 429, error, image.
+    """
+
+    latency: LatencyDistribution = "lognormal"
+    latency_ms: float = 200.0  # Mean (median for lognormal)
+    latency_spread: float = 0.5  # Half-width ratio for uniform, sigma for lognormal
+    error_rate: float = 0.0  # HTTP 500
+    rate_limit_rate: float = 0.0  # HTTP 429 with Retry-After
+    retry_after_seconds: float = 1.0
+    rpm_per_key: int = 0  # 429 once a key exceeds this per minute, 0 disables
+    response_chars: int = 200
+    image_rate: float = 0.0  # content=null with an images array
+    image_kb: int = 64  # Size of each generated image payload
+    seed: int | None = None
+
+
+class StubServer:
+    """OpenAI-compatible stub listening on a local port."""
+
+    def __init__(self, config: StubConfig | None = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or StubConfig()
+        self.host = host
+        self.port = port
+        self._random = random.Random(self.config.seed)
+        self._server: asyncio.AbstractServer | None = None
+        self._connections: set[asyncio.StreamWriter] = set()
+        self._windows: dict[str, tuple[int, int]] = {}  # key -> (window, count)
+        self._content = ("The quick brown fox jumps over the lazy dog. " * (
+            self.config.response_chars // 45 + 1
+        ))[: self.config.response_chars]
+        self._image = None
+
+        self.requests = 0
+        self.success = 0
+        self.errors = 0
+        self.rate_limited = 0
+        self.images = 0
+        self.bytes_sent = 0
+
+    @property
+    def url(self) -> str:
+        """Chat completions endpoint of the running server."""
+        return f"http://{self.host}:{self.port}/v1/chat/completions"
+
+    async def start(self) -> None:
+        """Start listening; port 0 picks a free port."""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        """Stop listening and drop open keep-alive connections."""
+        if self._server is None:
+            return
+        self._server.close()
+        for writer in list(self._connections):
+            writer.close()
+        await self._server.wait_closed()
+        self._server = None
+
+    def stats(self) -> dict[str, int]:
+        """Get request counts by outcome."""
+        return {
+            "requests": self.requests,
+            "success": self.success,
+            "errors": self.errors,
+            "rate_limited": self.rate_limited,
+            "images": self.images,
+            "bytes_sent": self.bytes_sent,
+        }
+
+    def sample_latency(self) -> float:
+        """Draw one response delay in seconds."""
+        config = self.config
+        mean = max(config.latency_ms, 0.0)
+        if config.latency == "uniform":
+            delta = mean * config.latency_spread
+            value = self._random.uniform(mean - delta, mean + delta)
+        elif config.latency == "exponential":
+            value = self._random.expovariate(1 / mean) if mean else 0.0
+        elif config.latency == "lognormal":
+            value = self._random.lognormvariate(math.log(mean), config.latency_spread) if mean else 0.0
+        else:
+            value = mean
+        return max(value, 0.0) / 1000
+
+    def _over_key_limit(self, key: str) -> bool:
+        """Count a request against its key's window."""
+        if self.config.rpm_per_key <= 0:
+            return False
+        window = int(time.time() // RPM_WINDOW_SECONDS)
+        current, count = self._windows.get(key, (window, 0))
+        if current != window:
+            count = 0
+        count += 1
+        self._windows[key] = (window, count)
+        return count > self.config.rpm_per_key
+
+    def _image_payload(self) -> str:
+        if self._image is None:
+            raw = self._random.randbytes(self.config.image_kb * 1024)
+            self._image = "data:image/png;base64," + base64.b64encode(raw).decode()
+        return self._image
+
+    def _completion(self, model: str) -> dict[str, Any]:
+        if self._random.random() < self.config.image_rate:
+            self.images += 1
+            message = {
+                "role": "assistant",
+                "content": None,
+                "images": [{"type": "image_url", "image_url": {"url": self._image_payload()}}],
+            }
+        else:
+            message = {"role": "assistant", "content": self._content}
+        return {
+            "id": f"chatcmpl-stub{self.requests}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "message": message, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+        }
+
+    async def respond(self, headers: dict[str, str], body: bytes) -> tuple[int, dict[str, str], bytes]:
+        """Build the response to one chat completion request."""
+        self.requests += 1
+        key = headers.get("authorization", "")
+        config = self.config
+
+        if self._over_key_limit(key):
+            self.rate_limited += 1
+            reset = RPM_WINDOW_SECONDS - time.time() % RPM_WINDOW_SECONDS
+            return 429, {
+                "x-ratelimit-remaining-requests": "0",
+                "x-ratelimit-reset-requests": f"{reset:.3f}s",
+            }, b'{"error": {"message": "Rate limit reached", "type": "requests"}}'
+
+        await asyncio.sleep(self.sample_latency())
+
+        if self._random.random() < config.rate_limit_rate:
+            self.rate_limited += 1
+            return 429, {"retry-after": f"{config.retry_after_seconds:g}"}, (
+                b'{"error": {"message": "Rate limit reached", "type": "requests"}}'
+            )
+        if self._random.random() < config.error_rate:
+            self.errors += 1
+            return 500, {}, b'{"error": {"message": "Stub server error", "type": "server_error"}}'
+
+        try:
+            model = json.loads(body).get("model", "stub")
+        except (ValueError, AttributeError):
+            model = "stub"
+        self.success += 1
+        return 200, {}, json.dumps(self._completion(model)).encode()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve requests on one keep-alive connection."""
+        self._connections.add(writer)
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+
+                lines = head.decode("latin-1").split("\r\n")
+                method, path, _ = lines[0].split(" ", 2)
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                if method == "POST" and path.rstrip("/").endswith("/chat/completions"):
+                    status, extra, payload = await self.respond(headers, body)
+                else:
+                    status, extra, payload = 404, {}, b'{"error": {"message": "Not found"}}'
+
+                response = [
+                    f"HTTP/1.1 {status} {_REASONS[status]}",
+                    "content-type: application/json",
+                    f"content-length: {len(payload)}",
+                ] + [f"{name}: {value}" for name, value in extra.items()]
+                writer.write(("\r\n".join(response) + "\r\n\r\n").encode() + payload)
+                self.bytes_sent += len(payload)
+                await writer.drain()
+
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections.discard(writer)
+            writer.close()
@@ -2,9 +2,10 @@
 
 import os
 from pathlib import Path
+from typing import Literal
 
 from cryptography.fernet import Fernet
-from pydantic import Field, field_validator
+from pydantic import Field, ValidationInfo, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -14,9 +15,95 @@ class Settings(BaseSettings):
     # Database
     database_url: str = "sqlite+aiosqlite:///./data/autoai.db"
 
+    # Connection pool for server databases (PostgreSQL); SQLite ignores these
+    db_pool_size: int = Field(default=10, ge=1)
+    db_max_overflow: int = Field(default=20, ge=0)
+    db_pool_timeout: float = Field(default=30.0, gt=0)  # seconds to wait for a connection
+    db_pool_recycle: int = Field(default=1800, ge=-1)  # seconds, -1 never recycles
+    db_pool_pre_ping: bool = True
+
+    # Read-only engine for dashboard, log pages and GET API routes
+    database_read_url: str | None = None  # Replica URL; default: read-only view of database_url
+    db_read_pool_size: int = Field(default=5, ge=1)
+    db_read_max_overflow: int = Field(default=10, ge=0)
+
+    # SQLite connection profile, applied to every new connection
+    sqlite_journal_mode: Literal["WAL", "DELETE", "TRUNCATE", "PERSIST", "MEMORY", "OFF"] = "WAL"
+    sqlite_synchronous: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = "NORMAL"
+    sqlite_mmap_size: int = Field(default=268435456, ge=0)  # bytes, 0 disables
+    sqlite_busy_timeout_ms: int = Field(default=5000, ge=0)
+
+    # Separate SQLite database for execution logs and daily stats (default: share database_url).
+    # Logs and task summaries then commit separately, logs first; summaries a crash
+    # left behind are recomputed from the newest logs at startup.
+    logs_database_url: str | None = None
+    logs_sqlite_synchronous: Literal["OFF", "NORMAL", "FULL", "EXTRA"] | None = None  # default: sqlite_synchronous
+
     # Logging
     log_level: str = "INFO"
 
+    # Outbound HTTP connection pool (one pooled client per endpoint origin)
+    http2_enabled: bool = False
+    http_max_connections: int = Field(default=100, ge=1)
+    http_max_keepalive_connections: int = Field(default=20, ge=0)
+    http_keepalive_expiry: float = Field(default=30.0, ge=0)
+
+    # Execution log writer (group commit)
+    log_writer_batch_size: int = Field(default=500, ge=1)
+    log_writer_flush_interval: float = Field(default=0.5, gt=0)  # seconds
+    log_writer_max_queue: int = Field(default=10000, ge=1)
+
+    # Store a per-phase timing breakdown with each execution log
+    execution_timings_enabled: bool = True
+
+    # Decrypted credential cache
+    credential_cache_ttl_seconds: int = Field(default=300, ge=0)
+    credential_cache_max_size: int = Field(default=10000, ge=1)
+
+    # Spread fixed_time fires over this many seconds (0 disables, tasks may override)
+    fixed_time_jitter_seconds: int = Field(default=0, ge=0, le=3600)
+
+    # Scheduler job instances and bulkhead concurrency limits
+    job_max_instances: int = Field(default=10, ge=1)  # Per task
+    shutdown_drain_seconds: float = Field(default=30.0, ge=0)  # Wait for running executions on shutdown
+    bulkhead_global_max_concurrent: int = Field(default=200, ge=1)
+    bulkhead_host_max_concurrent: int = Field(default=50, ge=1)
+    bulkhead_key_max_concurrent: int = Field(default=20, ge=1)
+    bulkhead_max_queue: int = Field(default=500, ge=0)
+    bulkhead_overflow: Literal["queue", "skip", "coalesce"] = "queue"
+
+    # Per-API-key rate limiting (0 = no limit unless a task sets one)
+    rate_limit_default_per_minute: int = Field(default=0, ge=0)
+    rate_limit_burst: int = Field(default=0, ge=0)  # 0 = one minute's worth
+    rate_limit_max_wait_seconds: float = Field(default=300.0, ge=0)
+    rate_limit_max_retries: int = Field(default=2, ge=0)  # Retries after a 429
+
+    # Task snapshot cache reconciliation with the database (0 disables)
+    task_cache_reconcile_seconds: int = Field(default=60, ge=0)
+
+    # Execution log retention (0 keeps logs forever; tasks may override)
+    log_retention_days: int = Field(default=0, ge=0)
+    log_retention_max_rows: int = Field(default=0, ge=0)  # Per task
+    log_retention_interval_minutes: int = Field(default=60, ge=0)  # 0 disables the job
+    log_retention_batch_size: int = Field(default=1000, ge=1)
+    log_retention_batch_pause: float = Field(default=0.05, ge=0)  # seconds between batches
+
+    # Compressed archive of purged execution logs, queried by date-filtered log views
+    log_archive_enabled: bool = False
+    log_archive_dir: str = "data/archive"
+    log_archive_compression: Literal["gzip", "zstd"] | None = None  # default: zstd if 'zstandard' is installed
+
+    # Multi-process scheduling through database leases (disabled = single node)
+    cluster_enabled: bool = False
+    cluster_mode: Literal["leader", "partition"] = "leader"
+    cluster_node_id: str | None = None  # Defaults to hostname-pid
+    # Lease expiry is timed by the database server's clock, so node clocks may drift
+    cluster_lease_seconds: int = Field(default=30, ge=5)
+    cluster_heartbeat_seconds: int = Field(default=10, ge=1)
+
+    # Prometheus text-format /metrics endpoint (unauthenticated, for a local scraper)
+    metrics_enabled: bool = True
+
     # Admin (required, hidden from repr/logs)
     admin_password: str = Field(..., repr=False)
 
@@ -48,6 +135,25 @@ class Settings(BaseSettings):
             raise ValueError('database_url must be a valid connection string (e.g., sqlite+aiosqlite:///./data/app.db)')
         return v
 
+    @field_validator('logs_database_url')
+    @classmethod
+    def validate_logs_database_url(cls, v: str | None) -> str | None:
+        """Validate logs_database_url points at a SQLite database."""
+        if v is None or not v.strip():
+            return None
+        if not v.startswith('sqlite'):
+            raise ValueError('logs_database_url must be a SQLite connection string (e.g., sqlite+aiosqlite:///./data/logs.db)')
+        return v
+
+    @field_validator('cluster_heartbeat_seconds')
+    @classmethod
+    def validate_cluster_heartbeat(cls, v: int, info: ValidationInfo) -> int:
+        """Validate heartbeats renew the lease well before it expires."""
+        lease_seconds = info.data.get('cluster_lease_seconds')
+        if lease_seconds is not None and v * 2 > lease_seconds:
+            raise ValueError('cluster_heartbeat_seconds must be at most half of cluster_lease_seconds')
+        return v
+
     @field_validator('admin_password')
     @classmethod
     def validate_admin_password(cls, v: str) -> str:
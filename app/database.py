@@ -1,7 +1,16 @@
-"""SQLAlchemy Async Engine and Session Configuration."""
+"""SQLAlchemy Async Engine and Session Configuration.
 
-from typing import AsyncGenerator
+Execution logs and their daily rollup can live in a separate SQLite
+database (logs_database_url). Sessions route those tables to the logs
+engine, so the constant stream of log writes takes that file's write
+lock and WAL instead of the one task edits wait on.
+"""
 
+from pathlib import Path
+from typing import Any, AsyncGenerator
+
+from loguru import logger
+from sqlalchemy import Table, event, make_url, text
 from sqlalchemy.ext.asyncio import (
     AsyncAttrs,
     AsyncEngine,
@@ -10,8 +19,9 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
 )
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import QueuePool
 
-from app.config import get_settings
+from app.config import Settings, get_settings
 
 
 class Base(AsyncAttrs, DeclarativeBase):
@@ -19,9 +29,212 @@ class Base(AsyncAttrs, DeclarativeBase):
     pass
 
 
+# PRAGMA synchronous levels as reported back by SQLite
+_SYNCHRONOUS_LEVELS = {0: "OFF", 1: "NORMAL", 2: "FULL", 3: "EXTRA"}
+
+# Tables stored in the logs database when logs_database_url is set
+LOG_TABLE_NAMES = ("execution_logs", "execution_stats_daily", "execution_latency_daily")
+
+
+def sqlite_profile(settings: Settings, *, logs: bool = False) -> dict[str, Any]:
+    """Get the connection pragmas configured for SQLite.
+
+    Args:
+        settings: Application settings.
+        logs: Profile of the separate logs database.
+
+    Returns:
+        Pragma name to value, in the order they are applied.
+    """
+    synchronous = settings.sqlite_synchronous
+    if logs and settings.logs_sqlite_synchronous is not None:
+        synchronous = settings.logs_sqlite_synchronous
+    return {
+        "journal_mode": settings.sqlite_journal_mode,
+        "synchronous": synchronous,
+        "mmap_size": settings.sqlite_mmap_size,
+        "busy_timeout": settings.sqlite_busy_timeout_ms,
+    }
+
+
+def _is_memory_database(url: str) -> bool:
+    """Check whether a SQLite URL points at an in-memory database."""
+    return url.endswith(":memory:") or url.endswith("://") or url.endswith(":///")
+
+
+def sqlite_file(url: str | None) -> Path | None:
+    """Get the file of a SQLite database URL.
+
+    Returns:
+        None for unset, in-memory or non-SQLite URLs.
+    """
+    if url is None:
+        return None
+    url = make_url(url)
+    if url.get_backend_name() != "sqlite" or url.database in (None, "", ":memory:"):
+        return None
+    return Path(url.database.removeprefix("file:"))
+
+
+def database_file(*, logs: bool = False) -> Path | None:
+    """Get the SQLite file configured for the main or the log tables.
+
+    Used by the SQLite maintenance scripts. The logs file falls back to
+    the main database when logs_database_url is not set.
+    """
+    settings = get_settings()
+    if logs and settings.logs_database_url is not None:
+        return sqlite_file(settings.logs_database_url)
+    return sqlite_file(settings.database_url)
+
+
+def _apply_sqlite_profile(dbapi_connection, profile: dict[str, Any]) -> None:
+    """Execute the pragmas of a profile on a DBAPI connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in profile.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+    finally:
+        cursor.close()
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Apply the SQLite profile to a new DBAPI connection."""
+    _apply_sqlite_profile(dbapi_connection, sqlite_profile(get_settings()))
+
+
+def _set_logs_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Apply the logs database profile to a new DBAPI connection."""
+    _apply_sqlite_profile(dbapi_connection, sqlite_profile(get_settings(), logs=True))
+
+
+def _set_sqlite_read_pragmas(dbapi_connection, connection_record) -> None:
+    """Apply the read side of the SQLite profile to a read-only connection.
+
+    journal_mode and synchronous belong to the writer; query_only
+    guards against accidental writes on read sessions.
+    """
+    profile = sqlite_profile(get_settings())
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA mmap_size = {profile['mmap_size']}")
+        cursor.execute(f"PRAGMA busy_timeout = {profile['busy_timeout']}")
+        cursor.execute("PRAGMA query_only = ON")
+    finally:
+        cursor.close()
+
+
+def _sqlite_read_url(database_url: str) -> str | None:
+    """Reopen a SQLite file as a read-only URI, None for in-memory databases."""
+    if _is_memory_database(database_url):
+        return None
+    url = make_url(database_url)
+    database = url.database if url.database.startswith("file:") else f"file:{url.database}"
+    return url.set(
+        database=database,
+        query={**url.query, "mode": "ro", "uri": "true"},
+    ).render_as_string(hide_password=False)
+
+
+def read_database_url(settings: Settings) -> str | None:
+    """Get the URL of the read-only engine.
+
+    An explicit database_read_url (e.g. a PostgreSQL replica) wins.
+    Otherwise SQLite files are opened a second time as read-only URI
+    connections, and server databases get a separate pool on the same
+    URL. In-memory SQLite databases cannot be shared, so they return
+    None and reads use the write engine.
+
+    Args:
+        settings: Application settings.
+
+    Returns:
+        Read engine URL, or None to share the write engine.
+    """
+    if settings.database_read_url:
+        return settings.database_read_url
+
+    if make_url(settings.database_url).get_backend_name() != "sqlite":
+        return settings.database_url
+    return _sqlite_read_url(settings.database_url)
+
+
+async def check_sqlite_profile(engine: AsyncEngine, *, logs: bool = False) -> dict[str, Any]:
+    """Read back the connection pragmas and log the effective profile.
+
+    Logs a warning for every pragma SQLite did not accept as
+    configured, e.g. WAL on a filesystem without shared memory.
+
+    Args:
+        engine: SQLite engine to check.
+        logs: Check against the logs database profile.
+
+    Returns:
+        Effective pragma values.
+    """
+    expected = sqlite_profile(get_settings(), logs=logs)
+
+    async with engine.connect() as conn:
+        effective = {
+            name: await conn.scalar(text(f"PRAGMA {name}")) for name in expected
+        }
+    effective["journal_mode"] = str(effective["journal_mode"]).upper()
+    effective["synchronous"] = _SYNCHRONOUS_LEVELS.get(
+        effective["synchronous"], effective["synchronous"]
+    )
+
+    for name, value in expected.items():
+        if name == "journal_mode" and _is_memory_database(str(engine.url)):
+            continue  # In-memory databases always report MEMORY
+        if effective[name] != value:
+            logger.warning(f"SQLite PRAGMA {name} is {effective[name]}, configured {value}")
+
+    logger.info(
+        ("SQLite logs engine profile: " if logs else "SQLite engine profile: ")
+        + ", ".join(f"{name}={value}" for name, value in effective.items())
+    )
+    return effective
+
+
+def engine_options(settings: Settings) -> dict[str, Any]:
+    """Get create_async_engine() keyword arguments for the configured backend.
+
+    SQLite keeps SQLAlchemy's default pool and gets its pragmas from a
+    connect event; server databases get a sized, pre-pinged pool. asyncpg
+    sessions run in UTC so server-side now() matches the naive UTC
+    timestamps the application writes.
+
+    Args:
+        settings: Application settings.
+
+    Returns:
+        Keyword arguments for create_async_engine().
+    """
+    url = make_url(settings.database_url)
+    if url.get_backend_name() == "sqlite":
+        return {}
+
+    options: dict[str, Any] = {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+    if url.get_driver_name() == "asyncpg":
+        options["connect_args"] = {
+            "server_settings": {"timezone": "UTC", "application_name": "autoai"},
+        }
+    return options
+
+
 # Lazy-loaded engine and session maker singletons
 _engine: AsyncEngine | None = None
 _async_session_maker: async_sessionmaker[AsyncSession] | None = None
+_read_engine: AsyncEngine | None = None
+_read_session_maker: async_sessionmaker[AsyncSession] | None = None
+_logs_engine: AsyncEngine | None = None
+_logs_read_engine: AsyncEngine | None = None
 
 
 def get_engine() -> AsyncEngine:
@@ -36,34 +249,176 @@ def get_engine() -> AsyncEngine:
         _engine = create_async_engine(
             settings.database_url,
             echo=False,
+            **engine_options(settings),
         )
+        if _engine.dialect.name == "sqlite":
+            event.listen(_engine.sync_engine, "connect", _set_sqlite_pragmas)
+        else:
+            logger.info(
+                f"Database pool: size={settings.db_pool_size}, "
+                f"max_overflow={settings.db_max_overflow}, "
+                f"pre_ping={settings.db_pool_pre_ping}"
+            )
     return _engine
 
 
+def get_logs_engine() -> AsyncEngine:
+    """Get the logs database engine singleton, creating it on first access.
+
+    Falls back to the main engine when logs_database_url is not set.
+    """
+    global _logs_engine
+    if _logs_engine is None:
+        settings = get_settings()
+        if settings.logs_database_url is None:
+            return get_engine()
+        _logs_engine = create_async_engine(settings.logs_database_url, echo=False)
+        event.listen(_logs_engine.sync_engine, "connect", _set_logs_sqlite_pragmas)
+    return _logs_engine
+
+
+def log_tables() -> list[Table]:
+    """Get the tables stored in the logs database."""
+    from app import models  # noqa: F401
+
+    return [Base.metadata.tables[name] for name in LOG_TABLE_NAMES]
+
+
+def _session_binds(engine: AsyncEngine, logs_engine: AsyncEngine) -> dict[Table, AsyncEngine]:
+    """Route the log tables to their own engine, if separate."""
+    if logs_engine is engine:
+        return {}
+    return {table: logs_engine for table in log_tables()}
+
+
+def schema_engines() -> list[tuple[AsyncEngine, list[Table]]]:
+    """Pair each engine with the tables it stores.
+
+    Used to create and migrate the schema of every database.
+    """
+    from app import models  # noqa: F401
+
+    engine = get_engine()
+    logs_engine = get_logs_engine()
+    if logs_engine is engine:
+        return [(engine, Base.metadata.sorted_tables)]
+    logs = log_tables()
+    return [
+        (engine, [table for table in Base.metadata.sorted_tables if table not in logs]),
+        (logs_engine, logs),
+    ]
+
+
 def get_session_maker() -> async_sessionmaker[AsyncSession]:
     """Get the async session maker singleton, creating it on first access."""
     global _async_session_maker
     if _async_session_maker is None:
+        engine = get_engine()
         _async_session_maker = async_sessionmaker(
-            get_engine(),
+            engine,
+            binds=_session_binds(engine, get_logs_engine()),
             class_=AsyncSession,
             expire_on_commit=False,
         )
     return _async_session_maker
 
 
+def get_read_engine() -> AsyncEngine:
+    """Get the read-only engine singleton, creating it on first access.
+
+    Report queries run on their own connections, so they never take a
+    connection from the execution path or queue behind its writes.
+    Falls back to the write engine when no separate reader is possible.
+    """
+    global _read_engine
+    if _read_engine is None:
+        settings = get_settings()
+        url = read_database_url(settings)
+        if url is None:
+            return get_engine()
+
+        options = engine_options(settings.model_copy(update={"database_url": url}))
+        if "pool_size" in options:
+            options["pool_size"] = settings.db_read_pool_size
+            options["max_overflow"] = settings.db_read_max_overflow
+        _read_engine = create_async_engine(url, echo=False, **options)
+        if _read_engine.dialect.name == "sqlite":
+            event.listen(_read_engine.sync_engine, "connect", _set_sqlite_read_pragmas)
+    return _read_engine
+
+
+def get_logs_read_engine() -> AsyncEngine:
+    """Get the read-only engine of the logs database, creating it on first access.
+
+    Falls back to the main read engine when logs share the main
+    database, and to the logs write engine for in-memory databases.
+    """
+    global _logs_read_engine
+    if _logs_read_engine is None:
+        settings = get_settings()
+        if settings.logs_database_url is None:
+            return get_read_engine()
+        url = _sqlite_read_url(settings.logs_database_url)
+        if url is None:
+            return get_logs_engine()
+        _logs_read_engine = create_async_engine(url, echo=False)
+        event.listen(_logs_read_engine.sync_engine, "connect", _set_sqlite_read_pragmas)
+    return _logs_read_engine
+
+
+def get_read_session_maker() -> async_sessionmaker[AsyncSession]:
+    """Get the read-only session maker singleton, creating it on first access."""
+    global _read_session_maker
+    if _read_session_maker is None:
+        read_engine = get_read_engine()
+        _read_session_maker = async_sessionmaker(
+            read_engine,
+            binds=_session_binds(read_engine, get_logs_read_engine()),
+            class_=AsyncSession,
+            expire_on_commit=False,
+        )
+    return _read_session_maker
+
+
+def pool_stats() -> list[dict[str, Any]]:
+    """Get connection pool usage of the engines created so far.
+
+    Engines without a queue pool (e.g. in-memory SQLite) are skipped.
+    """
+    engines = {
+        "main": _engine,
+        "read": _read_engine,
+        "logs": _logs_engine,
+        "logs_read": _logs_read_engine,
+    }
+    stats = []
+    for name, engine in engines.items():
+        if engine is None or not isinstance(engine.pool, QueuePool):
+            continue
+        stats.append({
+            "engine": name,
+            "size": engine.pool.size(),
+            "checked_out": engine.pool.checkedout(),
+            "checked_in": engine.pool.checkedin(),
+        })
+    return stats
+
+
 async def init_db():
     """Initialize database tables.
 
-    Models must be imported before calling this function
-    to register them with Base.metadata.
+    Creates the tables of the main database and, if configured, the
+    log tables in the separate logs database.
     """
-    # Import models to register them with Base.metadata
-    from app import models  # noqa: F401
+    for engine, tables in schema_engines():
+        async with engine.begin() as conn:
+            if engine.dialect.name == "sqlite":
+                # Lets log retention return freed pages; only applies to a new database
+                await conn.exec_driver_sql("PRAGMA auto_vacuum = INCREMENTAL")
+            await conn.run_sync(Base.metadata.create_all, tables=tables)
 
-    engine = get_engine()
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+        if engine.dialect.name == "sqlite":
+            await check_sqlite_profile(engine, logs=engine is not get_engine())
 
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
@@ -73,11 +428,23 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+async def get_read_session() -> AsyncGenerator[AsyncSession, None]:
+    """Get async read-only database session for pages and GET routes."""
+    session_maker = get_read_session_maker()
+    async with session_maker() as session:
+        yield session
+
+
 def reset_engine() -> None:
     """Reset engine and session maker singletons.
 
     Used by tests to reset state between test runs.
     """
-    global _engine, _async_session_maker
+    global _engine, _async_session_maker, _read_engine, _read_session_maker
+    global _logs_engine, _logs_read_engine
     _engine = None
     _async_session_maker = None
+    _read_engine = None
+    _read_session_maker = None
+    _logs_engine = None
+    _logs_read_engine = None
@@ -9,6 +9,10 @@ from loguru import logger
 from app.config import get_settings, ensure_encryption_key
 from app.database import init_db
 from app.scheduler import start_scheduler, shutdown_scheduler
+from app.services.cluster import start_cluster, stop_cluster
+from app.services.http_client import close_http_clients
+from app.services.log_writer import start_log_writer, stop_log_writer
+from app.api.metrics import RequestMetricsMiddleware, router as metrics_router
 from app.api.tasks import router as tasks_router
 from app.web.tasks import router as web_tasks_router
 from app.web.auth import router as auth_router, AuthRedirectException
@@ -31,6 +35,8 @@ async def lifespan(app: FastAPI):
     logger.info("Starting AutoAI application...")
     ensure_encryption_key()
     await init_db()
+    await start_log_writer()
+    await start_cluster()
     await start_scheduler()
     logger.info("AutoAI application started successfully")
 
@@ -38,7 +44,11 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("Shutting down AutoAI application...")
+    # Waits for running executions, which still need the writer and HTTP clients
     await shutdown_scheduler()
+    await stop_cluster()
+    await stop_log_writer()
+    await close_http_clients()
     logger.info("AutoAI application shutdown complete")
 
 
@@ -54,6 +64,11 @@ app.include_router(tasks_router)
 app.include_router(web_tasks_router)
 app.include_router(auth_router)
 
+# Prometheus metrics for a local scraping agent
+if settings.metrics_enabled:
+    app.include_router(metrics_router)
+    app.add_middleware(RequestMetricsMiddleware)
+
 
 @app.exception_handler(AuthRedirectException)
 async def auth_redirect_handler(request: Request, exc: AuthRedirectException):
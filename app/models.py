@@ -4,15 +4,35 @@ Task and ExecutionLog models for storing task configurations
 and execution history.
 """
 
-from datetime import datetime
+from datetime import date, datetime, timezone
 from typing import Optional, List
 
-from sqlalchemy import String, Text, Integer, Boolean, DateTime, ForeignKey, func
+from sqlalchemy import (
+    JSON, BigInteger, String, Text, Integer, Boolean, Date, DateTime, ForeignKey, Index, func
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.types import TypeDecorator
 
 from app.database import Base
 
 
+class UTCDateTime(TypeDecorator):
+    """Naive UTC timestamp column.
+
+    Aware datetimes are converted to UTC and stored without tzinfo, so
+    SQLite and PostgreSQL (timestamp without time zone) hold the same
+    values whichever form the caller passes.
+    """
+
+    impl = DateTime
+    cache_ok = True
+
+    def process_bind_param(self, value: Optional[datetime], dialect) -> Optional[datetime]:
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+
 class Task(Base):
     """Task configuration model.
 
@@ -26,22 +46,45 @@ class Task(Base):
     name: Mapped[str] = mapped_column(String(100))
     api_endpoint: Mapped[str] = mapped_column(String(500))
     api_key: Mapped[str] = mapped_column(String(500))  # Encrypted storage
+    # Non-reversible key identifier, groups tasks sharing a provider quota
+    api_key_fingerprint: Mapped[Optional[str]] = mapped_column(
+        String(64), nullable=True, index=True
+    )
+    rate_limit_per_minute: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     schedule_type: Mapped[str] = mapped_column(String(20))  # interval | fixed_time
     interval_minutes: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     interval_seconds: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     fixed_time: Mapped[Optional[str]] = mapped_column(String(5), nullable=True)  # HH:MM
+    # Fire-time spread window in seconds for fixed_time tasks (None = global default)
+    jitter_seconds: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    # Execution log retention overrides (None = global default, 0 = keep forever)
+    log_retention_days: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    log_retention_max_rows: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    # Next scheduled fire (UTC), anchors the interval phase across restarts
+    next_run_at: Mapped[Optional[datetime]] = mapped_column(UTCDateTime, nullable=True)
     message_content: Mapped[str] = mapped_column(Text)
     model: Mapped[str] = mapped_column(String(100))  # AI model name
     enabled: Mapped[bool] = mapped_column(Boolean, default=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+    # Latest execution, maintained by the log writer alongside each log insert
+    last_executed_at: Mapped[Optional[datetime]] = mapped_column(UTCDateTime, nullable=True)
+    last_status: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
+    last_latency_ms: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    consecutive_failures: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    created_at: Mapped[datetime] = mapped_column(UTCDateTime, server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, server_default=func.now(), onupdate=func.now()
+        UTCDateTime, server_default=func.now(), onupdate=func.now()
     )
 
     # Relationship
     execution_logs: Mapped[List["ExecutionLog"]] = relationship(
         back_populates="task", cascade="all, delete-orphan"
     )
+    daily_stats: Mapped[List["ExecutionStatsDaily"]] = relationship(
+        cascade="all, delete-orphan"
+    )
+    latency_histograms: Mapped[List["ExecutionLatencyDaily"]] = relationship(
+        cascade="all, delete-orphan"
+    )
 
     def __repr__(self) -> str:
         return f"<Task(id={self.id}, name='{self.name}', enabled={self.enabled})>"
@@ -56,15 +99,133 @@ class ExecutionLog(Base):
 
     __tablename__ = "execution_logs"
 
-    id: Mapped[int] = mapped_column(primary_key=True)
+    # 64-bit on PostgreSQL; SQLite needs INTEGER for its rowid alias
+    id: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer, "sqlite"), primary_key=True
+    )
     task_id: Mapped[int] = mapped_column(ForeignKey("tasks.id", ondelete="CASCADE"))
-    executed_at: Mapped[datetime] = mapped_column(DateTime)
+    executed_at: Mapped[datetime] = mapped_column(UTCDateTime)
+    # Trigger fire time the execution belongs to; None for immediate runs
+    scheduled_at: Mapped[Optional[datetime]] = mapped_column(UTCDateTime, nullable=True)
     status: Mapped[str] = mapped_column(String(20))  # success | failed
     response_summary: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # Successful calls only, in milliseconds; connect_ms is 0 on a reused connection
+    latency_ms: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    connect_ms: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    ttfb_ms: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    # Milliseconds per phase of this fire (latency.TIMING_PHASES), zero phases left out
+    timings: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
 
     # Relationship
     task: Mapped["Task"] = relationship(back_populates="execution_logs")
 
     def __repr__(self) -> str:
         return f"<ExecutionLog(id={self.id}, task_id={self.task_id}, status='{self.status}')>"
+
+
+# Per-task history (latest first), time-window stats and per-task status filters
+Index(
+    "ix_execution_logs_task_id_executed_at",
+    ExecutionLog.task_id,
+    ExecutionLog.executed_at.desc(),
+)
+Index("ix_execution_logs_executed_at", ExecutionLog.executed_at)
+Index(
+    "ix_execution_logs_task_id_status_executed_at",
+    ExecutionLog.task_id,
+    ExecutionLog.status,
+    ExecutionLog.executed_at,
+)
+
+
+class ExecutionStatsDaily(Base):
+    """Daily execution statistics rollup.
+
+    One row per task and day (China time), maintained alongside each
+    execution log insert so statistics never scan execution_logs.
+    """
+
+    __tablename__ = "execution_stats_daily"
+
+    task_id: Mapped[int] = mapped_column(
+        ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True
+    )
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    success: Mapped[int] = mapped_column(Integer, default=0)
+    failed: Mapped[int] = mapped_column(Integer, default=0)
+    latency_sum: Mapped[int] = mapped_column(BigInteger, default=0)  # ms, successful runs
+    latency_max: Mapped[int] = mapped_column(Integer, default=0)  # ms
+
+    def __repr__(self) -> str:
+        return (
+            f"<ExecutionStatsDaily(task_id={self.task_id}, day={self.day}, "
+            f"success={self.success}, failed={self.failed})>"
+        )
+
+
+# Dashboard reads one day across all tasks
+Index("ix_execution_stats_daily_day", ExecutionStatsDaily.day)
+
+
+class ExecutionLatencyDaily(Base):
+    """Daily latency histogram rollup.
+
+    Bucket counts of one latency metric (total | connect | ttfb | lag)
+    per task and day (China time); see app/services/latency.py for the
+    bucket scheme. Percentiles over any window merge these rows.
+    """
+
+    __tablename__ = "execution_latency_daily"
+
+    task_id: Mapped[int] = mapped_column(
+        ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True
+    )
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    metric: Mapped[str] = mapped_column(String(10), primary_key=True)
+    bucket: Mapped[int] = mapped_column(Integer, primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, default=0)
+
+    def __repr__(self) -> str:
+        return (
+            f"<ExecutionLatencyDaily(task_id={self.task_id}, day={self.day}, "
+            f"metric='{self.metric}', bucket={self.bucket}, count={self.count})>"
+        )
+
+
+class SchedulerNode(Base):
+    """Scheduler node heartbeat.
+
+    Each process running the scheduler in cluster mode keeps its row
+    fresh so other nodes can tell which members are alive.
+    """
+
+    __tablename__ = "scheduler_nodes"
+
+    node_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    hostname: Mapped[str] = mapped_column(String(255))
+    pid: Mapped[int] = mapped_column(Integer)
+    started_at: Mapped[datetime] = mapped_column(UTCDateTime)
+    heartbeat_at: Mapped[datetime] = mapped_column(UTCDateTime)
+
+    def __repr__(self) -> str:
+        return f"<SchedulerNode(node_id='{self.node_id}', heartbeat_at={self.heartbeat_at})>"
+
+
+class SchedulerLease(Base):
+    """Named time-bounded lease held by one scheduler node.
+
+    The token increases every time the lease changes hands and acts as
+    a fencing token: a node may only renew or release a lease while it
+    still holds the token it acquired.
+    """
+
+    __tablename__ = "scheduler_leases"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    owner: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    token: Mapped[int] = mapped_column(Integer, default=0)
+    expires_at: Mapped[datetime] = mapped_column(UTCDateTime)
+
+    def __repr__(self) -> str:
+        return f"<SchedulerLease(name='{self.name}', owner='{self.owner}', token={self.token})>"
@@ -5,29 +5,63 @@ Provides task registration, execution, and dynamic job management.
 """
 
 import asyncio
-from datetime import datetime, timezone
+import hashlib
+import time
+from datetime import datetime, timedelta, timezone
 
 from apscheduler.jobstores.base import JobLookupError
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.triggers.cron import CronTrigger
 from loguru import logger
-from sqlalchemy import select
+from sqlalchemy import bindparam, select, update
 
+from app.config import get_settings
 from app.database import get_session_maker
-from app.models import Task, ExecutionLog
-from app.services.openai_service import send_message, OpenAIServiceError
-from app.utils.security import decrypt_api_key, mask_api_key
-
-# Global scheduler instance with asyncio support
-scheduler = AsyncIOScheduler()
-
-# Maximum concurrent instances per job (effectively unlimited for fire-and-forget mode)
-MAX_CONCURRENT_INSTANCES = 999999
+from app.models import Task
+from app.services.bulkhead import BulkheadRejected, get_bulkheads
+from app.services.cluster import execution_fence, fence_valid, get_cluster, is_assigned, owns_task
+from app.services.latency import schedule_lag_ms
+from app.services.log_writer import submit_execution_log
+from app.services.metrics import EXECUTION_PHASE_SECONDS, EXECUTIONS, EXECUTIONS_IN_FLIGHT
+from app.services.openai_service import OpenAIResponse, OpenAIServiceError, send_message
+from app.services.rate_limiter import RateLimitHeaders, RateLimitWaitTooLong, get_rate_limiter
+from app.services.retention import purge_expired_logs
+from app.services.schedule_monitor import ScheduledTimeExecutor, get_schedule_monitor
+from app.services.task_cache import (
+    TaskSnapshot,
+    clear_snapshots,
+    get_cached_versions,
+    get_snapshot,
+    remove_snapshot,
+    upsert_snapshot,
+)
+from app.utils.security import CachedCredential, get_credential
+
+# Global scheduler instance with asyncio support; each run knows its fire time
+scheduler = AsyncIOScheduler(executors={"default": ScheduledTimeExecutor()})
 
 # Track pending immediate executions for cleanup
 _pending_immediate_tasks: set[asyncio.Task] = set()
 
+# Executions currently running, awaited on shutdown before the log writer stops
+_running_executions: set[asyncio.Task] = set()
+
+# Job ID of the periodic task cache reconciliation
+RECONCILE_JOB_ID = "task_cache_reconcile"
+
+# Job ID of the periodic execution log purge
+RETENTION_JOB_ID = "log_retention"
+
+# Metric children bound once, so execute_task does no label lookups
+_EXECUTIONS_BY_STATUS = {
+    status: EXECUTIONS.labels(status) for status in ("success", "failed", "rejected", "fenced")
+}
+_LOAD_SECONDS = EXECUTION_PHASE_SECONDS.labels("load")
+_DECRYPT_SECONDS = EXECUTION_PHASE_SECONDS.labels("decrypt")
+_HTTP_SECONDS = EXECUTION_PHASE_SECONDS.labels("http")
+_IN_FLIGHT = EXECUTIONS_IN_FLIGHT.labels()
+
 
 async def start_scheduler() -> None:
     """Start the scheduler and register all enabled tasks.
@@ -35,9 +69,41 @@ async def start_scheduler() -> None:
     This function should be called during application startup.
     It loads all enabled tasks from the database and starts the scheduler.
     """
+    # Count missed, coalesced and rejected fires
+    get_schedule_monitor().attach(scheduler)
+
     # Register all enabled tasks from database
     await register_all_tasks()
 
+    # In partition mode, take over or hand off tasks when nodes join or leave
+    settings = get_settings()
+    if settings.cluster_enabled and settings.cluster_mode == "partition":
+        get_cluster().add_listener(reconcile_tasks)
+
+    # Periodically pick up task edits made outside the API/web routes
+    reconcile_seconds = settings.task_cache_reconcile_seconds
+    if reconcile_seconds > 0:
+        scheduler.add_job(
+            reconcile_tasks,
+            trigger=IntervalTrigger(seconds=reconcile_seconds),
+            id=RECONCILE_JOB_ID,
+            replace_existing=True,
+            coalesce=True,
+            max_instances=1,
+        )
+
+    # Periodically purge execution logs past their retention policy
+    retention_minutes = settings.log_retention_interval_minutes
+    if retention_minutes > 0:
+        scheduler.add_job(
+            purge_expired_logs,
+            trigger=IntervalTrigger(minutes=retention_minutes),
+            id=RETENTION_JOB_ID,
+            replace_existing=True,
+            coalesce=True,
+            max_instances=1,
+        )
+
     # Start the scheduler (synchronous call)
     scheduler.start()
     logger.info("Scheduler started successfully")
@@ -46,57 +112,229 @@ async def start_scheduler() -> None:
 async def shutdown_scheduler() -> None:
     """Shutdown the scheduler gracefully.
 
-    This function should be called during application shutdown.
-    Uses wait=False for async compatibility.
+    This function should be called during application shutdown,
+    before the log writer stops and the HTTP clients close.
+    Uses wait=False for async compatibility, then waits up to
+    shutdown_drain_seconds for running executions so their results
+    are logged. Next fire times are persisted first so interval tasks
+    resume their phase on restart.
     """
+    await save_next_run_times()
     scheduler.shutdown(wait=False)
+    await drain_executions(get_settings().shutdown_drain_seconds)
+    clear_snapshots()
     logger.info("Scheduler shutdown complete")
 
 
+async def drain_executions(timeout: float) -> None:
+    """Wait for running and immediate executions, cancelling any left after the timeout.
+
+    Args:
+        timeout: Seconds to wait.
+    """
+    loop = asyncio.get_running_loop()
+    running = {
+        task for task in _running_executions | _pending_immediate_tasks
+        if task.get_loop() is loop and not task.done()
+    }
+    if not running:
+        return
+    logger.info(f"Waiting up to {timeout:g}s for {len(running)} running executions")
+    _, pending = await asyncio.wait(running, timeout=timeout)
+    if pending:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        logger.warning(f"Cancelled {len(pending)} executions still running at shutdown")
+
+
 async def register_all_tasks() -> None:
     """Load and register all enabled tasks from database.
 
     Queries the database for all tasks with enabled=True and
-    registers each one with the scheduler.
+    registers each one with the scheduler, which also loads
+    the task snapshot cache used by execute_task.
+
+    Interval tasks resume the phase recorded in next_run_at instead of
+    restarting from now; tasks without one get a staggered first fire
+    whose anchor is recorded immediately. In partition mode only the
+    tasks hashed to this node are registered.
     """
+    now = datetime.now(timezone.utc)
+    new_anchors = []
+
     session_maker = get_session_maker()
     async with session_maker() as session:
         result = await session.execute(
             select(Task).where(Task.enabled == True)  # noqa: E712
         )
-        tasks = result.scalars().all()
+        tasks = [task for task in result.scalars().all() if is_assigned(task.id)]
 
         for task in tasks:
-            register_task(task)
+            start_at = get_resume_time(task, now)
+            register_task(task, start_at=start_at)
+            if start_at is not None and task.next_run_at is None:
+                new_anchors.append({"task_id": task.id, "next_run_at": start_at})
+
+        if new_anchors:
+            await _write_next_run_times(session, new_anchors)
 
         logger.info(f"Registered {len(tasks)} enabled tasks")
 
 
-def register_task(task: Task) -> None:
+async def save_next_run_times() -> None:
+    """Persist the next fire time of every scheduled task.
+
+    Called on shutdown so the following startup can resume each
+    interval task's phase. Failures are logged and do not block shutdown.
+    """
+    values = []
+    for job in scheduler.get_jobs():
+        next_run_time = getattr(job, "next_run_time", None)
+        if job.func is not execute_task or next_run_time is None:
+            continue
+        values.append({"task_id": job.args[0], "next_run_at": next_run_time})
+
+    if not values:
+        return
+
+    try:
+        session_maker = get_session_maker()
+        async with session_maker() as session:
+            await _write_next_run_times(session, values)
+        logger.info(f"Saved next run times for {len(values)} tasks")
+    except Exception:
+        logger.exception("Failed to save next run times")
+
+
+async def _write_next_run_times(session, values: list[dict]) -> None:
+    """Write next_run_at for many tasks in one statement.
+
+    Args:
+        session: Database session to use.
+        values: Dicts with task_id and a timezone-aware next_run_at.
+    """
+    rows = [
+        {
+            "task_id": value["task_id"],
+            "next_run_at": value["next_run_at"].astimezone(timezone.utc).replace(tzinfo=None),
+        }
+        for value in values
+    ]
+    # Keep updated_at as is: the phase anchor is not a task edit
+    tasks = Task.__table__
+    stmt = (
+        update(tasks)
+        .where(tasks.c.id == bindparam("task_id"))
+        .values(next_run_at=bindparam("next_run_at"), updated_at=tasks.c.updated_at)
+    )
+    await session.execute(stmt, rows)
+    await session.commit()
+
+
+def _task_hash(task_id: int) -> int:
+    """Get a stable 32-bit hash of a task id, used to spread fires."""
+    digest = hashlib.blake2b(f"task:{task_id}".encode(), digest_size=4).digest()
+    return int.from_bytes(digest, "big")
+
+
+def get_resume_time(task: Task, now: datetime) -> datetime | None:
+    """Get the start anchor for an interval task registered at startup.
+
+    A recorded next_run_at is used as is: the interval trigger advances
+    a past anchor by whole intervals, so the task keeps its phase. A
+    task with no recorded phase starts after a stable offset within one
+    interval, so tasks registered together do not fire together.
+
+    Args:
+        task: The Task model instance.
+        now: Current time (timezone-aware).
+
+    Returns:
+        Timezone-aware start time, or None for non-interval tasks.
+    """
+    if task.schedule_type != "interval":
+        return None
+
+    if task.next_run_at is not None:
+        anchor = task.next_run_at
+        # Stored as naive UTC
+        if anchor.tzinfo is None:
+            anchor = anchor.replace(tzinfo=timezone.utc)
+        return anchor
+
+    total_seconds = (task.interval_minutes or 0) * 60 + (task.interval_seconds or 0)
+    if total_seconds <= 0:
+        return None
+    return now + timedelta(seconds=_task_hash(task.id) % total_seconds)
+
+
+def get_fire_offset(task: Task) -> int:
+    """Get the jitter offset applied to a fixed_time task's fire time.
+
+    The offset is derived from the task id, so it is stable across
+    restarts while tasks scheduled for the same minute are spread
+    over the jitter window instead of firing together.
+
+    Args:
+        task: The Task model instance.
+
+    Returns:
+        Offset in seconds within [0, window), 0 if jitter is disabled.
+    """
+    if task.schedule_type != "fixed_time":
+        return 0
+
+    window = task.jitter_seconds
+    if window is None:
+        window = get_settings().fixed_time_jitter_seconds
+    if window <= 0:
+        return 0
+
+    return _task_hash(task.id) % window
+
+
+def register_task(task: Task, start_at: datetime | None = None) -> None:
     """Register a single task with the scheduler.
 
     Args:
         task: The Task model instance to register.
+        start_at: Phase anchor for interval tasks. Defaults to one
+            interval from now.
 
-    If the task is disabled, it will be skipped.
+    If the task is disabled or assigned to another scheduler node,
+    it will be skipped.
     If a job with the same ID exists, it will be replaced.
+    The task snapshot cache is updated to match.
     """
     job_id = f"task_{task.id}"
 
-    # Remove existing job if present
+    # Remove existing job and snapshot if present
     try:
         scheduler.remove_job(job_id)
     except JobLookupError:
         pass  # Job doesn't exist, continue
+    remove_snapshot(task.id)
+
+    # The key's rate covers every enabled task on it, whichever node runs them
+    limiter = get_rate_limiter()
+    if task.enabled and task.api_key_fingerprint:
+        limiter.set_task_limit(task.api_key_fingerprint, task.id, task.rate_limit_per_minute)
+    else:
+        limiter.remove_task(task.id)
 
     if not task.enabled:
         logger.debug(f"Task {task.id} is disabled, skipping registration")
         return
 
+    if not is_assigned(task.id):
+        logger.debug(f"Task {task.id} is assigned to another scheduler node, skipping registration")
+        return
+
     # Create trigger based on schedule type
     if task.schedule_type == "interval":
         total_seconds = (task.interval_minutes or 0) * 60 + (task.interval_seconds or 0)
-        trigger = IntervalTrigger(seconds=total_seconds)
+        trigger = IntervalTrigger(seconds=total_seconds, start_date=start_at)
         # Format schedule description
         mins, secs = divmod(total_seconds, 60)
         if mins and secs:
@@ -107,8 +345,15 @@ def register_task(task: Task) -> None:
             schedule_desc = f"every {secs} seconds"
     elif task.schedule_type == "fixed_time":
         hour, minute = map(int, task.fixed_time.split(":"))
-        trigger = CronTrigger(hour=hour, minute=minute)
+        # Spread tasks sharing the same HH:MM across their jitter window
+        offset = get_fire_offset(task)
+        fire_second = (hour * 3600 + minute * 60 + offset) % 86400
+        hour, rest = divmod(fire_second, 3600)
+        minute, second = divmod(rest, 60)
+        trigger = CronTrigger(hour=hour, minute=minute, second=second)
         schedule_desc = f"daily at {task.fixed_time}"
+        if offset:
+            schedule_desc += f" (+{offset}s jitter)"
     else:
         logger.error(f"Unknown schedule type: {task.schedule_type}")
         return
@@ -120,88 +365,293 @@ def register_task(task: Task) -> None:
         args=[task.id],
         replace_existing=True,
         coalesce=True,
-        max_instances=MAX_CONCURRENT_INSTANCES,
+        max_instances=get_settings().job_max_instances,
     )
+    upsert_snapshot(task)
 
     logger.info(f"Registered task {task.id} ({task.name}): {schedule_desc}")
 
 
-async def execute_task(task_id: int) -> None:
+def queue_stats() -> dict[str, int]:
+    """Get scheduler queue depth for monitoring.
+
+    Returns:
+        Number of jobs, jobs past their next run time that have not
+        been submitted yet (the event loop is falling behind), and
+        pending immediate executions.
+    """
+    now = datetime.now(timezone.utc)
+    jobs = scheduler.get_jobs()
+    # Jobs added before the scheduler starts have no next_run_time yet
+    next_run_times = (getattr(job, "next_run_time", None) for job in jobs)
+    due = sum(1 for run_time in next_run_times if run_time is not None and run_time <= now)
+    return {"jobs": len(jobs), "due": due, "immediate": len(_pending_immediate_tasks)}
+
+
+async def execute_task(task_id: int, immediate: bool = False) -> None:
     """Execute a scheduled task.
 
     Args:
         task_id: The ID of the task to execute.
+        immediate: Run requested by creating or editing the task on this
+            node. It runs even where another node owns the task, and has
+            no scheduled time.
 
     This function:
-    1. Loads the task from the database
+    1. Loads the task snapshot from the cache (database on a miss)
     2. Checks if the task is still enabled
     3. Calls the OpenAI API with the task's message
-    4. Records the execution result in ExecutionLog
+    4. Queues the execution result on the ExecutionLog writer
+
+    The execution is tracked until it returns, so shutdown can wait for it.
     """
-    logger.info(f"Executing task {task_id}")
+    current = asyncio.current_task()
+    _running_executions.add(current)
+    try:
+        await _run_execution(task_id, immediate)
+    finally:
+        _running_executions.discard(current)
 
-    session_maker = get_session_maker()
-    async with session_maker() as session:
-        # Get task from database
-        result = await session.execute(
-            select(Task).where(Task.id == task_id)
-        )
-        task = result.scalar_one_or_none()
 
-        if task is None:
-            logger.error(f"Task {task_id} not found in database")
+async def _run_execution(task_id: int, immediate: bool) -> None:
+    """Run one execution; see execute_task()."""
+    if immediate:
+        # Requested on this node by a create/edit, so it runs here whoever owns the task
+        scheduled_at = fence = None
+    else:
+        # Fire time of this run, set by the executor that started it
+        scheduled_at = get_schedule_monitor().scheduled_time(task_id)
+
+        # In cluster mode only the lease holder executes
+        if not owns_task(task_id):
+            logger.debug(f"Task {task_id} is owned by another scheduler node, skipping")
             return
+        fence = execution_fence()
 
-        # Check if task is still enabled
-        if not task.enabled:
-            logger.info(f"Task {task_id} is disabled, skipping execution")
-            return  # Don't create ExecutionLog, just return
+    logger.info(f"Executing task {task_id}")
 
-        # Execute the task
-        masked_key = mask_api_key(task.api_key)
-        logger.info(f"Calling OpenAI API for task {task_id} (key: {masked_key})")
+    load_started = time.perf_counter()
+    task = get_snapshot(task_id)
+    if task is None:
+        task = await _load_snapshot(task_id)
+    load_seconds = time.perf_counter() - load_started
+    _LOAD_SECONDS.observe(load_seconds)
 
-        # Must set executed_at field (model has no default value)
-        execution_log = ExecutionLog(
-            task_id=task_id,
-            executed_at=datetime.now(timezone.utc),
+    if task is None:
+        logger.error(f"Task {task_id} not found in database")
+        return
+
+    # Check if task is still enabled
+    if not task.enabled:
+        logger.info(f"Task {task_id} is disabled, skipping execution")
+        return  # Don't create ExecutionLog, just return
+
+    # Execute the task
+    # Must set executed_at field (model has no default value)
+    log_values = {
+        "task_id": task_id,
+        "executed_at": datetime.now(timezone.utc),
+        "scheduled_at": scheduled_at,
+        "response_summary": None,
+        "error_message": None,
+        "latency_ms": None,
+        "connect_ms": None,
+        "ttfb_ms": None,
+        "timings": None,
+    }
+    timings = {"load": int(load_seconds * 1000)}
+    if scheduled_at is not None:
+        # Not a column: feeds the "lag" latency histogram
+        log_values["lag_ms"] = schedule_lag_ms(scheduled_at, log_values["executed_at"])
+        get_schedule_monitor().record_lag(log_values["lag_ms"])
+
+    _IN_FLIGHT.inc()
+    try:
+        # Decrypt API key (cached) and call OpenAI service
+        started = time.perf_counter()
+        credential = get_credential(task.id, task.api_key)
+        decrypt_seconds = time.perf_counter() - started
+        _DECRYPT_SECONDS.observe(decrypt_seconds)
+        timings["decrypt"] = int(decrypt_seconds * 1000)
+
+        started = time.perf_counter()
+        response = await _call_provider(task, credential)
+        provider_ms = int((time.perf_counter() - started) * 1000)
+
+        # Success - record result
+        log_values["status"] = "success"
+        log_values["latency_ms"] = response.response_time_ms
+        log_values["connect_ms"] = response.connect_ms
+        log_values["ttfb_ms"] = response.ttfb_ms
+        log_values["response_summary"] = response.response_summary
+        # Rate-limit and bulkhead waits (and 429 retries) around the request
+        timings["wait"] = max(0, provider_ms - response.response_time_ms)
+        timings.update(response.timings or {})
+        logger.info(
+            f"Task {task_id} executed successfully in {response.response_time_ms}ms"
         )
 
-        try:
-            # Decrypt API key and call OpenAI service
-            plain_api_key = decrypt_api_key(task.api_key)
-            response = await send_message(
-                api_endpoint=task.api_endpoint,
-                api_key=plain_api_key,
-                message_content=task.message_content,
-                model=task.model,
-            )
+    except BulkheadRejected as e:
+        # Overflow policy dropped this fire - nothing was sent, so no log
+        _EXECUTIONS_BY_STATUS["rejected"].inc()
+        logger.warning(f"Task {task_id} not executed: {e}")
+        return
 
-            # Success - record result
-            execution_log.status = "success"
-            execution_log.response_summary = (
-                f"{response.response_summary} (耗时: {response.response_time_ms}ms)"
-            )
-            logger.info(
-                f"Task {task_id} executed successfully in {response.response_time_ms}ms"
-            )
+    except RateLimitWaitTooLong as e:
+        # Quota exhausted for longer than we are willing to wait
+        log_values["status"] = "failed"
+        log_values["error_message"] = str(e)
+        logger.error(f"Task {task_id} failed: {e}")
+
+    except OpenAIServiceError as e:
+        # Failed - record error
+        log_values["status"] = "failed"
+        log_values["error_message"] = str(e.message)
+        timings.update(e.timings or {})
+        logger.error(f"Task {task_id} failed: {e.message}")
+
+    except Exception as e:
+        # Unexpected error
+        log_values["status"] = "failed"
+        log_values["error_message"] = f"Unexpected error: {str(e)}"
+        logger.exception(f"Task {task_id} failed with unexpected error")
+
+    finally:
+        _IN_FLIGHT.dec()
+
+    if get_settings().execution_timings_enabled:
+        log_values["timings"] = {phase: ms for phase, ms in timings.items() if ms > 0}
+
+    # A node that lost the lease mid-fire leaves the result to the new owner
+    if not immediate and not fence_valid(task_id, fence):
+        _EXECUTIONS_BY_STATUS["fenced"].inc()
+        logger.warning(
+            f"Task {task_id} finished after this node lost ownership, discarding the result"
+        )
+        return
+
+    # Hand the execution log to the group-commit writer
+    _EXECUTIONS_BY_STATUS[log_values["status"]].inc()
+    await submit_execution_log(log_values)
+    logger.debug(f"Queued execution log for task {task_id}")
+
+
+async def _call_provider(task: TaskSnapshot, credential: CachedCredential) -> OpenAIResponse:
+    """Send one fire to the provider, honoring rate limits and bulkheads.
 
+    Waits for a token from the API key's rate-limit bucket before taking
+    bulkhead slots, feeds response rate-limit headers back into the
+    bucket, and retries a 429 once the bucket allows it again.
+
+    Args:
+        task: Snapshot of the task being executed.
+        credential: Decrypted credential for the task's API key.
+
+    Returns:
+        OpenAIResponse from the successful call.
+
+    Raises:
+        OpenAIServiceError: If the call fails (or keeps returning 429).
+        RateLimitWaitTooLong: If the token wait exceeds the configured maximum.
+        BulkheadRejected: If a bulkhead does not admit the fire.
+    """
+    limiter = get_rate_limiter()
+    # Stored fingerprint groups tasks without decrypting; fall back for old rows
+    key_id = task.api_key_fingerprint or credential.key_id
+    attempts = get_settings().rate_limit_max_retries + 1
+
+    for attempt in range(1, attempts + 1):
+        await limiter.acquire(key_id, task.rate_limit_per_minute)
+        try:
+            async with get_bulkheads().guard(task.id, task.api_endpoint, key_id):
+                logger.info(f"Calling OpenAI API for task {task.id} (key: {credential.masked_key})")
+                started = time.perf_counter()
+                try:
+                    response = await send_message(
+                        api_endpoint=task.api_endpoint,
+                        api_key=credential.api_key,
+                        message_content=task.message_content,
+                        model=task.model,
+                        authorization=credential.authorization,
+                    )
+                finally:
+                    _HTTP_SECONDS.observe(time.perf_counter() - started)
         except OpenAIServiceError as e:
-            # Failed - record error
-            execution_log.status = "failed"
-            execution_log.error_message = str(e.message)
-            logger.error(f"Task {task_id} failed: {e.message}")
+            if e.status_code != 429:
+                limiter.observe(key_id, e.rate_limit)
+                raise
+            # Without provider hints, back off exponentially before the next token
+            limiter.observe(key_id, e.rate_limit or RateLimitHeaders(retry_after=float(2 ** attempt)))
+            if attempt == attempts:
+                raise
+            logger.warning(f"Task {task.id} rate limited by provider (429), waiting to retry")
+            continue
+
+        limiter.observe(key_id, response.rate_limit)
+        return response
 
-        except Exception as e:
-            # Unexpected error
-            execution_log.status = "failed"
-            execution_log.error_message = f"Unexpected error: {str(e)}"
-            logger.exception(f"Task {task_id} failed with unexpected error")
 
-        # Save execution log
-        session.add(execution_log)
-        await session.commit()
-        logger.debug(f"Saved execution log for task {task_id}")
+async def _load_snapshot(task_id: int) -> TaskSnapshot | None:
+    """Load a task snapshot from the database on a cache miss.
+
+    Args:
+        task_id: The ID of the task to load.
+
+    Returns:
+        TaskSnapshot if the task exists, None otherwise.
+    """
+    session_maker = get_session_maker()
+    async with session_maker() as session:
+        result = await session.execute(
+            select(Task).where(Task.id == task_id)
+        )
+        task = result.scalar_one_or_none()
+
+    return TaskSnapshot.from_task(task) if task is not None else None
+
+
+async def reconcile_tasks() -> None:
+    """Re-sync scheduled jobs and cached snapshots with the database.
+
+    Detects tasks edited outside the API/web routes by comparing each
+    row's updated_at with the cached snapshot, then re-registers
+    changed or newly enabled tasks and removes deleted or disabled ones.
+    In partition mode this also rebalances after membership changes:
+    tasks now hashed to this node are picked up at their recorded phase,
+    tasks hashed elsewhere are dropped.
+    """
+    cached = get_cached_versions()
+
+    session_maker = get_session_maker()
+    async with session_maker() as session:
+        result = await session.execute(
+            select(Task.id, Task.updated_at).where(Task.enabled == True)  # noqa: E712
+        )
+        current = {row.id: row.updated_at for row in result.all() if is_assigned(row.id)}
+
+        stale_ids = [
+            task_id for task_id, updated_at in current.items()
+            if task_id not in cached or cached[task_id] != updated_at
+        ]
+        tasks = []
+        if stale_ids:
+            result = await session.execute(select(Task).where(Task.id.in_(stale_ids)))
+            tasks = result.scalars().all()
+
+    now = datetime.now(timezone.utc)
+    for task in tasks:
+        # Tasks new to this node keep their phase; edited tasks start over
+        start_at = get_resume_time(task, now) if task.id not in cached else None
+        register_task(task, start_at=start_at)
+
+    removed_ids = [task_id for task_id in cached if task_id not in current]
+    for task_id in removed_ids:
+        remove_job(task_id)
+
+    if tasks or removed_ids:
+        logger.info(
+            f"Reconciled task cache: {len(tasks)} re-registered, {len(removed_ids)} removed"
+        )
 
 
 def add_job(task: Task) -> None:
@@ -227,7 +677,7 @@ def add_job(task: Task) -> None:
         # Create task with exception handling and cleanup
         async def execute_with_cleanup():
             try:
-                await execute_task(task.id)
+                await execute_task(task.id, immediate=True)
             except Exception as e:
                 logger.exception(f"Immediate execution failed for task {task.id}: {e}")
             finally:
@@ -246,6 +696,8 @@ def remove_job(task_id: int) -> None:
         task_id: The ID of the task to remove.
     """
     job_id = f"task_{task_id}"
+    remove_snapshot(task_id)
+    get_rate_limiter().remove_task(task_id)
     try:
         scheduler.remove_job(job_id)
         logger.info(f"Removed task {task_id} from scheduler")
@@ -280,7 +732,7 @@ def reschedule_job(task: Task) -> None:
         # Create task with exception handling and cleanup
         async def execute_with_cleanup():
             try:
-                await execute_task(task.id)
+                await execute_task(task.id, immediate=True)
             except Exception as e:
                 logger.exception(f"Immediate execution failed for task {task.id}: {e}")
             finally:
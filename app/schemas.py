@@ -5,7 +5,7 @@ automatic API key masking in responses.
 """
 
 import re
-from datetime import datetime
+from datetime import date, datetime
 from typing import Literal, Optional
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
@@ -21,6 +21,7 @@ MAX_NAME_LENGTH = 100
 MAX_API_ENDPOINT_LENGTH = 500
 MAX_API_KEY_LENGTH = 500
 MAX_MODEL_LENGTH = 100
+MAX_JITTER_SECONDS = 3600
 
 
 class TaskBase(BaseModel):
@@ -32,8 +33,12 @@ class TaskBase(BaseModel):
     interval_minutes: Optional[int] = None
     interval_seconds: Optional[int] = None
     fixed_time: Optional[str] = None  # HH:MM
+    jitter_seconds: Optional[int] = Field(None, ge=0, le=MAX_JITTER_SECONDS)  # None = global default
     message_content: str = Field(..., min_length=1)
     model: str = Field(..., min_length=1, max_length=MAX_MODEL_LENGTH)
+    rate_limit_per_minute: Optional[int] = Field(None, ge=1)  # None = global default
+    log_retention_days: Optional[int] = Field(None, ge=0)  # None = global default, 0 = forever
+    log_retention_max_rows: Optional[int] = Field(None, ge=0)
     enabled: bool = True
 
     @field_validator("fixed_time")
@@ -102,8 +107,12 @@ class TaskUpdate(BaseModel):
     interval_minutes: Optional[int] = None
     interval_seconds: Optional[int] = None
     fixed_time: Optional[str] = None
+    jitter_seconds: Optional[int] = Field(None, ge=0, le=MAX_JITTER_SECONDS)
     message_content: Optional[str] = Field(None, min_length=1)
     model: Optional[str] = Field(None, min_length=1, max_length=MAX_MODEL_LENGTH)
+    rate_limit_per_minute: Optional[int] = Field(None, ge=1)
+    log_retention_days: Optional[int] = Field(None, ge=0)
+    log_retention_max_rows: Optional[int] = Field(None, ge=0)
     enabled: Optional[bool] = None
 
     @field_validator("fixed_time")
@@ -160,6 +169,41 @@ class ExecutionLogResponse(BaseModel):
     id: int
     task_id: int
     executed_at: datetime
+    scheduled_at: Optional[datetime] = None  # None for immediate runs
     status: str  # success | failed
     response_summary: Optional[str] = None
     error_message: Optional[str] = None
+    latency_ms: Optional[int] = None
+    connect_ms: Optional[int] = None
+    ttfb_ms: Optional[int] = None
+    timings: Optional[dict[str, int]] = None  # Milliseconds per phase of this fire
+
+
+class LatencyPercentiles(BaseModel):
+    """Latency percentiles of one metric, in milliseconds."""
+
+    count: int
+    p50: Optional[int] = None
+    p95: Optional[int] = None
+    p99: Optional[int] = None
+
+
+class TaskStatsResponse(BaseModel):
+    """Schema for task statistics API responses.
+
+    latency and endpoint_latency map each metric (total | connect | ttfb
+    | lag) to its percentiles; endpoint_latency merges every task calling
+    the same API endpoint. misfires counts fires this node's scheduler
+    dropped since startup (missed | coalesced | max_instances).
+    """
+
+    task_id: int
+    days: int
+    since: date  # First statistics day (China time) in the window
+    success: int
+    failed: int
+    latency: dict[str, LatencyPercentiles]
+    api_endpoint: str
+    endpoint_tasks: int
+    endpoint_latency: dict[str, LatencyPercentiles]
+    misfires: dict[str, int]
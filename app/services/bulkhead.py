@@ -0,0 +1,198 @@
+"""Bulkhead Concurrency Limits for Task Executions.
+
+Bounds the number of in-flight provider requests globally, per endpoint
+host and per API key, so a slow provider cannot make coroutines, sockets
+and database sessions pile up without limit. Each bulkhead has a bounded
+wait queue and an overflow policy deciding what happens to a fire that
+cannot get a slot.
+"""
+
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Literal
+from urllib.parse import urlsplit
+
+from app.config import get_settings
+
+# What to do with a fire when a bulkhead has no free slot:
+# queue    - wait in the bounded queue, reject when the queue is full
+# skip     - reject immediately
+# coalesce - wait like queue, but drop the fire if the same task is already waiting
+OverflowPolicy = Literal["queue", "skip", "coalesce"]
+
+
+class BulkheadRejected(Exception):
+    """Raised when a fire is not admitted by a bulkhead."""
+
+    def __init__(self, bulkhead: str, reason: str):
+        self.bulkhead = bulkhead
+        self.reason = reason  # full | skipped | coalesced
+        super().__init__(f"Bulkhead '{bulkhead}' rejected execution ({reason})")
+
+
+class Bulkhead:
+    """Counting semaphore with a bounded FIFO wait queue."""
+
+    def __init__(self, name: str, max_concurrent: int, max_queue: int, overflow: OverflowPolicy):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.overflow = overflow
+
+        self.in_flight = 0
+        self.rejected = 0
+        self.coalesced = 0
+        self._waiters: deque[tuple[asyncio.Future, int]] = deque()
+
+    @property
+    def queued(self) -> int:
+        """Number of fires waiting for a slot."""
+        return len(self._waiters)
+
+    async def acquire(self, task_id: int) -> None:
+        """Acquire a slot for a task fire, waiting according to the overflow policy.
+
+        Args:
+            task_id: ID of the task being executed.
+
+        Raises:
+            BulkheadRejected: If the fire is not admitted.
+        """
+        if self.in_flight < self.max_concurrent and not self._waiters:
+            self.in_flight += 1
+            return
+
+        if self.overflow == "skip":
+            self.rejected += 1
+            raise BulkheadRejected(self.name, "skipped")
+
+        if self.overflow == "coalesce" and any(
+            waiting_id == task_id for _, waiting_id in self._waiters
+        ):
+            self.coalesced += 1
+            raise BulkheadRejected(self.name, "coalesced")
+
+        if len(self._waiters) >= self.max_queue:
+            self.rejected += 1
+            raise BulkheadRejected(self.name, "full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        entry = (waiter, task_id)
+        self._waiters.append(entry)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Slot was handed over just before cancellation, give it back
+                self.release()
+            else:
+                self._waiters.remove(entry)
+            raise
+
+    def release(self) -> None:
+        """Release a slot, handing it to the next waiter if any."""
+        while self._waiters:
+            waiter, _ = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)  # Slot transfers, in_flight unchanged
+                return
+        self.in_flight -= 1
+
+    def stats(self) -> dict:
+        """Get in-flight and queued counts for monitoring."""
+        return {
+            "name": self.name,
+            "max_concurrent": self.max_concurrent,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "rejected": self.rejected,
+            "coalesced": self.coalesced,
+        }
+
+
+class BulkheadRegistry:
+    """Global, per-host and per-API-key bulkheads built from settings."""
+
+    def __init__(self):
+        settings = get_settings()
+        self.max_queue = settings.bulkhead_max_queue
+        self.overflow: OverflowPolicy = settings.bulkhead_overflow
+        self.host_max_concurrent = settings.bulkhead_host_max_concurrent
+        self.key_max_concurrent = settings.bulkhead_key_max_concurrent
+
+        self.global_bulkhead = Bulkhead(
+            "global", settings.bulkhead_global_max_concurrent, self.max_queue, self.overflow
+        )
+        self.hosts: dict[str, Bulkhead] = {}
+        self.keys: dict[str, Bulkhead] = {}
+
+    def _get(self, pool: dict[str, Bulkhead], name: str, max_concurrent: int) -> Bulkhead:
+        """Get or create a bulkhead in a pool."""
+        bulkhead = pool.get(name)
+        if bulkhead is None:
+            bulkhead = Bulkhead(name, max_concurrent, self.max_queue, self.overflow)
+            pool[name] = bulkhead
+        return bulkhead
+
+    @asynccontextmanager
+    async def guard(self, task_id: int, api_endpoint: str, key_id: str) -> AsyncIterator[None]:
+        """Hold a slot in the key, host and global bulkheads for one fire.
+
+        Slots are taken narrowest first, so a fire queued behind a
+        saturated key or host does not hold a global slot meanwhile and
+        cannot starve fires for other hosts.
+
+        Args:
+            task_id: ID of the task being executed.
+            api_endpoint: Endpoint URL, used for the host bulkhead.
+            key_id: Non-reversible API key fingerprint, used for the key bulkhead.
+
+        Raises:
+            BulkheadRejected: If any bulkhead rejects the fire.
+        """
+        host = (urlsplit(api_endpoint).hostname or "").lower()
+        bulkheads = [
+            self._get(self.keys, f"key:{key_id[:12]}", self.key_max_concurrent),
+            self._get(self.hosts, f"host:{host}", self.host_max_concurrent),
+            self.global_bulkhead,
+        ]
+
+        acquired: list[Bulkhead] = []
+        try:
+            for bulkhead in bulkheads:
+                await bulkhead.acquire(task_id)
+                acquired.append(bulkhead)
+            yield
+        finally:
+            for bulkhead in reversed(acquired):
+                bulkhead.release()
+
+    def stats(self) -> list[dict]:
+        """Get stats for every bulkhead."""
+        return [
+            self.global_bulkhead.stats(),
+            *(b.stats() for b in self.hosts.values()),
+            *(b.stats() for b in self.keys.values()),
+        ]
+
+
+# Lazy-loaded registry singleton
+_registry: BulkheadRegistry | None = None
+
+
+def get_bulkheads() -> BulkheadRegistry:
+    """Get the bulkhead registry singleton, creating it on first access."""
+    global _registry
+    if _registry is None:
+        _registry = BulkheadRegistry()
+    return _registry
+
+
+def reset_bulkheads() -> None:
+    """Reset the bulkhead registry singleton.
+
+    Used by tests to reset state between test runs.
+    """
+    global _registry
+    _registry = None
@@ -0,0 +1,506 @@
+"""Database-Backed Scheduler Leases.
+
+Lets several processes run the application against one shared database
+while each scheduled fire executes once. Every node keeps a heartbeat
+row in scheduler_nodes and competes for the "scheduler" lease in
+scheduler_leases; only the node holding an unexpired lease executes
+fires, the others keep their jobs registered as warm standbys.
+
+Leases carry a fencing token that increases on every change of owner.
+Renewal and release are conditional on the token, so a node that was
+paused past its lease cannot extend it after another node took over.
+execute_task also records the token a fire starts under and checks it
+again before queueing the result, discarding results of fires that
+outlived the lease. That check uses the node's local view of the lease,
+so it narrows, but cannot close, the window in which a paused node
+writes a result late.
+A dead node's lease is reclaimed within cluster_lease_seconds plus one
+heartbeat interval. Lease expiry and heartbeats are computed and
+compared with the database server's clock, read once per heartbeat, so
+clock skew between hosts cannot let two nodes hold the lease at once.
+
+In "partition" mode execution is split instead: the live members read
+from scheduler_nodes form a consistent-hash ring, and each node
+schedules and executes only the tasks that hash to it. When members
+join or leave, registered listeners rebalance the node's jobs; since
+nodes notice the change at their own heartbeats, a moving task may fire
+on both or neither node for up to one heartbeat interval.
+"""
+
+import asyncio
+import bisect
+import hashlib
+import os
+import socket
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable
+
+from loguru import logger
+from sqlalchemy import and_, delete, exists, func, insert, literal, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.database import get_session_maker
+from app.models import SchedulerLease, SchedulerNode
+
+# Name of the lease whose holder executes scheduled fires
+LEADER_LEASE = "scheduler"
+
+# Heartbeat rows older than this many lease periods are deleted
+NODE_EXPIRY_LEASES = 10
+
+# Virtual points per node on the hash ring, evens out the task shares
+RING_VNODES = 64
+
+
+def _utcnow() -> datetime:
+    """Current time as naive UTC, matching how DateTime columns are stored."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+async def _database_now(session: AsyncSession) -> datetime:
+    """Current time of the database server as naive UTC.
+
+    Every node compares lease expiry against this one clock. A SQLite
+    database is only shared by processes on one host, so the local
+    clock is that clock.
+    """
+    if session.get_bind(SchedulerLease).dialect.name == "sqlite":
+        return _utcnow()
+    now = await session.scalar(select(func.now()))
+    if now.tzinfo is not None:
+        now = now.astimezone(timezone.utc).replace(tzinfo=None)
+    return now
+
+
+def default_node_id() -> str:
+    """Build a node id unique to this host and process."""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def _ring_hash(key: str) -> int:
+    """Stable 64-bit position of a key on the hash ring."""
+    digest = hashlib.blake2b(key.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+class HashRing:
+    """Consistent-hash ring mapping task ids to member node ids.
+
+    Adding or removing a member only moves the tasks between that
+    member and its ring neighbours, roughly 1/N of all tasks.
+    """
+
+    def __init__(self, members: list[str], vnodes: int = RING_VNODES):
+        self.members = sorted(members)
+        points = sorted(
+            (_ring_hash(f"{member}#{i}"), member)
+            for member in self.members
+            for i in range(vnodes)
+        )
+        self._positions = [position for position, _ in points]
+        self._owners = [member for _, member in points]
+
+    def owner_of(self, task_id: int) -> str | None:
+        """Get the member owning a task, None if the ring is empty."""
+        if not self._positions:
+            return None
+        index = bisect.bisect(self._positions, _ring_hash(f"task:{task_id}"))
+        return self._owners[index % len(self._owners)]
+
+
+class ClusterNode:
+    """One scheduler process taking part in lease-based coordination.
+
+    heartbeat() refreshes this node's row and acquires or renews the
+    leader lease in one transaction. The lease is trusted locally only
+    until one heartbeat interval before it expires in the database, so
+    the old holder stops executing before anyone else may take over.
+    """
+
+    def __init__(
+        self,
+        node_id: str,
+        lease_seconds: int,
+        heartbeat_seconds: int,
+        mode: str = "leader",
+    ):
+        self.node_id = node_id
+        self.lease_seconds = lease_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+        self.mode = mode
+        self.started_at = _utcnow()
+
+        # Fencing token of the held leader lease, None when not leader
+        self.token: int | None = None
+        self._valid_until = 0.0  # time.monotonic() deadline
+        self._runner: asyncio.Task | None = None
+
+        # Live members as of the last heartbeat, trusted until _view_valid_until
+        self.ring = HashRing([node_id])
+        self._view_valid_until = 0.0
+        self._listeners: list[Callable[[], Awaitable[None]]] = []
+
+        # Statistics
+        self.leader_acquisitions = 0
+        self.heartbeat_failures = 0
+        self.rebalances = 0
+
+    @property
+    def is_leader(self) -> bool:
+        """Whether this node currently holds a locally valid leader lease."""
+        return self.token is not None and time.monotonic() < self._valid_until
+
+    @property
+    def running(self) -> bool:
+        """Whether the background heartbeat loop is active."""
+        return self._runner is not None and not self._runner.done()
+
+    @property
+    def members(self) -> list[str]:
+        """Live member node ids as of the last heartbeat."""
+        return self.ring.members
+
+    def is_assigned(self, task_id: int) -> bool:
+        """Whether this node should keep the task's job registered.
+
+        In leader mode every node registers every task, so a standby can
+        take over without reloading; in partition mode only the ring owner does.
+        """
+        if self.mode != "partition":
+            return True
+        return self.ring.owner_of(task_id) == self.node_id
+
+    def owns(self, task_id: int) -> bool:
+        """Whether this node should execute a fire of the task now."""
+        if self.mode != "partition":
+            return self.is_leader
+        # A stale view means the others may already consider this node dead
+        if time.monotonic() >= self._view_valid_until:
+            return False
+        return self.ring.owner_of(task_id) == self.node_id
+
+    def add_listener(self, callback: Callable[[], Awaitable[None]]) -> None:
+        """Register a coroutine function called after membership changes.
+
+        Args:
+            callback: Coroutine function taking no arguments.
+        """
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def start(self) -> None:
+        """Start the background heartbeat loop on the running event loop."""
+        if self.running:
+            return
+        self._runner = asyncio.get_running_loop().create_task(self._run())
+        logger.info(
+            f"Cluster node {self.node_id} started (lease={self.lease_seconds}s, "
+            f"heartbeat={self.heartbeat_seconds}s)"
+        )
+
+    async def stop(self) -> None:
+        """Stop heartbeating, release the held lease and leave the cluster."""
+        if self._runner is not None:
+            self._runner.cancel()
+            try:
+                await self._runner
+            except asyncio.CancelledError:
+                pass
+            self._runner = None
+
+        try:
+            session_maker = get_session_maker()
+            async with session_maker() as session:
+                if self.token is not None:
+                    await session.execute(
+                        update(SchedulerLease)
+                        .where(
+                            SchedulerLease.name == LEADER_LEASE,
+                            SchedulerLease.owner == self.node_id,
+                            SchedulerLease.token == self.token,
+                        )
+                        .values(owner=None, expires_at=await _database_now(session))
+                    )
+                await session.execute(
+                    delete(SchedulerNode).where(SchedulerNode.node_id == self.node_id)
+                )
+                await session.commit()
+        except Exception:
+            logger.exception(f"Failed to release leases of cluster node {self.node_id}")
+
+        self.token = None
+        logger.info(f"Cluster node {self.node_id} stopped")
+
+    async def heartbeat(self) -> None:
+        """Refresh this node's heartbeat and acquire or renew the leader lease."""
+        started = time.monotonic()
+
+        session_maker = get_session_maker()
+        async with session_maker() as session:
+            now = await _database_now(session)
+            await self._beat(session, now)
+            members = await self._live_members(session, now)
+            token = await self._claim(session, LEADER_LEASE, now)
+            await session.commit()
+
+        self._view_valid_until = started + self.lease_seconds - self.heartbeat_seconds
+        if members != self.ring.members:
+            await self._rebalance(members)
+
+        if token is None:
+            if self.token is not None:
+                logger.warning(f"Cluster node {self.node_id} lost the scheduler lease")
+            self.token = None
+            return
+
+        if token != self.token:
+            self.leader_acquisitions += 1
+            logger.info(
+                f"Cluster node {self.node_id} acquired the scheduler lease (token={token})"
+            )
+        self.token = token
+        self._valid_until = started + self.lease_seconds - self.heartbeat_seconds
+
+    def stats(self) -> dict[str, Any]:
+        """Get node statistics for monitoring."""
+        return {
+            "node_id": self.node_id,
+            "running": self.running,
+            "is_leader": self.is_leader,
+            "token": self.token,
+            "mode": self.mode,
+            "members": self.members,
+            "leader_acquisitions": self.leader_acquisitions,
+            "heartbeat_failures": self.heartbeat_failures,
+            "rebalances": self.rebalances,
+        }
+
+    async def _run(self) -> None:
+        """Heartbeat every heartbeat_seconds until cancelled."""
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            try:
+                await self.heartbeat()
+            except Exception:
+                # The local lease deadline expires on its own if this persists
+                self.heartbeat_failures += 1
+                logger.exception(f"Cluster node {self.node_id} heartbeat failed")
+
+    async def _beat(self, session: AsyncSession, now: datetime) -> None:
+        """Upsert this node's heartbeat row and prune long-dead nodes."""
+        result = await session.execute(
+            update(SchedulerNode)
+            .where(SchedulerNode.node_id == self.node_id)
+            .values(heartbeat_at=now)
+        )
+        if result.rowcount == 0:
+            await session.execute(
+                insert(SchedulerNode).values(
+                    node_id=self.node_id,
+                    hostname=socket.gethostname(),
+                    pid=os.getpid(),
+                    started_at=self.started_at,
+                    heartbeat_at=now,
+                )
+            )
+
+        cutoff = now - timedelta(seconds=self.lease_seconds * NODE_EXPIRY_LEASES)
+        await session.execute(delete(SchedulerNode).where(SchedulerNode.heartbeat_at < cutoff))
+
+    async def _live_members(self, session: AsyncSession, now: datetime) -> list[str]:
+        """Get the ids of nodes that heartbeated within one lease period."""
+        cutoff = now - timedelta(seconds=self.lease_seconds)
+        result = await session.execute(
+            select(SchedulerNode.node_id).where(SchedulerNode.heartbeat_at >= cutoff)
+        )
+        return sorted(set(result.scalars().all()) | {self.node_id})
+
+    async def _rebalance(self, members: list[str]) -> None:
+        """Adopt a new member list and notify listeners."""
+        previous = self.ring.members
+        self.ring = HashRing(members)
+        self.rebalances += 1
+        logger.info(
+            f"Cluster membership changed: {len(previous)} -> {len(members)} nodes "
+            f"({', '.join(members)})"
+        )
+
+        for callback in self._listeners:
+            try:
+                await callback()
+            except Exception:
+                logger.exception("Cluster membership listener failed")
+
+    async def _claim(self, session: AsyncSession, name: str, now: datetime) -> int | None:
+        """Renew the lease if still held, otherwise try to take it over.
+
+        Returns:
+            The fencing token held after the claim, None if another node holds it.
+        """
+        expires_at = now + timedelta(seconds=self.lease_seconds)
+
+        if self.token is not None:
+            result = await session.execute(
+                update(SchedulerLease)
+                .where(
+                    SchedulerLease.name == name,
+                    SchedulerLease.owner == self.node_id,
+                    SchedulerLease.token == self.token,
+                )
+                .values(expires_at=expires_at)
+            )
+            if result.rowcount == 1:
+                return self.token
+
+        # Create the lease row once, portable across dialects
+        await session.execute(
+            insert(SchedulerLease).from_select(
+                ["name", "owner", "token", "expires_at"],
+                select(literal(name), literal(None), literal(0), literal(now)).where(
+                    ~exists().where(SchedulerLease.name == name)
+                ),
+            )
+        )
+
+        result = await session.execute(
+            update(SchedulerLease)
+            .where(
+                SchedulerLease.name == name,
+                or_(
+                    SchedulerLease.owner.is_(None),
+                    SchedulerLease.expires_at < now,
+                ),
+            )
+            .values(
+                owner=self.node_id,
+                token=SchedulerLease.token + 1,
+                expires_at=expires_at,
+            )
+        )
+        if result.rowcount != 1:
+            return None
+
+        result = await session.execute(
+            select(SchedulerLease.token).where(
+                and_(SchedulerLease.name == name, SchedulerLease.owner == self.node_id)
+            )
+        )
+        return result.scalar_one()
+
+
+# Lazy-loaded node singleton
+_cluster: ClusterNode | None = None
+
+
+def get_cluster() -> ClusterNode:
+    """Get the cluster node singleton, creating it from settings on first access."""
+    global _cluster
+    if _cluster is None:
+        settings = get_settings()
+        _cluster = ClusterNode(
+            node_id=settings.cluster_node_id or default_node_id(),
+            lease_seconds=settings.cluster_lease_seconds,
+            heartbeat_seconds=settings.cluster_heartbeat_seconds,
+            mode=settings.cluster_mode,
+        )
+    return _cluster
+
+
+async def start_cluster() -> None:
+    """Join the cluster and start heartbeating, if cluster mode is enabled.
+
+    This function should be called during application startup, before
+    the scheduler starts, so the first node up executes without delay.
+    """
+    if not get_settings().cluster_enabled:
+        return
+
+    node = get_cluster()
+    try:
+        await node.heartbeat()
+    except Exception:
+        node.heartbeat_failures += 1
+        logger.exception(f"Initial heartbeat of cluster node {node.node_id} failed")
+    node.start()
+
+
+async def stop_cluster() -> None:
+    """Release leases and leave the cluster.
+
+    This function should be called during application shutdown,
+    after the scheduler has stopped.
+    """
+    if _cluster is not None:
+        await _cluster.stop()
+
+
+def owns_task(task_id: int) -> bool:
+    """Check whether this process should execute a fire of the task.
+
+    Args:
+        task_id: The ID of the task about to fire.
+
+    Returns:
+        True when cluster mode is disabled, or this node holds the lease
+        (leader mode) or the task's ring position (partition mode).
+    """
+    if not get_settings().cluster_enabled:
+        return True
+    return get_cluster().owns(task_id)
+
+
+def execution_fence() -> int | None:
+    """Get the fencing token a fire starts under.
+
+    Returns:
+        The held leader lease token in leader mode, None when cluster
+        mode is disabled or in partition mode.
+    """
+    settings = get_settings()
+    if not settings.cluster_enabled or settings.cluster_mode != "leader":
+        return None
+    return get_cluster().token
+
+
+def fence_valid(task_id: int, token: int | None) -> bool:
+    """Check whether the result of a fire may still be written.
+
+    Args:
+        task_id: The ID of the task that fired.
+        token: Fencing token returned by execution_fence() when the fire started.
+
+    Returns:
+        True when cluster mode is disabled, or this node still holds the
+        same lease (leader mode) or the task's ring position (partition mode).
+    """
+    if not get_settings().cluster_enabled:
+        return True
+    node = get_cluster()
+    if node.mode == "partition":
+        return node.owns(task_id)
+    return node.is_leader and node.token == token
+
+
+def is_assigned(task_id: int) -> bool:
+    """Check whether this process should schedule the task at all.
+
+    Args:
+        task_id: The ID of the task to register.
+
+    Returns:
+        False only in partition mode for tasks owned by another node.
+    """
+    if not get_settings().cluster_enabled:
+        return True
+    return get_cluster().is_assigned(task_id)
+
+
+def reset_cluster() -> None:
+    """Reset the cluster node singleton.
+
+    Used by tests to reset state between test runs.
+    """
+    global _cluster
+    _cluster = None
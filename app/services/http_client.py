@@ -0,0 +1,209 @@
+"""Pooled HTTP Client Management.
+
+Keeps one long-lived httpx.AsyncClient per endpoint origin so repeated
+executions against the same provider reuse keep-alive connections
+instead of paying DNS/TCP/TLS handshakes on every call.
+"""
+
+import time
+from typing import Any
+from urllib.parse import urlsplit
+
+import httpx
+from loguru import logger
+
+from app.config import get_settings
+
+# HTTP timeout configuration
+REQUEST_TIMEOUT = 30.0  # seconds
+
+# Pooled clients keyed by endpoint origin (scheme://host:port)
+_clients: dict[str, httpx.AsyncClient] = {}
+
+
+def get_origin(url: str) -> str:
+    """Get the origin (scheme://host:port) of a URL.
+
+    Args:
+        url: Absolute endpoint URL.
+
+    Returns:
+        Normalized origin string used as the pool key.
+    """
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower() or "https"
+    host = (parts.hostname or "").lower()
+    port = parts.port or (443 if scheme == "https" else 80)
+    return f"{scheme}://{host}:{port}"
+
+
+class RequestTrace:
+    """Connection and protocol phase timings of one request.
+
+    Pass as the httpx "trace" request extension; httpcore reports each
+    connection and protocol phase to it. A request served on a pooled
+    keep-alive connection has no connect phase, so connect_ms stays 0.
+    """
+
+    def __init__(self):
+        self.start()
+
+    def start(self) -> None:
+        """Reset the timings at the start of a (re)tried request."""
+        self._started = time.perf_counter()
+        self._connect_started: float | None = None
+        self._connected: float | None = None
+        self._tls_started: float | None = None
+        self._tls_done: float | None = None
+        self._request_sent: float | None = None
+        self._headers_received: float | None = None
+        self._finished: float | None = None
+        self.acquire_ms: int | None = None
+        self.connect_ms = 0
+        self.ttfb_ms: int | None = None
+
+    def finish(self) -> None:
+        """Mark the response body as read."""
+        self._finished = time.perf_counter()
+
+    def _elapsed_ms(self, since: float) -> int:
+        return int((time.perf_counter() - since) * 1000)
+
+    def phases(self) -> dict[str, int]:
+        """Get the request's waterfall segments in milliseconds.
+
+        acquire: waiting for a pooled connection; connect: DNS and TCP;
+        tls: TLS handshake; ttfb: sending the request until the response
+        headers; body: reading the response body. After a failure the
+        phase in progress runs until now, so a timeout shows up in the
+        phase that stalled. Phases not reached are left out; custom
+        (e.g. mocked) transports report none.
+        """
+        end = self._finished if self._finished is not None else time.perf_counter()
+
+        def span(start: float, stop: float | None) -> int:
+            return int(((stop if stop is not None else end) - start) * 1000)
+
+        phases = {}
+        if self.acquire_ms is not None:
+            phases["acquire"] = self.acquire_ms
+        if self._connect_started is not None:
+            phases["connect"] = span(self._connect_started, self._connected)
+        if self._tls_started is not None:
+            phases["tls"] = span(self._tls_started, self._tls_done)
+        if self._request_sent is not None:
+            phases["ttfb"] = span(self._request_sent, self._headers_received)
+        if self._headers_received is not None and self._finished is not None:
+            phases["body"] = span(self._headers_received, self._finished)
+        return phases
+
+    async def __call__(self, event_name: str, info: dict[str, Any]) -> None:
+        now = time.perf_counter()
+        if event_name == "connection.connect_tcp.started":
+            self._connect_started = now
+            if self.acquire_ms is None:
+                self.acquire_ms = self._elapsed_ms(self._started)
+        elif event_name == "connection.connect_tcp.complete":
+            self._connected = now
+            if self._connect_started is not None:
+                self.connect_ms = self._elapsed_ms(self._connect_started)
+        elif event_name == "connection.start_tls.started":
+            self._tls_started = now
+        elif event_name == "connection.start_tls.complete":
+            self._tls_done = now
+            if self._connect_started is not None:
+                self.connect_ms = self._elapsed_ms(self._connect_started)
+        elif event_name.endswith(".send_request_headers.started"):
+            self._request_sent = now
+            if self.acquire_ms is None:
+                self.acquire_ms = self._elapsed_ms(self._started)
+        elif event_name.endswith(".receive_response_headers.complete"):
+            self._headers_received = now
+            self.ttfb_ms = self._elapsed_ms(self._started)
+
+
+def _http2_available() -> bool:
+    """Check whether the optional h2 package is installed."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _create_client() -> httpx.AsyncClient:
+    """Create a new pooled client from settings."""
+    settings = get_settings()
+
+    http2 = settings.http2_enabled
+    if http2 and not _http2_available():
+        logger.warning("HTTP2_ENABLED is set but 'h2' is not installed, falling back to HTTP/1.1")
+        http2 = False
+
+    limits = httpx.Limits(
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive_connections,
+        keepalive_expiry=settings.http_keepalive_expiry,
+    )
+    return httpx.AsyncClient(timeout=REQUEST_TIMEOUT, limits=limits, http2=http2)
+
+
+def get_http_client(url: str) -> httpx.AsyncClient:
+    """Get the pooled client for the origin of a URL, creating it on first access.
+
+    Args:
+        url: Endpoint URL the client will be used for.
+
+    Returns:
+        Shared httpx.AsyncClient for that origin.
+    """
+    origin = get_origin(url)
+    client = _clients.get(origin)
+    if client is None or client.is_closed:
+        client = _create_client()
+        _clients[origin] = client
+        logger.debug(f"Created pooled HTTP client for {origin}")
+    return client
+
+
+def get_pool_origins() -> list[str]:
+    """Get the origins that currently have a pooled client."""
+    return list(_clients)
+
+
+def pool_stats() -> list[dict[str, Any]]:
+    """Get connection pool usage per origin for monitoring.
+
+    Reads httpcore's pool behind each client's default transport;
+    clients without one (e.g. mocked transports in tests) are skipped.
+    """
+    stats = []
+    for origin, client in _clients.items():
+        pool = getattr(getattr(client, "_transport", None), "_pool", None)
+        if pool is None:
+            continue
+        connections = pool.connections
+        idle = sum(1 for connection in connections if connection.is_idle())
+        stats.append({
+            "origin": origin,
+            "active": len(connections) - idle,
+            "idle": idle,
+            "waiting": sum(1 for request in pool._requests if request.is_queued()),
+        })
+    return stats
+
+
+async def close_http_clients() -> None:
+    """Close all pooled clients.
+
+    This function should be called during application shutdown.
+    """
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.warning(f"Failed to close pooled HTTP client: {e}")
+    if clients:
+        logger.info(f"Closed {len(clients)} pooled HTTP clients")
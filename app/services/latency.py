@@ -0,0 +1,155 @@
+"""Mergeable Latency Histograms.
+
+Latencies are counted in logarithmic buckets (the DDSketch/HDR
+histogram scheme): bucket i holds values in (γ^(i-2), γ^(i-1)] with
+γ = (1 + α) / (1 - α), so any percentile read back is within α of the
+true value. Histograms of different tasks and days merge by adding
+bucket counts, which lets the daily rollup keep one small histogram per
+task and day and answer percentiles over any window without sorting
+raw rows.
+"""
+
+import math
+from datetime import datetime
+from typing import Any, Iterable
+
+# Relative error of percentiles read from a histogram
+RELATIVE_ACCURACY = 0.01
+
+_GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+_LOG_GAMMA = math.log(_GAMMA)
+
+# Bucket of zero latencies, e.g. connect time on a reused connection
+ZERO_BUCKET = 0
+
+# Histogram metric name -> ExecutionLog column; lag_ms is derived, see schedule_lag_ms()
+LATENCY_METRICS = {
+    "total": "latency_ms",
+    "connect": "connect_ms",
+    "ttfb": "ttfb_ms",
+    "lag": "lag_ms",
+}
+
+# Waterfall order of the per-execution timing breakdown (ExecutionLog.timings):
+# task load, key decrypt, rate-limit/bulkhead wait, connection acquire,
+# DNS+TCP connect, TLS, request to first byte, body read, JSON parse and
+# waiting for the log writer's group commit
+TIMING_PHASES = (
+    "load", "decrypt", "wait", "acquire", "connect", "tls", "ttfb", "body", "parse", "queue",
+)
+
+# Percentiles reported by the stats API
+PERCENTILES = (0.5, 0.95, 0.99)
+
+
+def bucket_of(value_ms: float) -> int:
+    """Get the bucket index of a latency.
+
+    Args:
+        value_ms: Latency in milliseconds.
+
+    Returns:
+        Bucket index, ZERO_BUCKET for latencies of zero or less.
+    """
+    if value_ms <= 0:
+        return ZERO_BUCKET
+    return math.ceil(math.log(value_ms) / _LOG_GAMMA) + 1
+
+
+def bucket_value(bucket: int) -> float:
+    """Get the representative latency of a bucket, within the relative accuracy."""
+    if bucket == ZERO_BUCKET:
+        return 0.0
+    return 2 * _GAMMA ** (bucket - 1) / (_GAMMA + 1)
+
+
+def schedule_lag_ms(scheduled_at: datetime, executed_at: datetime) -> int:
+    """Get how late an execution started after its scheduled fire time.
+
+    Returns:
+        Lag in milliseconds, never negative.
+    """
+    return max(0, int((executed_at - scheduled_at).total_seconds() * 1000))
+
+
+class LatencyHistogram:
+    """Sparse bucket counts of one latency metric."""
+
+    def __init__(self, counts: dict[int, int] | None = None):
+        self.counts: dict[int, int] = dict(counts or {})
+
+    @property
+    def count(self) -> int:
+        """Number of latencies recorded."""
+        return sum(self.counts.values())
+
+    def add(self, value_ms: float, count: int = 1) -> None:
+        """Record a latency."""
+        bucket = bucket_of(value_ms)
+        self.counts[bucket] = self.counts.get(bucket, 0) + count
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add another histogram's counts to this one."""
+        for bucket, count in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+
+    def quantile(self, q: float) -> float | None:
+        """Estimate a quantile.
+
+        Args:
+            q: Quantile between 0 and 1, e.g. 0.95.
+
+        Returns:
+            Latency in milliseconds, None if the histogram is empty.
+        """
+        total = self.count
+        if total == 0:
+            return None
+        rank = q * (total - 1)
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen > rank:
+                return bucket_value(bucket)
+        return bucket_value(max(self.counts))
+
+    def summary(self) -> dict[str, Any]:
+        """Get the count and reported percentiles, rounded to whole milliseconds."""
+        result: dict[str, Any] = {"count": self.count}
+        for q in PERCENTILES:
+            value = self.quantile(q)
+            result[f"p{round(q * 100)}"] = round(value) if value is not None else None
+        return result
+
+
+def histogram_rows(batch: Iterable[dict[str, Any]], day_of) -> list[dict[str, Any]]:
+    """Aggregate execution log records into histogram bucket increments.
+
+    Args:
+        batch: Execution log values with task_id, executed_at and any
+            of the latency columns.
+        day_of: Maps an executed_at to its statistics day.
+
+    Returns:
+        One dict of execution_latency_daily column values per task,
+        day, metric and bucket.
+    """
+    rows: dict[tuple, dict[str, Any]] = {}
+    for values in batch:
+        day = None
+        for metric, column in LATENCY_METRICS.items():
+            value = values.get(column)
+            if value is None:
+                continue
+            if day is None:
+                day = day_of(values["executed_at"])
+            bucket = bucket_of(value)
+            row = rows.setdefault((values["task_id"], day, metric, bucket), {
+                "task_id": values["task_id"],
+                "day": day,
+                "metric": metric,
+                "bucket": bucket,
+                "count": 0,
+            })
+            row["count"] += 1
+    return list(rows.values())
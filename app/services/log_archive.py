@@ -0,0 +1,521 @@
+"""Compressed Archive of Purged Execution Logs.
+
+Log retention hands every batch of rows it is about to delete to the
+archive, which appends them to compressed NDJSON part files partitioned
+by task and execution day (UTC):
+
+    <archive_dir>/2024/01/execution_logs-2024-01-15-task42-<run>.ndjson.gz
+
+Each batch is a separate gzip member (or zstd frame) appended to the
+run's part file for that task and day, so a part is readable even if a
+run stops halfway. manifest.json lists every part with its day, row and
+failure counts per task and time range, and is rewritten atomically
+after each append, so readers only open parts that can hold matching
+rows: pages read parts newest first and stop once no remaining part can
+reach the page, and counts come from the manifest for parts wholly in
+range. Parts written by older versions hold a whole day for every task;
+they are stream-decoded and only the requested task's rows are kept.
+
+zstd is used when the optional 'zstandard' package is installed, gzip
+otherwise. Parts are NDJSON rather than Parquet, so the archive needs
+no columnar dependency and parts stay appendable.
+"""
+
+import gzip
+import io
+import json
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Optional
+
+from loguru import logger
+
+from app.config import get_settings
+from app.models import ExecutionLog
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 3  # 2 added per-task failure counts, 3 one task per part
+
+# Decoded rows of recently read (part, task) slices kept for repeated page reads
+PART_CACHE_ROWS = 50_000
+
+_SUFFIXES = {"gzip": ".ndjson.gz", "zstd": ".ndjson.zst"}
+
+
+def _zstd_available() -> bool:
+    """Check whether the optional zstandard package is installed."""
+    try:
+        import zstandard  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _compress(data: bytes, compression: str) -> bytes:
+    """Compress one appendable gzip member or zstd frame."""
+    if compression == "zstd":
+        import zstandard
+        return zstandard.ZstdCompressor().compress(data)
+    return gzip.compress(data)
+
+
+def _open_decompressed(path: Path, compression: str) -> io.TextIOBase:
+    """Open a part for streaming reads across all members or frames."""
+    if compression == "zstd":
+        import zstandard
+        reader = zstandard.ZstdDecompressor().stream_reader(
+            open(path, "rb"), read_across_frames=True
+        )
+        return io.TextIOWrapper(reader, encoding="utf-8")
+    return gzip.open(path, "rt", encoding="utf-8")
+
+
+def _encode_row(values: dict[str, Any]) -> str:
+    """Serialize one log row, datetimes as ISO strings."""
+    return json.dumps(
+        {key: value.isoformat() if isinstance(value, datetime) else value
+         for key, value in values.items()},
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+
+
+def _decode_row(line: str) -> dict[str, Any]:
+    """Parse one log row written by _encode_row()."""
+    values = json.loads(line)
+    values["executed_at"] = datetime.fromisoformat(values["executed_at"])
+    if values.get("scheduled_at"):
+        values["scheduled_at"] = datetime.fromisoformat(values["scheduled_at"])
+    return values
+
+
+@dataclass
+class ArchivePart:
+    """Manifest entry of one part file."""
+
+    file: str  # Relative to the archive directory
+    day: date
+    compression: str
+    task_id: Optional[int] = None  # None for parts holding every task of the day
+    rows: int = 0
+    tasks: dict[int, int] = field(default_factory=dict)  # task_id -> rows
+    failed: Optional[dict[int, int]] = field(default_factory=dict)  # task_id -> rows, None if unknown
+    min_executed_at: Optional[datetime] = None
+    max_executed_at: Optional[datetime] = None
+
+    def task_rows(self, task_id: int, status: Optional[str]) -> Optional[int]:
+        """Get a task's row count from the manifest, None if it is not recorded."""
+        total = self.tasks.get(task_id, 0)
+        if status is None:
+            return total
+        if self.failed is None or status not in ("success", "failed"):
+            return None
+        failed = self.failed.get(task_id, 0)
+        return failed if status == "failed" else total - failed
+
+    def to_json(self) -> dict[str, Any]:
+        """Serialize for manifest.json."""
+        values = {
+            "file": self.file,
+            "day": self.day.isoformat(),
+            "compression": self.compression,
+            "task_id": self.task_id,
+            "rows": self.rows,
+            "tasks": {str(task_id): rows for task_id, rows in self.tasks.items()},
+            "min_executed_at": self.min_executed_at.isoformat() if self.min_executed_at else None,
+            "max_executed_at": self.max_executed_at.isoformat() if self.max_executed_at else None,
+        }
+        if self.failed is not None:
+            values["failed"] = {str(task_id): rows for task_id, rows in self.failed.items()}
+        return values
+
+    @classmethod
+    def from_json(cls, values: dict[str, Any]) -> "ArchivePart":
+        """Parse a manifest.json entry."""
+        return cls(
+            file=values["file"],
+            day=date.fromisoformat(values["day"]),
+            compression=values["compression"],
+            task_id=values.get("task_id"),
+            rows=values["rows"],
+            tasks={int(task_id): rows for task_id, rows in values["tasks"].items()},
+            # Parts listed by version 1 manifests have no failure counts
+            failed=(
+                {int(task_id): rows for task_id, rows in values["failed"].items()}
+                if "failed" in values else None
+            ),
+            min_executed_at=(
+                datetime.fromisoformat(values["min_executed_at"])
+                if values.get("min_executed_at") else None
+            ),
+            max_executed_at=(
+                datetime.fromisoformat(values["max_executed_at"])
+                if values.get("max_executed_at") else None
+            ),
+        )
+
+
+class LogArchive:
+    """Date-partitioned compressed store of purged execution logs.
+
+    Appends come from the retention job only; reads may come from any
+    request. All file access is blocking, so async callers run these
+    methods in a thread.
+    """
+
+    def __init__(self, archive_dir: str, compression: Optional[str] = None):
+        if compression is None:
+            compression = "zstd" if _zstd_available() else "gzip"
+        elif compression == "zstd" and not _zstd_available():
+            logger.warning(
+                "LOG_ARCHIVE_COMPRESSION is 'zstd' but 'zstandard' is not installed, "
+                "falling back to gzip"
+            )
+            compression = "gzip"
+        self.archive_dir = Path(archive_dir)
+        self.compression = compression
+
+        self._lock = threading.Lock()
+        self._parts: dict[str, ArchivePart] = {}
+        self._manifest_version: tuple[int, int] | None = None  # (mtime_ns, size)
+        # (file, task_id, mtime_ns, size) -> that task's rows, bounded by PART_CACHE_ROWS
+        self._part_cache: OrderedDict[tuple[str, int, int, int], list[dict[str, Any]]] = OrderedDict()
+        self._part_cache_rows = 0
+
+        # Suffix shared by the part files of one retention run
+        self._run_id = uuid.uuid4().hex[:8]
+
+    @property
+    def manifest_path(self) -> Path:
+        """Location of manifest.json."""
+        return self.archive_dir / MANIFEST_NAME
+
+    def new_run(self) -> None:
+        """Start new part files for the next retention run."""
+        self._run_id = uuid.uuid4().hex[:8]
+
+    def append(self, rows: list[dict[str, Any]]) -> int:
+        """Append log rows to the part files of their tasks and execution days.
+
+        Args:
+            rows: ExecutionLog column values with naive UTC executed_at.
+
+        Returns:
+            Number of rows written.
+        """
+        if not rows:
+            return 0
+
+        by_part: dict[tuple[date, int], list[dict[str, Any]]] = {}
+        for values in rows:
+            by_part.setdefault((values["executed_at"].date(), values["task_id"]), []).append(values)
+
+        with self._lock:
+            self._load_manifest()
+            for (day, task_id), part_rows in sorted(by_part.items()):
+                file = (
+                    f"{day:%Y}/{day:%m}/execution_logs-{day.isoformat()}-task{task_id}-{self._run_id}"
+                    f"{_SUFFIXES[self.compression]}"
+                )
+                path = self.archive_dir / file
+                path.parent.mkdir(parents=True, exist_ok=True)
+
+                data = "".join(_encode_row(values) + "\n" for values in part_rows).encode()
+                with open(path, "ab") as f:
+                    f.write(_compress(data, self.compression))
+                    f.flush()
+                    os.fsync(f.fileno())
+
+                part = self._parts.setdefault(
+                    file,
+                    ArchivePart(file=file, day=day, compression=self.compression, task_id=task_id),
+                )
+                for values in part_rows:
+                    executed_at = values["executed_at"]
+                    part.rows += 1
+                    part.tasks[values["task_id"]] = part.tasks.get(values["task_id"], 0) + 1
+                    if part.failed is not None and values["status"] == "failed":
+                        part.failed[values["task_id"]] = part.failed.get(values["task_id"], 0) + 1
+                    if part.min_executed_at is None or executed_at < part.min_executed_at:
+                        part.min_executed_at = executed_at
+                    if part.max_executed_at is None or executed_at > part.max_executed_at:
+                        part.max_executed_at = executed_at
+            self._save_manifest()
+        return len(rows)
+
+    def covers(
+        self,
+        task_id: int,
+        start_at: Optional[datetime],
+        end_at: Optional[datetime],
+    ) -> bool:
+        """Check whether any part may hold logs of a task in a time range."""
+        return bool(self._matching_parts(task_id, start_at, end_at))
+
+    def query(
+        self,
+        task_id: int,
+        *,
+        status: Optional[str] = None,
+        start_at: Optional[datetime] = None,
+        end_at: Optional[datetime] = None,
+        before: Optional[tuple[datetime, int]] = None,
+        after: Optional[tuple[datetime, int]] = None,
+        limit: Optional[int] = None,
+    ) -> list[dict[str, Any]]:
+        """Read a task's archived logs.
+
+        Parts are read from the newest (the oldest when reading after a
+        boundary) and reading stops once no unread part can hold one of
+        the first `limit` rows, so a page opens a few parts however
+        large the archive is.
+
+        Args:
+            task_id: Task ID.
+            status: Only logs with this status, all if None.
+            start_at: Only logs executed at or after this time (UTC).
+            end_at: Only logs executed before this time (UTC).
+            before: Only logs older than this (executed_at, id) boundary.
+            after: Only logs newer than this (executed_at, id) boundary.
+            limit: At most this many rows, all if None.
+
+        Returns:
+            Matching rows, newest first; oldest first when `after` is given.
+        """
+        ascending = after is not None
+        parts = self._matching_parts(task_id, start_at, end_at)
+        # Parts wholly on the far side of a boundary hold no matching rows
+        if before is not None:
+            parts = [p for p in parts if p.min_executed_at is None or p.min_executed_at <= before[0]]
+        if after is not None:
+            parts = [p for p in parts if p.max_executed_at is None or p.max_executed_at >= after[0]]
+        if ascending:
+            parts.sort(key=lambda p: p.min_executed_at or datetime.min)
+        else:
+            parts.sort(key=lambda p: p.max_executed_at or datetime.max, reverse=True)
+
+        matches: list[dict[str, Any]] = []
+        for part in parts:
+            if limit is not None and len(matches) >= limit:
+                # Parts are sorted by their nearest row, so none of the rest can do better
+                edge = matches[limit - 1]["executed_at"]
+                if ascending and part.min_executed_at is not None and part.min_executed_at > edge:
+                    break
+                if not ascending and part.max_executed_at is not None and part.max_executed_at < edge:
+                    break
+
+            for values in self._read_part(part, task_id):
+                if status is not None and values["status"] != status:
+                    continue
+                if start_at is not None and values["executed_at"] < start_at:
+                    continue
+                if end_at is not None and values["executed_at"] >= end_at:
+                    continue
+                key = (values["executed_at"], values["id"])
+                if before is not None and key >= before:
+                    continue
+                if after is not None and key <= after:
+                    continue
+                matches.append(values)
+
+            matches.sort(key=lambda values: (values["executed_at"], values["id"]), reverse=not ascending)
+            if limit is not None:
+                del matches[limit:]
+        return matches
+
+    def count(
+        self,
+        task_id: int,
+        *,
+        status: Optional[str] = None,
+        start_at: Optional[datetime] = None,
+        end_at: Optional[datetime] = None,
+    ) -> int:
+        """Count a task's archived logs.
+
+        Parts wholly inside the time range are counted from the manifest;
+        only parts cut by the range, or counted by status in parts from
+        older manifests, are read.
+
+        Args:
+            task_id: Task ID.
+            status: Only logs with this status, all if None.
+            start_at: Only logs executed at or after this time (UTC).
+            end_at: Only logs executed before this time (UTC).
+
+        Returns:
+            Number of matching archived logs.
+        """
+        total = 0
+        for part in self._matching_parts(task_id, start_at, end_at):
+            inside = (
+                part.min_executed_at is not None
+                and (start_at is None or part.min_executed_at >= start_at)
+                and (end_at is None or part.max_executed_at < end_at)
+            )
+            rows = part.task_rows(task_id, status) if inside else None
+            if rows is None:
+                rows = sum(
+                    1 for values in self._read_part(part, task_id)
+                    if (status is None or values["status"] == status)
+                    and (start_at is None or values["executed_at"] >= start_at)
+                    and (end_at is None or values["executed_at"] < end_at)
+                )
+            total += rows
+        return total
+
+    def stats(self) -> dict[str, Any]:
+        """Get archive statistics for monitoring."""
+        with self._lock:
+            self._load_manifest()
+            parts = list(self._parts.values())
+        return {
+            "compression": self.compression,
+            "parts": len(parts),
+            "rows": sum(part.rows for part in parts),
+            "bytes": sum(
+                (self.archive_dir / part.file).stat().st_size
+                for part in parts
+                if (self.archive_dir / part.file).exists()
+            ),
+            "oldest_day": min((part.day for part in parts), default=None),
+            "newest_day": max((part.day for part in parts), default=None),
+        }
+
+    def _matching_parts(
+        self,
+        task_id: int,
+        start_at: Optional[datetime],
+        end_at: Optional[datetime],
+    ) -> list[ArchivePart]:
+        """Select parts by manifest metadata, without opening any file."""
+        with self._lock:
+            self._load_manifest()
+            parts = list(self._parts.values())
+
+        first_day = start_at.date() if start_at is not None else date.min
+        # end_at is exclusive; midnight belongs to the previous day
+        last_day = (end_at - timedelta(microseconds=1)).date() if end_at is not None else date.max
+        return [
+            part for part in parts
+            if task_id in part.tasks and first_day <= part.day <= last_day
+        ]
+
+    def _read_part(self, part: ArchivePart, task_id: int) -> list[dict[str, Any]]:
+        """Decode a task's rows of a part, reusing recently decoded slices.
+
+        Parts are read as a stream; rows of other tasks in parts from
+        older versions are skipped without being kept.
+        """
+        path = self.archive_dir / part.file
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            logger.warning(f"Archive part listed in manifest is missing: {part.file}")
+            return []
+
+        # Parts only grow, so size and mtime identify their content
+        key = (part.file, task_id, stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            rows = self._part_cache.get(key)
+            if rows is not None:
+                self._part_cache.move_to_end(key)
+                return rows
+
+        # Cheap prefilter before decoding; _encode_row() writes no spaces
+        marker = f'"task_id":{task_id}'
+        rows = []
+        try:
+            with _open_decompressed(path, part.compression) as lines:
+                for line in lines:
+                    if part.task_id is None and marker not in line:
+                        continue
+                    values = _decode_row(line)
+                    if values["task_id"] == task_id:
+                        rows.append(values)
+        except ImportError:
+            logger.warning(f"Cannot read {part.file}: 'zstandard' is not installed")
+            return []
+
+        with self._lock:
+            if len(rows) <= PART_CACHE_ROWS and key not in self._part_cache:
+                self._part_cache[key] = rows
+                self._part_cache_rows += len(rows)
+                while self._part_cache_rows > PART_CACHE_ROWS:
+                    _, evicted = self._part_cache.popitem(last=False)
+                    self._part_cache_rows -= len(evicted)
+        return rows
+
+    def _load_manifest(self) -> None:
+        """Reload manifest.json if it changed on disk. Caller holds the lock."""
+        try:
+            stat = self.manifest_path.stat()
+        except FileNotFoundError:
+            return
+        version = (stat.st_mtime_ns, stat.st_size)
+        if version == self._manifest_version:
+            return
+
+        manifest = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        self._parts = {
+            values["file"]: ArchivePart.from_json(values) for values in manifest["parts"]
+        }
+        self._manifest_version = version
+
+    def _save_manifest(self) -> None:
+        """Atomically rewrite manifest.json. Caller holds the lock."""
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "parts": [
+                part.to_json()
+                for part in sorted(self._parts.values(), key=lambda part: part.file)
+            ],
+        }
+        tmp_path = self.manifest_path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(manifest, indent=1), encoding="utf-8")
+        os.replace(tmp_path, self.manifest_path)
+        stat = self.manifest_path.stat()
+        self._manifest_version = (stat.st_mtime_ns, stat.st_size)
+
+
+def to_execution_log(values: dict[str, Any]) -> ExecutionLog:
+    """Build a detached ExecutionLog from an archived row for rendering.
+
+    Keys of columns that no longer exist are dropped, so parts written
+    by older versions stay readable.
+    """
+    columns = ExecutionLog.__table__.columns.keys()
+    return ExecutionLog(**{key: value for key, value in values.items() if key in columns})
+
+
+# Lazy-loaded archive singleton
+_archive: LogArchive | None = None
+
+
+def get_log_archive() -> LogArchive | None:
+    """Get the archive singleton, or None if archiving is disabled."""
+    global _archive
+    settings = get_settings()
+    if not settings.log_archive_enabled:
+        return None
+    if _archive is None:
+        _archive = LogArchive(
+            archive_dir=settings.log_archive_dir,
+            compression=settings.log_archive_compression,
+        )
+    return _archive
+
+
+def reset_log_archive() -> None:
+    """Reset the archive singleton.
+
+    Used by tests to reset state between test runs.
+    """
+    global _archive
+    _archive = None
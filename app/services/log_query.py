@@ -0,0 +1,341 @@
+"""Execution Log Queries with Keyset Pagination.
+
+Pages through a task's execution logs newest first, keyed on
+(executed_at, id) instead of OFFSET, so every page costs one range
+scan of the (task_id, executed_at) index no matter how deep it is.
+Cursors are opaque URL-safe strings; totals are approximate and cached.
+
+Date-filtered queries that reach into days held by the log archive
+read the matching archive parts too and merge them into the same
+(executed_at, id) order, so purged history pages like live rows.
+"""
+
+import asyncio
+import base64
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import ExecutionLog, ExecutionStatsDaily
+from app.services.log_archive import get_log_archive, to_execution_log
+from app.services.stats import stats_day
+
+# Seconds a filtered COUNT(*) is reused before it is recomputed
+COUNT_CACHE_SECONDS = 30
+
+# Filter combinations whose counts are kept at most
+COUNT_CACHE_MAX_ENTRIES = 1024
+
+# (task_id, status, start_at, end_at) -> (expires_at monotonic, count), LRU order
+_count_cache: OrderedDict[tuple, tuple[float, int]] = OrderedDict()
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+@dataclass
+class Cursor:
+    """Position of a page boundary row and the direction to read from it."""
+
+    executed_at: datetime
+    id: int
+    direction: str = "next"  # next (older rows) | prev (newer rows)
+    page: int = 1  # Page number the cursor leads to, for display
+
+    def encode(self) -> str:
+        """Serialize to an opaque URL-safe string."""
+        payload = {
+            "t": self.executed_at.isoformat(),
+            "i": self.id,
+            "d": self.direction,
+            "p": self.page,
+        }
+        raw = json.dumps(payload, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, value: str) -> "Cursor":
+        """Parse a string produced by encode().
+
+        Raises:
+            InvalidCursor: If the value is malformed.
+        """
+        try:
+            raw = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+            payload = json.loads(raw)
+            cursor = cls(
+                executed_at=datetime.fromisoformat(payload["t"]),
+                id=int(payload["i"]),
+                direction=payload["d"],
+                page=max(1, int(payload.get("p", 1))),
+            )
+        except (ValueError, KeyError, TypeError) as e:
+            raise InvalidCursor(f"Invalid cursor: {value!r}") from e
+        if cursor.direction not in ("next", "prev"):
+            raise InvalidCursor(f"Invalid cursor direction: {cursor.direction!r}")
+        return cursor
+
+
+@dataclass
+class LogPage:
+    """One page of execution logs, newest first."""
+
+    logs: list[ExecutionLog]
+    page: int = 1
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+
+def _filters(
+    task_id: int,
+    status: Optional[str],
+    start_at: Optional[datetime],
+    end_at: Optional[datetime],
+) -> list:
+    """Build WHERE criteria shared by page and count queries."""
+    criteria = [ExecutionLog.task_id == task_id]
+    if status is not None:
+        criteria.append(ExecutionLog.status == status)
+    if start_at is not None:
+        criteria.append(ExecutionLog.executed_at >= start_at)
+    if end_at is not None:
+        criteria.append(ExecutionLog.executed_at < end_at)
+    return criteria
+
+
+async def fetch_log_page(
+    session: AsyncSession,
+    task_id: int,
+    *,
+    status: Optional[str] = None,
+    start_at: Optional[datetime] = None,
+    end_at: Optional[datetime] = None,
+    cursor: Optional[Cursor] = None,
+    limit: int = 20,
+) -> LogPage:
+    """Fetch one page of a task's logs.
+
+    Args:
+        session: Database session.
+        task_id: Task ID.
+        status: Only logs with this status, all if None.
+        start_at: Only logs executed at or after this time (UTC).
+        end_at: Only logs executed before this time (UTC).
+        cursor: Page boundary to continue from, first page if None.
+        limit: Page size.
+
+    Returns:
+        LogPage with the logs and cursors to its neighbours.
+    """
+    query = select(ExecutionLog).where(*_filters(task_id, status, start_at, end_at))
+    backwards = cursor is not None and cursor.direction == "prev"
+
+    if cursor is not None:
+        boundary_time = cursor.executed_at
+        if backwards:
+            query = query.where(or_(
+                ExecutionLog.executed_at > boundary_time,
+                and_(ExecutionLog.executed_at == boundary_time, ExecutionLog.id > cursor.id),
+            ))
+        else:
+            query = query.where(or_(
+                ExecutionLog.executed_at < boundary_time,
+                and_(ExecutionLog.executed_at == boundary_time, ExecutionLog.id < cursor.id),
+            ))
+
+    if backwards:
+        query = query.order_by(ExecutionLog.executed_at.asc(), ExecutionLog.id.asc())
+    else:
+        query = query.order_by(ExecutionLog.executed_at.desc(), ExecutionLog.id.desc())
+
+    # One extra row tells whether another page exists in this direction
+    rows = list((await session.execute(query.limit(limit + 1))).scalars().all())
+
+    archived = await _archived_logs(task_id, status, start_at, end_at, cursor, limit + 1)
+    if archived:
+        rows = _merge_archived(rows, archived, backwards, limit + 1)
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    if backwards:
+        rows.reverse()
+        page = max(1, cursor.page)
+        has_newer, has_older = has_more, True
+    else:
+        page = cursor.page if cursor is not None else 1
+        has_newer, has_older = cursor is not None, has_more
+
+    result = LogPage(logs=rows, page=page)
+    if rows and has_older:
+        last = rows[-1]
+        result.next_cursor = Cursor(last.executed_at, last.id, "next", page + 1).encode()
+    if rows and has_newer and page > 1:
+        first = rows[0]
+        result.prev_cursor = Cursor(first.executed_at, first.id, "prev", page - 1).encode()
+    return result
+
+
+def _archive_for(task_id: int, start_at: Optional[datetime], end_at: Optional[datetime]):
+    """Get the archive if a date-filtered query may reach into it.
+
+    Only a start date can reach past the live retention window, so
+    unfiltered queries never touch the archive.
+    """
+    archive = get_log_archive()
+    if archive is None or start_at is None or not archive.covers(task_id, start_at, end_at):
+        return None
+    return archive
+
+
+async def _archived_logs(
+    task_id: int,
+    status: Optional[str],
+    start_at: Optional[datetime],
+    end_at: Optional[datetime],
+    cursor: Optional[Cursor],
+    limit: int,
+) -> list[dict]:
+    """Read the first archived logs past the cursor, in page order."""
+    archive = _archive_for(task_id, start_at, end_at)
+    if archive is None:
+        return []
+    boundary = (cursor.executed_at, cursor.id) if cursor is not None else None
+    backwards = cursor is not None and cursor.direction == "prev"
+    return await asyncio.to_thread(
+        archive.query, task_id, status=status, start_at=start_at, end_at=end_at,
+        before=None if backwards else boundary,
+        after=boundary if backwards else None,
+        limit=limit,
+    )
+
+
+def _merge_archived(
+    rows: list[ExecutionLog],
+    archived: list[dict],
+    backwards: bool,
+    limit: int,
+) -> list[ExecutionLog]:
+    """Merge live rows with archived rows past the cursor, in page order."""
+    # Rows archived just before a crash may still be live; keep the live copy
+    live_ids = {log.id for log in rows}
+    merged = rows + [to_execution_log(v) for v in archived if v["id"] not in live_ids]
+    merged.sort(key=lambda log: (log.executed_at, log.id), reverse=not backwards)
+    return merged[:limit]
+
+
+async def count_logs(
+    session: AsyncSession,
+    task_id: int,
+    *,
+    status: Optional[str] = None,
+    start_at: Optional[datetime] = None,
+    end_at: Optional[datetime] = None,
+) -> int:
+    """Get the approximate number of logs matching a filter.
+
+    Without a date range the count comes from the daily stats rollup,
+    starting at the day of the oldest log still kept; with one, a COUNT(*)
+    over the range plus any archived logs in it is cached for
+    COUNT_CACHE_SECONDS.
+
+    Args:
+        session: Database session.
+        task_id: Task ID.
+        status: Only logs with this status, all if None.
+        start_at: Only logs executed at or after this time (UTC).
+        end_at: Only logs executed before this time (UTC).
+
+    Returns:
+        Number of matching logs, possibly slightly stale.
+    """
+    if start_at is None and end_at is None:
+        # Purged logs stay in the rollup, so skip days before the oldest kept log
+        oldest = await session.scalar(
+            select(func.min(ExecutionLog.executed_at)).where(ExecutionLog.task_id == task_id)
+        )
+        if oldest is None:
+            return 0
+        column = {
+            "success": ExecutionStatsDaily.success,
+            "failed": ExecutionStatsDaily.failed,
+        }.get(status, ExecutionStatsDaily.success + ExecutionStatsDaily.failed)
+        total = await session.scalar(
+            select(func.coalesce(func.sum(column), 0))
+            .where(
+                ExecutionStatsDaily.task_id == task_id,
+                ExecutionStatsDaily.day >= stats_day(oldest),
+            )
+        )
+        return int(total)
+
+    key = (task_id, status, start_at, end_at)
+    cached = _count_cache.get(key)
+    now = time.monotonic()
+    if cached is not None:
+        if cached[0] > now:
+            _count_cache.move_to_end(key)
+            return cached[1]
+        del _count_cache[key]
+
+    total = await session.scalar(
+        select(func.count(ExecutionLog.id)).where(*_filters(task_id, status, start_at, end_at))
+    )
+    archive = _archive_for(task_id, start_at, end_at)
+    if archive is not None:
+        total += await asyncio.to_thread(
+            archive.count, task_id, status=status, start_at=start_at, end_at=end_at
+        )
+    _store_count(key, total, now)
+    return total
+
+
+def _store_count(key: tuple, total: int, now: float) -> None:
+    """Cache a count, dropping expired entries and the least recently used beyond the bound."""
+    for expired in [k for k, (expires_at, _) in _count_cache.items() if expires_at <= now]:
+        del _count_cache[expired]
+    _count_cache[key] = (now + COUNT_CACHE_SECONDS, total)
+    while len(_count_cache) > COUNT_CACHE_MAX_ENTRIES:
+        _count_cache.popitem(last=False)
+
+
+def parse_date_range(
+    start_date: Optional[str],
+    end_date: Optional[str],
+) -> tuple[Optional[datetime], Optional[datetime]]:
+    """Convert inclusive YYYY-MM-DD filter dates into a UTC datetime range.
+
+    Invalid dates are ignored.
+
+    Returns:
+        Tuple of (start_at, end_at), end_at exclusive.
+    """
+    start_at = end_at = None
+    if start_date:
+        try:
+            start_at = datetime.combine(date.fromisoformat(start_date), datetime.min.time())
+        except ValueError:
+            pass
+    if end_date:
+        try:
+            # End date is inclusive, so add 1 day
+            end_at = datetime.combine(date.fromisoformat(end_date), datetime.min.time())
+            end_at += timedelta(days=1)
+        except ValueError:
+            pass
+    return start_at, end_at
+
+
+def clear_count_cache() -> None:
+    """Drop all cached counts.
+
+    Used by tests to reset state between test runs.
+    """
+    _count_cache.clear()
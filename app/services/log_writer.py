@@ -0,0 +1,461 @@
+"""Group-Commit ExecutionLog Writer.
+
+A single background writer buffers execution log records from all
+task executions and flushes them as multi-row inserts once either a
+size or a time threshold is reached, so SQLite does one commit per
+batch instead of one per execution. The same transaction refreshes the
+last-execution columns of each affected task and the daily statistics
+rollup.
+
+With a separate logs database the two databases cannot share a
+transaction: the logs and rollup commit first, then the task summaries.
+A crash in between leaves summaries behind their logs, and
+reconcile_task_summaries() recomputes them from the newest logs at
+startup.
+"""
+
+import asyncio
+import time
+from typing import Any
+
+from loguru import logger
+from sqlalchemy import Boolean, Integer, bindparam, case, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.database import get_engine, get_logs_engine, get_session_maker
+from app.models import ExecutionLog, Task
+from app.services.metrics import EXECUTION_PHASE_SECONDS
+from app.services.stats import upsert_daily_stats
+
+# Sentinel placed on the queue to stop the writer loop
+_STOP = object()
+
+# Batch write and commit, including a retry
+_COMMIT_SECONDS = EXECUTION_PHASE_SECONDS.labels("commit")
+
+# Submitted keys stored in execution_logs; others only feed the task summary and rollups
+_LOG_COLUMNS = frozenset(ExecutionLog.__table__.columns.keys())
+
+
+def summarize_batch(batch: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Reduce a batch of log records to one last-execution update per task.
+
+    Records are applied in submission order. The failure streak restarts
+    at the last success in the batch; if the batch holds no success for
+    a task, its failures are added to the stored streak.
+
+    Args:
+        batch: Submitted execution log values.
+
+    Returns:
+        Bind parameters for the task summary update, one dict per task.
+    """
+    summaries: dict[int, dict[str, Any]] = {}
+    for values in batch:
+        summary = summaries.setdefault(values["task_id"], {
+            "task_id": values["task_id"],
+            "b_reset": False,
+            "b_failures": 0,
+        })
+        summary["b_executed_at"] = values["executed_at"]
+        summary["b_status"] = values["status"]
+        summary["b_latency_ms"] = values.get("latency_ms")
+        if values["status"] == "success":
+            summary["b_reset"] = True
+            summary["b_failures"] = 0
+        else:
+            summary["b_failures"] += 1
+    return list(summaries.values())
+
+
+def _task_summary_update():
+    """Build the executemany UPDATE applying summarize_batch() output."""
+    tasks = Task.__table__
+    return (
+        update(tasks)
+        .where(tasks.c.id == bindparam("task_id"))
+        .values(
+            last_executed_at=bindparam("b_executed_at"),
+            last_status=bindparam("b_status"),
+            last_latency_ms=bindparam("b_latency_ms"),
+            consecutive_failures=case(
+                (bindparam("b_reset", type_=Boolean), 0),
+                else_=tasks.c.consecutive_failures,
+            ) + bindparam("b_failures", type_=Integer),
+            # Not an edit of the task: keep updated_at for cache reconciliation
+            updated_at=tasks.c.updated_at,
+        )
+    )
+
+
+class ExecutionLogWriter:
+    """Background writer that batches ExecutionLog inserts.
+
+    Producers call submit() with a dict of ExecutionLog column values.
+    When the buffer is full, submit() waits until the writer has drained
+    it, which propagates back-pressure to the executing tasks.
+    """
+
+    def __init__(self, max_queue: int, batch_size: int, flush_interval: float):
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._queue: asyncio.Queue | None = None
+        self._runner: asyncio.Task | None = None
+
+        # Statistics
+        self.total_written = 0
+        self.total_batches = 0
+        self.total_dropped = 0
+        self.backpressure_waits = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+
+    @property
+    def running(self) -> bool:
+        """Whether the background writer loop is active."""
+        return self._runner is not None and not self._runner.done()
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of records waiting to be flushed."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def start(self) -> None:
+        """Start the background writer loop on the running event loop."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._runner = asyncio.get_running_loop().create_task(self._run())
+        logger.info(
+            f"Execution log writer started (batch_size={self.batch_size}, "
+            f"flush_interval={self.flush_interval}s, max_queue={self.max_queue})"
+        )
+
+    async def stop(self) -> None:
+        """Flush all buffered records and stop the writer loop."""
+        if not self.running:
+            return
+        await self._queue.put(_STOP)
+        await self._runner
+        self._runner = None
+        logger.info(f"Execution log writer stopped ({self.total_written} records written)")
+
+    async def submit(self, values: dict[str, Any]) -> None:
+        """Queue one execution log record for writing.
+
+        Args:
+            values: ExecutionLog column values.
+
+        Waits while the buffer is full. If the writer is not running,
+        the record is written immediately in its own transaction.
+        """
+        if values.get("timings") is not None:
+            # Not a column: turned into the "queue" phase when the batch is written
+            values["queued_at"] = time.perf_counter()
+
+        if not self.running:
+            await self._write_batch([values])
+            return
+
+        try:
+            self._queue.put_nowait(values)
+        except asyncio.QueueFull:
+            self.backpressure_waits += 1
+            logger.warning(
+                f"Execution log buffer full ({self.max_queue} records), "
+                f"waiting for writer to drain"
+            )
+            await self._queue.put(values)
+
+    def stats(self) -> dict[str, Any]:
+        """Get writer statistics for monitoring."""
+        return {
+            "running": self.running,
+            "queue_depth": self.queue_depth,
+            "max_queue": self.max_queue,
+            "total_written": self.total_written,
+            "total_batches": self.total_batches,
+            "total_dropped": self.total_dropped,
+            "backpressure_waits": self.backpressure_waits,
+            "last_flush_ms": round(self.last_flush_ms, 2),
+            "max_flush_ms": round(self.max_flush_ms, 2),
+        }
+
+    async def _run(self) -> None:
+        """Collect records into batches and flush them until stopped."""
+        loop = asyncio.get_running_loop()
+        stopping = False
+
+        while not stopping:
+            item = await self._queue.get()
+            if item is _STOP:
+                break
+
+            batch = [item]
+            deadline = loop.time() + self.flush_interval
+
+            while len(batch) < self.batch_size:
+                # Drain whatever is already buffered without waiting
+                try:
+                    item = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            await self._flush(batch)
+
+    async def _flush(self, batch: list[dict[str, Any]]) -> None:
+        """Write a batch, retrying once before splitting out the rows that fail."""
+        start_time = time.perf_counter()
+
+        for attempt in (1, 2):
+            try:
+                await self._write_batch(batch)
+                break
+            except Exception:
+                if attempt == 1:
+                    logger.exception(
+                        f"Failed to flush {len(batch)} execution logs, retrying"
+                    )
+                    await asyncio.sleep(self.flush_interval)
+                elif len(batch) == 1:
+                    logger.exception(
+                        f"Dropping execution log for task {batch[0].get('task_id')} after retry"
+                    )
+                    self.total_dropped += 1
+                    return
+                else:
+                    # Keep the rest of the group commit: only the offending rows are dropped
+                    logger.exception(
+                        f"Failed to flush {len(batch)} execution logs after retry, "
+                        f"splitting the batch"
+                    )
+                    await self._write_bisected(batch)
+                    break
+
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        _COMMIT_SECONDS.observe(elapsed_ms / 1000)
+        self.total_batches += 1
+        self.last_flush_ms = elapsed_ms
+        self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+        logger.debug(f"Flushed {len(batch)} execution logs in {elapsed_ms:.1f}ms")
+
+    async def _write_bisected(self, batch: list[dict[str, Any]]) -> None:
+        """Write a failed batch in halves, dropping only rows that fail on their own."""
+        middle = len(batch) // 2
+        for half in (batch[:middle], batch[middle:]):
+            try:
+                await self._write_batch(half)
+            except Exception as e:
+                if len(half) > 1:
+                    await self._write_bisected(half)
+                    continue
+                logger.error(f"Dropping execution log for task {half[0].get('task_id')}: {e}")
+                self.total_dropped += 1
+
+    async def _write_batch(self, batch: list[dict[str, Any]]) -> None:
+        """Write a batch of records and everything derived from them in one transaction."""
+        written_at = time.perf_counter()
+        for values in batch:
+            if "queued_at" in values:
+                values["timings"]["queue"] = int((written_at - values["queued_at"]) * 1000)
+
+        session_maker = get_session_maker()
+        if get_logs_engine() is get_engine():
+            async with session_maker() as session:
+                await apply_execution_logs(session, batch)
+                await session.commit()
+            self.total_written += len(batch)
+            return
+
+        # Logs first: once committed they are never written again, so a
+        # failed summary update is left to reconcile_task_summaries()
+        async with session_maker() as session:
+            await insert_execution_logs(session, batch)
+            await session.commit()
+        self.total_written += len(batch)
+        try:
+            async with session_maker() as session:
+                await update_task_summaries(session, batch)
+                await session.commit()
+        except Exception:
+            logger.exception(
+                f"Failed to update task summaries for {len(batch)} execution logs, "
+                f"they are recomputed at next startup"
+            )
+
+
+async def insert_execution_logs(session: AsyncSession, batch: list[dict[str, Any]]) -> None:
+    """Insert execution logs and update the daily stats rollup.
+
+    Args:
+        session: Database session.
+        batch: Execution log values, in submission order.
+    """
+    rows = [
+        {key: value for key, value in values.items() if key in _LOG_COLUMNS}
+        for values in batch
+    ]
+    await session.execute(insert(ExecutionLog), rows)
+    await upsert_daily_stats(session, batch)
+
+
+async def update_task_summaries(session: AsyncSession, batch: list[dict[str, Any]]) -> None:
+    """Refresh the last-execution columns of the tasks in a batch.
+
+    Args:
+        session: Database session.
+        batch: Execution log values, in submission order.
+    """
+    await session.execute(_task_summary_update(), summarize_batch(batch))
+
+
+async def apply_execution_logs(session: AsyncSession, batch: list[dict[str, Any]]) -> None:
+    """Insert execution logs and update task summaries and daily stats.
+
+    Runs inside the caller's transaction; the caller commits. The task
+    summary update goes last, so with a separate logs database the main
+    database's write lock is only taken right before the commit. The
+    two databases still commit independently; see _write_batch() for
+    the ordered writes the log writer uses instead.
+
+    Args:
+        session: Database session.
+        batch: Execution log values, in submission order.
+    """
+    await insert_execution_logs(session, batch)
+    await update_task_summaries(session, batch)
+
+
+async def reconcile_task_summaries() -> int:
+    """Recompute task summaries that fell behind their execution logs.
+
+    Only needed with a separate logs database, where a crash between
+    the logs commit and the summary commit leaves the summary stale.
+    Tasks whose last_executed_at is older than their newest log get
+    last_* from that log and the failure streak since their last
+    success.
+
+    Returns:
+        Number of tasks updated.
+    """
+    if get_logs_engine() is get_engine():
+        return 0
+
+    logs = ExecutionLog.__table__
+    session_maker = get_session_maker()
+    async with session_maker() as session:
+        stored = dict((await session.execute(select(Task.id, Task.last_executed_at))).all())
+        newest = (await session.execute(
+            select(logs.c.task_id, func.max(logs.c.executed_at)).group_by(logs.c.task_id)
+        )).all()
+        stale = [
+            task_id for task_id, executed_at in newest
+            if task_id in stored and (stored[task_id] is None or stored[task_id] < executed_at)
+        ]
+
+        params = []
+        for task_id in stale:
+            last = (await session.execute(
+                select(logs.c.executed_at, logs.c.status, logs.c.latency_ms)
+                .where(logs.c.task_id == task_id)
+                .order_by(logs.c.executed_at.desc())
+                .limit(1)
+            )).one()
+            last_success = (
+                select(func.max(logs.c.executed_at))
+                .where(logs.c.task_id == task_id, logs.c.status == "success")
+                .scalar_subquery()
+            )
+            failures = await session.scalar(
+                select(func.count())
+                .select_from(logs)
+                .where(
+                    logs.c.task_id == task_id,
+                    logs.c.status != "success",
+                    (last_success.is_(None)) | (logs.c.executed_at > last_success),
+                )
+            )
+            params.append({
+                "task_id": task_id,
+                "b_executed_at": last.executed_at,
+                "b_status": last.status,
+                "b_latency_ms": last.latency_ms,
+                "b_reset": True,
+                "b_failures": failures,
+            })
+
+        if params:
+            await session.execute(_task_summary_update(), params)
+            await session.commit()
+            logger.warning(f"Reconciled last execution of {len(params)} tasks with the logs database")
+    return len(params)
+
+
+# Lazy-loaded writer singleton
+_writer: ExecutionLogWriter | None = None
+
+
+def get_log_writer() -> ExecutionLogWriter:
+    """Get the writer singleton, creating it from settings on first access."""
+    global _writer
+    if _writer is None:
+        settings = get_settings()
+        _writer = ExecutionLogWriter(
+            max_queue=settings.log_writer_max_queue,
+            batch_size=settings.log_writer_batch_size,
+            flush_interval=settings.log_writer_flush_interval,
+        )
+    return _writer
+
+
+async def start_log_writer() -> None:
+    """Start the background log writer.
+
+    Task summaries left behind by an interrupted write are reconciled
+    first. This function should be called during application startup,
+    after init_db().
+    """
+    await reconcile_task_summaries()
+    get_log_writer().start()
+
+
+async def stop_log_writer() -> None:
+    """Flush buffered logs and stop the background log writer.
+
+    This function should be called during application shutdown,
+    after the scheduler has stopped submitting new executions.
+    """
+    if _writer is not None:
+        await _writer.stop()
+
+
+async def submit_execution_log(values: dict[str, Any]) -> None:
+    """Queue an execution log record on the shared writer.
+
+    Args:
+        values: ExecutionLog column values.
+    """
+    await get_log_writer().submit(values)
+
+
+def reset_log_writer() -> None:
+    """Reset the writer singleton.
+
+    Used by tests to reset state between test runs.
+    """
+    global _writer
+    _writer = None
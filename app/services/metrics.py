@@ -0,0 +1,271 @@
+"""Prometheus-Compatible Metrics.
+
+Minimal counters, gauges and fixed-bucket histograms rendered in the
+Prometheus text exposition format, so a local agent can scrape
+/metrics without a client library or external service.
+
+Observations are cheap: a labelled metric allocates one child per label
+set on first use, and callers on the hot path bind their children once
+at import time. Histograms keep preallocated bucket counts and
+accumulate cumulative counts only when scraped. Everything runs on the
+application's event loop, so no locks are taken.
+"""
+
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Callable, Iterable
+
+# Seconds; spans a cached lookup to a slow provider call
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+# (labels, value) pairs of one metric family, produced at scrape time; a
+# (suffix, labels, value) triple names a sample such as a summary's "_sum"
+Samples = Iterable[tuple[dict[str, str], float] | tuple[str, dict[str, str], float]]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return f"{{{pairs}}}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class _Metric(ABC):
+    """Base of a metric family with optional labels."""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._children: dict[tuple[str, ...], object] = {}
+
+    @abstractmethod
+    def _new_child(self):
+        """Create the value holder of one label combination."""
+
+    def labels(self, *values: str):
+        """Get the child for a label set, creating it on first use."""
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        child = self._children.get(values)
+        if child is None:
+            child = self._children[values] = self._new_child()
+        return child
+
+    def _unlabelled(self):
+        return self.labels()
+
+    def children(self) -> dict[tuple[str, ...], object]:
+        """Get the children created so far, keyed by label values."""
+        return dict(self._children)
+
+    def reset(self) -> None:
+        """Zero all recorded values, keeping children bound at import. Used by tests."""
+        for child in self._children.values():
+            child.reset()
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        for values, child in self._children.items():
+            lines.extend(self._render_child(_format_labels(self.labelnames, values), values, child))
+        return lines
+
+    def _render_child(self, labels: str, values: tuple[str, ...], child) -> list[str]:
+        return [f"{self.name}{labels} {_format_value(child.value)}"]
+
+
+class _Value:
+    """A single counter or gauge value."""
+
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def reset(self) -> None:
+        self.value = 0
+
+
+class Counter(_Metric):
+    """Monotonically increasing count, e.g. executions by status."""
+
+    type_name = "counter"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1) -> None:
+        """Increment the unlabelled counter."""
+        self._unlabelled().inc(amount)
+
+
+class Gauge(_Metric):
+    """Value that goes up and down, e.g. executions in flight."""
+
+    type_name = "gauge"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1) -> None:
+        """Increment the unlabelled gauge."""
+        self._unlabelled().inc(amount)
+
+    def dec(self, amount: float = 1) -> None:
+        """Decrement the unlabelled gauge."""
+        self._unlabelled().dec(amount)
+
+    def set(self, value: float) -> None:
+        """Set the unlabelled gauge."""
+        self._unlabelled().set(value)
+
+
+class _HistogramValue:
+    """Per-bucket (non-cumulative) counts of one label set."""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def reset(self) -> None:
+        self.counts = [0] * len(self.counts)
+        self.sum = 0.0
+        self.count = 0
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in fixed buckets, e.g. phase durations."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramValue:
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float) -> None:
+        """Observe a value on the unlabelled histogram."""
+        self._unlabelled().observe(value)
+
+    def _render_child(self, labels: str, values: tuple[str, ...], child) -> list[str]:
+        lines = []
+        cumulative = 0
+        names = self.labelnames + ("le",)
+        for bound, count in zip(self.buckets + (float("inf"),), child.counts):
+            cumulative += count
+            bucket_labels = _format_labels(names, values + (_format_value(float(bound)),))
+            lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+        lines.append(f"{self.name}_sum{labels} {_format_value(child.sum)}")
+        lines.append(f"{self.name}_count{labels} {child.count}")
+        return lines
+
+
+class Registry:
+    """Metrics and scrape-time collectors rendered by /metrics."""
+
+    def __init__(self):
+        self._metrics: list[_Metric] = []
+        self._collectors: list[Callable[[], Iterable[tuple[str, str, str, Samples]]]] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        """Add a metric family; returns it for assignment at import time."""
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collect: Callable[[], Iterable[tuple[str, str, str, Samples]]]) -> None:
+        """Add a function producing (name, type, help, samples) families at scrape time."""
+        self._collectors.append(collect)
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text format (version 0.0.4)."""
+        lines: list[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collect in self._collectors:
+            for name, type_name, documentation, samples in collect():
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {type_name}")
+                for sample in samples:
+                    suffix, labels, value = sample if len(sample) == 3 else ("", *sample)
+                    label_str = _format_labels(tuple(labels), tuple(str(v) for v in labels.values()))
+                    lines.append(f"{name}{suffix}{label_str} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Zero all recorded values. Used by tests."""
+        for metric in self._metrics:
+            metric.reset()
+
+
+REGISTRY = Registry()
+
+# Content type of the text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# Execution hot path (see execute_task and the log writer)
+EXECUTIONS = REGISTRY.register(Counter(
+    "autoai_executions_total", "Task executions by result.", ("status",)
+))
+EXECUTION_PHASE_SECONDS = REGISTRY.register(Histogram(
+    "autoai_execution_phase_seconds",
+    "Duration of execute_task phases: load (snapshot cache or database), decrypt, http, "
+    "commit (one execution log batch).",
+    ("phase",),
+))
+EXECUTIONS_IN_FLIGHT = REGISTRY.register(Gauge(
+    "autoai_executions_in_flight", "Executions currently running on this node."
+))
+
+# Web and API requests
+HTTP_REQUEST_SECONDS = REGISTRY.register(Histogram(
+    "autoai_http_request_duration_seconds",
+    "Latency of requests served, by router (api | web | other), method, route template and status.",
+    ("router", "method", "route", "status"),
+))
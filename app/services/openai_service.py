@@ -13,15 +13,25 @@ from tenacity import (
     wait_exponential,
 )
 
+from app.services.http_client import RequestTrace, get_http_client
+from app.services.rate_limiter import RateLimitHeaders, parse_rate_limit_headers
 from app.utils.security import mask_api_key
 
 
 class OpenAIServiceError(Exception):
     """Exception raised when OpenAI API call fails."""
 
-    def __init__(self, message: str, status_code: int | None = None):
+    def __init__(
+        self,
+        message: str,
+        status_code: int | None = None,
+        rate_limit: RateLimitHeaders | None = None,
+        timings: dict[str, int] | None = None,
+    ):
         self.message = message
         self.status_code = status_code
+        self.rate_limit = rate_limit  # Provider rate-limit hints, if any
+        self.timings = timings  # Request phases reached before failing, if any
         super().__init__(self.message)
 
 
@@ -31,10 +41,10 @@ class OpenAIResponse:
 
     response_summary: str  # First 500 chars of AI response
     response_time_ms: int  # Request duration in milliseconds
-
-
-# HTTP timeout configuration
-REQUEST_TIMEOUT = 30.0  # seconds
+    rate_limit: RateLimitHeaders | None = None  # Provider rate-limit hints, if any
+    connect_ms: int | None = None  # TCP/TLS connect, 0 on a reused connection
+    ttfb_ms: int | None = None  # Request start to response headers, last attempt
+    timings: dict[str, int] | None = None  # Request phases in ms, see RequestTrace.phases()
 
 
 @retry(
@@ -48,13 +58,18 @@ async def _make_request(
     endpoint: str,
     headers: dict[str, str],
     payload: dict[str, Any],
+    trace: RequestTrace | None = None,
 ) -> httpx.Response:
     """Make HTTP request with retry logic.
 
     Only retries on network errors (httpx.RequestError).
     Does not retry on HTTP 4xx/5xx errors.
     """
-    response = await client.post(endpoint, headers=headers, json=payload)
+    extensions = {}
+    if trace is not None:
+        trace.start()
+        extensions["trace"] = trace
+    response = await client.post(endpoint, headers=headers, json=payload, extensions=extensions)
     return response
 
 
@@ -63,6 +78,7 @@ async def send_message(
     api_key: str,
     message_content: str,
     model: str = "gpt-3.5-turbo",
+    authorization: str | None = None,
 ) -> OpenAIResponse:
     """Send a message to OpenAI API.
 
@@ -71,6 +87,8 @@ async def send_message(
         api_key: The API key (plain text, already decrypted).
         message_content: The message to send.
         model: The model to use (default: gpt-3.5-turbo).
+        authorization: Prebuilt Authorization header value; built from
+            api_key when not provided.
 
     Returns:
         OpenAIResponse with response summary and timing.
@@ -82,7 +100,7 @@ async def send_message(
     logger.info(f"Sending message to OpenAI API (key: {masked_key})")
 
     headers = {
-        "Authorization": f"Bearer {api_key}",
+        "Authorization": authorization or f"Bearer {api_key}",
         "Content-Type": "application/json",
     }
 
@@ -92,12 +110,15 @@ async def send_message(
     }
 
     start_time = time.perf_counter()
+    trace = RequestTrace()
 
     try:
-        async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT) as client:
-            response = await _make_request(client, api_endpoint, headers, payload)
+        client = get_http_client(api_endpoint)
+        response = await _make_request(client, api_endpoint, headers, payload, trace)
+        trace.finish()
 
         elapsed_ms = int((time.perf_counter() - start_time) * 1000)
+        rate_limit = parse_rate_limit_headers(response.headers)
 
         # Check for HTTP errors
         if response.status_code >= 400:
@@ -109,9 +130,12 @@ async def send_message(
             raise OpenAIServiceError(
                 message=f"API returned {response.status_code}: {error_detail}",
                 status_code=response.status_code,
+                rate_limit=rate_limit,
+                timings=trace.phases(),
             )
 
         # Parse successful response
+        parse_started = time.perf_counter()
         try:
             data = response.json()
             message = data["choices"][0]["message"]
@@ -153,6 +177,8 @@ async def send_message(
             ) from e
 
         response_summary = ai_content[:500] if len(ai_content) > 500 else ai_content
+        timings = trace.phases()
+        timings["parse"] = int((time.perf_counter() - parse_started) * 1000)
 
         logger.info(
             f"OpenAI API call successful in {elapsed_ms}ms "
@@ -162,6 +188,11 @@ async def send_message(
         return OpenAIResponse(
             response_summary=response_summary,
             response_time_ms=elapsed_ms,
+            rate_limit=rate_limit,
+            connect_ms=trace.connect_ms,
+            # Custom (e.g. mocked) transports report no phases
+            ttfb_ms=trace.ttfb_ms if trace.ttfb_ms is not None else elapsed_ms,
+            timings=timings,
         )
 
     except httpx.RequestError as e:
@@ -173,4 +204,5 @@ async def send_message(
         raise OpenAIServiceError(
             message=f"Network error: {str(e)}",
             status_code=None,
+            timings=trace.phases(),
         ) from e
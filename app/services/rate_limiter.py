@@ -0,0 +1,315 @@
+"""Per-API-Key Token Bucket Rate Limiting.
+
+Tasks sharing an API key share one provider quota. Each key (identified
+by its non-reversible fingerprint) gets a token bucket, and executions
+wait for a token instead of firing blindly into 429 responses. A key's
+rate is the smallest rate_limit_per_minute among the enabled tasks using
+it, falling back to the global default, and is refreshed when a task is
+registered rather than on every fire. Buckets also learn from provider rate-limit headers: an exhausted
+x-ratelimit-remaining or a Retry-After blocks the key until the
+advertised reset time.
+"""
+
+import asyncio
+import re
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Mapping
+
+from loguru import logger
+
+from app.config import get_settings
+
+
+class RateLimitWaitTooLong(Exception):
+    """Raised when the wait for a token exceeds the configured maximum."""
+
+    def __init__(self, wait_seconds: float):
+        self.wait_seconds = wait_seconds
+        super().__init__(f"Rate limited: next token available in {wait_seconds:.1f}s")
+
+
+@dataclass
+class RateLimitHeaders:
+    """Rate-limit hints parsed from a provider response."""
+
+    remaining: int | None = None  # Requests left in the current window
+    reset_seconds: float | None = None  # Seconds until the window resets
+    retry_after: float | None = None  # Seconds the provider asked us to wait
+
+
+# Header names checked in order (OpenAI-style request limits first)
+REMAINING_HEADERS = ("x-ratelimit-remaining-requests", "x-ratelimit-remaining")
+RESET_HEADERS = ("x-ratelimit-reset-requests", "x-ratelimit-reset")
+
+# Duration strings like "1s", "6m0s", "20ms", "1h2m3.5s"
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+
+
+def _parse_seconds(value: str) -> float | None:
+    """Parse a reset/retry value as seconds from now.
+
+    Accepts plain seconds, Go-style durations ("6m0s"), Unix epoch
+    timestamps and HTTP dates.
+    """
+    value = value.strip()
+    try:
+        number = float(value)
+    except ValueError:
+        parts = _DURATION_PART.findall(value)
+        if parts and "".join(n + u for n, u in parts) == value:
+            return sum(float(n) * _DURATION_UNITS[u] for n, u in parts)
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    if number > 1_000_000_000:  # Epoch timestamp
+        return max(0.0, number - time.time())
+    return max(0.0, number)
+
+
+def parse_rate_limit_headers(headers: Mapping[str, str]) -> RateLimitHeaders | None:
+    """Extract rate-limit hints from response headers.
+
+    Args:
+        headers: Response headers (case-insensitive mapping).
+
+    Returns:
+        RateLimitHeaders, or None when the response carries no hints.
+    """
+    remaining = reset_seconds = retry_after = None
+
+    for name in REMAINING_HEADERS:
+        if name in headers:
+            try:
+                remaining = int(float(headers[name]))
+            except ValueError:
+                pass
+            break
+    for name in RESET_HEADERS:
+        if name in headers:
+            reset_seconds = _parse_seconds(headers[name])
+            break
+    if "retry-after" in headers:
+        retry_after = _parse_seconds(headers["retry-after"])
+
+    if remaining is None and reset_seconds is None and retry_after is None:
+        return None
+    return RateLimitHeaders(remaining, reset_seconds, retry_after)
+
+
+class TokenBucket:
+    """Token bucket allowing rate_per_minute fires with a burst of capacity.
+
+    Tokens may go negative: each acquire reserves a token immediately and
+    sleeps for its share of the deficit, so concurrent waiters are served
+    in order without polling. A bucket without a configured rate only
+    enforces provider-advertised blocks.
+    """
+
+    def __init__(self, rate_per_minute: int | None, capacity: int | None = None):
+        self.rate_per_minute = rate_per_minute
+        self.capacity = capacity or rate_per_minute or 0
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+
+        # Statistics
+        self.waits = 0
+        self.total_wait_seconds = 0.0
+
+    def configure(self, rate_per_minute: int | None, capacity: int | None = None) -> None:
+        """Update the configured rate, keeping accumulated tokens."""
+        if rate_per_minute == self.rate_per_minute:
+            return
+        self._refill(time.monotonic())
+        self.rate_per_minute = rate_per_minute
+        self.capacity = capacity or rate_per_minute or 0
+        self.tokens = min(self.tokens, float(self.capacity))
+
+    def _refill(self, now: float) -> None:
+        """Add tokens accrued since the last update."""
+        if self.rate_per_minute:
+            elapsed = now - self.updated_at
+            self.tokens = min(
+                float(self.capacity), self.tokens + elapsed * self.rate_per_minute / 60.0
+            )
+        self.updated_at = now
+
+    def reserve(self) -> float:
+        """Reserve one token.
+
+        Returns:
+            Seconds the caller must wait before using the token.
+        """
+        now = time.monotonic()
+        self._refill(now)
+
+        wait = max(0.0, self.blocked_until - now)
+        if self.rate_per_minute:
+            self.tokens -= 1
+            if self.tokens < 0:
+                wait = max(wait, -self.tokens * 60.0 / self.rate_per_minute)
+        return wait
+
+    def observe(self, headers: RateLimitHeaders | None) -> None:
+        """Adjust the bucket from provider rate-limit headers."""
+        if headers is None:
+            return
+        now = time.monotonic()
+        self._refill(now)
+
+        if headers.retry_after is not None:
+            self.blocked_until = max(self.blocked_until, now + headers.retry_after)
+
+        if headers.remaining is not None:
+            if headers.remaining <= 0 and headers.reset_seconds is not None:
+                self.blocked_until = max(self.blocked_until, now + headers.reset_seconds)
+            if self.rate_per_minute:
+                self.tokens = min(self.tokens, float(headers.remaining))
+
+
+class RateLimiter:
+    """Token buckets keyed by API key fingerprint."""
+
+    def __init__(self):
+        settings = get_settings()
+        self.default_per_minute = settings.rate_limit_default_per_minute or None
+        self.burst = settings.rate_limit_burst or None
+        self.max_wait_seconds = settings.rate_limit_max_wait_seconds
+        self.buckets: dict[str, TokenBucket] = {}
+        self._task_limits: dict[str, dict[int, int | None]] = {}  # key -> task -> limit
+        self._task_keys: dict[int, str] = {}
+
+    def key_rate(self, key_id: str) -> int | None:
+        """Get a key's rate: the smallest limit of its tasks, else the default."""
+        limits = [rate for rate in self._task_limits.get(key_id, {}).values() if rate]
+        return min(limits) if limits else self.default_per_minute
+
+    def set_task_limit(self, key_id: str, task_id: int, rate_per_minute: int | None) -> None:
+        """Record the limit of an enabled task and refresh its key's rate.
+
+        Args:
+            key_id: API key fingerprint of the task.
+            task_id: Task ID.
+            rate_per_minute: Per-task limit, None for no limit of its own.
+        """
+        self.remove_task(task_id)
+        self._task_limits.setdefault(key_id, {})[task_id] = rate_per_minute
+        self._task_keys[task_id] = key_id
+        self._refresh(key_id)
+
+    def remove_task(self, task_id: int) -> None:
+        """Forget a disabled or deleted task's limit."""
+        key_id = self._task_keys.pop(task_id, None)
+        if key_id is None:
+            return
+        limits = self._task_limits[key_id]
+        limits.pop(task_id, None)
+        if not limits:
+            del self._task_limits[key_id]
+        self._refresh(key_id)
+
+    def _refresh(self, key_id: str) -> None:
+        """Apply a changed key rate to an existing bucket."""
+        bucket = self.buckets.get(key_id)
+        rate = self.key_rate(key_id)
+        # A rated bucket is never relaxed to unlimited: it keeps its last rate
+        if bucket is not None and rate is not None:
+            bucket.configure(rate, self.burst)
+
+    def bucket(self, key_id: str, rate_per_minute: int | None = None) -> TokenBucket:
+        """Get the bucket for a key, creating it on first use.
+
+        Args:
+            key_id: API key fingerprint.
+            rate_per_minute: Rate of a new bucket whose key has no
+                registered tasks; the global default is used when None.
+                An existing bucket keeps its rate.
+        """
+        bucket = self.buckets.get(key_id)
+        if bucket is None:
+            if key_id in self._task_limits:
+                rate = self.key_rate(key_id)
+            else:
+                rate = rate_per_minute or self.default_per_minute
+            bucket = TokenBucket(rate, self.burst)
+            self.buckets[key_id] = bucket
+        return bucket
+
+    async def acquire(self, key_id: str, rate_per_minute: int | None = None) -> float:
+        """Wait until a token for the key is available.
+
+        Args:
+            key_id: API key fingerprint.
+            rate_per_minute: Rate of the bucket if the key has none yet
+                (see bucket()).
+
+        Returns:
+            Seconds spent waiting.
+
+        Raises:
+            RateLimitWaitTooLong: If the wait would exceed rate_limit_max_wait_seconds.
+        """
+        bucket = self.bucket(key_id, rate_per_minute)
+        wait = bucket.reserve()
+        if wait <= 0:
+            return 0.0
+
+        if wait > self.max_wait_seconds:
+            # Give the reservation back, this fire will not use it
+            if bucket.rate_per_minute:
+                bucket.tokens += 1
+            raise RateLimitWaitTooLong(wait)
+
+        bucket.waits += 1
+        bucket.total_wait_seconds += wait
+        logger.debug(f"Rate limit: waiting {wait:.2f}s for key {key_id[:12]}")
+        await asyncio.sleep(wait)
+        return wait
+
+    def observe(self, key_id: str, headers: RateLimitHeaders | None) -> None:
+        """Feed provider rate-limit headers back into the key's bucket."""
+        if headers is None:
+            return
+        bucket = self.buckets.get(key_id) or self.bucket(key_id)
+        bucket.observe(headers)
+
+    def stats(self) -> list[dict]:
+        """Get per-key bucket state for monitoring."""
+        now = time.monotonic()
+        return [
+            {
+                "key": key_id[:12],
+                "rate_per_minute": bucket.rate_per_minute,
+                "tokens": round(bucket.tokens, 2),
+                "blocked_for": round(max(0.0, bucket.blocked_until - now), 2),
+                "waits": bucket.waits,
+                "total_wait_seconds": round(bucket.total_wait_seconds, 2),
+            }
+            for key_id, bucket in self.buckets.items()
+        ]
+
+
+# Lazy-loaded limiter singleton
+_limiter: RateLimiter | None = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get the rate limiter singleton, creating it on first access."""
+    global _limiter
+    if _limiter is None:
+        _limiter = RateLimiter()
+    return _limiter
+
+
+def reset_rate_limiter() -> None:
+    """Reset the rate limiter singleton.
+
+    Used by tests to reset state between test runs.
+    """
+    global _limiter
+    _limiter = None
@@ -0,0 +1,310 @@
+"""Execution Log Retention.
+
+Purges execution logs older than a retention age or beyond a per-task
+row cap. Rows are deleted in small batches, each in its own short
+transaction with a pause in between, so the log writer and the web UI
+are never locked out for long. Purged rows can be written to the
+compressed log archive first, and on SQLite freed pages are returned to
+the filesystem with incremental vacuum.
+
+The daily stats rollup is left untouched, so dashboard and per-task
+totals keep counting purged executions.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from loguru import logger
+from sqlalchemy import and_, delete, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.database import get_logs_engine, get_session_maker
+from app.models import ExecutionLog, Task
+from app.services.cluster import owns_task
+from app.services.log_archive import LogArchive, get_log_archive
+
+# Pages released per PRAGMA incremental_vacuum step
+VACUUM_PAGES_PER_STEP = 1000
+
+# PRAGMA auto_vacuum value of INCREMENTAL mode
+_AUTO_VACUUM_INCREMENTAL = 2
+
+# Columns copied into the archive
+_LOG_COLUMNS = tuple(ExecutionLog.__table__.columns.keys())
+
+
+@dataclass
+class RetentionReport:
+    """Outcome of one retention run."""
+
+    purged: int = 0
+    archived: int = 0
+    tasks: int = 0  # Tasks with at least one purged row
+    batch_ms: list[float] = field(default_factory=list)
+    vacuumed_pages: int = 0
+    elapsed_ms: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Summarize for logging and monitoring."""
+        return {
+            "purged": self.purged,
+            "archived": self.archived,
+            "tasks": self.tasks,
+            "batches": len(self.batch_ms),
+            "max_batch_ms": round(max(self.batch_ms, default=0.0), 2),
+            "vacuumed_pages": self.vacuumed_pages,
+            "elapsed_ms": round(self.elapsed_ms, 2),
+        }
+
+
+def _resolve(task_value: int | None, default: int) -> int:
+    """Apply a per-task override, None meaning the global default."""
+    return default if task_value is None else task_value
+
+
+class LogRetention:
+    """Batched purge of expired execution logs.
+
+    Each task's policy is its own log_retention_days and
+    log_retention_max_rows, falling back to the global defaults;
+    a value of 0 disables that limit.
+    """
+
+    def __init__(
+        self,
+        retention_days: int,
+        max_rows: int,
+        batch_size: int,
+        batch_pause: float,
+        archive: LogArchive | None = None,
+    ):
+        self.retention_days = retention_days
+        self.max_rows = max_rows
+        self.batch_size = batch_size
+        self.batch_pause = batch_pause
+        self.archive = archive
+
+        self._lock = asyncio.Lock()
+
+        # Statistics
+        self.total_runs = 0
+        self.total_purged = 0
+        self.last_report: RetentionReport | None = None
+
+    async def run(self) -> RetentionReport:
+        """Purge expired logs of every task this node owns.
+
+        Returns:
+            Report of rows purged and time spent per batch.
+        """
+        async with self._lock:
+            start_time = time.perf_counter()
+            report = RetentionReport()
+            if self.archive is not None:
+                self.archive.new_run()
+
+            session_maker = get_session_maker()
+            async with session_maker() as session:
+                result = await session.execute(
+                    select(Task.id, Task.log_retention_days, Task.log_retention_max_rows)
+                    .order_by(Task.id)
+                )
+                policies = [
+                    (
+                        row.id,
+                        _resolve(row.log_retention_days, self.retention_days),
+                        _resolve(row.log_retention_max_rows, self.max_rows),
+                    )
+                    for row in result.all()
+                    if owns_task(row.id)
+                ]
+
+            for task_id, days, max_rows in policies:
+                if days <= 0 and max_rows <= 0:
+                    continue
+                purged = await self._purge_task(task_id, days, max_rows, report)
+                if purged:
+                    report.tasks += 1
+
+            if report.purged:
+                report.vacuumed_pages = await self._incremental_vacuum()
+
+            report.elapsed_ms = (time.perf_counter() - start_time) * 1000
+            self.total_runs += 1
+            self.total_purged += report.purged
+            self.last_report = report
+
+            if report.purged:
+                logger.info(f"Log retention finished: {report.as_dict()}")
+            return report
+
+    def stats(self) -> dict[str, Any]:
+        """Get retention statistics for monitoring."""
+        return {
+            "retention_days": self.retention_days,
+            "max_rows": self.max_rows,
+            "total_runs": self.total_runs,
+            "total_purged": self.total_purged,
+            "last_run": self.last_report.as_dict() if self.last_report else None,
+        }
+
+    async def _expired_criteria(
+        self,
+        session: AsyncSession,
+        task_id: int,
+        days: int,
+        max_rows: int,
+    ) -> list:
+        """Build the OR-ed criteria selecting a task's purgeable rows."""
+        criteria = []
+        if days > 0:
+            cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=days)
+            criteria.append(ExecutionLog.executed_at < cutoff)
+        if max_rows > 0:
+            # Oldest row to keep; one walk of the (task_id, executed_at) index
+            boundary = (await session.execute(
+                select(ExecutionLog.executed_at, ExecutionLog.id)
+                .where(ExecutionLog.task_id == task_id)
+                .order_by(ExecutionLog.executed_at.desc(), ExecutionLog.id.desc())
+                .offset(max_rows - 1)
+                .limit(1)
+            )).first()
+            if boundary is not None:
+                criteria.append(or_(
+                    ExecutionLog.executed_at < boundary.executed_at,
+                    and_(
+                        ExecutionLog.executed_at == boundary.executed_at,
+                        ExecutionLog.id < boundary.id,
+                    ),
+                ))
+        return criteria
+
+    async def _purge_task(
+        self,
+        task_id: int,
+        days: int,
+        max_rows: int,
+        report: RetentionReport,
+    ) -> int:
+        """Delete a task's expired logs batch by batch, oldest first."""
+        session_maker = get_session_maker()
+        async with session_maker() as session:
+            criteria = await self._expired_criteria(session, task_id, days, max_rows)
+        if not criteria:
+            return 0
+
+        purged = 0
+        while True:
+            batch_start = time.perf_counter()
+            async with session_maker() as session:
+                query = (
+                    select(ExecutionLog)
+                    .where(ExecutionLog.task_id == task_id, or_(*criteria))
+                    .order_by(ExecutionLog.executed_at, ExecutionLog.id)
+                    .limit(self.batch_size)
+                )
+                if self.archive is None:
+                    query = query.with_only_columns(ExecutionLog.id)
+                    ids = list((await session.execute(query)).scalars().all())
+                else:
+                    logs = (await session.execute(query)).scalars().all()
+                    ids = [log.id for log in logs]
+                    rows = [
+                        {column: getattr(log, column) for column in _LOG_COLUMNS}
+                        for log in logs
+                    ]
+                    # Archive before deleting: a crash in between duplicates rows, never loses them
+                    report.archived += await asyncio.to_thread(self.archive.append, rows)
+
+                if not ids:
+                    break
+                await session.execute(delete(ExecutionLog).where(ExecutionLog.id.in_(ids)))
+                await session.commit()
+
+            elapsed_ms = (time.perf_counter() - batch_start) * 1000
+            purged += len(ids)
+            report.purged += len(ids)
+            report.batch_ms.append(elapsed_ms)
+            logger.debug(
+                f"Purged {len(ids)} execution logs of task {task_id} in {elapsed_ms:.1f}ms"
+            )
+
+            if len(ids) < self.batch_size:
+                break
+            # Let queued log writes through between batches
+            await asyncio.sleep(self.batch_pause)
+
+        return purged
+
+    async def _incremental_vacuum(self) -> int:
+        """Release free pages to the filesystem, a step at a time.
+
+        Runs on the database holding the logs. Only effective on SQLite
+        databases in auto_vacuum=INCREMENTAL mode; see
+        scripts/enable_incremental_vacuum.py.
+
+        Returns:
+            Number of pages released.
+        """
+        engine = get_logs_engine()
+        if engine.dialect.name != "sqlite":
+            return 0
+
+        released = 0
+        async with engine.connect() as conn:
+            mode = await conn.scalar(text("PRAGMA auto_vacuum"))
+            if mode != _AUTO_VACUUM_INCREMENTAL:
+                logger.debug("SQLite auto_vacuum is not INCREMENTAL, skipping vacuum")
+                return 0
+
+            free_pages = await conn.scalar(text("PRAGMA freelist_count"))
+            while free_pages:
+                await conn.execute(text(f"PRAGMA incremental_vacuum({VACUUM_PAGES_PER_STEP})"))
+                await conn.commit()
+                remaining = await conn.scalar(text("PRAGMA freelist_count"))
+                if remaining >= free_pages:
+                    break
+                released += free_pages - remaining
+                free_pages = remaining
+                await asyncio.sleep(self.batch_pause)
+        return released
+
+
+# Lazy-loaded retention singleton
+_retention: LogRetention | None = None
+
+
+def get_log_retention() -> LogRetention:
+    """Get the retention singleton, creating it from settings on first access."""
+    global _retention
+    if _retention is None:
+        settings = get_settings()
+        _retention = LogRetention(
+            retention_days=settings.log_retention_days,
+            max_rows=settings.log_retention_max_rows,
+            batch_size=settings.log_retention_batch_size,
+            batch_pause=settings.log_retention_batch_pause,
+            archive=get_log_archive(),
+        )
+    return _retention
+
+
+async def purge_expired_logs() -> None:
+    """Run one retention pass, as the periodic scheduler job."""
+    try:
+        await get_log_retention().run()
+    except Exception:
+        logger.exception("Log retention run failed")
+
+
+def reset_log_retention() -> None:
+    """Reset the retention singleton.
+
+    Used by tests to reset state between test runs.
+    """
+    global _retention
+    _retention = None
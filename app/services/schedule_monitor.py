@@ -0,0 +1,207 @@
+"""Scheduling Lag and Misfire Accounting.
+
+APScheduler runs task jobs with coalesce=True and a short misfire grace
+time, so fires can disappear without a trace: several due fire times
+are merged into one run (coalesced), a fire that starts too late is
+skipped (missed), and a fire arriving while max_instances runs are
+active is dropped. The monitor listens to the scheduler's job events to
+count each of these per task. Jobs run on ScheduledTimeExecutor, which
+hands each run its own scheduled fire time through a context variable;
+execute_task records it next to the actual start so the lag between
+them can be measured.
+
+Counts are per process since startup; lag is also persisted with each
+execution log and rolled up as the "lag" latency metric.
+"""
+
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+from typing import Any
+
+from apscheduler.events import (
+    EVENT_JOB_MAX_INSTANCES,
+    EVENT_JOB_MISSED,
+    EVENT_JOB_REMOVED,
+    EVENT_JOB_SUBMITTED,
+)
+from apscheduler.executors.asyncio import AsyncIOExecutor
+from loguru import logger
+
+from app.services.latency import LatencyHistogram
+
+# Job IDs of task jobs, see register_task()
+TASK_JOB_PREFIX = "task_"
+
+# Upper bound on fire times walked when counting coalesced fires
+MAX_COALESCED_WALK = 10000
+
+_MISFIRE_KEYS = ("missed", "coalesced", "max_instances")
+
+# (job ID, scheduled fire time) of the job run the current task belongs to
+_scheduled_run: ContextVar[tuple[str, datetime] | None] = ContextVar(
+    "scheduled_run", default=None
+)
+
+
+def _task_id(job_id: str) -> int | None:
+    """Get the task ID of a task job, None for internal jobs."""
+    if not job_id.startswith(TASK_JOB_PREFIX):
+        return None
+    try:
+        return int(job_id[len(TASK_JOB_PREFIX):])
+    except ValueError:
+        return None
+
+
+class ScheduledTimeExecutor(AsyncIOExecutor):
+    """AsyncIOExecutor that tells each job run its own scheduled fire time.
+
+    The run's asyncio task copies the context when it is created, so the
+    fire time set around the submission stays with that run however
+    submissions and starts interleave. With coalesce=True the latest due
+    fire time is the one the run stands for.
+    """
+
+    def _do_submit_job(self, job, run_times):
+        token = _scheduled_run.set((job.id, run_times[-1]))
+        try:
+            super()._do_submit_job(job, run_times)
+        finally:
+            _scheduled_run.reset(token)
+
+
+class ScheduleMonitor:
+    """Counts dropped fires and measures the lag of executed ones."""
+
+    def __init__(self):
+        self._scheduler = None
+        self._last_run_time: dict[str, datetime] = {}
+        self._by_task: dict[int, dict[str, int]] = {}
+
+        # Statistics
+        self.total_fires = 0
+        self.total_missed = 0
+        self.total_coalesced = 0
+        self.total_max_instances = 0
+        self.lag = LatencyHistogram()
+        self.total_lag_ms = 0
+        self.max_lag_ms = 0
+
+    def attach(self, scheduler) -> None:
+        """Start listening to a scheduler's job events."""
+        if self._scheduler is scheduler:
+            return
+        scheduler.add_listener(
+            self._on_event,
+            EVENT_JOB_SUBMITTED | EVENT_JOB_MISSED | EVENT_JOB_MAX_INSTANCES | EVENT_JOB_REMOVED,
+        )
+        self._scheduler = scheduler
+
+    def scheduled_time(self, task_id: int) -> datetime | None:
+        """Get the scheduled fire time of the run executing the task.
+
+        Args:
+            task_id: Task whose execution is starting.
+
+        Returns:
+            Timezone-aware fire time, or None if the execution was not
+            started by the scheduler (e.g. an immediate run).
+        """
+        scheduled = _scheduled_run.get()
+        if scheduled is None or scheduled[0] != f"{TASK_JOB_PREFIX}{task_id}":
+            return None
+        return scheduled[1]
+
+    def record_lag(self, lag_ms: int) -> None:
+        """Record how late an execution started, in milliseconds."""
+        self.lag.add(lag_ms)
+        self.total_lag_ms += lag_ms
+        self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+
+    def task_stats(self, task_id: int) -> dict[str, int]:
+        """Get a task's dropped fire counts since startup."""
+        return dict(self._by_task.get(task_id, dict.fromkeys(_MISFIRE_KEYS, 0)))
+
+    def stats(self) -> dict[str, Any]:
+        """Get scheduling statistics for monitoring."""
+        return {
+            "fires": self.total_fires,
+            "missed": self.total_missed,
+            "coalesced": self.total_coalesced,
+            "max_instances": self.total_max_instances,
+            "lag": self.lag.summary(),
+            "total_lag_ms": self.total_lag_ms,
+            "max_lag_ms": self.max_lag_ms,
+        }
+
+    def _count(self, task_id: int, key: str, count: int = 1) -> None:
+        counts = self._by_task.setdefault(task_id, dict.fromkeys(_MISFIRE_KEYS, 0))
+        counts[key] += count
+        setattr(self, f"total_{key}", getattr(self, f"total_{key}") + count)
+
+    def _on_event(self, event) -> None:
+        """Handle one APScheduler job event."""
+        task_id = _task_id(event.job_id)
+        if task_id is None:
+            return
+
+        if event.code == EVENT_JOB_REMOVED:
+            # Rescheduled or deleted: the next fire starts a new series
+            self._last_run_time.pop(event.job_id, None)
+        elif event.code == EVENT_JOB_SUBMITTED:
+            run_times = event.scheduled_run_times
+            coalesced = self._skipped_fire_times(event.job_id, run_times[0])
+            if coalesced:
+                self._count(task_id, "coalesced", coalesced)
+                logger.warning(f"Task {task_id}: {coalesced} due fires coalesced into one run")
+            self._last_run_time[event.job_id] = run_times[-1]
+            self.total_fires += len(run_times)
+        elif event.code == EVENT_JOB_MAX_INSTANCES:
+            run_times = event.scheduled_run_times
+            self._count(task_id, "max_instances", len(run_times))
+            self._last_run_time[event.job_id] = run_times[-1]
+        elif event.code == EVENT_JOB_MISSED:
+            self._count(task_id, "missed")
+
+    def _skipped_fire_times(self, job_id: str, run_time: datetime) -> int:
+        """Count the trigger's fire times between the last submission and run_time.
+
+        With coalesce=True APScheduler submits only the latest due fire
+        time; the ones before it are skipped without an event.
+        """
+        previous = self._last_run_time.get(job_id)
+        job = self._scheduler.get_job(job_id) if self._scheduler is not None else None
+        if previous is None or job is None:
+            return 0
+
+        skipped = 0
+        fire_time = previous
+        for _ in range(MAX_COALESCED_WALK):
+            fire_time = job.trigger.get_next_fire_time(
+                fire_time, fire_time + timedelta(microseconds=1)
+            )
+            if fire_time is None or fire_time >= run_time:
+                break
+            skipped += 1
+        return skipped
+
+
+# Lazy-loaded monitor singleton
+_monitor: ScheduleMonitor | None = None
+
+
+def get_schedule_monitor() -> ScheduleMonitor:
+    """Get the monitor singleton, creating it on first access."""
+    global _monitor
+    if _monitor is None:
+        _monitor = ScheduleMonitor()
+    return _monitor
+
+
+def reset_schedule_monitor() -> None:
+    """Reset the monitor singleton.
+
+    Used by tests to reset state between test runs.
+    """
+    global _monitor
+    _monitor = None
@@ -0,0 +1,290 @@
+"""Daily Execution Statistics Rollup.
+
+Maintains execution_stats_daily, one row per task and day with success
+and failure counts and latency aggregates, so dashboard and per-task
+statistics read a handful of rows instead of scanning execution_logs.
+Alongside it, execution_latency_daily keeps a latency histogram per
+task, day and metric, from which percentiles over any window are read.
+Rows are upserted by the log writer in the same transaction as the log
+insert; rebuild_daily_stats() recomputes them from the raw logs.
+
+Days are calendar days in China time (UTC+8), matching the web UI.
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from typing import Any
+
+from loguru import logger
+from sqlalchemy import case, delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import ExecutionLatencyDaily, ExecutionLog, ExecutionStatsDaily
+from app.services.latency import (
+    LATENCY_METRICS,
+    LatencyHistogram,
+    histogram_rows,
+    schedule_lag_ms,
+)
+
+# China timezone UTC+8, the day boundary of all statistics
+CHINA_TZ: timezone = timezone(timedelta(hours=8))
+
+# Log rows fetched per round trip while rebuilding
+REBUILD_CHUNK_SIZE = 10000
+
+
+def stats_day(executed_at: datetime) -> date:
+    """Get the statistics day of an execution time.
+
+    Args:
+        executed_at: Execution time, naive values are taken as UTC.
+
+    Returns:
+        Calendar day in China time.
+    """
+    if executed_at.tzinfo is None:
+        executed_at = executed_at.replace(tzinfo=timezone.utc)
+    return executed_at.astimezone(CHINA_TZ).date()
+
+
+def today() -> date:
+    """Get the current statistics day."""
+    return datetime.now(CHINA_TZ).date()
+
+
+def summarize_daily(batch: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Aggregate execution log records into per task and day increments.
+
+    Args:
+        batch: Execution log values with task_id, executed_at, status
+            and optionally latency_ms.
+
+    Returns:
+        One dict of execution_stats_daily column values per task and day.
+    """
+    rows: dict[tuple[int, date], dict[str, Any]] = {}
+    for values in batch:
+        day = stats_day(values["executed_at"])
+        row = rows.setdefault((values["task_id"], day), {
+            "task_id": values["task_id"],
+            "day": day,
+            "success": 0,
+            "failed": 0,
+            "latency_sum": 0,
+            "latency_max": 0,
+        })
+        if values["status"] == "success":
+            row["success"] += 1
+        else:
+            row["failed"] += 1
+
+        latency_ms = values.get("latency_ms")
+        if latency_ms is not None:
+            row["latency_sum"] += latency_ms
+            row["latency_max"] = max(row["latency_max"], latency_ms)
+    return list(rows.values())
+
+
+def _dialect_insert(dialect_name: str, table):
+    """Build the dialect's INSERT supporting ON CONFLICT."""
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    return dialect_insert(table)
+
+
+def _upsert_statement(dialect_name: str):
+    """Build an INSERT that adds to an existing (task_id, day) row."""
+    table = ExecutionStatsDaily.__table__
+    stmt = _dialect_insert(dialect_name, table)
+    excluded = stmt.excluded
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c.task_id, table.c.day],
+        set_={
+            "success": table.c.success + excluded.success,
+            "failed": table.c.failed + excluded.failed,
+            "latency_sum": table.c.latency_sum + excluded.latency_sum,
+            "latency_max": case(
+                (excluded.latency_max > table.c.latency_max, excluded.latency_max),
+                else_=table.c.latency_max,
+            ),
+        },
+    )
+
+
+def _histogram_upsert_statement(dialect_name: str):
+    """Build an INSERT that adds to an existing histogram bucket row."""
+    table = ExecutionLatencyDaily.__table__
+    stmt = _dialect_insert(dialect_name, table)
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c.task_id, table.c.day, table.c.metric, table.c.bucket],
+        set_={"count": table.c.count + stmt.excluded.count},
+    )
+
+
+async def upsert_daily_stats(session: AsyncSession, batch: list[dict[str, Any]]) -> None:
+    """Add a batch of execution log records to the daily rollup and histograms.
+
+    Runs inside the caller's transaction; the caller commits.
+
+    Args:
+        session: Database session.
+        batch: Execution log values, as submitted to the log writer.
+    """
+    rows = summarize_daily(batch)
+    if not rows:
+        return
+    dialect_name = session.get_bind(ExecutionStatsDaily).dialect.name
+    await session.execute(_upsert_statement(dialect_name), rows)
+
+    buckets = histogram_rows(batch, stats_day)
+    if buckets:
+        await session.execute(_histogram_upsert_statement(dialect_name), buckets)
+
+
+async def get_day_totals(
+    session: AsyncSession,
+    since: date,
+    task_id: int | None = None,
+) -> tuple[int, int]:
+    """Get success and failed counts from a day onwards.
+
+    Args:
+        session: Database session.
+        since: First day included.
+        task_id: Limit to one task, all tasks if None.
+
+    Returns:
+        Tuple of (success, failed).
+    """
+    query = select(
+        func.coalesce(func.sum(ExecutionStatsDaily.success), 0),
+        func.coalesce(func.sum(ExecutionStatsDaily.failed), 0),
+    ).where(ExecutionStatsDaily.day >= since)
+    if task_id is not None:
+        query = query.where(ExecutionStatsDaily.task_id == task_id)
+
+    success, failed = (await session.execute(query)).one()
+    return int(success), int(failed)
+
+
+async def get_task_totals(session: AsyncSession, task_id: int) -> tuple[int, int]:
+    """Get all-time success and failed counts of a task.
+
+    Args:
+        session: Database session.
+        task_id: Task ID.
+
+    Returns:
+        Tuple of (success, failed).
+    """
+    return await get_day_totals(session, date.min, task_id=task_id)
+
+
+async def get_latency_histograms(
+    session: AsyncSession,
+    task_ids: list[int],
+    since: date,
+) -> dict[str, LatencyHistogram]:
+    """Merge the latency histograms of tasks from a day onwards.
+
+    Args:
+        session: Database session.
+        task_ids: Tasks whose histograms are merged.
+        since: First day included.
+
+    Returns:
+        One histogram per metric in LATENCY_METRICS, empty if no data.
+    """
+    histograms = {metric: LatencyHistogram() for metric in LATENCY_METRICS}
+    if not task_ids:
+        return histograms
+
+    result = await session.execute(
+        select(
+            ExecutionLatencyDaily.metric,
+            ExecutionLatencyDaily.bucket,
+            func.sum(ExecutionLatencyDaily.count),
+        )
+        .where(
+            ExecutionLatencyDaily.task_id.in_(task_ids),
+            ExecutionLatencyDaily.day >= since,
+        )
+        .group_by(ExecutionLatencyDaily.metric, ExecutionLatencyDaily.bucket)
+    )
+    for metric, bucket, count in result.all():
+        if metric in histograms:
+            histograms[metric].counts[bucket] = int(count)
+    return histograms
+
+
+async def rebuild_daily_stats(session: AsyncSession) -> int:
+    """Recompute the whole rollup and latency histograms from execution_logs.
+
+    Streams the logs in chunks and replaces every rollup row in one
+    transaction. Logs written while the rebuild runs may be missed, so
+    run it with the application stopped.
+
+    Args:
+        session: Database session.
+
+    Returns:
+        Number of rollup rows written.
+    """
+    batch: list[dict[str, Any]] = []
+    totals: dict[tuple[int, date], dict[str, Any]] = {}
+    buckets: dict[tuple, dict[str, Any]] = {}
+
+    def merge(chunk: list[dict[str, Any]]) -> None:
+        for row in histogram_rows(chunk, stats_day):
+            key = (row["task_id"], row["day"], row["metric"], row["bucket"])
+            if key in buckets:
+                buckets[key]["count"] += row["count"]
+            else:
+                buckets[key] = row
+        for row in summarize_daily(chunk):
+            key = (row["task_id"], row["day"])
+            total = totals.get(key)
+            if total is None:
+                totals[key] = row
+                continue
+            total["success"] += row["success"]
+            total["failed"] += row["failed"]
+            total["latency_sum"] += row["latency_sum"]
+            total["latency_max"] = max(total["latency_max"], row["latency_max"])
+
+    result = await session.stream(
+        select(
+            ExecutionLog.task_id,
+            ExecutionLog.executed_at,
+            ExecutionLog.status,
+            ExecutionLog.latency_ms,
+            ExecutionLog.connect_ms,
+            ExecutionLog.ttfb_ms,
+            ExecutionLog.scheduled_at,
+        )
+        .execution_options(yield_per=REBUILD_CHUNK_SIZE)
+    )
+    async for row in result:
+        values = row._asdict()
+        if values["scheduled_at"] is not None:
+            values["lag_ms"] = schedule_lag_ms(values["scheduled_at"], values["executed_at"])
+        batch.append(values)
+        if len(batch) >= REBUILD_CHUNK_SIZE:
+            merge(batch)
+            batch = []
+    merge(batch)
+
+    await session.execute(delete(ExecutionStatsDaily))
+    await session.execute(delete(ExecutionLatencyDaily))
+    if totals:
+        await session.execute(insert(ExecutionStatsDaily), list(totals.values()))
+    if buckets:
+        await session.execute(insert(ExecutionLatencyDaily), list(buckets.values()))
+    await session.commit()
+
+    logger.info(
+        f"Rebuilt daily execution stats: {len(totals)} rows, {len(buckets)} histogram buckets"
+    )
+    return len(totals)
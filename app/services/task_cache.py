@@ -0,0 +1,122 @@
+"""In-Memory Task Snapshot Cache.
+
+Holds compact, detached snapshots of runnable tasks so the scheduler
+hot path can execute a fire without reading the Task row from the
+database. Snapshots are loaded when tasks are registered with the
+scheduler and replaced whenever a task is created, updated or deleted.
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from app.models import Task
+
+
+class TaskSnapshot:
+    """Immutable view of the Task fields needed to execute a fire."""
+
+    __slots__ = (
+        "id",
+        "name",
+        "api_endpoint",
+        "api_key",
+        "api_key_fingerprint",
+        "rate_limit_per_minute",
+        "model",
+        "message_content",
+        "enabled",
+        "updated_at",
+    )
+
+    def __init__(
+        self,
+        id: int,
+        name: str,
+        api_endpoint: str,
+        api_key: str,
+        api_key_fingerprint: Optional[str],
+        rate_limit_per_minute: Optional[int],
+        model: str,
+        message_content: str,
+        enabled: bool,
+        updated_at: Optional[datetime],
+    ):
+        self.id = id
+        self.name = name
+        self.api_endpoint = api_endpoint
+        self.api_key = api_key  # Encrypted, as stored
+        self.api_key_fingerprint = api_key_fingerprint
+        self.rate_limit_per_minute = rate_limit_per_minute
+        self.model = model
+        self.message_content = message_content
+        self.enabled = enabled
+        self.updated_at = updated_at
+
+    @classmethod
+    def from_task(cls, task: Task) -> "TaskSnapshot":
+        """Build a snapshot from a Task model instance."""
+        return cls(
+            id=task.id,
+            name=task.name,
+            api_endpoint=task.api_endpoint,
+            api_key=task.api_key,
+            api_key_fingerprint=task.api_key_fingerprint,
+            rate_limit_per_minute=task.rate_limit_per_minute,
+            model=task.model,
+            message_content=task.message_content,
+            enabled=task.enabled,
+            updated_at=task.updated_at,
+        )
+
+    def __repr__(self) -> str:
+        return f"<TaskSnapshot(id={self.id}, name='{self.name}', enabled={self.enabled})>"
+
+
+# Snapshots of runnable (enabled) tasks keyed by task id
+_snapshots: dict[int, TaskSnapshot] = {}
+
+
+def get_snapshot(task_id: int) -> TaskSnapshot | None:
+    """Get the cached snapshot for a task.
+
+    Args:
+        task_id: Task ID.
+
+    Returns:
+        TaskSnapshot if the task is cached, None otherwise.
+    """
+    return _snapshots.get(task_id)
+
+
+def upsert_snapshot(task: Task) -> None:
+    """Cache a task, or evict it if it is no longer runnable.
+
+    Args:
+        task: The Task model instance to cache.
+    """
+    if task.enabled:
+        _snapshots[task.id] = TaskSnapshot.from_task(task)
+    else:
+        _snapshots.pop(task.id, None)
+
+
+def remove_snapshot(task_id: int) -> None:
+    """Evict a task from the cache.
+
+    Args:
+        task_id: Task ID.
+    """
+    _snapshots.pop(task_id, None)
+
+
+def get_cached_versions() -> dict[int, Optional[datetime]]:
+    """Get the updated_at of every cached task, used for reconciliation."""
+    return {task_id: snapshot.updated_at for task_id, snapshot in _snapshots.items()}
+
+
+def clear_snapshots() -> None:
+    """Remove all cached snapshots.
+
+    Used on scheduler shutdown and by tests to reset state.
+    """
+    _snapshots.clear()
@@ -8,7 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import Task
 from app.schemas import TaskCreate, TaskUpdate
-from app.utils.security import encrypt_api_key
+from app.utils.security import encrypt_api_key, fingerprint_api_key, invalidate_credential
 
 
 async def create_task(session: AsyncSession, task_data: TaskCreate) -> Task:
@@ -28,11 +28,16 @@ async def create_task(session: AsyncSession, task_data: TaskCreate) -> Task:
         name=task_data.name,
         api_endpoint=task_data.api_endpoint,
         api_key=encrypted_key,  # Store encrypted
+        api_key_fingerprint=fingerprint_api_key(task_data.api_key),
         schedule_type=task_data.schedule_type,
         interval_minutes=task_data.interval_minutes,
         fixed_time=task_data.fixed_time,
+        jitter_seconds=task_data.jitter_seconds,
         message_content=task_data.message_content,
         model=task_data.model,
+        rate_limit_per_minute=task_data.rate_limit_per_minute,
+        log_retention_days=task_data.log_retention_days,
+        log_retention_max_rows=task_data.log_retention_max_rows,
         enabled=task_data.enabled,
     )
     session.add(task)
@@ -88,7 +93,9 @@ async def update_task(
 
     # Encrypt API key if being updated
     if "api_key" in update_data and update_data["api_key"] is not None:
+        update_data["api_key_fingerprint"] = fingerprint_api_key(update_data["api_key"])
         update_data["api_key"] = encrypt_api_key(update_data["api_key"])
+        invalidate_credential(task.id)
 
     for field, value in update_data.items():
         setattr(task, field, value)
@@ -105,5 +112,6 @@ async def delete_task(session: AsyncSession, task: Task) -> None:
         session: Async database session.
         task: Task instance to delete.
     """
+    invalidate_credential(task.id)
     await session.delete(task)
     await session.commit()
@@ -4,7 +4,11 @@ Provides encryption/decryption for sensitive data storage
 and masking for safe display in logs and responses.
 """
 
+import hashlib
+import hmac
 import secrets
+import time
+from collections import OrderedDict
 
 from cryptography.fernet import Fernet
 
@@ -14,6 +18,26 @@ from app.config import get_settings
 _fernet: Fernet | None = None
 
 
+class CachedCredential:
+    """Decrypted API key with its ready-to-send Authorization header."""
+
+    __slots__ = ("api_key", "authorization", "masked_key", "key_id", "fingerprint", "expires_at")
+
+    def __init__(self, api_key: str, masked_key: str, fingerprint: str, expires_at: float):
+        self.api_key = api_key
+        self.authorization = f"Bearer {api_key}"
+        self.masked_key = masked_key
+        self.key_id = fingerprint_api_key(api_key)
+        self.fingerprint = fingerprint
+        self.expires_at = expires_at
+
+
+# Decrypted credentials keyed by task id (LRU order, oldest first)
+_credentials: OrderedDict[int, CachedCredential] = OrderedDict()
+_credential_hits = 0
+_credential_misses = 0
+
+
 def mask_api_key(key: str) -> str:
     """Mask API key for safe display in logs and responses.
 
@@ -71,6 +95,105 @@ def decrypt_api_key(encrypted_text: str) -> str:
     return get_fernet().decrypt(encrypted_text.encode()).decode()
 
 
+def fingerprint_api_key(plain_text: str) -> str:
+    """Get a non-reversible identifier for a plain text API key.
+
+    Uses an HMAC keyed with ENCRYPTION_KEY, so tasks sharing the same
+    key get the same identifier without the key being recoverable.
+
+    Args:
+        plain_text: The plain text API key.
+
+    Returns:
+        Hex digest identifying the key.
+
+    Raises:
+        ValueError: If ENCRYPTION_KEY is not configured. Without a secret
+            the digest could be recomputed to test guessed keys.
+    """
+    secret = get_settings().encryption_key
+    if not secret:
+        raise ValueError("ENCRYPTION_KEY not configured")
+    return hmac.new(secret.encode(), plain_text.encode(), hashlib.sha256).hexdigest()[:32]
+
+
+def _ciphertext_fingerprint(encrypted_text: str) -> str:
+    """Get a short fingerprint identifying a stored ciphertext."""
+    return hashlib.blake2b(encrypted_text.encode(), digest_size=8).hexdigest()
+
+
+def get_credential(task_id: int, encrypted_text: str) -> CachedCredential:
+    """Get the decrypted credential for a task, using the TTL cache.
+
+    Entries are keyed by task id and only reused while the stored
+    ciphertext fingerprint matches, so a changed key is never served
+    from a stale entry.
+
+    Args:
+        task_id: Task ID owning the key.
+        encrypted_text: The encrypted API key as stored.
+
+    Returns:
+        CachedCredential with the plain key and Authorization header.
+    """
+    global _credential_hits, _credential_misses
+
+    fingerprint = _ciphertext_fingerprint(encrypted_text)
+    now = time.monotonic()
+
+    entry = _credentials.get(task_id)
+    if entry is not None and entry.fingerprint == fingerprint and entry.expires_at > now:
+        _credentials.move_to_end(task_id)
+        _credential_hits += 1
+        return entry
+
+    _credential_misses += 1
+    settings = get_settings()
+    entry = CachedCredential(
+        api_key=decrypt_api_key(encrypted_text),
+        masked_key=mask_api_key(encrypted_text),
+        fingerprint=fingerprint,
+        expires_at=now + settings.credential_cache_ttl_seconds,
+    )
+    _credentials[task_id] = entry
+    _credentials.move_to_end(task_id)
+
+    # Evict least recently used entries beyond the size bound
+    while len(_credentials) > settings.credential_cache_max_size:
+        _credentials.popitem(last=False)
+
+    return entry
+
+
+def invalidate_credential(task_id: int) -> None:
+    """Drop the cached credential for a task.
+
+    Args:
+        task_id: Task ID whose key changed or was deleted.
+    """
+    _credentials.pop(task_id, None)
+
+
+def get_credential_cache_stats() -> dict[str, int]:
+    """Get credential cache size and hit/miss counters."""
+    return {
+        "size": len(_credentials),
+        "hits": _credential_hits,
+        "misses": _credential_misses,
+    }
+
+
+def clear_credential_cache() -> None:
+    """Remove all cached credentials and reset counters.
+
+    Used by tests to reset state between test runs.
+    """
+    global _credential_hits, _credential_misses
+    _credentials.clear()
+    _credential_hits = 0
+    _credential_misses = 0
+
+
 def verify_password(plain_password: str, stored_password: str) -> bool:
     """Verify password matches using timing-safe comparison.
 
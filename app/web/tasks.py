@@ -3,64 +3,54 @@
 Server-side rendered pages using Jinja2 templates.
 """
 
-import asyncio
-from datetime import datetime, timedelta, timezone
+from datetime import timedelta, timezone
 from typing import Optional
 
 from fastapi import APIRouter, Depends, Form, Request
 from fastapi.responses import RedirectResponse
 from fastapi.templating import Jinja2Templates
 from pydantic import ValidationError
-from sqlalchemy import select, desc, func, case
+from sqlalchemy import select, func, case
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from loguru import logger
 
-from app.database import get_session
+from app.database import get_read_session, get_session
 from app.models import Task, ExecutionLog
 from app.schemas import TaskCreate, TaskUpdate
-from app.services import task_service
-from app.scheduler import add_job, remove_job, reschedule_job
+from app.services import log_query, stats, task_service
+from app.services.latency import TIMING_PHASES
+from app.services.schedule_monitor import get_schedule_monitor
+from app.scheduler import add_job, get_fire_offset, remove_job, reschedule_job
 from app.web.auth import render_template, require_auth_web
 
 router = APIRouter(tags=["web"])
 
 # China timezone UTC+8
-CHINA_TZ: timezone = timezone(timedelta(hours=8))
+CHINA_TZ: timezone = stats.CHINA_TZ
+
+# Waterfall labels of the per-execution timing breakdown, in phase order
+TIMING_PHASE_LABELS = dict(zip(TIMING_PHASES, (
+    "加载任务", "解密密钥", "限流排队", "获取连接", "DNS/TCP", "TLS", "首字节", "读取响应", "解析", "写入日志",
+)))
 templates = Jinja2Templates(directory="templates")
 
 
 async def get_dashboard_stats(session: AsyncSession) -> dict:
     """Get dashboard statistics for the task list page."""
-    # Get today's start in China timezone, convert to UTC for database query
-    china_now = datetime.now(CHINA_TZ)
-    china_today_start = china_now.replace(hour=0, minute=0, second=0, microsecond=0)
-    today_start = china_today_start.astimezone(timezone.utc)
-
     # Query for task counts
     task_query = select(
         func.count(Task.id).label("total"),
         func.sum(case((Task.enabled == True, 1), else_=0)).label("enabled"),
     )
 
-    # Query for today's execution stats
-    exec_query = select(
-        func.count(ExecutionLog.id).label("count"),
-        func.sum(case((ExecutionLog.status == "success", 1), else_=0)).label("success"),
-    ).where(ExecutionLog.executed_at >= today_start)
-
-    # Execute both queries in parallel
-    task_result, exec_result = await asyncio.gather(
-        session.execute(task_query),
-        session.execute(exec_query),
-    )
-
-    task_stats = task_result.one()
-    exec_stats = exec_result.one()
+    # Task counts and today's rollup rows (China timezone day); one
+    # AsyncSession does not allow concurrent queries, so await in turn
+    task_stats = (await session.execute(task_query)).one()
+    today_success, today_failed = await stats.get_day_totals(session, stats.today())
 
     # Calculate success rate (format in backend to avoid frontend division by zero)
-    today_count = exec_stats.count or 0
-    today_success = exec_stats.success or 0
+    today_count = today_success + today_failed
     success_rate = f"{int(today_success / today_count * 100)}%" if today_count > 0 else "--"
 
     return {
@@ -74,7 +64,7 @@ async def get_dashboard_stats(session: AsyncSession) -> dict:
 @router.get("/")
 async def list_tasks(
     request: Request,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     _: bool = Depends(require_auth_web),
     message: Optional[str] = None,
     message_type: str = "success",
@@ -83,46 +73,16 @@ async def list_tasks(
     # Get dashboard statistics
     stats = await get_dashboard_stats(session)
 
-    # Use window function to get each task's latest execution (both time and status)
-    # Performance Note: For large datasets, consider adding index on (task_id, executed_at DESC)
-    last_exec_subquery = (
-        select(
-            ExecutionLog.task_id,
-            ExecutionLog.executed_at.label("last_executed_at"),
-            ExecutionLog.status.label("last_status"),
-            func.row_number().over(
-                partition_by=ExecutionLog.task_id,
-                order_by=ExecutionLog.executed_at.desc()
-            ).label("rn")
-        )
-        .subquery()
-    )
-
-    # Only take rn=1 (most recent execution per task)
-    latest_exec = (
-        select(
-            last_exec_subquery.c.task_id,
-            last_exec_subquery.c.last_executed_at,
-            last_exec_subquery.c.last_status,
-        )
-        .where(last_exec_subquery.c.rn == 1)
-        .subquery()
-    )
-
-    # Get all tasks with last execution time and status in single query
-    result = await session.execute(
-        select(Task, latest_exec.c.last_executed_at, latest_exec.c.last_status)
-        .outerjoin(latest_exec, Task.id == latest_exec.c.task_id)
-        .order_by(Task.id)
-    )
-    rows = result.all()
+    # Last-execution columns are kept on the task row by the log writer
+    result = await session.execute(select(Task).order_by(Task.id))
+    tasks = result.scalars().all()
 
     # Build task list
     task_list = []
-    for task, last_executed_at, last_status in rows:
+    for task in tasks:
         # Convert UTC to China timezone for display
-        if last_executed_at:
-            china_time = last_executed_at.replace(tzinfo=timezone.utc).astimezone(CHINA_TZ)
+        if task.last_executed_at:
+            china_time = task.last_executed_at.replace(tzinfo=timezone.utc).astimezone(CHINA_TZ)
             last_executed_str = china_time.strftime("%Y-%m-%d %H:%M")
         else:
             last_executed_str = None
@@ -134,9 +94,12 @@ async def list_tasks(
             "interval_minutes": task.interval_minutes,
             "interval_seconds": task.interval_seconds,
             "fixed_time": task.fixed_time,
+            "fire_offset_seconds": get_fire_offset(task),
             "enabled": task.enabled,
             "last_executed_at": last_executed_str,
-            "last_execution_status": last_status,  # 'success', 'failed', or None
+            "last_execution_status": task.last_status,  # 'success', 'failed', or None
+            "last_latency_ms": task.last_latency_ms,
+            "consecutive_failures": task.consecutive_failures or 0,
         }
         task_list.append(task_dict)
 
@@ -169,8 +132,12 @@ async def create_task(
     interval_minutes: Optional[int] = Form(None),
     interval_seconds: Optional[int] = Form(None),
     fixed_time: Optional[str] = Form(None),
+    jitter_seconds: Optional[int] = Form(None),
     message_content: str = Form(...),
     model: str = Form(...),
+    rate_limit_per_minute: Optional[int] = Form(None),
+    log_retention_days: Optional[int] = Form(None),
+    log_retention_max_rows: Optional[int] = Form(None),
     enabled: Optional[str] = Form(None),
 ):
     """Handle new task form submission."""
@@ -182,8 +149,12 @@ async def create_task(
         "interval_minutes": interval_minutes,
         "interval_seconds": interval_seconds,
         "fixed_time": fixed_time,
+        "jitter_seconds": jitter_seconds,
         "message_content": message_content,
         "model": model,
+        "rate_limit_per_minute": rate_limit_per_minute,
+        "log_retention_days": log_retention_days,
+        "log_retention_max_rows": log_retention_max_rows,
         "enabled": enabled == "true",
     }
 
@@ -197,8 +168,12 @@ async def create_task(
             interval_minutes=interval_minutes,
             interval_seconds=interval_seconds,
             fixed_time=fixed_time,
+            jitter_seconds=jitter_seconds,
             message_content=message_content,
             model=model,
+            rate_limit_per_minute=rate_limit_per_minute,
+            log_retention_days=log_retention_days,
+            log_retention_max_rows=log_retention_max_rows,
             enabled=enabled == "true",
         )
 
@@ -269,8 +244,12 @@ async def update_task(
     interval_minutes: Optional[int] = Form(None),
     interval_seconds: Optional[int] = Form(None),
     fixed_time: Optional[str] = Form(None),
+    jitter_seconds: Optional[int] = Form(None),
     message_content: str = Form(...),
     model: str = Form(...),
+    rate_limit_per_minute: Optional[int] = Form(None),
+    log_retention_days: Optional[int] = Form(None),
+    log_retention_max_rows: Optional[int] = Form(None),
     enabled: Optional[str] = Form(None),
 ):
     """Handle edit task form submission."""
@@ -287,8 +266,12 @@ async def update_task(
         "interval_minutes": interval_minutes,
         "interval_seconds": interval_seconds,
         "fixed_time": fixed_time,
+        "jitter_seconds": jitter_seconds,
         "message_content": message_content,
         "model": model,
+        "rate_limit_per_minute": rate_limit_per_minute,
+        "log_retention_days": log_retention_days,
+        "log_retention_max_rows": log_retention_max_rows,
         "enabled": enabled == "true",
     }
 
@@ -301,8 +284,12 @@ async def update_task(
             "interval_minutes": interval_minutes if schedule_type == "interval" else None,
             "interval_seconds": interval_seconds if schedule_type == "interval" else None,
             "fixed_time": fixed_time if schedule_type == "fixed_time" else None,
+            "jitter_seconds": jitter_seconds if schedule_type == "fixed_time" else None,
             "message_content": message_content,
             "model": model,
+            "rate_limit_per_minute": rate_limit_per_minute,
+            "log_retention_days": log_retention_days,
+            "log_retention_max_rows": log_retention_max_rows,
             "enabled": enabled == "true",
         }
 
@@ -371,40 +358,28 @@ async def delete_task(
 
 async def get_log_stats(session: AsyncSession, task_id: int) -> dict:
     """Get execution statistics for a specific task."""
-    # Total and success count
-    stats_query = select(
-        func.count(ExecutionLog.id).label("total"),
-        func.sum(case((ExecutionLog.status == "success", 1), else_=0)).label("success"),
-    ).where(ExecutionLog.task_id == task_id)
-
-    stats_result = await session.execute(stats_query)
-    stats = stats_result.one()
+    # All-time totals from the daily rollup
+    success, failed = await stats.get_task_totals(session, task_id)
 
-    total = stats.total or 0
-    success = int(stats.success or 0)
+    total = success + failed
     success_rate = f"{int(success / total * 100)}%" if total > 0 else "--"
 
-    # Last 7 days stats
-    seven_days_ago = datetime.now(timezone.utc) - timedelta(days=7)
-    recent_query = select(
-        func.count(ExecutionLog.id).label("count"),
-        func.sum(case((ExecutionLog.status == "success", 1), else_=0)).label("success"),
-    ).where(
-        ExecutionLog.task_id == task_id,
-        ExecutionLog.executed_at >= seven_days_ago,
+    # Last 7 days stats (today and the 6 days before)
+    since = stats.today() - timedelta(days=6)
+    recent_success, recent_failed = await stats.get_day_totals(
+        session, since, task_id=task_id
     )
-
-    recent_result = await session.execute(recent_query)
-    recent = recent_result.one()
-
-    recent_count = recent.count or 0
-    recent_success = int(recent.success or 0)
+    latency = await stats.get_latency_histograms(session, [task_id], since)
+    lag_p95 = latency["lag"].quantile(0.95)
 
     return {
         "total_executions": total,
         "success_rate": success_rate,
-        "recent_count": recent_count,
+        "recent_count": recent_success + recent_failed,
         "recent_success": recent_success,
+        "recent_lag_p95": f"{round(lag_p95)}ms" if lag_p95 is not None else "--",
+        # Fires this node's scheduler dropped since startup
+        "misfires": get_schedule_monitor().task_stats(task_id),
     }
 
 
@@ -412,59 +387,46 @@ async def get_log_stats(session: AsyncSession, task_id: int) -> dict:
 async def view_task_logs(
     request: Request,
     task_id: int,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     _: bool = Depends(require_auth_web),
     status: Optional[str] = None,  # success | failed | None
     start_date: Optional[str] = None,  # YYYY-MM-DD
     end_date: Optional[str] = None,  # YYYY-MM-DD
-    page: int = 1,
+    cursor: Optional[str] = None,  # Opaque keyset cursor from a pagination link
 ):
-    """Display task execution logs with filtering and pagination."""
+    """Display task execution logs with filtering and keyset pagination."""
     task = await session.get(Task, task_id)
     if task is None:
         return RedirectResponse(url="/?message=任务不存在&message_type=error", status_code=303)
 
-    # Build base query
-    query = select(ExecutionLog).where(ExecutionLog.task_id == task_id)
-
-    # Apply status filter
-    if status in ("success", "failed"):
-        query = query.where(ExecutionLog.status == status)
+    # Apply status and date range filters (invalid values are ignored)
+    status_filter = status if status in ("success", "failed") else None
+    start_at, end_at = log_query.parse_date_range(start_date, end_date)
 
-    # Apply date range filter
-    if start_date:
+    # A stale or tampered cursor falls back to the first page
+    page_cursor = None
+    if cursor:
         try:
-            start_dt = datetime.strptime(start_date, "%Y-%m-%d").replace(tzinfo=timezone.utc)
-            query = query.where(ExecutionLog.executed_at >= start_dt)
-        except ValueError:
-            pass  # Invalid date format, ignore
+            page_cursor = log_query.Cursor.decode(cursor)
+        except log_query.InvalidCursor:
+            page_cursor = None
 
-    if end_date:
-        try:
-            # End date is inclusive, so add 1 day
-            end_dt = datetime.strptime(end_date, "%Y-%m-%d").replace(tzinfo=timezone.utc)
-            end_dt = end_dt + timedelta(days=1)
-            query = query.where(ExecutionLog.executed_at < end_dt)
-        except ValueError:
-            pass
-
-    # Count total for pagination
-    count_query = select(func.count()).select_from(query.subquery())
-    total_count = (await session.execute(count_query)).scalar() or 0
-
-    # Pagination
     page_size = 20
-    total_pages = (total_count + page_size - 1) // page_size  # Ceiling division
-    page = max(1, min(page, total_pages)) if total_pages > 0 else 1
-    offset = (page - 1) * page_size
-
-    # Get paginated logs
-    result = await session.execute(
-        query.order_by(desc(ExecutionLog.executed_at))
-        .offset(offset)
-        .limit(page_size)
+    log_page = await log_query.fetch_log_page(
+        session,
+        task_id,
+        status=status_filter,
+        start_at=start_at,
+        end_at=end_at,
+        cursor=page_cursor,
+        limit=page_size,
+    )
+
+    # Approximate total, for display only
+    total_count = await log_query.count_logs(
+        session, task_id, status=status_filter, start_at=start_at, end_at=end_at
     )
-    logs = result.scalars().all()
+    total_pages = max(log_page.page, (total_count + page_size - 1) // page_size)
 
     # Get statistics
     log_stats = await get_log_stats(session, task_id)
@@ -474,11 +436,14 @@ async def view_task_logs(
         "tasks/logs.html",
         {
             "task": task,
-            "logs": logs,
+            "logs": log_page.logs,
             "stats": log_stats,
-            "page": page,
+            "page": log_page.page,
             "total_pages": total_pages,
             "total_count": total_count,
+            "next_cursor": log_page.next_cursor,
+            "prev_cursor": log_page.prev_cursor,
+            "timing_phases": list(TIMING_PHASE_LABELS.items()),
             "filters": {
                 "status": status,
                 "start_date": start_date,
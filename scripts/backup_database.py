@@ -0,0 +1,80 @@
+"""Maintenance script: Back up the SQLite databases while the application runs.
+
+Uses SQLite's online backup API, copying a few pages at a time so the
+application keeps writing in between steps. With a separate logs
+database (LOGS_DATABASE_URL), the main database holding the task
+configuration and the logs database can be backed up on their own
+schedules. Uses DATABASE_URL and LOGS_DATABASE_URL from the
+environment or .env.
+
+Usage:
+    python scripts/backup_database.py [main|logs|all] [backup_dir]
+"""
+
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config import get_settings  # noqa: E402
+from app.database import sqlite_file  # noqa: E402
+
+# Pages copied per backup step, with a pause in between
+PAGES_PER_STEP = 1000
+STEP_PAUSE = 0.05
+
+
+def database_files() -> dict[str, Path]:
+    """Get the SQLite files of the main and logs databases."""
+    settings = get_settings()
+    urls = {"main": settings.database_url, "logs": settings.logs_database_url}
+    files = {name: sqlite_file(url) for name, url in urls.items()}
+    return {name: path for name, path in files.items() if path is not None}
+
+
+def backup(source: Path, backup_dir: Path) -> Path:
+    """Copy one database into a timestamped file."""
+    backup_dir.mkdir(parents=True, exist_ok=True)
+    target = backup_dir / f"{source.stem}-{datetime.now():%Y%m%d-%H%M%S}.db"
+
+    src = sqlite3.connect(f"file:{source}?mode=ro", uri=True)
+    dst = sqlite3.connect(target)
+    try:
+        src.backup(dst, pages=PAGES_PER_STEP, sleep=STEP_PAUSE)
+    finally:
+        dst.close()
+        src.close()
+    return target
+
+
+def main():
+    """Back up the selected databases."""
+    which = sys.argv[1] if len(sys.argv) > 1 else "all"
+    backup_dir = Path(sys.argv[2]) if len(sys.argv) > 2 else Path("data") / "backups"
+    if which not in ("main", "logs", "all"):
+        print(f"Unknown database '{which}', expected main, logs or all")
+        sys.exit(1)
+
+    files = database_files()
+    if which == "logs" and "logs" not in files:
+        print("LOGS_DATABASE_URL is not set, logs are stored in the main database.")
+        sys.exit(1)
+
+    for name, path in files.items():
+        if which not in ("all", name):
+            continue
+        if not path.exists():
+            print(f"Database not found at {path}")
+            continue
+        try:
+            target = backup(path, backup_dir)
+        except sqlite3.Error as e:
+            print(f"Error backing up {path}: {e}")
+            sys.exit(1)
+        print(f"Backed up {name} database to {target}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Migration script: Switch the database to incremental auto-vacuum.
+
+Log retention deletes old execution logs, but SQLite only returns the
+freed pages to the filesystem when auto_vacuum is INCREMENTAL. New
+databases are created that way; this script converts an existing one.
+The conversion rebuilds the whole file with VACUUM, so stop the
+application first and make sure there is free disk space for a copy.
+
+Usage:
+    python scripts/enable_incremental_vacuum.py
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+# PRAGMA auto_vacuum value of INCREMENTAL mode
+AUTO_VACUUM_INCREMENTAL = 2
+
+
+def migrate():
+    """Set auto_vacuum=INCREMENTAL and rebuild the database if needed."""
+    db_path = Path(__file__).parent.parent / "data" / "autoai.db"
+
+    if not db_path.exists():
+        print(f"Database not found at {db_path}")
+        print("No migration needed - new databases use incremental vacuum.")
+        return
+
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    cursor.execute("PRAGMA auto_vacuum")
+    if cursor.fetchone()[0] == AUTO_VACUUM_INCREMENTAL:
+        print("auto_vacuum is already INCREMENTAL. No migration needed.")
+        conn.close()
+        return
+
+    # The new mode only takes effect after a full VACUUM
+    try:
+        cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        cursor.execute("VACUUM")
+        cursor.execute("PRAGMA auto_vacuum")
+        if cursor.fetchone()[0] != AUTO_VACUUM_INCREMENTAL:
+            print("Error: auto_vacuum did not change, is the database in use?")
+            sys.exit(1)
+        print("Successfully switched database to incremental auto-vacuum.")
+    except sqlite3.Error as e:
+        print(f"Error rebuilding database: {e}")
+        sys.exit(1)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,116 @@
+"""Migration script: Bring any supported database up to the current schema.
+
+Portable counterpart of the SQLite-only migrate_add_*.py scripts, for
+SQLite and PostgreSQL alike. Compares the models with the live
+database and:
+
+- creates missing tables,
+- adds missing columns (NOT NULL columns without a server default are
+  added as nullable, with a warning),
+- creates missing indexes (CONCURRENTLY on PostgreSQL, so execution
+  logs keep being written while large indexes build).
+
+Backfills are separate: run scripts/rebuild_execution_stats.py after
+adding the daily rollup. Uses DATABASE_URL (and LOGS_DATABASE_URL, if
+set, for the log tables) from the environment or .env.
+
+Usage:
+    python scripts/migrate.py
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import inspect  # noqa: E402
+from sqlalchemy.schema import CreateColumn  # noqa: E402
+
+from app.database import Base, schema_engines  # noqa: E402
+from app import models  # noqa: E402, F401
+
+
+def add_missing_columns(conn, tables: list) -> list[str]:
+    """Add model columns the live tables lack."""
+    inspector = inspect(conn)
+    existing_tables = set(inspector.get_table_names())
+    added = []
+
+    for table in tables:
+        if table.name not in existing_tables:
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            ddl = str(CreateColumn(column).compile(dialect=conn.dialect))
+            if not column.nullable and column.server_default is None:
+                print(f"Warning: adding {table.name}.{column.name} as nullable (no default).")
+                ddl = ddl.replace(" NOT NULL", "")
+            conn.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {ddl}")
+            added.append(f"{table.name}.{column.name}")
+    return added
+
+
+def missing_indexes(conn, tables: list) -> list:
+    """List model indexes the live tables lack."""
+    inspector = inspect(conn)
+    existing_tables = set(inspector.get_table_names())
+    missing = []
+
+    for table in tables:
+        if table.name not in existing_tables:
+            continue
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        missing.extend(index for index in table.indexes if index.name not in existing)
+    return missing
+
+
+async def migrate_engine(engine, tables: list) -> bool:
+    """Create one database's missing tables, columns and indexes.
+
+    Returns:
+        True if anything was changed.
+    """
+    is_postgres = engine.dialect.name == "postgresql"
+
+    async with engine.begin() as conn:
+        tables_before = set(await conn.run_sync(lambda c: inspect(c).get_table_names()))
+        await conn.run_sync(Base.metadata.create_all, tables=tables)
+        created = [table.name for table in tables if table.name not in tables_before]
+        added = await conn.run_sync(add_missing_columns, tables)
+        indexes = await conn.run_sync(missing_indexes, tables)
+
+    for name in created:
+        print(f"Created table '{name}'.")
+    for name in added:
+        print(f"Added column '{name}'.")
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    isolation = "AUTOCOMMIT" if is_postgres else None
+    for index in indexes:
+        if is_postgres:
+            index.dialect_options["postgresql"]["concurrently"] = True
+        options = {"isolation_level": isolation} if isolation else {}
+        async with engine.connect() as conn:
+            conn = await conn.execution_options(**options)
+            await conn.run_sync(index.create)
+            await conn.commit()
+        print(f"Created index '{index.name}'.")
+
+    await engine.dispose()
+    return bool(created or added or indexes)
+
+
+async def migrate():
+    """Bring the main database and the logs database, if separate, up to date."""
+    changed = False
+    for engine, tables in schema_engines():
+        changed |= await migrate_engine(engine, tables)
+    if not changed:
+        print("Schema is up to date. No migration needed.")
+
+
+if __name__ == "__main__":
+    asyncio.run(migrate())
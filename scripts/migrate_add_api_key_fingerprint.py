@@ -0,0 +1,101 @@
+"""Migration script: Add rate limiting columns to tasks table.
+
+This script adds the api_key_fingerprint and rate_limit_per_minute
+columns to the tasks table for existing databases, then backfills the
+fingerprint of every stored key so tasks sharing an API key can be
+grouped without decrypting. For new databases, the columns will be
+created automatically by SQLAlchemy's create_all.
+
+Requires ENCRYPTION_KEY (and ADMIN_PASSWORD) to be configured, since
+each stored key must be decrypted once to compute its fingerprint.
+
+Uses DATABASE_URL from the environment or .env.
+
+Usage:
+    python scripts/migrate_add_api_key_fingerprint.py
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database import database_file  # noqa: E402
+from app.utils.security import decrypt_api_key, fingerprint_api_key  # noqa: E402
+
+NEW_COLUMNS = {
+    "api_key_fingerprint": "VARCHAR(64)",
+    "rate_limit_per_minute": "INTEGER",
+}
+
+
+def migrate():
+    """Add rate limiting columns and backfill key fingerprints."""
+    db_path = database_file()
+
+    if db_path is None:
+        print("DATABASE_URL is not a SQLite file, use scripts/migrate.py instead.")
+        return
+
+    if not db_path.exists():
+        print(f"Database not found at {db_path}")
+        print("No migration needed - columns will be created on first run.")
+        return
+
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    # Check if tasks table exists
+    cursor.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name='tasks'"
+    )
+    if not cursor.fetchone():
+        print("Table 'tasks' does not exist yet.")
+        print("No migration needed - columns will be created on first run.")
+        conn.close()
+        return
+
+    try:
+        # Add missing columns
+        cursor.execute("PRAGMA table_info(tasks)")
+        columns = [row[1] for row in cursor.fetchall()]
+        for name, column_type in NEW_COLUMNS.items():
+            if name in columns:
+                print(f"Column '{name}' already exists.")
+                continue
+            cursor.execute(f"ALTER TABLE tasks ADD COLUMN {name} {column_type}")
+            print(f"Added '{name}' column to tasks table.")
+
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS ix_tasks_api_key_fingerprint "
+            "ON tasks (api_key_fingerprint)"
+        )
+
+        # Backfill fingerprints for rows that don't have one yet
+        cursor.execute("SELECT id, api_key FROM tasks WHERE api_key_fingerprint IS NULL")
+        rows = cursor.fetchall()
+        failed = 0
+        for task_id, encrypted_key in rows:
+            try:
+                fingerprint = fingerprint_api_key(decrypt_api_key(encrypted_key))
+            except Exception as e:
+                print(f"Could not decrypt API key of task {task_id}: {e}")
+                failed += 1
+                continue
+            cursor.execute(
+                "UPDATE tasks SET api_key_fingerprint = ? WHERE id = ?",
+                (fingerprint, task_id),
+            )
+
+        conn.commit()
+        print(f"Backfilled fingerprints for {len(rows) - failed} of {len(rows)} tasks.")
+    except sqlite3.Error as e:
+        print(f"Error migrating tasks table: {e}")
+        sys.exit(1)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,101 @@
+"""Migration script: Add indexes to execution_logs table.
+
+This script creates the execution_logs indexes declared in
+app/models.py on existing databases. For new databases, the indexes
+will be created automatically by SQLAlchemy's create_all.
+
+SQLite cannot build an index without blocking writers, so each index
+is built in its own transaction to keep every write lock as short as
+possible, and busy_timeout lets the running application's log writer
+wait for it instead of failing. On a multi-GB database each index can
+take minutes; executions keep running meanwhile and their logs wait in
+the writer's buffer (see LOG_WRITER_MAX_QUEUE). ANALYZE is run at the
+end so the query planner starts using the new indexes.
+
+Migrates the database holding execution_logs: LOGS_DATABASE_URL if
+set, else DATABASE_URL, from the environment or .env.
+
+Usage:
+    python scripts/migrate_add_execution_log_indexes.py
+"""
+
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database import database_file  # noqa: E402
+
+INDEXES = {
+    "ix_execution_logs_task_id_executed_at": "(task_id, executed_at DESC)",
+    "ix_execution_logs_executed_at": "(executed_at)",
+    "ix_execution_logs_task_id_status_executed_at": "(task_id, status, executed_at)",
+}
+
+# Milliseconds the application may wait on this script's write locks
+BUSY_TIMEOUT_MS = 60000
+
+
+def migrate():
+    """Create missing execution_logs indexes one at a time."""
+    db_path = database_file(logs=True)
+
+    if db_path is None:
+        print("DATABASE_URL is not a SQLite file, use scripts/migrate.py instead.")
+        return
+
+    if not db_path.exists():
+        print(f"Database not found at {db_path}")
+        print("No migration needed - indexes will be created on first run.")
+        return
+
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    cursor = conn.cursor()
+    cursor.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+
+    # Check if execution_logs table exists
+    cursor.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name='execution_logs'"
+    )
+    if not cursor.fetchone():
+        print("Table 'execution_logs' does not exist yet.")
+        print("No migration needed - indexes will be created on first run.")
+        conn.close()
+        return
+
+    try:
+        cursor.execute("PRAGMA index_list(execution_logs)")
+        existing = {row[1] for row in cursor.fetchall()}
+
+        created = 0
+        for name, columns in INDEXES.items():
+            if name in existing:
+                print(f"Index '{name}' already exists.")
+                continue
+
+            print(f"Creating index '{name}' on execution_logs {columns}...")
+            start = time.perf_counter()
+            cursor.execute("BEGIN IMMEDIATE")
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON execution_logs {columns}")
+            cursor.execute("COMMIT")
+            print(f"Created '{name}' in {time.perf_counter() - start:.1f}s.")
+            created += 1
+
+        if created:
+            cursor.execute("ANALYZE execution_logs")
+            print(f"Created {created} indexes and refreshed planner statistics.")
+        else:
+            print("No migration needed.")
+    except sqlite3.Error as e:
+        if conn.in_transaction:
+            cursor.execute("ROLLBACK")
+        print(f"Error creating indexes: {e}")
+        sys.exit(1)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    migrate()
@@ -4,6 +4,8 @@ This script adds the interval_seconds column to the tasks table
 for existing databases. For new databases, the column will be
 created automatically by SQLAlchemy's create_all.
 
+Uses DATABASE_URL from the environment or .env.
+
 Usage:
     python scripts/migrate_add_interval_seconds.py
 """
@@ -12,10 +14,18 @@ import sqlite3
 import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database import database_file  # noqa: E402
+
 
 def migrate():
     """Add interval_seconds column to tasks table if it doesn't exist."""
-    db_path = Path(__file__).parent.parent / "data" / "autoai.db"
+    db_path = database_file()
+
+    if db_path is None:
+        print("DATABASE_URL is not a SQLite file, use scripts/migrate.py instead.")
+        return
 
     if not db_path.exists():
         print(f"Database not found at {db_path}")
@@ -0,0 +1,72 @@
+"""Migration script: Add jitter_seconds column to tasks table.
+
+This script adds the jitter_seconds column to the tasks table
+for existing databases. For new databases, the column will be
+created automatically by SQLAlchemy's create_all.
+
+Uses DATABASE_URL from the environment or .env.
+
+Usage:
+    python scripts/migrate_add_jitter_seconds.py
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database import database_file  # noqa: E402
+
+
+def migrate():
+    """Add jitter_seconds column to tasks table if it doesn't exist."""
+    db_path = database_file()
+
+    if db_path is None:
+        print("DATABASE_URL is not a SQLite file, use scripts/migrate.py instead.")
+        return
+
+    if not db_path.exists():
+        print(f"Database not found at {db_path}")
+        print("No migration needed - column will be created on first run.")
+        return
+
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    # Check if tasks table exists
+    cursor.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name='tasks'"
+    )
+    if not cursor.fetchone():
+        print("Table 'tasks' does not exist yet.")
+        print("No migration needed - column will be created on first run.")
+        conn.close()
+        return
+
+    # Check if column already exists
+    cursor.execute("PRAGMA table_info(tasks)")
+    columns = [row[1] for row in cursor.fetchall()]
+
+    if "jitter_seconds" in columns:
+        print("Column 'jitter_seconds' already exists. No migration needed.")
+        conn.close()
+        return
+
+    # Add the column
+    try:
+        cursor.execute(
+            "ALTER TABLE tasks ADD COLUMN jitter_seconds INTEGER"
+        )
+        conn.commit()
+        print("Successfully added 'jitter_seconds' column to tasks table.")
+    except sqlite3.Error as e:
+        print(f"Error adding column: {e}")
+        sys.exit(1)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,115 @@
+"""Migration script: Add latency columns to execution_logs table.
+
+This script adds the latency_ms, connect_ms and ttfb_ms columns to the
+execution_logs table for existing databases, and backfills latency_ms
+from the " (耗时: 1234ms)" suffix older versions appended to
+response_summary (removing the suffix). Connect and first-byte times
+were never recorded and stay empty.
+
+Afterwards run scripts/rebuild_execution_stats.py to build the latency
+histograms. For new databases, the columns and the histogram table are
+created automatically by SQLAlchemy's create_all.
+
+Migrates the database holding execution_logs (LOGS_DATABASE_URL if
+set, else DATABASE_URL, from the environment or .env) unless db_path
+is given.
+
+Usage:
+    python scripts/migrate_add_latency_columns.py [db_path]
+"""
+
+import re
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database import database_file  # noqa: E402
+
+NEW_COLUMNS = ("latency_ms", "connect_ms", "ttfb_ms")
+
+# Suffix written by execute_task before latency had its own column
+LATENCY_SUFFIX = re.compile(r" \(耗时: (\d+)ms\)$")
+
+BACKFILL_CHUNK_SIZE = 5000
+
+
+def backfill(conn: sqlite3.Connection) -> int:
+    """Move latencies out of response_summary, a chunk at a time."""
+    cursor = conn.cursor()
+    updated = 0
+    last_id = 0
+    while True:
+        cursor.execute(
+            "SELECT id, response_summary FROM execution_logs "
+            "WHERE id > ? AND latency_ms IS NULL AND response_summary LIKE '%(耗时: %ms)' "
+            "ORDER BY id LIMIT ?",
+            (last_id, BACKFILL_CHUNK_SIZE),
+        )
+        rows = cursor.fetchall()
+        if not rows:
+            return updated
+        last_id = rows[-1][0]
+
+        updates = []
+        for log_id, summary in rows:
+            match = LATENCY_SUFFIX.search(summary)
+            if match:
+                updates.append((int(match.group(1)), summary[:match.start()], log_id))
+        cursor.executemany(
+            "UPDATE execution_logs SET latency_ms = ?, response_summary = ? WHERE id = ?",
+            updates,
+        )
+        conn.commit()
+        updated += len(updates)
+
+
+def migrate():
+    """Add latency columns to execution_logs table if they don't exist."""
+    db_path = Path(sys.argv[1]) if len(sys.argv) > 1 else database_file(logs=True)
+
+    if db_path is None:
+        print("DATABASE_URL is not a SQLite file, use scripts/migrate.py instead.")
+        return
+
+    if not db_path.exists():
+        print(f"Database not found at {db_path}")
+        print("No migration needed - columns will be created on first run.")
+        return
+
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    # Check if execution_logs table exists (it may live in a separate logs database)
+    cursor.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name='execution_logs'"
+    )
+    if not cursor.fetchone():
+        print("Table 'execution_logs' does not exist in this database.")
+        conn.close()
+        return
+
+    cursor.execute("PRAGMA table_info(execution_logs)")
+    columns = [row[1] for row in cursor.fetchall()]
+    missing = [column for column in NEW_COLUMNS if column not in columns]
+
+    try:
+        for column in missing:
+            cursor.execute(f"ALTER TABLE execution_logs ADD COLUMN {column} INTEGER")
+            print(f"Successfully added '{column}' column to execution_logs table.")
+        conn.commit()
+        if not missing:
+            print("Latency columns already exist.")
+
+        updated = backfill(conn)
+        print(f"Backfilled latency_ms of {updated} execution logs.")
+    except sqlite3.Error as e:
+        print(f"Error migrating execution_logs: {e}")
+        sys.exit(1)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    migrate()
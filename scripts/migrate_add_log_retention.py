@@ -0,0 +1,72 @@
+"""Migration script: Add log retention columns to tasks table.
+
+This script adds the log_retention_days and log_retention_max_rows
+columns to the tasks table for existing databases. For new databases,
+the columns will be created automatically by SQLAlchemy's create_all.
+Existing tasks keep NULL, meaning they follow the global settings.
+
+Uses DATABASE_URL from the environment or .env.
+
+Usage:
+    python scripts/migrate_add_log_retention.py
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database import database_file  # noqa: E402
+
+NEW_COLUMNS = ("log_retention_days", "log_retention_max_rows")
+
+
+def migrate():
+    """Add log retention columns to tasks table if they don't exist."""
+    db_path = database_file()
+
+    if db_path is None:
+        print("DATABASE_URL is not a SQLite file, use scripts/migrate.py instead.")
+        return
+
+    if not db_path.exists():
+        print(f"Database not found at {db_path}")
+        print("No migration needed - columns will be created on first run.")
+        return
+
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    # Check if tasks table exists
+    cursor.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name='tasks'"
+    )
+    if not cursor.fetchone():
+        print("Table 'tasks' does not exist yet.")
+        print("No migration needed - columns will be created on first run.")
+        conn.close()
+        return
+
+    # Check which columns already exist
+    cursor.execute("PRAGMA table_info(tasks)")
+    columns = [row[1] for row in cursor.fetchall()]
+
+    # Add the columns
+    try:
+        for name in NEW_COLUMNS:
+            if name in columns:
+                print(f"Column '{name}' already exists.")
+                continue
+            cursor.execute(f"ALTER TABLE tasks ADD COLUMN {name} INTEGER")
+            print(f"Successfully added '{name}' column to tasks table.")
+        conn.commit()
+    except sqlite3.Error as e:
+        print(f"Error adding column: {e}")
+        sys.exit(1)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,75 @@
+"""Migration script: Add next_run_at column to tasks table.
+
+This script adds the next_run_at column to the tasks table
+for existing databases. For new databases, the column will be
+created automatically by SQLAlchemy's create_all.
+
+Existing tasks start with no recorded phase and get a staggered
+first fire on the next startup.
+
+Uses DATABASE_URL from the environment or .env.
+
+Usage:
+    python scripts/migrate_add_next_run_at.py
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database import database_file  # noqa: E402
+
+
+def migrate():
+    """Add next_run_at column to tasks table if it doesn't exist."""
+    db_path = database_file()
+
+    if db_path is None:
+        print("DATABASE_URL is not a SQLite file, use scripts/migrate.py instead.")
+        return
+
+    if not db_path.exists():
+        print(f"Database not found at {db_path}")
+        print("No migration needed - column will be created on first run.")
+        return
+
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    # Check if tasks table exists
+    cursor.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name='tasks'"
+    )
+    if not cursor.fetchone():
+        print("Table 'tasks' does not exist yet.")
+        print("No migration needed - column will be created on first run.")
+        conn.close()
+        return
+
+    # Check if column already exists
+    cursor.execute("PRAGMA table_info(tasks)")
+    columns = [row[1] for row in cursor.fetchall()]
+
+    if "next_run_at" in columns:
+        print("Column 'next_run_at' already exists. No migration needed.")
+        conn.close()
+        return
+
+    # Add the column
+    try:
+        cursor.execute(
+            "ALTER TABLE tasks ADD COLUMN next_run_at DATETIME"
+        )
+        conn.commit()
+        print("Successfully added 'next_run_at' column to tasks table.")
+    except sqlite3.Error as e:
+        print(f"Error adding column: {e}")
+        sys.exit(1)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    migrate()
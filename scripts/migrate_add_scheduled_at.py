@@ -0,0 +1,75 @@
+"""Migration script: Add scheduled_at column to execution_logs table.
+
+This script adds the scheduled_at column to the execution_logs table
+for existing databases. For new databases, the column will be
+created automatically by SQLAlchemy's create_all.
+
+Existing logs keep an empty scheduled_at and have no scheduling lag.
+
+Migrates the database holding execution_logs (LOGS_DATABASE_URL if
+set, else DATABASE_URL, from the environment or .env) unless db_path
+is given.
+
+Usage:
+    python scripts/migrate_add_scheduled_at.py [db_path]
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database import database_file  # noqa: E402
+
+
+def migrate():
+    """Add scheduled_at column to execution_logs table if it doesn't exist."""
+    db_path = Path(sys.argv[1]) if len(sys.argv) > 1 else database_file(logs=True)
+
+    if db_path is None:
+        print("DATABASE_URL is not a SQLite file, use scripts/migrate.py instead.")
+        return
+
+    if not db_path.exists():
+        print(f"Database not found at {db_path}")
+        print("No migration needed - column will be created on first run.")
+        return
+
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    # Check if execution_logs table exists (it may live in a separate logs database)
+    cursor.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name='execution_logs'"
+    )
+    if not cursor.fetchone():
+        print("Table 'execution_logs' does not exist in this database.")
+        conn.close()
+        return
+
+    # Check if column already exists
+    cursor.execute("PRAGMA table_info(execution_logs)")
+    columns = [row[1] for row in cursor.fetchall()]
+
+    if "scheduled_at" in columns:
+        print("Column 'scheduled_at' already exists. No migration needed.")
+        conn.close()
+        return
+
+    # Add the column
+    try:
+        cursor.execute(
+            "ALTER TABLE execution_logs ADD COLUMN scheduled_at DATETIME"
+        )
+        conn.commit()
+        print("Successfully added 'scheduled_at' column to execution_logs table.")
+    except sqlite3.Error as e:
+        print(f"Error adding column: {e}")
+        sys.exit(1)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    migrate()
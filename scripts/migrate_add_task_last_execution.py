@@ -0,0 +1,109 @@
+"""Migration script: Add last-execution columns to tasks table.
+
+This script adds the last_executed_at, last_status, last_latency_ms
+and consecutive_failures columns to the tasks table for existing
+databases, then backfills them from execution_logs. For new databases,
+the columns will be created automatically by SQLAlchemy's create_all.
+
+Run scripts/migrate_add_execution_log_indexes.py first so the backfill
+can use the (task_id, executed_at) index. last_latency_ms is left empty
+for historical executions and filled in from the next run onwards.
+
+Uses DATABASE_URL, and LOGS_DATABASE_URL for the execution logs if
+set, from the environment or .env.
+
+Usage:
+    python scripts/migrate_add_task_last_execution.py
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database import database_file  # noqa: E402
+
+NEW_COLUMNS = {
+    "last_executed_at": "DATETIME",
+    "last_status": "VARCHAR(20)",
+    "last_latency_ms": "INTEGER",
+    "consecutive_failures": "INTEGER NOT NULL DEFAULT 0",
+}
+
+BACKFILL_SQL = """
+UPDATE tasks SET
+    last_executed_at = (
+        SELECT executed_at FROM execution_logs
+        WHERE task_id = tasks.id ORDER BY executed_at DESC LIMIT 1
+    ),
+    last_status = (
+        SELECT status FROM execution_logs
+        WHERE task_id = tasks.id ORDER BY executed_at DESC LIMIT 1
+    ),
+    consecutive_failures = (
+        SELECT COUNT(*) FROM execution_logs
+        WHERE task_id = tasks.id AND status = 'failed'
+        AND executed_at > COALESCE((
+            SELECT MAX(executed_at) FROM execution_logs
+            WHERE task_id = tasks.id AND status = 'success'
+        ), '')
+    )
+WHERE last_executed_at IS NULL
+"""
+
+
+def migrate():
+    """Add last-execution columns and backfill them from execution_logs."""
+    db_path = database_file()
+
+    if db_path is None:
+        print("DATABASE_URL is not a SQLite file, use scripts/migrate.py instead.")
+        return
+
+    if not db_path.exists():
+        print(f"Database not found at {db_path}")
+        print("No migration needed - columns will be created on first run.")
+        return
+
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    logs_path = database_file(logs=True)
+    if logs_path is not None and logs_path != db_path:
+        # Unqualified execution_logs then resolves to the attached logs database
+        cursor.execute("ATTACH DATABASE ? AS logs", (str(logs_path),))
+
+    # Check if tasks table exists
+    cursor.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name='tasks'"
+    )
+    if not cursor.fetchone():
+        print("Table 'tasks' does not exist yet.")
+        print("No migration needed - columns will be created on first run.")
+        conn.close()
+        return
+
+    try:
+        # Add missing columns
+        cursor.execute("PRAGMA table_info(tasks)")
+        columns = [row[1] for row in cursor.fetchall()]
+        for name, column_type in NEW_COLUMNS.items():
+            if name in columns:
+                print(f"Column '{name}' already exists.")
+                continue
+            cursor.execute(f"ALTER TABLE tasks ADD COLUMN {name} {column_type}")
+            print(f"Added '{name}' column to tasks table.")
+
+        cursor.execute(BACKFILL_SQL)
+        conn.commit()
+        print(f"Backfilled last execution of {cursor.rowcount} tasks.")
+    except sqlite3.Error as e:
+        print(f"Error migrating tasks table: {e}")
+        sys.exit(1)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    migrate()
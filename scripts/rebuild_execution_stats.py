@@ -0,0 +1,40 @@
+"""Maintenance script: Rebuild the daily execution statistics rollup.
+
+Recomputes every execution_stats_daily row from execution_logs. Use it
+to backfill the rollup after upgrading an existing database, or to
+repair it after editing logs by hand. New databases need no backfill:
+the rollup is maintained as logs are written.
+
+Logs written while the rebuild runs may be missed, so stop the
+application first. Uses DATABASE_URL from the environment or .env.
+
+Usage:
+    python scripts/rebuild_execution_stats.py
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database import get_engine, get_logs_engine, get_session_maker, init_db  # noqa: E402
+from app.services.stats import rebuild_daily_stats  # noqa: E402
+
+
+async def rebuild():
+    """Create the rollup table if needed and recompute it."""
+    # Creates execution_stats_daily on databases that predate it
+    await init_db()
+
+    session_maker = get_session_maker()
+    async with session_maker() as session:
+        rows = await rebuild_daily_stats(session)
+
+    await get_logs_engine().dispose()
+    await get_engine().dispose()
+    print(f"Rebuilt execution_stats_daily: {rows} rows.")
+
+
+if __name__ == "__main__":
+    asyncio.run(rebuild())
@@ -0,0 +1,90 @@
+"""Migration script: Move execution logs into a separate logs database.
+
+Copies execution_logs and the daily rollup tables, with their indexes,
+from data/autoai.db into a new SQLite file, verifies the row counts and
+drops the tables from the main database. Afterwards set
+LOGS_DATABASE_URL to the new file, e.g.
+
+    LOGS_DATABASE_URL=sqlite+aiosqlite:///./data/logs.db
+
+Stop the application first. The new file is created in incremental
+auto-vacuum mode, so log retention can return freed pages.
+
+Usage:
+    python scripts/split_logs_database.py [logs_db_path]
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+LOG_TABLES = ("execution_logs", "execution_stats_daily", "execution_latency_daily")
+
+
+def migrate():
+    """Copy the log tables into the logs database and drop the originals."""
+    root = Path(__file__).parent.parent
+    db_path = root / "data" / "autoai.db"
+    logs_path = Path(sys.argv[1]) if len(sys.argv) > 1 else root / "data" / "logs.db"
+
+    if not db_path.exists():
+        print(f"Database not found at {db_path}")
+        print("No migration needed - new databases are created with LOGS_DATABASE_URL.")
+        return
+
+    conn = sqlite3.connect(logs_path)
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("ATTACH DATABASE ? AS source", (str(db_path),))
+        placeholders = ", ".join("?" for _ in LOG_TABLES)
+
+        cursor.execute(
+            f"SELECT name FROM main.sqlite_master WHERE type = 'table' AND name IN ({placeholders})",
+            LOG_TABLES,
+        )
+        if cursor.fetchall():
+            print(f"{logs_path} already holds log tables. No migration needed.")
+            return
+
+        cursor.execute(
+            f"SELECT type, name, sql FROM source.sqlite_master "
+            f"WHERE tbl_name IN ({placeholders}) AND sql IS NOT NULL "
+            f"ORDER BY type = 'index'",
+            LOG_TABLES,
+        )
+        schema = cursor.fetchall()
+        tables = [name for kind, name, _ in schema if kind == "table"]
+        if not tables:
+            print("Log tables not found in the main database. No migration needed.")
+            return
+
+        # Must precede the first table of the new file
+        cursor.execute("PRAGMA main.auto_vacuum = INCREMENTAL")
+        for _, _, sql in schema:
+            cursor.execute(sql)
+        for name in tables:
+            cursor.execute(f"INSERT INTO main.{name} SELECT * FROM source.{name}")
+            copied = cursor.execute(f"SELECT COUNT(*) FROM main.{name}").fetchone()[0]
+            expected = cursor.execute(f"SELECT COUNT(*) FROM source.{name}").fetchone()[0]
+            if copied != expected:
+                raise sqlite3.Error(f"copied {copied} of {expected} rows of '{name}'")
+            print(f"Copied {copied} rows of '{name}'.")
+        conn.commit()
+
+        for name in tables:
+            cursor.execute(f"DROP TABLE source.{name}")
+        conn.commit()
+        cursor.execute("PRAGMA source.incremental_vacuum")
+        print(f"Successfully moved log tables to {logs_path}.")
+        print(f"Set LOGS_DATABASE_URL=sqlite+aiosqlite:///{logs_path} before starting the application.")
+    except sqlite3.Error as e:
+        print(f"Error moving log tables: {e}")
+        conn.rollback()
+        sys.exit(1)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    migrate()
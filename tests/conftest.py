@@ -40,3 +40,13 @@ def reset_settings_singleton():
     if 'app.config' in sys.modules:
         import app.config
         app.config._settings = None
+
+
+@pytest.fixture(autouse=True)
+def reset_log_count_cache():
+    """Clear cached log counts so totals don't leak between test databases."""
+    from app.services.log_query import clear_count_cache
+
+    clear_count_cache()
+    yield
+    clear_count_cache()
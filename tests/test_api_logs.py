@@ -11,7 +11,7 @@ from httpx import AsyncClient, ASGITransport
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 
 from app.main import app
-from app.database import get_session, Base
+from app.database import get_read_session, get_session, Base
 from app.models import Task, ExecutionLog
 
 
@@ -58,6 +58,7 @@ async def client(test_session):
         yield test_session
 
     app.dependency_overrides[get_session] = override_get_session
+    app.dependency_overrides[get_read_session] = override_get_session
 
     async with AsyncClient(
         transport=ASGITransport(app=app),
@@ -245,3 +246,141 @@ class TestGetTaskLogs:
         response = await client.get(f"/api/tasks/{sample_task.id}/logs?limit=100")
 
         assert response.status_code == 200
+
+
+class TestGetTaskLogsCursor:
+    """Tests for cursor pagination of GET /api/tasks/{task_id}/logs."""
+
+    @pytest_asyncio.fixture
+    async def many_logs(self, test_session, sample_task):
+        """Create 5 logs for the sample task, one minute apart."""
+        from app.services.log_writer import apply_execution_logs
+
+        await apply_execution_logs(test_session, [
+            {
+                "task_id": sample_task.id,
+                "executed_at": datetime(2025, 12, 23, 10, i, 0),
+                "status": "success",
+                "response_summary": f"Response {i}",
+                "error_message": None,
+            }
+            for i in range(5)
+        ])
+        await test_session.commit()
+        return sample_task
+
+    @pytest.mark.asyncio
+    async def test_cursor_pages_through_all_logs(self, client, many_logs):
+        """Test following X-Next-Cursor returns every log exactly once."""
+        seen = []
+        url = f"/api/tasks/{many_logs.id}/logs?limit=2"
+        response = await client.get(url)
+        seen.extend(log["response_summary"] for log in response.json())
+        while "X-Next-Cursor" in response.headers:
+            response = await client.get(f"{url}&cursor={response.headers['X-Next-Cursor']}")
+            assert response.status_code == 200
+            seen.extend(log["response_summary"] for log in response.json())
+
+        assert seen == [f"Response {i}" for i in range(4, -1, -1)]
+
+    @pytest.mark.asyncio
+    async def test_prev_cursor_returns_previous_page(self, client, many_logs):
+        """Test X-Prev-Cursor leads back to the newer page."""
+        url = f"/api/tasks/{many_logs.id}/logs?limit=2"
+        first = await client.get(url)
+        assert "X-Prev-Cursor" not in first.headers
+
+        second = await client.get(f"{url}&cursor={first.headers['X-Next-Cursor']}")
+        back = await client.get(f"{url}&cursor={second.headers['X-Prev-Cursor']}")
+
+        assert back.json() == first.json()
+
+    @pytest.mark.asyncio
+    async def test_include_total(self, client, many_logs):
+        """Test include_total sets X-Total-Count."""
+        response = await client.get(f"/api/tasks/{many_logs.id}/logs?limit=2&include_total=true")
+
+        assert response.headers["X-Total-Count"] == "5"
+
+    @pytest.mark.asyncio
+    async def test_total_omitted_by_default(self, client, many_logs):
+        """Test X-Total-Count is only computed on request."""
+        response = await client.get(f"/api/tasks/{many_logs.id}/logs")
+
+        assert "X-Total-Count" not in response.headers
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor_rejected(self, client, sample_task):
+        """Test that a malformed cursor returns 400."""
+        response = await client.get(f"/api/tasks/{sample_task.id}/logs?cursor=not-a-cursor")
+
+        assert response.status_code == 400
+
+
+class TestGetTaskStats:
+    """Tests for GET /api/tasks/{task_id}/stats."""
+
+    @pytest_asyncio.fixture
+    async def task_pair(self, test_session, sample_task):
+        """Two tasks on the same endpoint with latencies recorded today."""
+        from app.services.log_writer import apply_execution_logs
+
+        other = Task(
+            name="Other Task",
+            api_endpoint=sample_task.api_endpoint,
+            api_key=sample_task.api_key,
+            schedule_type="interval",
+            interval_minutes=60,
+            message_content="Hi",
+            model="gpt-4",
+        )
+        test_session.add(other)
+        await test_session.commit()
+
+        now = datetime.now(timezone.utc)
+        batch = [
+            {"task_id": sample_task.id, "executed_at": now, "status": "success",
+             "latency_ms": ms, "connect_ms": 0, "ttfb_ms": ms - 5}
+            for ms in range(10, 110)
+        ]
+        batch += [
+            {"task_id": other.id, "executed_at": now, "status": "success", "latency_ms": 1000},
+            {"task_id": sample_task.id, "executed_at": now, "status": "failed"},
+        ]
+        await apply_execution_logs(test_session, batch)
+        await test_session.commit()
+        return sample_task
+
+    @pytest.mark.asyncio
+    async def test_task_and_endpoint_percentiles(self, client, task_pair):
+        """Test that the task's and endpoint's percentiles come back."""
+        response = await client.get(f"/api/tasks/{task_pair.id}/stats?days=1")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert (data["success"], data["failed"]) == (100, 1)
+        assert data["latency"]["total"]["count"] == 100
+        assert 58 <= data["latency"]["total"]["p50"] <= 60
+        assert data["latency"]["connect"]["p99"] == 0
+        assert data["endpoint_tasks"] == 2
+        assert data["endpoint_latency"]["total"]["count"] == 101
+        assert data["api_endpoint"] == task_pair.api_endpoint
+
+    @pytest.mark.asyncio
+    async def test_empty_window(self, client, sample_task):
+        """Test a task without executions."""
+        response = await client.get(f"/api/tasks/{sample_task.id}/stats")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["days"] == 7
+        assert data["latency"]["total"] == {"count": 0, "p50": None, "p95": None, "p99": None}
+        assert data["latency"]["lag"]["count"] == 0
+        assert data["misfires"] == {"missed": 0, "coalesced": 0, "max_instances": 0}
+
+    @pytest.mark.asyncio
+    async def test_task_not_found(self, client):
+        """Test 404 for an unknown task."""
+        response = await client.get("/api/tasks/99999/stats")
+
+        assert response.status_code == 404
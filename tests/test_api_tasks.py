@@ -11,7 +11,7 @@ from httpx import AsyncClient, ASGITransport
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 
 from app.main import app
-from app.database import get_session, Base
+from app.database import get_read_session, get_session, Base
 
 
 # Test database setup
@@ -57,6 +57,7 @@ async def client(test_session):
         yield test_session
 
     app.dependency_overrides[get_session] = override_get_session
+    app.dependency_overrides[get_read_session] = override_get_session
 
     async with AsyncClient(
         transport=ASGITransport(app=app),
@@ -0,0 +1,145 @@
+"""Tests for the load-test stub server and harness."""
+
+import pytest
+import pytest_asyncio
+
+from app.bench.stub import StubConfig, StubServer
+from app.services.http_client import close_http_clients
+from app.services.openai_service import OpenAIServiceError, send_message
+
+
+@pytest_asyncio.fixture
+async def start_stub():
+    """Start stub servers on free ports and close them afterwards."""
+    servers = []
+
+    async def start(**options) -> StubServer:
+        server = StubServer(StubConfig(latency="fixed", latency_ms=0, seed=1, **options))
+        await server.start()
+        servers.append(server)
+        return server
+
+    yield start
+
+    await close_http_clients()
+    for server in servers:
+        await server.close()
+
+
+class TestStubServer:
+    """Tests for the OpenAI-compatible stub."""
+
+    @pytest.mark.asyncio
+    async def test_text_response(self, start_stub):
+        """Test that send_message parses a stub completion."""
+        server = await start_stub(response_chars=50)
+
+        response = await send_message(server.url, "sk-test", "Hello")
+
+        assert len(response.response_summary) == 50
+        assert server.stats()["success"] == 1
+
+    @pytest.mark.asyncio
+    async def test_image_response(self, start_stub):
+        """Test that image payloads are reported as generated images."""
+        server = await start_stub(image_rate=1.0, image_kb=16)
+
+        response = await send_message(server.url, "sk-test", "Draw")
+
+        assert response.response_summary == "[图像生成成功] 共 1 张图片"
+        assert server.stats()["bytes_sent"] > 16 * 1024
+
+    @pytest.mark.asyncio
+    async def test_error_rate(self, start_stub):
+        """Test that errors are returned as HTTP 500."""
+        server = await start_stub(error_rate=1.0)
+
+        with pytest.raises(OpenAIServiceError) as exc_info:
+            await send_message(server.url, "sk-test", "Hello")
+
+        assert exc_info.value.status_code == 500
+        assert server.stats()["errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_random_429_has_retry_after(self, start_stub):
+        """Test that random 429s carry a parsable Retry-After."""
+        server = await start_stub(rate_limit_rate=1.0, retry_after_seconds=2)
+
+        with pytest.raises(OpenAIServiceError) as exc_info:
+            await send_message(server.url, "sk-test", "Hello")
+
+        assert exc_info.value.status_code == 429
+        assert exc_info.value.rate_limit.retry_after == 2.0
+
+    @pytest.mark.asyncio
+    async def test_rpm_per_key(self, start_stub):
+        """Test that each key gets its own per-minute allowance."""
+        server = await start_stub(rpm_per_key=2)
+
+        await send_message(server.url, "sk-a", "Hello")
+        await send_message(server.url, "sk-a", "Hello")
+        with pytest.raises(OpenAIServiceError) as exc_info:
+            await send_message(server.url, "sk-a", "Hello")
+        await send_message(server.url, "sk-b", "Hello")
+
+        assert exc_info.value.status_code == 429
+        assert exc_info.value.rate_limit.remaining == 0
+        assert exc_info.value.rate_limit.reset_seconds > 0
+        assert server.stats()["rate_limited"] == 1
+
+    @pytest.mark.parametrize("latency", ["fixed", "uniform", "exponential", "lognormal"])
+    def test_latency_distributions(self, latency):
+        """Test that latency samples are non-negative and centered on the mean."""
+        server = StubServer(StubConfig(latency=latency, latency_ms=100, latency_spread=0.5, seed=7))
+
+        samples = sorted(server.sample_latency() for _ in range(2000))
+
+        assert samples[0] >= 0
+        assert 0.05 < samples[len(samples) // 2] < 0.15
+
+
+class TestHarness:
+    """Tests for a short benchmark run."""
+
+    def test_peak_rss_without_resource_module(self):
+        """Test that peak RSS is reported as 0 where resource is unavailable (Windows)."""
+        import sys
+        from unittest.mock import patch
+
+        from app.bench.harness import _peak_rss_bytes
+
+        assert _peak_rss_bytes() > 0
+        with patch.dict(sys.modules, {"resource": None}):
+            assert _peak_rss_bytes() == 0
+
+    @pytest.mark.asyncio
+    async def test_run_bench(self, tmp_path, monkeypatch):
+        """Test that seeded tasks fire against the stub and are logged."""
+        from app.bench.harness import BenchConfig, format_report, run_bench
+        from app.database import reset_engine
+        from app.services.log_writer import reset_log_writer
+        from app.services.schedule_monitor import reset_schedule_monitor
+
+        monkeypatch.setenv("DATABASE_URL", f"sqlite+aiosqlite:///{tmp_path / 'bench.db'}")
+        monkeypatch.setenv("TASK_CACHE_RECONCILE_SECONDS", "0")
+        monkeypatch.setenv("LOG_RETENTION_INTERVAL_MINUTES", "0")
+        reset_engine()
+        reset_log_writer()
+        reset_schedule_monitor()
+        try:
+            report = await run_bench(
+                BenchConfig(tasks=5, intervals=(1,), keys=2, duration=2.5),
+                StubConfig(latency="fixed", latency_ms=5),
+            )
+        finally:
+            reset_engine()
+            reset_log_writer()
+            reset_schedule_monitor()
+
+        assert report["fires"] >= 5
+        assert report["executions"]["success"] == report["fires"]
+        assert report["db_rows_written"] == report["fires"]
+        assert report["stub"]["requests"] == report["fires"]
+        assert report["lag_ms"]["p50"] is not None
+        assert report["cpu_percent"] >= 0
+        assert "lag p50/p95/p99/max" in format_report(report)
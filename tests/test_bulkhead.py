@@ -0,0 +1,166 @@
+"""Tests for bulkhead concurrency limits."""
+
+import asyncio
+
+import pytest
+
+from app.services.bulkhead import Bulkhead, BulkheadRegistry, BulkheadRejected
+
+
+@pytest.fixture(autouse=True)
+def settings_env(monkeypatch):
+    """Provide required settings for the registry."""
+    monkeypatch.setenv("ADMIN_PASSWORD", "test123")
+
+
+class TestBulkhead:
+    """Tests for a single bulkhead."""
+
+    @pytest.mark.asyncio
+    async def test_acquire_within_limit(self):
+        """Test that fires are admitted while slots are free."""
+        bulkhead = Bulkhead("test", max_concurrent=2, max_queue=0, overflow="queue")
+
+        await bulkhead.acquire(1)
+        await bulkhead.acquire(2)
+
+        assert bulkhead.in_flight == 2
+        bulkhead.release()
+        bulkhead.release()
+        assert bulkhead.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_queue_waits_for_release(self):
+        """Test that queued fires get the slot when it is released."""
+        bulkhead = Bulkhead("test", max_concurrent=1, max_queue=5, overflow="queue")
+        await bulkhead.acquire(1)
+
+        waiter = asyncio.ensure_future(bulkhead.acquire(2))
+        await asyncio.sleep(0)
+        assert bulkhead.queued == 1
+        assert not waiter.done()
+
+        bulkhead.release()
+        await waiter
+
+        assert bulkhead.in_flight == 1
+        assert bulkhead.queued == 0
+
+    @pytest.mark.asyncio
+    async def test_queue_full_rejects(self):
+        """Test that a full wait queue rejects new fires."""
+        bulkhead = Bulkhead("test", max_concurrent=1, max_queue=1, overflow="queue")
+        await bulkhead.acquire(1)
+        waiter = asyncio.ensure_future(bulkhead.acquire(2))
+        await asyncio.sleep(0)
+
+        with pytest.raises(BulkheadRejected) as exc_info:
+            await bulkhead.acquire(3)
+
+        assert exc_info.value.reason == "full"
+        assert bulkhead.rejected == 1
+        waiter.cancel()
+
+    @pytest.mark.asyncio
+    async def test_skip_rejects_immediately(self):
+        """Test that the skip policy never queues."""
+        bulkhead = Bulkhead("test", max_concurrent=1, max_queue=5, overflow="skip")
+        await bulkhead.acquire(1)
+
+        with pytest.raises(BulkheadRejected) as exc_info:
+            await bulkhead.acquire(2)
+
+        assert exc_info.value.reason == "skipped"
+        assert bulkhead.queued == 0
+
+    @pytest.mark.asyncio
+    async def test_coalesce_drops_duplicate_waiting_task(self):
+        """Test that the coalesce policy keeps one waiting fire per task."""
+        bulkhead = Bulkhead("test", max_concurrent=1, max_queue=5, overflow="coalesce")
+        await bulkhead.acquire(1)
+        waiter = asyncio.ensure_future(bulkhead.acquire(2))
+        await asyncio.sleep(0)
+
+        with pytest.raises(BulkheadRejected) as exc_info:
+            await bulkhead.acquire(2)
+
+        assert exc_info.value.reason == "coalesced"
+        assert bulkhead.coalesced == 1
+        assert bulkhead.queued == 1
+        waiter.cancel()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_queue(self):
+        """Test that cancelling a waiting fire removes it from the queue."""
+        bulkhead = Bulkhead("test", max_concurrent=1, max_queue=5, overflow="queue")
+        await bulkhead.acquire(1)
+        waiter = asyncio.ensure_future(bulkhead.acquire(2))
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        assert bulkhead.queued == 0
+        bulkhead.release()
+        assert bulkhead.in_flight == 0
+
+
+class TestBulkheadRegistry:
+    """Tests for the global/host/key bulkhead registry."""
+
+    @pytest.mark.asyncio
+    async def test_guard_holds_all_bulkheads(self):
+        """Test that guard() occupies the global, host and key bulkheads."""
+        registry = BulkheadRegistry()
+
+        async with registry.guard(1, "https://api.example.com/v1/chat", "abc123"):
+            in_flight = {s["name"]: s["in_flight"] for s in registry.stats()}
+            assert in_flight == {"global": 1, "host:api.example.com": 1, "key:abc123": 1}
+
+        assert all(s["in_flight"] == 0 for s in registry.stats())
+
+    @pytest.mark.asyncio
+    async def test_guard_releases_on_rejection(self, monkeypatch):
+        """Test that a rejection by the host bulkhead releases the key slot."""
+        monkeypatch.setenv("BULKHEAD_HOST_MAX_CONCURRENT", "1")
+        monkeypatch.setenv("BULKHEAD_OVERFLOW", "skip")
+        registry = BulkheadRegistry()
+
+        async with registry.guard(1, "https://api.example.com/v1/chat", "abc123"):
+            with pytest.raises(BulkheadRejected):
+                async with registry.guard(2, "https://api.example.com/v1/chat", "def456"):
+                    pass
+
+            assert registry.keys["key:def456"].in_flight == 0
+            assert registry.global_bulkhead.in_flight == 1
+
+    @pytest.mark.asyncio
+    async def test_saturated_host_does_not_block_other_hosts(self, monkeypatch):
+        """Test that fires queued on a busy host hold no global slot."""
+        monkeypatch.setenv("BULKHEAD_GLOBAL_MAX_CONCURRENT", "2")
+        monkeypatch.setenv("BULKHEAD_HOST_MAX_CONCURRENT", "1")
+        registry = BulkheadRegistry()
+        release = asyncio.Event()
+
+        async def slow_fire(task_id: int):
+            async with registry.guard(task_id, "https://slow.example.com/v1", f"key{task_id}"):
+                await release.wait()
+
+        fires = [asyncio.create_task(slow_fire(i)) for i in range(1, 4)]
+        await asyncio.sleep(0)
+
+        host_stats = registry.hosts["host:slow.example.com"].stats()
+        assert host_stats["in_flight"] == 1
+        assert host_stats["queued"] == 2
+        assert registry.global_bulkhead.in_flight == 1
+
+        async def fast_fire():
+            async with registry.guard(9, "https://fast.example.com/v1", "key9"):
+                return True
+
+        assert await asyncio.wait_for(fast_fire(), timeout=1)
+
+        release.set()
+        await asyncio.gather(*fires)
+        assert all(s["in_flight"] == 0 for s in registry.stats())
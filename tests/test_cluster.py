@@ -0,0 +1,300 @@
+"""Tests for database-backed scheduler leases."""
+
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database import Base
+from app.models import SchedulerLease, SchedulerNode
+from app.services.cluster import (
+    LEADER_LEASE,
+    ClusterNode,
+    HashRing,
+    _database_now,
+    execution_fence,
+    fence_valid,
+    is_assigned,
+    owns_task,
+    reset_cluster,
+)
+
+
+@pytest.fixture(autouse=True)
+def settings_env(monkeypatch):
+    """Provide required settings and reset the node singleton."""
+    monkeypatch.setenv("ADMIN_PASSWORD", "test123")
+    reset_cluster()
+    yield
+    reset_cluster()
+
+
+@pytest_asyncio.fixture
+async def session_maker(tmp_path):
+    """Create a shared file-backed database and patch the cluster to use it."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    with patch("app.services.cluster.get_session_maker", return_value=maker):
+        yield maker
+
+    await engine.dispose()
+
+
+def make_node(node_id: str, mode: str = "leader") -> ClusterNode:
+    """Create a node with the default lease timings."""
+    return ClusterNode(node_id=node_id, lease_seconds=30, heartbeat_seconds=10, mode=mode)
+
+
+async def expire_lease(maker) -> None:
+    """Move the leader lease expiry into the past, as if its holder died."""
+    async with maker() as session:
+        await session.execute(
+            update(SchedulerLease)
+            .where(SchedulerLease.name == LEADER_LEASE)
+            .values(expires_at=datetime(2000, 1, 1))
+        )
+        await session.commit()
+
+
+class TestLeaderLease:
+    """Tests for acquiring, renewing and handing over the lease."""
+
+    @pytest.mark.asyncio
+    async def test_single_leader(self, session_maker):
+        """Test that only the first node to heartbeat becomes leader."""
+        node_a, node_b = make_node("a"), make_node("b")
+
+        await node_a.heartbeat()
+        await node_b.heartbeat()
+
+        assert node_a.is_leader
+        assert not node_b.is_leader
+        assert node_a.token == 1
+
+    @pytest.mark.asyncio
+    async def test_renewal_keeps_token(self, session_maker):
+        """Test that renewing the lease does not change the fencing token."""
+        node = make_node("a")
+
+        await node.heartbeat()
+        await node.heartbeat()
+
+        assert node.token == 1
+        assert node.leader_acquisitions == 1
+
+    @pytest.mark.asyncio
+    async def test_expired_lease_is_reclaimed_and_fenced(self, session_maker):
+        """Test that a dead leader's lease moves on and the old token cannot renew."""
+        node_a, node_b = make_node("a"), make_node("b")
+        await node_a.heartbeat()
+
+        await expire_lease(session_maker)
+        await node_b.heartbeat()
+        await node_a.heartbeat()
+
+        assert node_b.is_leader
+        assert node_b.token == 2
+        assert not node_a.is_leader
+        assert node_a.token is None
+
+    @pytest.mark.asyncio
+    async def test_stop_releases_lease(self, session_maker):
+        """Test that a graceful stop hands the lease over at the next heartbeat."""
+        node_a, node_b = make_node("a"), make_node("b")
+        await node_a.heartbeat()
+        await node_b.heartbeat()
+
+        await node_a.stop()
+        await node_b.heartbeat()
+
+        assert node_b.is_leader
+        async with session_maker() as session:
+            nodes = (await session.execute(select(SchedulerNode.node_id))).scalars().all()
+        assert nodes == ["b"]
+
+    @pytest.mark.asyncio
+    async def test_local_lease_expires_without_heartbeat(self, session_maker):
+        """Test that leadership lapses locally before the database lease expires."""
+        node = make_node("a")
+        await node.heartbeat()
+
+        with patch("app.services.cluster.time.monotonic", return_value=time.monotonic() + 21):
+            assert not node.is_leader
+
+
+    @pytest.mark.asyncio
+    async def test_lease_expiry_uses_database_clock(self, session_maker):
+        """Test that the lease is stamped from the database clock, not the node's."""
+        db_now = datetime(2030, 1, 1, 12, 0, 0)
+        node = make_node("a")
+
+        with patch("app.services.cluster._database_now", AsyncMock(return_value=db_now)):
+            await node.heartbeat()
+
+        async with session_maker() as session:
+            lease = await session.get(SchedulerLease, LEADER_LEASE)
+            beat = await session.get(SchedulerNode, "a")
+        assert lease.expires_at == db_now + timedelta(seconds=30)
+        assert beat.heartbeat_at == db_now
+
+    @pytest.mark.asyncio
+    async def test_database_now_converts_server_time_to_naive_utc(self):
+        """Test that a server timestamp with a time zone is returned as naive UTC."""
+        session = MagicMock()
+        session.get_bind.return_value.dialect.name = "postgresql"
+        server_now = datetime(2030, 1, 1, 14, 0, tzinfo=timezone(timedelta(hours=2)))
+        session.scalar = AsyncMock(return_value=server_now)
+
+        assert await _database_now(session) == datetime(2030, 1, 1, 12, 0)
+
+
+class TestHashRing:
+    """Tests for consistent-hash task assignment."""
+
+    def test_every_task_has_one_owner(self):
+        """Test that tasks are spread roughly evenly across members."""
+        ring = HashRing(["a", "b", "c"])
+
+        counts = {"a": 0, "b": 0, "c": 0}
+        for task_id in range(3000):
+            counts[ring.owner_of(task_id)] += 1
+
+        assert all(600 < count < 1400 for count in counts.values())
+
+    def test_adding_member_moves_few_tasks(self):
+        """Test that a join only moves tasks to the new member."""
+        before = HashRing(["a", "b", "c"])
+        after = HashRing(["a", "b", "c", "d"])
+
+        moved = [
+            task_id for task_id in range(3000)
+            if before.owner_of(task_id) != after.owner_of(task_id)
+        ]
+
+        assert all(after.owner_of(task_id) == "d" for task_id in moved)
+        assert len(moved) < 3000 * 0.4
+
+    def test_empty_ring(self):
+        """Test that an empty ring owns nothing."""
+        assert HashRing([]).owner_of(1) is None
+
+
+class TestPartitionMode:
+    """Tests for splitting tasks across live nodes."""
+
+    @pytest.mark.asyncio
+    async def test_membership_from_heartbeats(self, session_maker):
+        """Test that nodes discover each other and split the tasks."""
+        node_a, node_b = make_node("a", "partition"), make_node("b", "partition")
+
+        await node_a.heartbeat()
+        await node_b.heartbeat()
+        await node_a.heartbeat()
+
+        assert node_a.members == ["a", "b"]
+        assert node_b.members == ["a", "b"]
+        for task_id in range(100):
+            assert node_a.owns(task_id) != node_b.owns(task_id)
+            assert node_a.is_assigned(task_id) == node_a.owns(task_id)
+
+    @pytest.mark.asyncio
+    async def test_membership_change_notifies_listeners(self, session_maker):
+        """Test that joins and leaves trigger a rebalance callback."""
+        node_a, node_b = make_node("a", "partition"), make_node("b", "partition")
+        calls = []
+
+        async def listener():
+            calls.append(list(node_a.members))
+
+        node_a.add_listener(listener)
+        await node_a.heartbeat()
+        await node_b.heartbeat()
+        await node_a.heartbeat()
+        await node_a.heartbeat()
+        await node_b.stop()
+        await node_a.heartbeat()
+
+        assert calls == [["a", "b"], ["a"]]
+
+    @pytest.mark.asyncio
+    async def test_stale_view_stops_execution(self, session_maker):
+        """Test that a node that cannot heartbeat stops executing its share."""
+        node = make_node("a", "partition")
+        await node.heartbeat()
+        assert node.owns(1)
+
+        with patch("app.services.cluster.time.monotonic", return_value=time.monotonic() + 21):
+            assert not node.owns(1)
+            assert node.is_assigned(1)
+
+
+class TestOwnsTask:
+    """Tests for the execution guard used by the scheduler."""
+
+    def test_single_node_owns_everything(self):
+        """Test that every task is owned when cluster mode is disabled."""
+        assert owns_task(1) is True
+
+    @pytest.mark.asyncio
+    async def test_follower_does_not_own_tasks(self, session_maker, monkeypatch):
+        """Test that a node without the lease does not execute fires."""
+        monkeypatch.setenv("CLUSTER_ENABLED", "true")
+        leader = make_node("leader")
+        await leader.heartbeat()
+
+        from app.services.cluster import get_cluster
+        await get_cluster().heartbeat()
+
+        assert owns_task(1) is False
+
+
+    @pytest.mark.asyncio
+    async def test_fence_invalid_after_takeover(self, session_maker, monkeypatch):
+        """Test that a result started under an old token may not be written."""
+        monkeypatch.setenv("CLUSTER_ENABLED", "true")
+        from app.services.cluster import get_cluster
+
+        node = get_cluster()
+        await node.heartbeat()
+        token = execution_fence()
+        assert token is not None
+        assert fence_valid(1, token) is True
+
+        await expire_lease(session_maker)
+        await make_node("other").heartbeat()
+        await node.heartbeat()
+
+        assert fence_valid(1, token) is False
+
+    def test_fence_without_cluster(self):
+        """Test that results are always written when cluster mode is disabled."""
+        assert execution_fence() is None
+        assert fence_valid(1, None) is True
+
+    def test_leader_mode_assigns_every_task(self, monkeypatch):
+        """Test that standbys keep every task registered in leader mode."""
+        monkeypatch.setenv("CLUSTER_ENABLED", "true")
+
+        assert all(is_assigned(task_id) for task_id in range(10))
+
+
+class TestClusterSettings:
+    """Tests for cluster setting validation."""
+
+    def test_heartbeat_must_fit_in_lease(self, monkeypatch):
+        """Test that heartbeats slower than half the lease are rejected."""
+        from pydantic import ValidationError
+        from app.config import Settings
+
+        monkeypatch.setenv("CLUSTER_LEASE_SECONDS", "10")
+        monkeypatch.setenv("CLUSTER_HEARTBEAT_SECONDS", "6")
+
+        with pytest.raises(ValidationError):
+            Settings()
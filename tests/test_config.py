@@ -104,6 +104,15 @@ class TestSettings:
             Settings(_env_file=None)
         assert "database_url" in str(exc_info.value)
 
+    def test_logs_database_url_must_be_sqlite(self, monkeypatch):
+        """Test ValidationError for a non-SQLite LOGS_DATABASE_URL."""
+        monkeypatch.setenv("ADMIN_PASSWORD", "test123")
+        monkeypatch.setenv("LOGS_DATABASE_URL", "postgresql+asyncpg://u:p@db/logs")
+        from app.config import Settings
+        with pytest.raises(ValidationError) as exc_info:
+            Settings(_env_file=None)
+        assert "logs_database_url" in str(exc_info.value)
+
     def test_get_settings_returns_singleton(self, monkeypatch):
         """Test get_settings() returns the same instance on repeated calls."""
         monkeypatch.setenv("ADMIN_PASSWORD", "test123")
@@ -0,0 +1,160 @@
+"""Tests for the pooled HTTP client module."""
+
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+import pytest_asyncio
+
+
+@pytest.fixture(autouse=True)
+def admin_password(monkeypatch):
+    """Provide required settings for client creation."""
+    monkeypatch.setenv("ADMIN_PASSWORD", "test123")
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def close_clients():
+    """Close pooled clients after each test."""
+    yield
+    from app.services.http_client import close_http_clients
+    await close_http_clients()
+
+
+class TestGetOrigin:
+    """Tests for origin normalization."""
+
+    def test_default_https_port(self):
+        """Test that https URLs default to port 443."""
+        from app.services.http_client import get_origin
+
+        assert get_origin("https://API.openai.com/v1/chat/completions") == "https://api.openai.com:443"
+
+    def test_explicit_port(self):
+        """Test that explicit ports are kept."""
+        from app.services.http_client import get_origin
+
+        assert get_origin("http://localhost:8080/v1/chat") == "http://localhost:8080"
+
+
+class TestGetHttpClient:
+    """Tests for pooled client lookup."""
+
+    @pytest.mark.asyncio
+    async def test_same_origin_shares_client(self):
+        """Test that endpoints on the same origin reuse one client."""
+        from app.services.http_client import get_http_client
+
+        first = get_http_client("https://api.example.com/v1/chat/completions")
+        second = get_http_client("https://api.example.com/v1/other")
+
+        assert first is second
+
+    @pytest.mark.asyncio
+    async def test_different_origins_get_separate_clients(self):
+        """Test that different origins get their own client."""
+        from app.services.http_client import get_http_client
+
+        first = get_http_client("https://a.example.com/v1/chat/completions")
+        second = get_http_client("https://b.example.com/v1/chat/completions")
+
+        assert first is not second
+
+    @pytest.mark.asyncio
+    async def test_http2_falls_back_without_h2(self, monkeypatch):
+        """Test that HTTP/2 falls back to HTTP/1.1 when h2 is missing."""
+        monkeypatch.setenv("HTTP2_ENABLED", "true")
+        from app.services import http_client
+
+        monkeypatch.setattr(http_client, "_http2_available", lambda: False)
+        with patch.object(http_client.httpx, "AsyncClient", wraps=httpx.AsyncClient) as client_cls:
+            client = http_client.get_http_client("https://api.example.com/v1")
+
+        assert client_cls.call_args.kwargs["http2"] is False
+        assert not client.is_closed
+
+    @pytest.mark.asyncio
+    async def test_close_http_clients(self):
+        """Test that close_http_clients closes and forgets all clients."""
+        from app.services.http_client import close_http_clients, get_http_client, get_pool_origins
+
+        client = get_http_client("https://api.example.com/v1")
+        await close_http_clients()
+
+        assert client.is_closed
+        assert get_pool_origins() == []
+
+
+class TestRequestTrace:
+    """Tests for connect and first-byte timings from trace events."""
+
+    @pytest.mark.asyncio
+    async def test_new_connection_timings(self):
+        """Test that connect and TTFB are taken from the trace events."""
+        from app.services.http_client import RequestTrace
+
+        trace = RequestTrace()
+        await trace("connection.connect_tcp.started", {})
+        await trace("connection.connect_tcp.complete", {})
+        await trace("connection.start_tls.complete", {})
+        await trace("http11.send_request_headers.started", {})
+        await trace("http11.receive_response_headers.complete", {})
+
+        assert trace.connect_ms >= 0
+        assert trace.ttfb_ms is not None and trace.ttfb_ms >= trace.connect_ms
+
+    @pytest.mark.asyncio
+    async def test_phases_of_new_connection(self):
+        """Test the waterfall segments of a request on a new connection."""
+        from app.services.http_client import RequestTrace
+
+        trace = RequestTrace()
+        for event in (
+            "connection.connect_tcp.started",
+            "connection.connect_tcp.complete",
+            "connection.start_tls.started",
+            "connection.start_tls.complete",
+            "http11.send_request_headers.started",
+            "http11.receive_response_headers.complete",
+        ):
+            await trace(event, {})
+        trace.finish()
+
+        assert list(trace.phases()) == ["acquire", "connect", "tls", "ttfb", "body"]
+
+    @pytest.mark.asyncio
+    async def test_phases_of_reused_connection(self):
+        """Test that a pooled connection has no connect or TLS segment."""
+        from app.services.http_client import RequestTrace
+
+        trace = RequestTrace()
+        await trace("http2.send_request_headers.started", {})
+        await trace("http2.receive_response_headers.complete", {})
+        trace.finish()
+
+        assert list(trace.phases()) == ["acquire", "ttfb", "body"]
+
+    @pytest.mark.asyncio
+    async def test_phases_of_failed_connect(self):
+        """Test that a connect timeout is charged to the connect phase."""
+        from app.services.http_client import RequestTrace
+
+        trace = RequestTrace()
+        await trace("connection.connect_tcp.started", {})
+        await asyncio.sleep(0.02)
+
+        phases = trace.phases()
+        assert list(phases) == ["acquire", "connect"]
+        assert phases["connect"] >= 20
+
+    @pytest.mark.asyncio
+    async def test_reused_connection_has_no_connect_time(self):
+        """Test that a pooled connection reports connect_ms 0."""
+        from app.services.http_client import RequestTrace
+
+        trace = RequestTrace()
+        await trace("http2.receive_response_headers.complete", {})
+
+        assert trace.connect_ms == 0
+        assert trace.ttfb_ms is not None
@@ -0,0 +1,89 @@
+"""Tests for the mergeable latency histograms."""
+
+import random
+from datetime import date, datetime
+
+from app.services.latency import (
+    RELATIVE_ACCURACY,
+    ZERO_BUCKET,
+    LatencyHistogram,
+    bucket_of,
+    bucket_value,
+    histogram_rows,
+)
+
+
+def exact_quantile(values: list[int], q: float) -> int:
+    """Quantile by sorting, with the histogram's rank convention."""
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+class TestBuckets:
+    """Tests for the logarithmic bucket scheme."""
+
+    def test_bucket_value_within_relative_accuracy(self):
+        """Test that every value maps to a bucket representing it within α."""
+        for value in (1, 2, 7, 99, 100, 101, 1234, 59999, 600000):
+            estimate = bucket_value(bucket_of(value))
+            assert abs(estimate - value) <= value * RELATIVE_ACCURACY + 1e-9
+
+    def test_zero_has_own_bucket(self):
+        """Test that zero latencies (reused connections) are kept apart."""
+        assert bucket_of(0) == ZERO_BUCKET
+        assert bucket_of(1) != ZERO_BUCKET
+        assert bucket_value(ZERO_BUCKET) == 0.0
+
+
+class TestLatencyHistogram:
+    """Tests for LatencyHistogram."""
+
+    def test_percentiles_match_sorted_values(self):
+        """Test p50/p95/p99 against exact quantiles of random latencies."""
+        rng = random.Random(42)
+        values = [int(rng.lognormvariate(6, 0.8)) + 1 for _ in range(5000)]
+        histogram = LatencyHistogram()
+        for value in values:
+            histogram.add(value)
+
+        for q in (0.5, 0.95, 0.99):
+            exact = exact_quantile(values, q)
+            assert abs(histogram.quantile(q) - exact) <= exact * RELATIVE_ACCURACY + 1
+
+    def test_merge_equals_combined(self):
+        """Test that merging two histograms equals recording all values in one."""
+        first, second, combined = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+        for value in range(1, 500):
+            (first if value % 2 else second).add(value)
+            combined.add(value)
+
+        first.merge(second)
+
+        assert first.counts == combined.counts
+        assert first.quantile(0.95) == combined.quantile(0.95)
+
+    def test_empty_summary(self):
+        """Test that an empty histogram reports no percentiles."""
+        assert LatencyHistogram().summary() == {"count": 0, "p50": None, "p95": None, "p99": None}
+
+
+class TestHistogramRows:
+    """Tests for building histogram upsert rows."""
+
+    def test_rows_per_metric_and_bucket(self):
+        """Test that each recorded metric adds to its own bucket row."""
+        batch = [
+            {"task_id": 1, "executed_at": datetime(2024, 1, 15), "latency_ms": 100,
+             "connect_ms": 0, "ttfb_ms": 90},
+            {"task_id": 1, "executed_at": datetime(2024, 1, 15), "latency_ms": 100,
+             "connect_ms": None, "ttfb_ms": None},
+            {"task_id": 1, "executed_at": datetime(2024, 1, 15), "latency_ms": None},
+        ]
+
+        rows = histogram_rows(batch, lambda executed_at: executed_at.date())
+
+        by_metric = {row["metric"]: row for row in rows}
+        assert len(rows) == 3
+        assert by_metric["total"]["count"] == 2
+        assert by_metric["connect"]["bucket"] == ZERO_BUCKET
+        assert all(row["day"] == date(2024, 1, 15) for row in rows)
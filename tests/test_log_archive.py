@@ -0,0 +1,288 @@
+"""Tests for the compressed execution log archive."""
+
+import gzip
+import json
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database import Base
+from app.models import ExecutionLog, Task
+from app.services import log_query
+from app.services.log_archive import LogArchive, _decode_row
+
+
+def make_row(log_id: int, executed_at: datetime, task_id: int = 1, status: str = "success") -> dict:
+    """Build archived ExecutionLog column values."""
+    return {
+        "id": log_id,
+        "task_id": task_id,
+        "executed_at": executed_at,
+        "status": status,
+        "response_summary": f"Log{log_id}",
+        "error_message": None,
+    }
+
+
+class TestLogArchive:
+    """Tests for LogArchive writes and reads."""
+
+    def test_partitions_by_day_with_manifest(self, tmp_path):
+        """Test that rows land in one compressed part per task and day, listed in the manifest."""
+        archive = LogArchive(str(tmp_path))
+
+        archive.append([
+            make_row(1, datetime(2024, 1, 15, 10, 0)),
+            make_row(2, datetime(2024, 1, 15, 11, 0)),
+            make_row(3, datetime(2024, 1, 16, 9, 0), task_id=2),
+        ])
+
+        manifest = json.loads((tmp_path / "manifest.json").read_text())
+        parts = {part["day"]: part for part in manifest["parts"]}
+        assert set(parts) == {"2024-01-15", "2024-01-16"}
+        assert parts["2024-01-15"]["rows"] == 2
+        assert parts["2024-01-16"]["tasks"] == {"2": 1}
+        assert parts["2024-01-16"]["task_id"] == 2
+        assert parts["2024-01-15"]["file"].startswith("2024/01/execution_logs-2024-01-15-task1-")
+
+        lines = gzip.decompress((tmp_path / parts["2024-01-15"]["file"]).read_bytes()).splitlines()
+        assert len(lines) == 2
+
+    def test_appends_to_same_part_within_run(self, tmp_path):
+        """Test that batches of one run append compressed members to the same part."""
+        archive = LogArchive(str(tmp_path))
+
+        archive.append([make_row(1, datetime(2024, 1, 15, 10, 0))])
+        archive.append([make_row(2, datetime(2024, 1, 15, 11, 0))])
+
+        manifest = json.loads((tmp_path / "manifest.json").read_text())
+        assert len(manifest["parts"]) == 1
+        assert manifest["parts"][0]["rows"] == 2
+        assert [v["id"] for v in archive.query(1)] == [2, 1]
+
+    def test_tasks_of_one_day_get_separate_parts(self, tmp_path):
+        """Test that reading one task's day does not decode other tasks' rows."""
+        archive = LogArchive(str(tmp_path))
+        archive.append([
+            make_row(1, datetime(2024, 1, 15, 10, 0)),
+            make_row(2, datetime(2024, 1, 15, 11, 0), task_id=2),
+            make_row(3, datetime(2024, 1, 15, 12, 0), task_id=2),
+        ])
+
+        manifest = json.loads((tmp_path / "manifest.json").read_text())
+        assert sorted(part["task_id"] for part in manifest["parts"]) == [1, 2]
+        with patch("app.services.log_archive._decode_row", wraps=_decode_row) as decode:
+            assert [v["id"] for v in archive.query(1)] == [1]
+        assert decode.call_count == 1
+
+    def test_legacy_day_part_keeps_only_task_rows(self, tmp_path):
+        """Test that a part holding every task of a day caches only the requested task's rows."""
+        part = "2024/01/execution_logs-2024-01-15-old.ndjson.gz"
+        rows = [make_row(i, datetime(2024, 1, 15, 10, i), task_id=1 + i % 3) for i in range(30)]
+        (tmp_path / "2024" / "01").mkdir(parents=True)
+        (tmp_path / part).write_bytes(gzip.compress(
+            "".join(json.dumps(row, default=str, separators=(",", ":")) + "\n" for row in rows).encode()
+        ))
+        (tmp_path / "manifest.json").write_text(json.dumps({"version": 2, "parts": [{
+            "file": part, "day": "2024-01-15", "compression": "gzip", "rows": 30,
+            "tasks": {"1": 10, "2": 10, "3": 10}, "failed": {},
+            "min_executed_at": "2024-01-15T10:00:00", "max_executed_at": "2024-01-15T10:29:00",
+        }]}))
+        archive = LogArchive(str(tmp_path))
+
+        assert len(archive.query(2)) == 10
+        assert [len(cached) for cached in archive._part_cache.values()] == [10]
+
+    def test_part_cache_bounded_by_rows(self, tmp_path):
+        """Test that decoded slices are evicted oldest first past the row bound."""
+        archive = LogArchive(str(tmp_path))
+        archive.append([make_row(day, datetime(2024, 1, day, 12, 0)) for day in range(1, 6)])
+
+        with patch("app.services.log_archive.PART_CACHE_ROWS", 2):
+            assert len(archive.query(1)) == 5
+
+        assert len(archive._part_cache) == 2
+        assert archive._part_cache_rows == 2
+
+    def test_query_filters_and_orders_newest_first(self, tmp_path):
+        """Test that query applies task, status and time range filters."""
+        archive = LogArchive(str(tmp_path))
+        archive.append([
+            make_row(1, datetime(2024, 1, 14, 23, 0)),
+            make_row(2, datetime(2024, 1, 15, 10, 0), status="failed"),
+            make_row(3, datetime(2024, 1, 15, 12, 0)),
+            make_row(4, datetime(2024, 1, 15, 13, 0), task_id=2),
+            make_row(5, datetime(2024, 1, 16, 0, 0)),
+        ])
+
+        rows = archive.query(
+            1, start_at=datetime(2024, 1, 15), end_at=datetime(2024, 1, 16)
+        )
+        assert [v["id"] for v in rows] == [3, 2]
+        assert [v["id"] for v in archive.query(1, status="failed")] == [2]
+
+    def test_covers_uses_manifest(self, tmp_path):
+        """Test that covers() matches task and day range from the manifest."""
+        archive = LogArchive(str(tmp_path))
+        archive.append([make_row(1, datetime(2024, 1, 15, 10, 0))])
+
+        assert archive.covers(1, datetime(2024, 1, 1), None)
+        assert not archive.covers(2, datetime(2024, 1, 1), None)
+        assert not archive.covers(1, datetime(2024, 1, 16), None)
+        assert not archive.covers(1, datetime(2024, 1, 1), datetime(2024, 1, 15))
+
+    def test_manifest_shared_between_instances(self, tmp_path):
+        """Test that a reader picks up parts written by another instance."""
+        LogArchive(str(tmp_path)).append([make_row(1, datetime(2024, 1, 15, 10, 0))])
+
+        assert len(LogArchive(str(tmp_path)).query(1)) == 1
+
+    def test_limited_query_stops_at_newest_parts(self, tmp_path):
+        """Test that a page reads only the parts that can hold its rows."""
+        archive = LogArchive(str(tmp_path))
+        archive.append([make_row(day, datetime(2024, 1, day, 12, 0)) for day in range(1, 11)])
+
+        with patch.object(archive, "_read_part", wraps=archive._read_part) as read_part:
+            rows = archive.query(1, start_at=datetime(2024, 1, 1), limit=3)
+
+        assert [v["id"] for v in rows] == [10, 9, 8]
+        assert read_part.call_count == 3
+
+    def test_query_past_boundary(self, tmp_path):
+        """Test that cursor boundaries select older or newer rows in page order."""
+        archive = LogArchive(str(tmp_path))
+        archive.append([make_row(day, datetime(2024, 1, day, 12, 0)) for day in range(1, 6)])
+        boundary = (datetime(2024, 1, 3, 12, 0), 3)
+
+        assert [v["id"] for v in archive.query(1, before=boundary, limit=5)] == [2, 1]
+        assert [v["id"] for v in archive.query(1, after=boundary, limit=1)] == [4]
+
+    def test_count_from_manifest(self, tmp_path):
+        """Test that parts wholly in range are counted without being read."""
+        archive = LogArchive(str(tmp_path))
+        archive.append([
+            make_row(1, datetime(2024, 1, 15, 10, 0)),
+            make_row(2, datetime(2024, 1, 15, 11, 0), status="failed"),
+            make_row(3, datetime(2024, 1, 16, 9, 0)),
+            make_row(4, datetime(2024, 1, 16, 9, 30), task_id=2),
+        ])
+
+        with patch.object(archive, "_read_part", wraps=archive._read_part) as read_part:
+            assert archive.count(1, start_at=datetime(2024, 1, 1)) == 3
+            assert archive.count(1, status="failed", start_at=datetime(2024, 1, 1)) == 1
+            assert archive.count(1, status="success", start_at=datetime(2024, 1, 1)) == 2
+            read_part.assert_not_called()
+
+            # A range cutting through a part reads it
+            assert archive.count(1, start_at=datetime(2024, 1, 15, 10, 30)) == 2
+            assert read_part.call_count == 1
+
+    def test_count_by_status_reads_parts_without_failure_counts(self, tmp_path):
+        """Test that parts listed by a version 1 manifest are still counted by status."""
+        archive = LogArchive(str(tmp_path))
+        archive.append([
+            make_row(1, datetime(2024, 1, 15, 10, 0)),
+            make_row(2, datetime(2024, 1, 15, 11, 0), status="failed"),
+        ])
+        manifest = json.loads((tmp_path / "manifest.json").read_text())
+        for part in manifest["parts"]:
+            del part["failed"]
+        (tmp_path / "manifest.json").write_text(json.dumps(manifest))
+
+        reader = LogArchive(str(tmp_path))
+        assert reader.count(1, status="failed", start_at=datetime(2024, 1, 1)) == 1
+        assert reader.count(1, start_at=datetime(2024, 1, 1)) == 2
+
+    def test_default_compression_prefers_zstd(self, tmp_path):
+        """Test that zstd is the default when zstandard is installed."""
+        with patch("app.services.log_archive._zstd_available", return_value=True):
+            assert LogArchive(str(tmp_path)).compression == "zstd"
+        with patch("app.services.log_archive._zstd_available", return_value=False):
+            assert LogArchive(str(tmp_path)).compression == "gzip"
+
+    def test_zstd_falls_back_to_gzip_when_missing(self, tmp_path):
+        """Test that zstd without the zstandard package uses gzip."""
+        with patch("app.services.log_archive._zstd_available", return_value=False):
+            archive = LogArchive(str(tmp_path), compression="zstd")
+
+        assert archive.compression == "gzip"
+
+
+@pytest_asyncio.fixture
+async def test_session():
+    """Create an in-memory database with one task."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with maker() as session:
+        session.add(Task(
+            id=1,
+            name="Test Task",
+            api_endpoint="https://api.example.com/v1/chat",
+            api_key="encrypted_key_value",
+            schedule_type="interval",
+            interval_minutes=30,
+            message_content="Hello",
+            model="gpt-4",
+        ))
+        await session.commit()
+        yield session
+
+    await engine.dispose()
+
+
+class TestQueryThrough:
+    """Tests for log pages reading archived logs."""
+
+    @pytest_asyncio.fixture
+    async def archive(self, tmp_path, test_session):
+        """Archive 3 old logs and keep 3 newer ones live."""
+        archive = LogArchive(str(tmp_path))
+        archive.append([make_row(i, datetime(2024, 1, 10 + i, 12, 0)) for i in (1, 2, 3)])
+        test_session.add_all(
+            ExecutionLog(**make_row(i, datetime(2024, 1, 10 + i, 12, 0))) for i in (4, 5, 6)
+        )
+        await test_session.commit()
+
+        with patch("app.services.log_query.get_log_archive", return_value=archive):
+            yield archive
+
+    @pytest.mark.asyncio
+    async def test_date_filter_pages_through_archive(self, test_session, archive):
+        """Test that cursor pages continue from live rows into archived ones."""
+        start_at, end_at = log_query.parse_date_range("2024-01-01", None)
+
+        first = await log_query.fetch_log_page(test_session, 1, start_at=start_at, limit=4)
+        second = await log_query.fetch_log_page(
+            test_session, 1, start_at=start_at,
+            cursor=log_query.Cursor.decode(first.next_cursor), limit=4,
+        )
+
+        assert [log.id for log in first.logs] == [6, 5, 4, 3]
+        assert [log.id for log in second.logs] == [2, 1]
+        assert second.next_cursor is None
+
+        back = await log_query.fetch_log_page(
+            test_session, 1, start_at=start_at,
+            cursor=log_query.Cursor.decode(second.prev_cursor), limit=4,
+        )
+        assert [log.id for log in back.logs] == [6, 5, 4, 3]
+
+    @pytest.mark.asyncio
+    async def test_unfiltered_page_skips_archive(self, test_session, archive):
+        """Test that pages without a start date only read live rows."""
+        page = await log_query.fetch_log_page(test_session, 1, limit=10)
+
+        assert [log.id for log in page.logs] == [6, 5, 4]
+
+    @pytest.mark.asyncio
+    async def test_count_includes_archive(self, test_session, archive):
+        """Test that a date-filtered total counts archived logs."""
+        start_at, end_at = log_query.parse_date_range("2024-01-12", "2024-01-14")
+
+        assert await log_query.count_logs(test_session, 1, start_at=start_at, end_at=end_at) == 3
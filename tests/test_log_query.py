@@ -0,0 +1,88 @@
+"""Tests for execution log keyset pagination."""
+
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.services import log_query
+from app.services.log_query import Cursor, InvalidCursor, count_logs, parse_date_range
+
+
+class TestCursor:
+    """Tests for cursor encoding."""
+
+    def test_round_trip(self):
+        """Test that a decoded cursor equals the encoded one."""
+        cursor = Cursor(datetime(2024, 1, 15, 10, 30, 5, 123456), 42, "prev", 7)
+
+        assert Cursor.decode(cursor.encode()) == cursor
+
+    def test_encoded_cursor_is_url_safe(self):
+        """Test that the encoded cursor needs no URL escaping."""
+        encoded = Cursor(datetime(2024, 1, 15), 1).encode()
+
+        assert all(c.isalnum() or c in "-_" for c in encoded)
+
+    @pytest.mark.parametrize("value", ["", "garbage", "e30", "eyJ0IjoxfQ"])
+    def test_malformed_cursor_rejected(self, value):
+        """Test that malformed cursors raise InvalidCursor."""
+        with pytest.raises(InvalidCursor):
+            Cursor.decode(value)
+
+    def test_unknown_direction_rejected(self):
+        """Test that a cursor with an unknown direction is rejected."""
+        encoded = Cursor(datetime(2024, 1, 15), 1, "sideways").encode()
+
+        with pytest.raises(InvalidCursor):
+            Cursor.decode(encoded)
+
+
+class TestParseDateRange:
+    """Tests for date filter parsing."""
+
+    def test_end_date_is_inclusive(self):
+        """Test that the end of the range is the start of the next day."""
+        start_at, end_at = parse_date_range("2024-01-15", "2024-01-16")
+
+        assert start_at == datetime(2024, 1, 15)
+        assert end_at == datetime(2024, 1, 17)
+
+    def test_invalid_dates_ignored(self):
+        """Test that unparseable dates leave the range open."""
+        assert parse_date_range("not-a-date", "2024-13-40") == (None, None)
+
+
+class TestCountCache:
+    """Tests for the cache of filtered counts."""
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_evicted(self):
+        """Test that expired counts are dropped instead of accumulating."""
+        session = AsyncMock()
+        session.scalar.return_value = 5
+
+        with patch("app.services.log_query.time.monotonic", return_value=1000.0):
+            for day in range(1, 4):
+                await count_logs(session, 1, start_at=datetime(2024, 1, day))
+        assert len(log_query._count_cache) == 3
+
+        with patch("app.services.log_query.time.monotonic", return_value=1000.0 + log_query.COUNT_CACHE_SECONDS):
+            await count_logs(session, 1, start_at=datetime(2024, 2, 1))
+
+        assert list(log_query._count_cache) == [(1, None, datetime(2024, 2, 1), None)]
+
+    @pytest.mark.asyncio
+    async def test_size_bounded_least_recently_used(self):
+        """Test that the cache keeps at most COUNT_CACHE_MAX_ENTRIES, evicting the least recently used."""
+        session = AsyncMock()
+        session.scalar.return_value = 5
+
+        with patch("app.services.log_query.COUNT_CACHE_MAX_ENTRIES", 2):
+            await count_logs(session, 1, start_at=datetime(2024, 1, 1))
+            await count_logs(session, 1, start_at=datetime(2024, 1, 2))
+            await count_logs(session, 1, start_at=datetime(2024, 1, 1))  # Hit, now most recent
+            await count_logs(session, 1, start_at=datetime(2024, 1, 3))
+
+        assert [key[2].day for key in log_query._count_cache] == [1, 3]
+        assert session.scalar.await_count == 3
@@ -0,0 +1,214 @@
+"""Tests for the group-commit ExecutionLog writer."""
+
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database import Base
+from app.models import Task, ExecutionLog
+from app.services.log_writer import ExecutionLogWriter
+
+
+@pytest_asyncio.fixture
+async def session_maker(tmp_path):
+    """Create a file-backed database with one task and patch the writer to use it."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with maker() as session:
+        session.add(Task(
+            id=1,
+            name="Test Task",
+            api_endpoint="https://api.example.com/v1/chat",
+            api_key="encrypted_key_value",
+            schedule_type="interval",
+            interval_minutes=30,
+            message_content="Hello",
+            model="gpt-4",
+        ))
+        await session.commit()
+
+    with patch("app.services.log_writer.get_session_maker", return_value=maker):
+        yield maker
+
+    await engine.dispose()
+
+
+def make_values(status: str = "success") -> dict:
+    """Build ExecutionLog column values for task 1."""
+    return {
+        "task_id": 1,
+        "executed_at": datetime.now(timezone.utc),
+        "status": status,
+        "response_summary": "ok" if status == "success" else None,
+        "error_message": None if status == "success" else "boom",
+    }
+
+
+async def count_logs(maker) -> int:
+    """Count ExecutionLog rows."""
+    async with maker() as session:
+        return (await session.execute(select(func.count(ExecutionLog.id)))).scalar()
+
+
+class TestExecutionLogWriter:
+    """Tests for ExecutionLogWriter batching and shutdown."""
+
+    @pytest.mark.asyncio
+    async def test_submit_without_running_writes_immediately(self, session_maker):
+        """Test that submit falls back to a direct write when the writer is stopped."""
+        writer = ExecutionLogWriter(max_queue=10, batch_size=10, flush_interval=0.05)
+
+        await writer.submit(make_values())
+
+        assert await count_logs(session_maker) == 1
+        assert writer.total_written == 1
+
+    @pytest.mark.asyncio
+    async def test_records_flushed_in_one_batch(self, session_maker):
+        """Test that buffered records are written as a single batch."""
+        writer = ExecutionLogWriter(max_queue=100, batch_size=50, flush_interval=0.05)
+        writer.start()
+
+        for _ in range(20):
+            await writer.submit(make_values())
+        await asyncio.sleep(0.2)
+
+        assert await count_logs(session_maker) == 20
+        assert writer.total_batches == 1
+        await writer.stop()
+
+    @pytest.mark.asyncio
+    async def test_timings_include_queue_wait(self, session_maker):
+        """Test that the wait for the group commit is added to the timings."""
+        writer = ExecutionLogWriter(max_queue=100, batch_size=50, flush_interval=0.1)
+        writer.start()
+
+        values = make_values()
+        values["timings"] = {"ttfb": 120}
+        await writer.submit(values)
+        await writer.submit(make_values())
+        await writer.stop()
+
+        async with session_maker() as session:
+            timings = (await session.execute(
+                select(ExecutionLog.timings).order_by(ExecutionLog.id)
+            )).scalars().all()
+        assert timings[0]["ttfb"] == 120
+        assert timings[0]["queue"] >= 0
+        assert timings[1] is None
+
+    @pytest.mark.asyncio
+    async def test_batch_size_threshold(self, session_maker):
+        """Test that batches are split at batch_size."""
+        writer = ExecutionLogWriter(max_queue=100, batch_size=5, flush_interval=10)
+        writer.start()
+
+        for _ in range(12):
+            await writer.submit(make_values())
+        await writer.stop()
+
+        assert await count_logs(session_maker) == 12
+        assert writer.total_batches == 3
+
+    @pytest.mark.asyncio
+    async def test_stop_flushes_pending_records(self, session_maker):
+        """Test that stop() writes everything still buffered."""
+        writer = ExecutionLogWriter(max_queue=100, batch_size=100, flush_interval=10)
+        writer.start()
+
+        for _ in range(7):
+            await writer.submit(make_values("failed"))
+        await writer.stop()
+
+        assert await count_logs(session_maker) == 7
+        assert writer.running is False
+
+    @pytest.mark.asyncio
+    async def test_backpressure_when_buffer_full(self, session_maker):
+        """Test that submit waits when the buffer is full."""
+        writer = ExecutionLogWriter(max_queue=2, batch_size=1, flush_interval=0.01)
+        writer.start()
+
+        for _ in range(10):
+            await writer.submit(make_values())
+        await writer.stop()
+
+        assert await count_logs(session_maker) == 10
+        assert writer.backpressure_waits > 0
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_drops_only_bad_rows(self, session_maker):
+        """Test that a batch failing twice is split so the valid rows are kept."""
+        writer = ExecutionLogWriter(max_queue=100, batch_size=10, flush_interval=0.01)
+        bad = make_values()
+        bad["executed_at"] = None  # NOT NULL column
+
+        await writer._flush([make_values(), make_values(), bad, make_values(), make_values()])
+
+        assert await count_logs(session_maker) == 4
+        assert writer.total_written == 4
+        assert writer.total_dropped == 1
+
+    @pytest.mark.asyncio
+    async def test_stats(self, session_maker):
+        """Test that stats() exposes queue depth and flush latency."""
+        writer = ExecutionLogWriter(max_queue=100, batch_size=10, flush_interval=0.01)
+        writer.start()
+        await writer.submit(make_values())
+        await writer.stop()
+
+        stats = writer.stats()
+        assert stats["queue_depth"] == 0
+        assert stats["total_written"] == 1
+        assert stats["last_flush_ms"] >= 0
+        assert stats["max_queue"] == 100
+
+
+async def load_task(maker) -> Task:
+    """Load task 1 with its last-execution columns."""
+    async with maker() as session:
+        return await session.get(Task, 1)
+
+
+class TestTaskSummary:
+    """Tests for the last-execution columns maintained with each batch."""
+
+    @pytest.mark.asyncio
+    async def test_last_execution_updated_with_insert(self, session_maker):
+        """Test that a write refreshes the task's last execution without touching updated_at."""
+        writer = ExecutionLogWriter(max_queue=10, batch_size=10, flush_interval=0.05)
+        before = await load_task(session_maker)
+        values = make_values()
+        values["latency_ms"] = 250
+
+        await writer.submit(values)
+
+        task = await load_task(session_maker)
+        assert task.last_executed_at == values["executed_at"].replace(tzinfo=None)
+        assert task.last_status == "success"
+        assert task.last_latency_ms == 250
+        assert task.consecutive_failures == 0
+        assert task.updated_at == before.updated_at
+
+    @pytest.mark.asyncio
+    async def test_failure_streak_across_batches(self, session_maker):
+        """Test that failures accumulate across batches and reset on success."""
+        writer = ExecutionLogWriter(max_queue=10, batch_size=10, flush_interval=0.05)
+
+        await writer._write_batch([make_values("failed"), make_values("failed")])
+        await writer._write_batch([make_values("failed")])
+        assert (await load_task(session_maker)).consecutive_failures == 3
+
+        await writer._write_batch([make_values("failed"), make_values(), make_values("failed")])
+        task = await load_task(session_maker)
+        assert task.consecutive_failures == 1
+        assert task.last_status == "failed"
+        assert task.last_latency_ms is None
@@ -0,0 +1,193 @@
+"""Tests for the Prometheus metrics."""
+
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+
+from app.main import app
+from app.services.http_client import close_http_clients, get_http_client, pool_stats
+from app.services.metrics import (
+    EXECUTIONS,
+    HTTP_REQUEST_SECONDS,
+    REGISTRY,
+    Counter,
+    Gauge,
+    Histogram,
+    Registry,
+    _Metric,
+)
+
+
+@pytest_asyncio.fixture
+async def client():
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+class TestMetricTypes:
+    """Tests for counters, gauges and histograms."""
+
+    def test_counter_with_labels(self):
+        """Test that each label set is rendered as its own sample."""
+        counter = Counter("test_total", "Test counter.", ("status",))
+        success = counter.labels("success")
+        success.inc()
+        success.inc(2)
+        counter.labels("failed").inc()
+
+        assert counter.render() == [
+            "# HELP test_total Test counter.",
+            "# TYPE test_total counter",
+            'test_total{status="success"} 3',
+            'test_total{status="failed"} 1',
+        ]
+
+    def test_labels_reuse_child(self):
+        """Test that a label set creates its child once."""
+        counter = Counter("test_total", "Test counter.", ("status",))
+
+        assert counter.labels("success") is counter.labels("success")
+
+    def test_wrong_label_count(self):
+        """Test that a mismatched label set is rejected."""
+        with pytest.raises(ValueError):
+            Counter("test_total", "Test counter.", ("status",)).labels()
+
+    def test_metric_type_must_create_children(self):
+        """Test that a metric type without _new_child cannot be instantiated."""
+        class Incomplete(_Metric):
+            type_name = "untyped"
+
+        with pytest.raises(TypeError):
+            Incomplete("test_untyped", "Test metric.")
+
+    def test_gauge(self):
+        """Test an unlabelled gauge going up and down."""
+        gauge = Gauge("test_in_flight", "Test gauge.")
+        gauge.inc()
+        gauge.inc()
+        gauge.dec()
+
+        assert gauge.render()[-1] == "test_in_flight 1"
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test bucket, sum and count lines of a histogram."""
+        histogram = Histogram("test_seconds", "Test histogram.", buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value)
+
+        assert histogram.render()[2:] == [
+            'test_seconds_bucket{le="0.1"} 2',
+            'test_seconds_bucket{le="1"} 3',
+            'test_seconds_bucket{le="+Inf"} 4',
+            "test_seconds_sum 2.65",
+            "test_seconds_count 4",
+        ]
+
+    def test_label_values_escaped(self):
+        """Test that quotes and backslashes in label values are escaped."""
+        counter = Counter("test_total", "Test counter.", ("route",))
+        counter.labels('a"b\\c').inc()
+
+        assert counter.render()[-1] == 'test_total{route="a\\"b\\\\c"} 1'
+
+    def test_collector(self):
+        """Test that collectors are rendered at scrape time."""
+        registry = Registry()
+        registry.add_collector(lambda: [("test_depth", "gauge", "Test.", [({"queue": "a"}, 3)])])
+
+        assert 'test_depth{queue="a"} 3' in registry.render()
+
+    def test_collector_suffixed_samples(self):
+        """Test that a collector can emit a summary's _sum and _count."""
+        registry = Registry()
+        registry.add_collector(lambda: [("test_lag", "summary", "Test.", [
+            ({"quantile": "0.5"}, 0.25),
+            ("_sum", {}, 1.5),
+            ("_count", {}, 4),
+        ])])
+
+        assert registry.render().splitlines()[2:] == [
+            'test_lag{quantile="0.5"} 0.25',
+            "test_lag_sum 1.5",
+            "test_lag_count 4",
+        ]
+
+    def test_reset_keeps_bound_children(self):
+        """Test that reset zeroes values without orphaning children bound earlier."""
+        counter = Counter("test_total", "Test counter.", ("status",))
+        histogram = Histogram("test_seconds", "Test histogram.", buckets=(1.0,))
+        success = counter.labels("success")
+        observed = histogram.labels()
+        success.inc(3)
+        observed.observe(0.5)
+
+        counter.reset()
+        histogram.reset()
+        success.inc()
+        observed.observe(2.0)
+
+        assert counter.render()[-1] == 'test_total{status="success"} 1'
+        assert histogram.render()[2:] == [
+            'test_seconds_bucket{le="1"} 0',
+            'test_seconds_bucket{le="+Inf"} 1',
+            "test_seconds_sum 2",
+            "test_seconds_count 1",
+        ]
+
+
+class TestMetricsEndpoint:
+    """Tests for the /metrics route."""
+
+    @pytest.mark.asyncio
+    async def test_exposition_format(self, client):
+        """Test that /metrics serves the text format with runtime gauges."""
+        response = await client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        body = response.text
+        assert "# TYPE autoai_executions_total counter" in body
+        assert "# TYPE autoai_execution_phase_seconds histogram" in body
+        assert "# TYPE autoai_scheduler_due_jobs gauge" in body
+        assert "autoai_log_writer_queue_depth 0" in body
+        assert "autoai_schedule_missed_total" in body
+        assert "# TYPE autoai_schedule_lag_seconds summary" in body
+        assert "autoai_schedule_lag_seconds_count" in body
+
+    @pytest.mark.asyncio
+    async def test_request_latency_by_route_template(self, client):
+        """Test that requests are labelled with their route template."""
+        HTTP_REQUEST_SECONDS.reset()
+
+        await client.get("/api/tasks/12345")
+        await client.get("/no-such-page")
+
+        samples = {
+            values: child.count for values, child in HTTP_REQUEST_SECONDS.children().items() if child.count
+        }
+        assert samples == {
+            ("api", "GET", "/api/tasks/{task_id}", "401"): 1,
+            ("other", "GET", "unmatched", "404"): 1,
+        }
+
+    @pytest.mark.asyncio
+    async def test_http_pool_usage(self, client):
+        """Test that pooled HTTP clients are reported per origin."""
+        get_http_client("https://api.example.com/v1/chat/completions")
+        try:
+            assert pool_stats() == [
+                {"origin": "https://api.example.com:443", "active": 0, "idle": 0, "waiting": 0},
+            ]
+            response = await client.get("/metrics")
+        finally:
+            await close_http_clients()
+
+        assert (
+            'autoai_http_pool_connections{origin="https://api.example.com:443",state="idle"} 0'
+            in response.text
+        )
+
+    def test_execution_counter_registered(self):
+        """Test that the execution counter is part of the registry."""
+        assert EXECUTIONS in REGISTRY._metrics
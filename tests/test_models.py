@@ -303,3 +303,47 @@ async def test_execution_log_repr(async_session):
     repr_str = repr(log)
     assert "ExecutionLog" in repr_str
     assert "success" in repr_str
+
+
+@pytest.mark.asyncio
+async def test_execution_log_indexes(async_engine):
+    """Test that create_all builds the execution_logs query indexes."""
+    from sqlalchemy import inspect
+
+    async with async_engine.connect() as conn:
+        indexes = await conn.run_sync(
+            lambda sync_conn: inspect(sync_conn).get_indexes("execution_logs")
+        )
+
+    columns = {index["name"]: index["column_names"] for index in indexes}
+    assert columns["ix_execution_logs_task_id_executed_at"] == ["task_id", "executed_at"]
+    assert columns["ix_execution_logs_executed_at"] == ["executed_at"]
+    assert columns["ix_execution_logs_task_id_status_executed_at"] == [
+        "task_id", "status", "executed_at",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_aware_datetimes_stored_as_naive_utc(async_session):
+    """Test that timezone-aware values are normalized to naive UTC."""
+    from datetime import timedelta, timezone
+
+    task = Task(
+        name="Test Task",
+        api_endpoint="https://api.openai.com/v1/chat/completions",
+        api_key="encrypted_key",
+        schedule_type="interval",
+        interval_minutes=30,
+        message_content="Hello",
+        model="gpt-4",
+    )
+    async_session.add(task)
+    await async_session.commit()
+
+    china_time = datetime(2024, 1, 15, 18, 0, tzinfo=timezone(timedelta(hours=8)))
+    log = ExecutionLog(task_id=task.id, executed_at=china_time, status="success")
+    async_session.add(log)
+    await async_session.commit()
+    await async_session.refresh(log)
+
+    assert log.executed_at == datetime(2024, 1, 15, 10, 0)
@@ -1,6 +1,7 @@
 """Tests for OpenAI API Service."""
 
 import pytest
+import pytest_asyncio
 import httpx
 import respx
 from httpx import Response
@@ -30,6 +31,15 @@ MOCK_SUCCESS_RESPONSE = {
 }
 
 
+@pytest_asyncio.fixture(autouse=True)
+async def close_pooled_clients(monkeypatch):
+    """Close pooled HTTP clients so each test starts without shared connections."""
+    monkeypatch.setenv("ADMIN_PASSWORD", "test123")
+    yield
+    from app.services.http_client import close_http_clients
+    await close_http_clients()
+
+
 class TestOpenAIServiceError:
     """Tests for OpenAIServiceError exception class."""
 
@@ -267,6 +277,53 @@ class TestRetryLogic:
         assert exc_info.value.status_code is None
 
 
+class TestRateLimitHeaders:
+    """Tests for exposing provider rate-limit headers."""
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_success_response_carries_rate_limit(self):
+        """Test that rate-limit headers are parsed on success."""
+        from app.services.openai_service import send_message
+
+        respx.post(TEST_ENDPOINT).mock(
+            return_value=Response(
+                200,
+                json=MOCK_SUCCESS_RESPONSE,
+                headers={"x-ratelimit-remaining-requests": "42", "x-ratelimit-reset-requests": "1s"},
+            )
+        )
+
+        result = await send_message(
+            api_endpoint=TEST_ENDPOINT,
+            api_key=TEST_API_KEY,
+            message_content=TEST_MESSAGE,
+        )
+
+        assert result.rate_limit.remaining == 42
+        assert result.rate_limit.reset_seconds == 1.0
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_429_error_carries_retry_after(self):
+        """Test that a 429 error exposes Retry-After."""
+        from app.services.openai_service import send_message, OpenAIServiceError
+
+        respx.post(TEST_ENDPOINT).mock(
+            return_value=Response(429, json={"error": "slow down"}, headers={"retry-after": "7"})
+        )
+
+        with pytest.raises(OpenAIServiceError) as exc_info:
+            await send_message(
+                api_endpoint=TEST_ENDPOINT,
+                api_key=TEST_API_KEY,
+                message_content=TEST_MESSAGE,
+            )
+
+        assert exc_info.value.status_code == 429
+        assert exc_info.value.rate_limit.retry_after == 7.0
+
+
 class TestResponseProcessing:
     """Tests for response processing and logging."""
 
@@ -335,6 +392,8 @@ class TestResponseProcessing:
         # Response time should be a positive integer
         assert isinstance(result.response_time_ms, int)
         assert result.response_time_ms >= 0
+        # Mocked transports report no connection phases, only the parse
+        assert list(result.timings) == ["parse"]
 
     def test_api_key_masking(self):
         """Test that API key is properly masked."""
@@ -0,0 +1,167 @@
+"""Tests for per-API-key token bucket rate limiting."""
+
+import pytest
+
+from app.services.rate_limiter import (
+    RateLimitHeaders,
+    RateLimiter,
+    RateLimitWaitTooLong,
+    TokenBucket,
+    parse_rate_limit_headers,
+)
+
+
+@pytest.fixture(autouse=True)
+def settings_env(monkeypatch):
+    """Provide required settings for the limiter."""
+    monkeypatch.setenv("ADMIN_PASSWORD", "test123")
+
+
+class TestParseRateLimitHeaders:
+    """Tests for provider header parsing."""
+
+    def test_openai_style_headers(self):
+        """Test OpenAI request-limit headers with duration resets."""
+        headers = {
+            "x-ratelimit-remaining-requests": "0",
+            "x-ratelimit-reset-requests": "6m0s",
+        }
+
+        result = parse_rate_limit_headers(headers)
+
+        assert result.remaining == 0
+        assert result.reset_seconds == 360.0
+
+    def test_retry_after_seconds(self):
+        """Test Retry-After given in seconds."""
+        result = parse_rate_limit_headers({"retry-after": "2.5"})
+
+        assert result.retry_after == 2.5
+
+    def test_no_hints(self):
+        """Test that responses without hints return None."""
+        assert parse_rate_limit_headers({"content-type": "application/json"}) is None
+
+
+class TestTokenBucket:
+    """Tests for token accounting."""
+
+    def test_burst_then_wait(self):
+        """Test that fires beyond capacity must wait for refill."""
+        bucket = TokenBucket(rate_per_minute=60, capacity=2)
+
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 0
+        wait = bucket.reserve()
+
+        assert 0.9 < wait <= 1.0
+
+    def test_unlimited_bucket_never_waits(self):
+        """Test that a bucket without a rate only honors provider blocks."""
+        bucket = TokenBucket(rate_per_minute=None)
+
+        assert all(bucket.reserve() == 0 for _ in range(100))
+
+    def test_retry_after_blocks(self):
+        """Test that Retry-After blocks the bucket."""
+        bucket = TokenBucket(rate_per_minute=None)
+
+        bucket.observe(RateLimitHeaders(retry_after=30))
+
+        assert 29 < bucket.reserve() <= 30
+
+    def test_exhausted_remaining_blocks_until_reset(self):
+        """Test that remaining=0 blocks until the advertised reset."""
+        bucket = TokenBucket(rate_per_minute=600)
+
+        bucket.observe(RateLimitHeaders(remaining=0, reset_seconds=10))
+
+        assert 9 < bucket.reserve() <= 10
+
+    def test_remaining_caps_tokens(self):
+        """Test that a low remaining count caps local tokens."""
+        bucket = TokenBucket(rate_per_minute=600)
+
+        bucket.observe(RateLimitHeaders(remaining=1))
+
+        assert bucket.reserve() == 0
+        assert bucket.reserve() > 0
+
+
+class TestRateLimiter:
+    """Tests for the per-key limiter registry."""
+
+    @pytest.mark.asyncio
+    async def test_keys_have_separate_buckets(self):
+        """Test that different keys do not share tokens."""
+        limiter = RateLimiter()
+
+        await limiter.acquire("key-a", rate_per_minute=1)
+        waited = await limiter.acquire("key-b", rate_per_minute=1)
+
+        assert waited == 0
+
+    @pytest.mark.asyncio
+    async def test_acquire_waits_for_token(self):
+        """Test that acquire sleeps instead of failing."""
+        limiter = RateLimiter()
+
+        await limiter.acquire("key", rate_per_minute=1200)
+        limiter.bucket("key", 1200).tokens = 0
+        waited = await limiter.acquire("key", rate_per_minute=1200)
+
+        assert 0 < waited <= 0.06
+
+    @pytest.mark.asyncio
+    async def test_wait_too_long_raises(self, monkeypatch):
+        """Test that waits beyond the maximum fail the fire."""
+        monkeypatch.setenv("RATE_LIMIT_MAX_WAIT_SECONDS", "1")
+        limiter = RateLimiter()
+        limiter.observe("key", RateLimitHeaders(retry_after=60))
+
+        with pytest.raises(RateLimitWaitTooLong):
+            await limiter.acquire("key")
+
+    def test_default_rate_from_settings(self, monkeypatch):
+        """Test that the global default applies when a task sets no limit."""
+        monkeypatch.setenv("RATE_LIMIT_DEFAULT_PER_MINUTE", "30")
+        limiter = RateLimiter()
+
+        assert limiter.bucket("key").rate_per_minute == 30
+        assert limiter.bucket("other", 10).rate_per_minute == 10
+
+    @pytest.mark.asyncio
+    async def test_shared_key_uses_smallest_task_limit(self, monkeypatch):
+        """Test that a limited and an unlimited task on one key share the limit."""
+        monkeypatch.setenv("RATE_LIMIT_MAX_WAIT_SECONDS", "1")
+        monkeypatch.setenv("RATE_LIMIT_BURST", "2")
+        limiter = RateLimiter()
+        limiter.set_task_limit("key", 1, 2)
+        limiter.set_task_limit("key", 2, None)
+
+        fired = 0
+        for task_rate in (2, None) * 4:
+            try:
+                await limiter.acquire("key", task_rate)
+                fired += 1
+            except RateLimitWaitTooLong:
+                pass
+
+        assert fired == 2
+        assert limiter.bucket("key").rate_per_minute == 2
+
+    def test_task_limits_refresh_key_rate(self):
+        """Test that saving tasks refreshes the key rate but never relaxes it to unlimited."""
+        limiter = RateLimiter()
+        limiter.set_task_limit("key", 1, 10)
+        bucket = limiter.bucket("key")
+
+        limiter.set_task_limit("key", 2, 5)
+        assert bucket.rate_per_minute == 5
+
+        limiter.remove_task(2)
+        assert bucket.rate_per_minute == 10
+
+        limiter.set_task_limit("key", 1, None)
+        assert limiter.key_rate("key") is None
+        assert bucket.rate_per_minute == 10
@@ -0,0 +1,221 @@
+"""Tests for batched execution log retention."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database import Base
+from app.models import ExecutionLog, Task
+from app.services.log_archive import LogArchive
+from app.services.retention import LogRetention
+
+
+def make_task(task_id: int, **overrides) -> Task:
+    """Build a task row with optional retention overrides."""
+    return Task(
+        id=task_id,
+        name=f"Task {task_id}",
+        api_endpoint="https://api.example.com/v1/chat",
+        api_key="encrypted_key_value",
+        schedule_type="interval",
+        interval_minutes=30,
+        message_content="Hello",
+        model="gpt-4",
+        **overrides,
+    )
+
+
+@pytest_asyncio.fixture
+async def engine(tmp_path):
+    """Create a file-backed database in incremental auto-vacuum mode."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}", echo=False)
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql("PRAGMA auto_vacuum = INCREMENTAL")
+        await conn.run_sync(Base.metadata.create_all)
+
+    maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    with patch("app.services.retention.get_session_maker", return_value=maker), \
+         patch("app.services.retention.get_logs_engine", return_value=engine):
+        yield engine
+
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def session_maker(engine):
+    """Session maker bound to the test database."""
+    return async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+async def add_logs(maker, task_id: int, ages_days: list[float]) -> None:
+    """Insert one log per age, measured back from now."""
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    async with maker() as session:
+        session.add_all(
+            ExecutionLog(
+                task_id=task_id,
+                executed_at=now - timedelta(days=age),
+                status="success",
+                response_summary="x" * 2000,
+            )
+            for age in ages_days
+        )
+        await session.commit()
+
+
+async def remaining(maker, task_id: int) -> int:
+    """Count a task's remaining logs."""
+    async with maker() as session:
+        return await session.scalar(
+            select(func.count(ExecutionLog.id)).where(ExecutionLog.task_id == task_id)
+        )
+
+
+def make_retention(**overrides) -> LogRetention:
+    """Build a retention runner with no limits unless overridden."""
+    options = {"retention_days": 0, "max_rows": 0, "batch_size": 1000, "batch_pause": 0}
+    options.update(overrides)
+    return LogRetention(**options)
+
+
+class TestLogRetention:
+    """Tests for LogRetention policies and batching."""
+
+    @pytest.mark.asyncio
+    async def test_purges_logs_older_than_retention_days(self, session_maker):
+        """Test that logs past the global age limit are deleted."""
+        async with session_maker() as session:
+            session.add(make_task(1))
+            await session.commit()
+        await add_logs(session_maker, 1, [0.1, 1, 5, 10, 20])
+
+        report = await make_retention(retention_days=7).run()
+
+        assert report.purged == 2
+        assert await remaining(session_maker, 1) == 3
+
+    @pytest.mark.asyncio
+    async def test_keeps_newest_max_rows(self, session_maker):
+        """Test that only the newest max_rows logs of each task are kept."""
+        async with session_maker() as session:
+            session.add_all([make_task(1), make_task(2)])
+            await session.commit()
+        await add_logs(session_maker, 1, [1, 2, 3, 4, 5])
+        await add_logs(session_maker, 2, [1, 2])
+
+        report = await make_retention(max_rows=3).run()
+
+        assert report.purged == 2
+        assert report.tasks == 1
+        assert await remaining(session_maker, 1) == 3
+        assert await remaining(session_maker, 2) == 2
+
+    @pytest.mark.asyncio
+    async def test_task_override_takes_precedence(self, session_maker):
+        """Test that per-task settings override the global policy, 0 keeping forever."""
+        async with session_maker() as session:
+            session.add_all([
+                make_task(1),
+                make_task(2, log_retention_days=0),
+                make_task(3, log_retention_max_rows=1),
+            ])
+            await session.commit()
+        for task_id in (1, 2, 3):
+            await add_logs(session_maker, task_id, [1, 10, 20])
+
+        await make_retention(retention_days=7).run()
+
+        assert await remaining(session_maker, 1) == 1
+        assert await remaining(session_maker, 2) == 3
+        assert await remaining(session_maker, 3) == 1
+
+    @pytest.mark.asyncio
+    async def test_deletes_in_batches(self, session_maker):
+        """Test that purging is split into batch_size deletes, each reported."""
+        async with session_maker() as session:
+            session.add(make_task(1))
+            await session.commit()
+        await add_logs(session_maker, 1, [10 + i for i in range(25)])
+
+        report = await make_retention(retention_days=7, batch_size=10).run()
+
+        assert report.purged == 25
+        assert len(report.batch_ms) == 3
+        assert report.as_dict()["batches"] == 3
+
+    @pytest.mark.asyncio
+    async def test_no_policy_deletes_nothing(self, session_maker):
+        """Test that the default policy keeps every log."""
+        async with session_maker() as session:
+            session.add(make_task(1))
+            await session.commit()
+        await add_logs(session_maker, 1, [1, 100, 1000])
+
+        report = await make_retention().run()
+
+        assert report.purged == 0
+        assert await remaining(session_maker, 1) == 3
+
+    @pytest.mark.asyncio
+    async def test_archives_rows_before_deleting(self, session_maker, tmp_path):
+        """Test that purged rows are appended to the log archive."""
+        async with session_maker() as session:
+            session.add(make_task(1))
+            await session.commit()
+        await add_logs(session_maker, 1, [1, 10, 11])
+        archive = LogArchive(str(tmp_path / "archive"))
+
+        report = await make_retention(retention_days=7, archive=archive).run()
+
+        assert report.archived == 2
+        archived = archive.query(1)
+        assert len(archived) == 2
+        assert all(values["response_summary"] == "x" * 2000 for values in archived)
+
+    @pytest.mark.asyncio
+    async def test_incremental_vacuum_releases_pages(self, session_maker):
+        """Test that freed pages are returned after a purge."""
+        async with session_maker() as session:
+            session.add(make_task(1))
+            await session.commit()
+        await add_logs(session_maker, 1, [10] * 200)
+
+        report = await make_retention(retention_days=7).run()
+
+        assert report.vacuumed_pages > 0
+        assert await remaining(session_maker, 1) == 0
+
+    @pytest.mark.asyncio
+    async def test_skips_tasks_owned_by_other_nodes(self, session_maker):
+        """Test that only tasks this node executes are purged."""
+        async with session_maker() as session:
+            session.add_all([make_task(1), make_task(2)])
+            await session.commit()
+        await add_logs(session_maker, 1, [10])
+        await add_logs(session_maker, 2, [10])
+
+        with patch("app.services.retention.owns_task", side_effect=lambda task_id: task_id == 1):
+            await make_retention(retention_days=7).run()
+
+        assert await remaining(session_maker, 1) == 0
+        assert await remaining(session_maker, 2) == 1
+
+    @pytest.mark.asyncio
+    async def test_stats_track_runs(self, session_maker):
+        """Test that stats() reports totals and the last run."""
+        async with session_maker() as session:
+            session.add(make_task(1))
+            await session.commit()
+        await add_logs(session_maker, 1, [10, 11])
+        retention = make_retention(retention_days=7)
+
+        await retention.run()
+        stats = retention.stats()
+
+        assert stats["total_runs"] == 1
+        assert stats["total_purged"] == 2
+        assert stats["last_run"]["purged"] == 2
@@ -0,0 +1,173 @@
+"""Tests for scheduling lag and misfire accounting."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+import pytest
+from apscheduler.events import (
+    EVENT_JOB_MAX_INSTANCES,
+    EVENT_JOB_MISSED,
+    EVENT_JOB_REMOVED,
+    EVENT_JOB_SUBMITTED,
+    JobEvent,
+    JobExecutionEvent,
+    JobSubmissionEvent,
+)
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.date import DateTrigger
+from apscheduler.triggers.interval import IntervalTrigger
+
+from app.services.schedule_monitor import (
+    ScheduledTimeExecutor,
+    ScheduleMonitor,
+    get_schedule_monitor,
+    reset_schedule_monitor,
+)
+
+START = datetime(2024, 1, 15, 8, 0, tzinfo=timezone.utc)
+
+
+def attached(trigger) -> ScheduleMonitor:
+    """Create a monitor attached to a scheduler whose jobs use trigger."""
+    scheduler = MagicMock()
+    scheduler.get_job.return_value = MagicMock(trigger=trigger)
+    monitor = ScheduleMonitor()
+    monitor.attach(scheduler)
+    return monitor
+
+
+def submitted(monitor: ScheduleMonitor, *run_times: datetime, job_id: str = "task_1") -> None:
+    monitor._on_event(JobSubmissionEvent(EVENT_JOB_SUBMITTED, job_id, "default", list(run_times)))
+
+
+class TestScheduledTimes:
+    """Tests for handing fire times to execute_task."""
+
+    @pytest.mark.asyncio
+    async def test_run_gets_its_own_fire_time(self):
+        """Test that each job run sees the fire time it was submitted for."""
+        monitor = ScheduleMonitor()
+        scheduler = AsyncIOScheduler(executors={"default": ScheduledTimeExecutor()})
+        seen = []
+
+        async def job(task_id):
+            seen.append((task_id, monitor.scheduled_time(1), monitor.scheduled_time(2)))
+
+        fire_time = datetime.now(timezone.utc) + timedelta(milliseconds=50)
+        scheduler.add_job(job, DateTrigger(fire_time), id="task_1", args=[1])
+        scheduler.start()
+        try:
+            for _ in range(100):
+                if seen:
+                    break
+                await asyncio.sleep(0.02)
+        finally:
+            scheduler.shutdown(wait=False)
+
+        # The time belongs to this run only, not to other tasks' executions
+        assert seen == [(1, fire_time, None)]
+
+    def test_stale_submission_not_used(self):
+        """Test that a submitted fire that never ran does not skew later runs."""
+        monitor = ScheduleMonitor()
+        submitted(monitor, START)
+
+        assert monitor.scheduled_time(1) is None
+        assert monitor.stats()["fires"] == 1
+
+    def test_immediate_run_has_no_scheduled_time(self):
+        """Test that executions not started by the scheduler get None."""
+        assert ScheduleMonitor().scheduled_time(1) is None
+
+    def test_internal_jobs_ignored(self):
+        """Test that reconcile and retention jobs are not counted."""
+        monitor = ScheduleMonitor()
+        submitted(monitor, START, job_id="task_cache_reconcile")
+        submitted(monitor, START, job_id="log_retention")
+
+        assert monitor.stats()["fires"] == 0
+
+    def test_record_lag(self):
+        """Test that lag percentiles and the maximum are tracked."""
+        monitor = ScheduleMonitor()
+        for lag_ms in (10, 20, 5000):
+            monitor.record_lag(lag_ms)
+
+        stats = monitor.stats()
+        assert stats["lag"]["count"] == 3
+        assert stats["lag"]["p50"] == pytest.approx(20, rel=0.01)
+        assert stats["total_lag_ms"] == 5030
+        assert stats["max_lag_ms"] == 5000
+
+
+class TestDroppedFires:
+    """Tests for counting missed, coalesced and rejected fires."""
+
+    def test_interval_fires_coalesced(self):
+        """Test that fires skipped between two submissions are counted."""
+        monitor = attached(IntervalTrigger(seconds=10, start_date=START))
+        submitted(monitor, START)
+        submitted(monitor, START + timedelta(seconds=40))
+
+        assert monitor.task_stats(1)["coalesced"] == 3
+        assert monitor.stats()["coalesced"] == 3
+
+    def test_cron_fires_coalesced(self):
+        """Test that skipped fire times of a cron trigger are counted."""
+        monitor = attached(CronTrigger(minute="*", timezone=timezone.utc))
+        submitted(monitor, START)
+        submitted(monitor, START + timedelta(minutes=1))
+        submitted(monitor, START + timedelta(minutes=5))
+
+        assert monitor.task_stats(1)["coalesced"] == 3
+
+    def test_removed_job_starts_new_series(self):
+        """Test that a rescheduled job does not count the gap as coalesced."""
+        monitor = attached(IntervalTrigger(seconds=10, start_date=START))
+        submitted(monitor, START)
+        monitor._on_event(JobEvent(EVENT_JOB_REMOVED, "task_1", "default"))
+        submitted(monitor, START + timedelta(minutes=5))
+
+        assert monitor.task_stats(1)["coalesced"] == 0
+
+    def test_missed_fire(self):
+        """Test that a fire past its grace time is counted."""
+        monitor = ScheduleMonitor()
+        submitted(monitor, START)
+        monitor._on_event(JobExecutionEvent(EVENT_JOB_MISSED, "task_1", "default", START))
+
+        assert monitor.task_stats(1)["missed"] == 1
+
+    def test_max_instances_fire(self):
+        """Test that fires dropped at max_instances are counted."""
+        monitor = attached(IntervalTrigger(seconds=10, start_date=START))
+        submitted(monitor, START)
+        monitor._on_event(JobSubmissionEvent(
+            EVENT_JOB_MAX_INSTANCES, "task_1", "default", [START + timedelta(seconds=10)]
+        ))
+        submitted(monitor, START + timedelta(seconds=20))
+
+        assert monitor.task_stats(1) == {"missed": 0, "coalesced": 0, "max_instances": 1}
+
+
+class TestSingleton:
+    """Tests for the monitor singleton."""
+
+    def test_attach_once(self):
+        """Test that attaching twice registers one listener."""
+        scheduler = MagicMock()
+        monitor = ScheduleMonitor()
+        monitor.attach(scheduler)
+        monitor.attach(scheduler)
+
+        scheduler.add_listener.assert_called_once()
+
+    def test_reset(self):
+        """Test that reset creates a new monitor."""
+        monitor = get_schedule_monitor()
+        assert get_schedule_monitor() is monitor
+
+        reset_schedule_monitor()
+        assert get_schedule_monitor() is not monitor
@@ -2,7 +2,7 @@
 
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 from app.models import Task, ExecutionLog
 from app.services.openai_service import OpenAIResponse, OpenAIServiceError
@@ -16,10 +16,13 @@ def mock_task():
     task.name = "Test Task"
     task.api_endpoint = "https://api.openai.com/v1/chat/completions"
     task.api_key = "encrypted_key"
+    task.api_key_fingerprint = None
+    task.rate_limit_per_minute = None
     task.schedule_type = "interval"
     task.interval_minutes = 60
     task.interval_seconds = 0
     task.fixed_time = None
+    task.next_run_at = None
     task.message_content = "Hello, AI!"
     task.enabled = True
     return task
@@ -33,9 +36,13 @@ def mock_fixed_time_task():
     task.name = "Daily Task"
     task.api_endpoint = "https://api.openai.com/v1/chat/completions"
     task.api_key = "encrypted_key"
+    task.api_key_fingerprint = None
+    task.rate_limit_per_minute = None
     task.schedule_type = "fixed_time"
     task.interval_minutes = None
     task.fixed_time = "09:00"
+    task.jitter_seconds = None
+    task.next_run_at = None
     task.message_content = "Good morning!"
     task.enabled = True
     return task
@@ -49,10 +56,13 @@ def mock_disabled_task():
     task.name = "Disabled Task"
     task.api_endpoint = "https://api.openai.com/v1/chat/completions"
     task.api_key = "encrypted_key"
+    task.api_key_fingerprint = None
+    task.rate_limit_per_minute = None
     task.schedule_type = "interval"
     task.interval_minutes = 30
     task.interval_seconds = 0
     task.fixed_time = None
+    task.next_run_at = None
     task.message_content = "Should not run"
     task.enabled = False
     return task
@@ -71,6 +81,16 @@ def cleanup_scheduler():
     # Ensure scheduler is stopped for next test
     if scheduler.running:
         scheduler.shutdown(wait=False)
+    from app.services.task_cache import clear_snapshots
+    from app.services.bulkhead import reset_bulkheads
+    from app.services.rate_limiter import reset_rate_limiter
+    from app.services.schedule_monitor import reset_schedule_monitor
+    from app.utils.security import clear_credential_cache
+    clear_snapshots()
+    clear_credential_cache()
+    reset_bulkheads()
+    reset_rate_limiter()
+    reset_schedule_monitor()
 
 
 # =============================================================================
@@ -125,6 +145,54 @@ class TestSchedulerShutdown:
             # due to APScheduler internals, but the shutdown call was made)
             # The important thing is that shutdown completes without error
 
+    @pytest.mark.asyncio
+    async def test_shutdown_waits_for_running_executions(self):
+        """Test that shutdown returns only after running executions have finished."""
+        import asyncio
+
+        from app.scheduler import execute_task, shutdown_scheduler, start_scheduler
+
+        finished = []
+
+        async def slow_execution(task_id, immediate):
+            await asyncio.sleep(0.05)
+            finished.append(task_id)
+
+        with patch("app.scheduler.register_all_tasks", new_callable=AsyncMock), \
+                patch("app.scheduler._run_execution", side_effect=slow_execution):
+            await start_scheduler()
+            running = asyncio.create_task(execute_task(1))
+            await asyncio.sleep(0)
+
+            await shutdown_scheduler()
+
+        assert finished == [1]
+        assert running.done()
+
+    @pytest.mark.asyncio
+    async def test_shutdown_cancels_executions_past_timeout(self, monkeypatch):
+        """Test that executions still running after the drain timeout are cancelled."""
+        import asyncio
+
+        import app.config
+        from app.scheduler import execute_task, shutdown_scheduler, start_scheduler
+
+        monkeypatch.setenv("SHUTDOWN_DRAIN_SECONDS", "0.05")
+        app.config._settings = None
+
+        async def stuck_execution(task_id, immediate):
+            await asyncio.sleep(60)
+
+        with patch("app.scheduler.register_all_tasks", new_callable=AsyncMock), \
+                patch("app.scheduler._run_execution", side_effect=stuck_execution):
+            await start_scheduler()
+            running = asyncio.create_task(execute_task(1))
+            await asyncio.sleep(0)
+
+            await shutdown_scheduler()
+
+        assert running.cancelled()
+
     @pytest.mark.asyncio
     async def test_shutdown_scheduler_logs_complete(self):
         """Test that shutdown_scheduler logs completion message."""
@@ -175,6 +243,25 @@ class TestTaskRegistration:
 
         scheduler.shutdown(wait=False)
 
+    @pytest.mark.asyncio
+    async def test_register_sets_shared_key_rate(self, mock_task, mock_fixed_time_task):
+        """Test that tasks sharing a key limit it to the smallest task limit."""
+        from app.scheduler import register_task, remove_job, scheduler
+        from app.services.rate_limiter import get_rate_limiter
+
+        scheduler.start()
+        mock_task.api_key_fingerprint = mock_fixed_time_task.api_key_fingerprint = "shared"
+        mock_task.rate_limit_per_minute = 6
+
+        register_task(mock_task)
+        register_task(mock_fixed_time_task)
+        assert get_rate_limiter().key_rate("shared") == 6
+
+        remove_job(mock_task.id)
+        assert get_rate_limiter().key_rate("shared") is None
+
+        scheduler.shutdown(wait=False)
+
     @pytest.mark.asyncio
     async def test_register_disabled_task_skipped(self, mock_disabled_task):
         """Test that disabled tasks are not registered (Task 2.1)."""
@@ -257,6 +344,173 @@ class TestTaskRegistration:
         scheduler.shutdown(wait=False)
 
 
+class TestFixedTimeJitter:
+    """Tests for deterministic fire-time jitter of fixed_time tasks."""
+
+    def test_no_jitter_by_default(self, mock_fixed_time_task):
+        """Test that fixed_time tasks fire on the minute without jitter."""
+        from app.scheduler import get_fire_offset
+
+        assert get_fire_offset(mock_fixed_time_task) == 0
+
+    def test_offset_is_deterministic_and_within_window(self, mock_fixed_time_task):
+        """Test that the offset is stable per task id and inside the window."""
+        from app.scheduler import get_fire_offset
+
+        mock_fixed_time_task.jitter_seconds = 300
+        offset = get_fire_offset(mock_fixed_time_task)
+
+        assert 0 <= offset < 300
+        assert get_fire_offset(mock_fixed_time_task) == offset
+
+    def test_offsets_spread_across_tasks(self, mock_fixed_time_task):
+        """Test that tasks at the same minute get different offsets."""
+        from app.scheduler import get_fire_offset
+
+        mock_fixed_time_task.jitter_seconds = 600
+        offsets = set()
+        for task_id in range(1, 51):
+            mock_fixed_time_task.id = task_id
+            offsets.add(get_fire_offset(mock_fixed_time_task))
+
+        assert len(offsets) > 40
+
+    def test_global_jitter_setting(self, mock_fixed_time_task, monkeypatch):
+        """Test that FIXED_TIME_JITTER_SECONDS applies when the task sets none."""
+        monkeypatch.setenv("FIXED_TIME_JITTER_SECONDS", "120")
+        from app.scheduler import get_fire_offset
+
+        assert 0 <= get_fire_offset(mock_fixed_time_task) < 120
+
+    def test_interval_tasks_have_no_offset(self, mock_task):
+        """Test that jitter only applies to fixed_time tasks."""
+        from app.scheduler import get_fire_offset
+
+        assert get_fire_offset(mock_task) == 0
+
+    @pytest.mark.asyncio
+    async def test_trigger_includes_offset(self, mock_fixed_time_task):
+        """Test that the registered trigger fires at HH:MM plus the offset."""
+        from app.scheduler import get_fire_offset, register_task, scheduler
+
+        mock_fixed_time_task.fixed_time = "23:59"
+        mock_fixed_time_task.jitter_seconds = 3600
+        offset = get_fire_offset(mock_fixed_time_task)
+
+        scheduler.start()
+        register_task(mock_fixed_time_task)
+        next_run = scheduler.get_job(f"task_{mock_fixed_time_task.id}").next_run_time
+
+        fire_second = (23 * 3600 + 59 * 60 + offset) % 86400
+        assert next_run.hour * 3600 + next_run.minute * 60 + next_run.second == fire_second
+
+        scheduler.shutdown(wait=False)
+
+
+class TestIntervalPhasePersistence:
+    """Tests for restart-safe interval phases."""
+
+    def test_resume_time_uses_recorded_phase(self, mock_task):
+        """Test that a recorded next_run_at (naive UTC) is the anchor."""
+        from app.scheduler import get_resume_time
+
+        mock_task.next_run_at = datetime(2025, 1, 1, 8, 17, 5)
+
+        start_at = get_resume_time(mock_task, datetime.now(timezone.utc))
+
+        assert start_at == datetime(2025, 1, 1, 8, 17, 5, tzinfo=timezone.utc)
+
+    def test_resume_time_staggers_new_tasks(self, mock_task):
+        """Test that tasks without history start within one interval."""
+        from app.scheduler import get_resume_time
+
+        now = datetime.now(timezone.utc)
+        starts = set()
+        for task_id in range(1, 21):
+            mock_task.id = task_id
+            start_at = get_resume_time(mock_task, now)
+            assert now <= start_at < now + timedelta(hours=1)
+            assert start_at == get_resume_time(mock_task, now)
+            starts.add(start_at)
+
+        assert len(starts) > 10
+
+    def test_resume_time_ignores_fixed_time_tasks(self, mock_fixed_time_task):
+        """Test that fixed_time tasks keep their cron schedule."""
+        from app.scheduler import get_resume_time
+
+        assert get_resume_time(mock_fixed_time_task, datetime.now(timezone.utc)) is None
+
+    @pytest.mark.asyncio
+    async def test_past_anchor_keeps_phase(self, mock_task):
+        """Test that the next fire is a whole number of intervals after the anchor."""
+        from app.scheduler import register_task, scheduler
+
+        scheduler.start()
+        anchor = datetime.now(timezone.utc) - timedelta(hours=5, minutes=17)
+
+        register_task(mock_task, start_at=anchor)
+
+        next_run = scheduler.get_job(f"task_{mock_task.id}").next_run_time
+        elapsed = (next_run - anchor).total_seconds()
+        assert elapsed == 6 * 3600
+        scheduler.shutdown(wait=False)
+
+    @pytest.mark.asyncio
+    async def test_phase_survives_restart(self, tmp_path):
+        """Test that a saved next run time is resumed after a restart."""
+        from app.database import Base
+        from app.scheduler import register_all_tasks, save_next_run_times, scheduler
+        from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with maker() as session:
+            session.add(Task(
+                id=1,
+                name="Interval Task",
+                api_endpoint="https://api.example.com/v1/chat",
+                api_key="encrypted_key_value",
+                schedule_type="interval",
+                interval_minutes=10,
+                message_content="Hello",
+                model="gpt-4",
+            ))
+            await session.commit()
+
+        async def load_task():
+            async with maker() as session:
+                return await session.get(Task, 1)
+
+        with patch("app.scheduler.get_session_maker", return_value=maker):
+            # First start records a staggered anchor without touching updated_at
+            before = await load_task()
+            await register_all_tasks()
+            first = await load_task()
+            assert first.next_run_at is not None
+            assert first.updated_at == before.updated_at
+
+            # Shutdown persists the live next fire time
+            scheduler.start()
+            next_run = scheduler.get_job("task_1").next_run_time
+            await save_next_run_times()
+            scheduler.shutdown(wait=False)
+            scheduler.remove_all_jobs()
+            saved = await load_task()
+            assert saved.next_run_at.replace(tzinfo=timezone.utc) == next_run
+
+            # Restart resumes the same phase
+            await register_all_tasks()
+            scheduler.start()
+            resumed = scheduler.get_job("task_1").next_run_time
+            assert (resumed - next_run).total_seconds() % 600 == 0
+            scheduler.shutdown(wait=False)
+
+        await engine.dispose()
+
+
 # =============================================================================
 # Task 3: Task Execution Tests
 # =============================================================================
@@ -287,8 +541,9 @@ class TestTaskExecution:
             mock_result.scalar_one_or_none.return_value = mock_task
             mock_session.execute.return_value = mock_result
 
-            with patch("app.scheduler.decrypt_api_key", return_value="plain_key"):
-                with patch("app.scheduler.send_message", new_callable=AsyncMock) as mock_send:
+            with patch("app.utils.security.decrypt_api_key", return_value="plain_key"):
+                with patch("app.scheduler.send_message", new_callable=AsyncMock) as mock_send, \
+                        patch("app.scheduler.submit_execution_log", new_callable=AsyncMock) as mock_submit:
                     mock_send.return_value = mock_response
 
                     from app.scheduler import execute_task
@@ -299,15 +554,114 @@ class TestTaskExecution:
                         api_key="plain_key",
                         message_content=mock_task.message_content,
                         model=mock_task.model,
+                        authorization="Bearer plain_key",
                     )
-                    mock_session.add.assert_called_once()
-                    mock_session.commit.assert_called_once()
+                    mock_submit.assert_called_once()
+
+                    # Verify ExecutionLog values
+                    log_values = mock_submit.call_args[0][0]
+                    assert log_values["task_id"] == mock_task.id
+                    assert log_values["status"] == "success"
+                    assert log_values["executed_at"] is not None
+                    assert log_values["latency_ms"] == 150
+                    assert log_values["response_summary"] == "Hello! How can I help?"
+                    # Not started by a trigger fire
+                    assert log_values["scheduled_at"] is None
+                    assert "lag_ms" not in log_values
+
+    @pytest.mark.asyncio
+    async def test_execute_task_records_scheduled_time(self, mock_task):
+        """Test that a scheduler-fired execution records its fire time and lag."""
+        from app.services.schedule_monitor import _scheduled_run, get_schedule_monitor
+        from app.services.task_cache import upsert_snapshot
+
+        scheduled_at = datetime.now(timezone.utc) - timedelta(seconds=2)
+        upsert_snapshot(mock_task)
+
+        with patch("app.utils.security.decrypt_api_key", return_value="plain_key"), \
+                patch("app.scheduler.send_message", new_callable=AsyncMock) as mock_send, \
+                patch("app.scheduler.submit_execution_log", new_callable=AsyncMock) as mock_submit:
+            mock_send.return_value = OpenAIResponse(response_summary="ok", response_time_ms=150)
+
+            from app.scheduler import execute_task
+            # As set by ScheduledTimeExecutor when the job run is submitted
+            token = _scheduled_run.set((f"task_{mock_task.id}", scheduled_at))
+            try:
+                await execute_task(mock_task.id)
+            finally:
+                _scheduled_run.reset(token)
+
+        log_values = mock_submit.call_args[0][0]
+        assert log_values["scheduled_at"] == scheduled_at
+        assert 2000 <= log_values["lag_ms"] < 3000
+        assert get_schedule_monitor().stats()["lag"]["count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_execute_task_records_metrics(self, mock_task):
+        """Test that an execution is counted and its phases timed."""
+        from app.services.metrics import EXECUTION_PHASE_SECONDS, EXECUTIONS, EXECUTIONS_IN_FLIGHT
+        from app.services.task_cache import upsert_snapshot
 
-                    # Verify ExecutionLog
-                    call_args = mock_session.add.call_args[0][0]
-                    assert call_args.status == "success"
-                    assert call_args.executed_at is not None
-                    assert "150ms" in call_args.response_summary
+        upsert_snapshot(mock_task)
+        successes = EXECUTIONS.labels("success").value
+        http_count = EXECUTION_PHASE_SECONDS.labels("http").count
+        decrypt_count = EXECUTION_PHASE_SECONDS.labels("decrypt").count
+
+        with patch("app.utils.security.decrypt_api_key", return_value="plain_key"), \
+                patch("app.scheduler.send_message", new_callable=AsyncMock) as mock_send, \
+                patch("app.scheduler.submit_execution_log", new_callable=AsyncMock):
+            mock_send.return_value = OpenAIResponse(response_summary="ok", response_time_ms=150)
+
+            from app.scheduler import execute_task
+            await execute_task(mock_task.id)
+
+        assert EXECUTIONS.labels("success").value == successes + 1
+        assert EXECUTION_PHASE_SECONDS.labels("http").count == http_count + 1
+        assert EXECUTION_PHASE_SECONDS.labels("decrypt").count == decrypt_count + 1
+        assert EXECUTIONS_IN_FLIGHT.labels().value == 0
+
+    @pytest.mark.asyncio
+    async def test_execute_task_records_timings(self, mock_task):
+        """Test that the phase breakdown is attached to the execution log."""
+        from app.services.task_cache import upsert_snapshot
+
+        upsert_snapshot(mock_task)
+        mock_response = OpenAIResponse(
+            response_summary="ok",
+            response_time_ms=150,
+            timings={"acquire": 0, "ttfb": 120, "body": 20, "parse": 1},
+        )
+
+        with patch("app.utils.security.decrypt_api_key", return_value="plain_key"), \
+                patch("app.scheduler.send_message", new_callable=AsyncMock) as mock_send, \
+                patch("app.scheduler.submit_execution_log", new_callable=AsyncMock) as mock_submit:
+            mock_send.return_value = mock_response
+
+            from app.scheduler import execute_task
+            await execute_task(mock_task.id)
+
+        timings = mock_submit.call_args[0][0]["timings"]
+        # Zero phases are left out
+        assert {"ttfb": 120, "body": 20, "parse": 1}.items() <= timings.items()
+        assert "acquire" not in timings
+
+    @pytest.mark.asyncio
+    async def test_execute_task_timings_disabled(self, mock_task, monkeypatch):
+        """Test that no breakdown is stored when disabled."""
+        from app.services.task_cache import upsert_snapshot
+
+        monkeypatch.setenv("EXECUTION_TIMINGS_ENABLED", "false")
+        upsert_snapshot(mock_task)
+
+        with patch("app.utils.security.decrypt_api_key", return_value="plain_key"), \
+                patch("app.scheduler.send_message", new_callable=AsyncMock) as mock_send, \
+                patch("app.scheduler.submit_execution_log", new_callable=AsyncMock) as mock_submit:
+            mock_send.return_value = OpenAIResponse(response_summary="ok", response_time_ms=150)
+
+            from app.scheduler import execute_task
+            await execute_task(mock_task.id)
+
+        assert mock_submit.call_args[0][0]["timings"] is None
 
     @pytest.mark.asyncio
     async def test_execute_task_failure(self, mock_task):
@@ -326,8 +680,9 @@ class TestTaskExecution:
             mock_result.scalar_one_or_none.return_value = mock_task
             mock_session.execute.return_value = mock_result
 
-            with patch("app.scheduler.decrypt_api_key", return_value="plain_key"):
-                with patch("app.scheduler.send_message", new_callable=AsyncMock) as mock_send:
+            with patch("app.utils.security.decrypt_api_key", return_value="plain_key"):
+                with patch("app.scheduler.send_message", new_callable=AsyncMock) as mock_send, \
+                        patch("app.scheduler.submit_execution_log", new_callable=AsyncMock) as mock_submit:
                     mock_send.side_effect = OpenAIServiceError(
                         message="API error", status_code=500
                     )
@@ -335,13 +690,12 @@ class TestTaskExecution:
                     from app.scheduler import execute_task
                     await execute_task(mock_task.id)
 
-                    mock_session.add.assert_called_once()
-                    mock_session.commit.assert_called_once()
+                    mock_submit.assert_called_once()
 
                     # Verify ExecutionLog has failed status
-                    call_args = mock_session.add.call_args[0][0]
-                    assert call_args.status == "failed"
-                    assert call_args.error_message == "API error"
+                    log_values = mock_submit.call_args[0][0]
+                    assert log_values["status"] == "failed"
+                    assert log_values["error_message"] == "API error"
 
     @pytest.mark.asyncio
     async def test_execute_disabled_task_skipped(self, mock_disabled_task):
@@ -360,15 +714,15 @@ class TestTaskExecution:
             mock_result.scalar_one_or_none.return_value = mock_disabled_task
             mock_session.execute.return_value = mock_result
 
-            with patch("app.scheduler.send_message", new_callable=AsyncMock) as mock_send:
+            with patch("app.scheduler.send_message", new_callable=AsyncMock) as mock_send, \
+                    patch("app.scheduler.submit_execution_log", new_callable=AsyncMock) as mock_submit:
                 from app.scheduler import execute_task
                 await execute_task(mock_disabled_task.id)
 
                 # Verify: OpenAI service not called
                 mock_send.assert_not_called()
                 # Verify: No ExecutionLog created
-                mock_session.add.assert_not_called()
-                mock_session.commit.assert_not_called()
+                mock_submit.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_execute_nonexistent_task(self):
@@ -387,12 +741,66 @@ class TestTaskExecution:
             mock_result.scalar_one_or_none.return_value = None
             mock_session.execute.return_value = mock_result
 
-            from app.scheduler import execute_task
-            # Should not raise exception
-            await execute_task(999)
+            with patch("app.scheduler.submit_execution_log", new_callable=AsyncMock) as mock_submit:
+                from app.scheduler import execute_task
+                # Should not raise exception
+                await execute_task(999)
+
+                # No ExecutionLog should be created
+                mock_submit.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_execute_task_skipped_on_follower_node(self, mock_task):
+        """Test that a node without the scheduler lease does not execute fires."""
+        from app.scheduler import execute_task, register_task
+
+        register_task(mock_task)
+
+        with patch("app.scheduler.owns_task", return_value=False), \
+             patch("app.scheduler.send_message", new_callable=AsyncMock) as mock_send, \
+             patch("app.scheduler.submit_execution_log", new_callable=AsyncMock) as mock_submit:
+            await execute_task(mock_task.id)
+
+            mock_send.assert_not_called()
+            mock_submit.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_immediate_run_executes_on_follower_node(self, mock_task):
+        """Test that a run requested by an edit is not skipped for ownership."""
+        from app.scheduler import execute_task, register_task
+
+        register_task(mock_task)
+        response = OpenAIResponse(response_summary="ok", response_time_ms=10)
+
+        with patch("app.scheduler.owns_task", return_value=False), \
+             patch("app.scheduler.fence_valid", return_value=False), \
+             patch("app.utils.security.decrypt_api_key", return_value="plain_key"), \
+             patch("app.scheduler.send_message", new_callable=AsyncMock, return_value=response), \
+             patch("app.scheduler.submit_execution_log", new_callable=AsyncMock) as mock_submit:
+            await execute_task(mock_task.id, immediate=True)
+
+            mock_submit.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_result_discarded_after_losing_lease(self, mock_task):
+        """Test that a fire finishing after the lease moved writes no result."""
+        from app.scheduler import execute_task, register_task
+        from app.services.metrics import EXECUTIONS
+
+        register_task(mock_task)
+        response = OpenAIResponse(response_summary="ok", response_time_ms=10)
+        fenced_before = EXECUTIONS.labels("fenced").value
+
+        with patch("app.scheduler.execution_fence", return_value=3), \
+             patch("app.scheduler.fence_valid", return_value=False) as mock_fence, \
+             patch("app.utils.security.decrypt_api_key", return_value="plain_key"), \
+             patch("app.scheduler.send_message", new_callable=AsyncMock, return_value=response), \
+             patch("app.scheduler.submit_execution_log", new_callable=AsyncMock) as mock_submit:
+            await execute_task(mock_task.id)
 
-            # No ExecutionLog should be created
-            mock_session.add.assert_not_called()
+            mock_fence.assert_called_once_with(mock_task.id, 3)
+            mock_submit.assert_not_called()
+        assert EXECUTIONS.labels("fenced").value == fenced_before + 1
 
     @pytest.mark.asyncio
     async def test_execute_task_unexpected_error(self, mock_task):
@@ -411,17 +819,253 @@ class TestTaskExecution:
             mock_result.scalar_one_or_none.return_value = mock_task
             mock_session.execute.return_value = mock_result
 
-            with patch("app.scheduler.decrypt_api_key", return_value="plain_key"):
-                with patch("app.scheduler.send_message", new_callable=AsyncMock) as mock_send:
+            with patch("app.utils.security.decrypt_api_key", return_value="plain_key"):
+                with patch("app.scheduler.send_message", new_callable=AsyncMock) as mock_send, \
+                        patch("app.scheduler.submit_execution_log", new_callable=AsyncMock) as mock_submit:
                     mock_send.side_effect = RuntimeError("Unexpected error")
 
                     from app.scheduler import execute_task
                     await execute_task(mock_task.id)
 
                     # Verify ExecutionLog still created with failed status
-                    call_args = mock_session.add.call_args[0][0]
-                    assert call_args.status == "failed"
-                    assert "Unexpected error" in call_args.error_message
+                    log_values = mock_submit.call_args[0][0]
+                    assert log_values["status"] == "failed"
+                    assert "Unexpected error" in log_values["error_message"]
+
+
+class TestTaskSnapshotCache:
+    """Tests for executing from the task snapshot cache."""
+
+    @pytest.mark.asyncio
+    async def test_execute_cached_task_skips_database(self, mock_task):
+        """Test that a registered task fires without reading the database."""
+        from app.scheduler import execute_task, register_task, scheduler
+        from app.services.metrics import EXECUTION_PHASE_SECONDS
+
+        scheduler.start()
+        register_task(mock_task)
+        load_count = EXECUTION_PHASE_SECONDS.labels("load").count
+
+        mock_response = OpenAIResponse(response_summary="Hi", response_time_ms=10)
+        with patch("app.scheduler.get_session_maker") as mock_get_session_maker, \
+                patch("app.utils.security.decrypt_api_key", return_value="plain_key"), \
+                patch("app.scheduler.send_message", new_callable=AsyncMock) as mock_send, \
+                patch("app.scheduler.submit_execution_log", new_callable=AsyncMock) as mock_submit:
+            mock_send.return_value = mock_response
+
+            await execute_task(mock_task.id)
+
+            mock_get_session_maker.assert_not_called()
+            mock_send.assert_called_once()
+            mock_submit.assert_called_once()
+            assert EXECUTION_PHASE_SECONDS.labels("load").count == load_count + 1
+
+        scheduler.shutdown(wait=False)
+
+    @pytest.mark.asyncio
+    async def test_register_disabled_task_evicts_snapshot(self, mock_task):
+        """Test that disabling a task removes its snapshot."""
+        from app.scheduler import register_task, scheduler
+        from app.services.task_cache import get_snapshot
+
+        scheduler.start()
+        register_task(mock_task)
+        assert get_snapshot(mock_task.id) is not None
+
+        mock_task.enabled = False
+        register_task(mock_task)
+        assert get_snapshot(mock_task.id) is None
+
+        scheduler.shutdown(wait=False)
+
+    @pytest.mark.asyncio
+    async def test_remove_job_evicts_snapshot(self, mock_task):
+        """Test that removing a job removes its snapshot."""
+        from app.scheduler import register_task, remove_job, scheduler
+        from app.services.task_cache import get_snapshot
+
+        scheduler.start()
+        register_task(mock_task)
+        remove_job(mock_task.id)
+
+        assert get_snapshot(mock_task.id) is None
+
+        scheduler.shutdown(wait=False)
+
+    @pytest.mark.asyncio
+    async def test_reconcile_reregisters_changed_and_removes_deleted(self, mock_task, mock_fixed_time_task):
+        """Test that reconcile_tasks detects out-of-band edits via updated_at."""
+        from app.scheduler import reconcile_tasks, register_task, scheduler
+        from app.services.task_cache import get_snapshot
+
+        scheduler.start()
+        mock_task.updated_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        mock_fixed_time_task.updated_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        register_task(mock_task)
+        register_task(mock_fixed_time_task)
+
+        # Task 1 was edited in the database, task 2 was deleted
+        edited_at = datetime(2025, 1, 2, tzinfo=timezone.utc)
+        mock_task.updated_at = edited_at
+        mock_task.message_content = "Edited"
+
+        with patch("app.scheduler.get_session_maker") as mock_get_session_maker:
+            mock_session = AsyncMock()
+            mock_session_maker = MagicMock()
+            mock_session_maker.return_value.__aenter__.return_value = mock_session
+            mock_get_session_maker.return_value = mock_session_maker
+
+            version_row = MagicMock(id=mock_task.id, updated_at=edited_at)
+            versions_result = MagicMock()
+            versions_result.all.return_value = [version_row]
+            tasks_result = MagicMock()
+            tasks_result.scalars.return_value.all.return_value = [mock_task]
+            mock_session.execute.side_effect = [versions_result, tasks_result]
+
+            await reconcile_tasks()
+
+        assert get_snapshot(mock_task.id).message_content == "Edited"
+        assert get_snapshot(mock_fixed_time_task.id) is None
+        assert scheduler.get_job(f"task_{mock_fixed_time_task.id}") is None
+
+        scheduler.shutdown(wait=False)
+
+
+class TestPartitionedScheduling:
+    """Tests for registering only this node's share of tasks."""
+
+    @pytest.mark.asyncio
+    async def test_register_task_skips_unassigned(self, mock_task):
+        """Test that tasks hashed to another node are not scheduled here."""
+        from app.scheduler import register_task, scheduler
+        from app.services.task_cache import get_snapshot
+
+        scheduler.start()
+
+        with patch("app.scheduler.is_assigned", return_value=False):
+            register_task(mock_task)
+
+        assert scheduler.get_job(f"task_{mock_task.id}") is None
+        assert get_snapshot(mock_task.id) is None
+        scheduler.shutdown(wait=False)
+
+    @pytest.mark.asyncio
+    async def test_reconcile_rebalances(self, mock_task, mock_fixed_time_task):
+        """Test that reconcile hands off tasks moved away and picks up new ones."""
+        from app.scheduler import reconcile_tasks, register_task, scheduler
+
+        scheduler.start()
+        updated_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        mock_task.updated_at = updated_at
+        mock_fixed_time_task.updated_at = updated_at
+        register_task(mock_task)
+
+        # After a membership change task 1 moved away and task 2 moved here
+        with patch("app.scheduler.get_session_maker") as mock_get_session_maker, \
+             patch("app.scheduler.is_assigned", side_effect=lambda task_id: task_id == 2):
+            mock_session = AsyncMock()
+            mock_session_maker = MagicMock()
+            mock_session_maker.return_value.__aenter__.return_value = mock_session
+            mock_get_session_maker.return_value = mock_session_maker
+
+            versions_result = MagicMock()
+            versions_result.all.return_value = [
+                MagicMock(id=mock_task.id, updated_at=updated_at),
+                MagicMock(id=mock_fixed_time_task.id, updated_at=updated_at),
+            ]
+            tasks_result = MagicMock()
+            tasks_result.scalars.return_value.all.return_value = [mock_fixed_time_task]
+            mock_session.execute.side_effect = [versions_result, tasks_result]
+
+            await reconcile_tasks()
+
+        assert scheduler.get_job(f"task_{mock_task.id}") is None
+        assert scheduler.get_job(f"task_{mock_fixed_time_task.id}") is not None
+        scheduler.shutdown(wait=False)
+
+
+class TestBulkheadExecution:
+    """Tests for bulkhead admission during execution."""
+
+    @pytest.mark.asyncio
+    async def test_rejected_fire_records_no_log(self, mock_task):
+        """Test that a fire rejected by a bulkhead is dropped without a log."""
+        from app.scheduler import execute_task, register_task, scheduler
+        from app.services.bulkhead import BulkheadRejected
+
+        scheduler.start()
+        register_task(mock_task)
+
+        rejecting_guard = MagicMock()
+        rejecting_guard.return_value.__aenter__ = AsyncMock(
+            side_effect=BulkheadRejected("global", "skipped")
+        )
+        rejecting_guard.return_value.__aexit__ = AsyncMock(return_value=None)
+
+        with patch("app.utils.security.decrypt_api_key", return_value="plain_key"), \
+                patch("app.scheduler.get_bulkheads") as mock_get_bulkheads, \
+                patch("app.scheduler.send_message", new_callable=AsyncMock) as mock_send, \
+                patch("app.scheduler.submit_execution_log", new_callable=AsyncMock) as mock_submit:
+            mock_get_bulkheads.return_value.guard = rejecting_guard
+
+            await execute_task(mock_task.id)
+
+            mock_send.assert_not_called()
+            mock_submit.assert_not_called()
+
+        scheduler.shutdown(wait=False)
+
+
+class TestRateLimitedExecution:
+    """Tests for provider rate-limit handling during execution."""
+
+    @pytest.mark.asyncio
+    async def test_429_waits_and_retries(self, mock_task):
+        """Test that a 429 is retried after the advertised Retry-After."""
+        from app.scheduler import execute_task, register_task, scheduler
+        from app.services.rate_limiter import RateLimitHeaders
+
+        scheduler.start()
+        register_task(mock_task)
+
+        rate_limited = OpenAIServiceError(
+            message="API returned 429", status_code=429,
+            rate_limit=RateLimitHeaders(retry_after=0.01),
+        )
+        mock_response = OpenAIResponse(response_summary="Hi", response_time_ms=10)
+
+        with patch("app.utils.security.decrypt_api_key", return_value="plain_key"), \
+                patch("app.scheduler.send_message", new_callable=AsyncMock) as mock_send, \
+                patch("app.scheduler.submit_execution_log", new_callable=AsyncMock) as mock_submit:
+            mock_send.side_effect = [rate_limited, mock_response]
+
+            await execute_task(mock_task.id)
+
+            assert mock_send.call_count == 2
+            assert mock_submit.call_args[0][0]["status"] == "success"
+
+        scheduler.shutdown(wait=False)
+
+    @pytest.mark.asyncio
+    async def test_429_exhausts_retries(self, mock_task, monkeypatch):
+        """Test that repeated 429s are recorded as a failure."""
+        monkeypatch.setenv("RATE_LIMIT_MAX_RETRIES", "0")
+        from app.scheduler import execute_task, register_task, scheduler
+
+        scheduler.start()
+        register_task(mock_task)
+
+        with patch("app.utils.security.decrypt_api_key", return_value="plain_key"), \
+                patch("app.scheduler.send_message", new_callable=AsyncMock) as mock_send, \
+                patch("app.scheduler.submit_execution_log", new_callable=AsyncMock) as mock_submit:
+            mock_send.side_effect = OpenAIServiceError(message="API returned 429", status_code=429)
+
+            await execute_task(mock_task.id)
+
+            mock_send.assert_called_once()
+            assert mock_submit.call_args[0][0]["status"] == "failed"
+
+        scheduler.shutdown(wait=False)
 
 
 # =============================================================================
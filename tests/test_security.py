@@ -93,6 +93,18 @@ def test_get_fernet_raises_without_key(monkeypatch):
         security_module.get_fernet()
 
 
+def test_fingerprint_api_key_raises_without_key(monkeypatch):
+    """Test that fingerprints are not computed with an empty HMAC secret."""
+    import app.utils.security as security_module
+    import app.config as config_module
+
+    config_module._settings = None
+    monkeypatch.delenv("ENCRYPTION_KEY", raising=False)
+
+    with pytest.raises(ValueError, match="ENCRYPTION_KEY not configured"):
+        security_module.fingerprint_api_key("sk-test1234567890")
+
+
 # === Password Verification Tests (Story 3.1) ===
 
 
@@ -117,3 +129,92 @@ def test_verify_password_empty():
     assert verify_password("", "") is True
     assert verify_password("", "password") is False
     assert verify_password("password", "") is False
+
+
+# === Credential Cache Tests ===
+
+
+@pytest.fixture
+def credential_cache():
+    """Provide an empty credential cache."""
+    from app.utils.security import clear_credential_cache
+    clear_credential_cache()
+    yield
+    clear_credential_cache()
+
+
+def test_get_credential_builds_authorization_header(credential_cache):
+    """Test get_credential decrypts and builds the Bearer header."""
+    from app.utils.security import encrypt_api_key, get_credential
+
+    encrypted = encrypt_api_key("sk-test1234567890")
+    credential = get_credential(1, encrypted)
+
+    assert credential.api_key == "sk-test1234567890"
+    assert credential.authorization == "Bearer sk-test1234567890"
+
+
+def test_get_credential_hits_cache(credential_cache):
+    """Test repeated lookups skip decryption."""
+    from unittest.mock import patch
+
+    from app.utils.security import encrypt_api_key, get_credential, get_credential_cache_stats
+
+    encrypted = encrypt_api_key("sk-test1234567890")
+    get_credential(1, encrypted)
+
+    with patch("app.utils.security.decrypt_api_key") as mock_decrypt:
+        get_credential(1, encrypted)
+        mock_decrypt.assert_not_called()
+
+    stats = get_credential_cache_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_get_credential_changed_ciphertext_misses(credential_cache):
+    """Test a new ciphertext for the same task is not served from cache."""
+    from app.utils.security import encrypt_api_key, get_credential
+
+    get_credential(1, encrypt_api_key("sk-oldkey12345678"))
+    credential = get_credential(1, encrypt_api_key("sk-newkey12345678"))
+
+    assert credential.api_key == "sk-newkey12345678"
+
+
+def test_get_credential_expires_after_ttl(credential_cache, monkeypatch):
+    """Test entries are re-decrypted once the TTL elapses."""
+    monkeypatch.setenv("CREDENTIAL_CACHE_TTL_SECONDS", "0")
+    from app.utils.security import encrypt_api_key, get_credential, get_credential_cache_stats
+
+    encrypted = encrypt_api_key("sk-test1234567890")
+    get_credential(1, encrypted)
+    get_credential(1, encrypted)
+
+    assert get_credential_cache_stats()["misses"] == 2
+
+
+def test_get_credential_evicts_least_recently_used(credential_cache, monkeypatch):
+    """Test the cache is bounded by credential_cache_max_size."""
+    monkeypatch.setenv("CREDENTIAL_CACHE_MAX_SIZE", "2")
+    from app.utils.security import encrypt_api_key, get_credential, get_credential_cache_stats
+
+    for task_id in (1, 2, 3):
+        get_credential(task_id, encrypt_api_key(f"sk-key{task_id}-1234567890"))
+
+    assert get_credential_cache_stats()["size"] == 2
+
+
+def test_invalidate_credential(credential_cache):
+    """Test invalidate_credential drops the task's entry."""
+    from app.utils.security import (
+        encrypt_api_key,
+        get_credential,
+        get_credential_cache_stats,
+        invalidate_credential,
+    )
+
+    get_credential(1, encrypt_api_key("sk-test1234567890"))
+    invalidate_credential(1)
+
+    assert get_credential_cache_stats()["size"] == 0
@@ -0,0 +1,200 @@
+"""Tests for the daily execution statistics rollup."""
+
+from datetime import date, datetime, timezone
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database import Base
+from app.models import ExecutionLatencyDaily, ExecutionLog, ExecutionStatsDaily, Task
+from app.services.log_writer import apply_execution_logs
+from app.services.stats import (
+    get_day_totals,
+    get_latency_histograms,
+    get_task_totals,
+    rebuild_daily_stats,
+    stats_day,
+    summarize_daily,
+)
+
+
+@pytest_asyncio.fixture
+async def session():
+    """Create an in-memory database with one task."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with maker() as session:
+        session.add(Task(
+            id=1,
+            name="Test Task",
+            api_endpoint="https://api.example.com/v1/chat",
+            api_key="encrypted_key_value",
+            schedule_type="interval",
+            interval_minutes=30,
+            message_content="Hello",
+            model="gpt-4",
+        ))
+        await session.commit()
+        yield session
+
+    await engine.dispose()
+
+
+def make_values(executed_at: datetime, status: str = "success", latency_ms: int | None = None) -> dict:
+    """Build execution log values for task 1."""
+    return {
+        "task_id": 1,
+        "executed_at": executed_at,
+        "status": status,
+        "response_summary": None,
+        "error_message": None,
+        "latency_ms": latency_ms,
+    }
+
+
+async def load_rows(session) -> list[ExecutionStatsDaily]:
+    """Load all rollup rows ordered by day."""
+    result = await session.execute(select(ExecutionStatsDaily).order_by(ExecutionStatsDaily.day))
+    return list(result.scalars().all())
+
+
+class TestSummarizeDaily:
+    """Tests for aggregating records into day buckets."""
+
+    def test_day_boundary_is_china_time(self):
+        """Test that 16:00 UTC starts the next China day."""
+        assert stats_day(datetime(2024, 1, 15, 15, 59)) == date(2024, 1, 15)
+        assert stats_day(datetime(2024, 1, 15, 16, 0, tzinfo=timezone.utc)) == date(2024, 1, 16)
+
+    def test_counts_and_latency(self):
+        """Test that counts and latency aggregate per task and day."""
+        rows = summarize_daily([
+            make_values(datetime(2024, 1, 15, 1), latency_ms=100),
+            make_values(datetime(2024, 1, 15, 2), latency_ms=300),
+            make_values(datetime(2024, 1, 15, 3), status="failed"),
+            make_values(datetime(2024, 1, 16, 3), latency_ms=50),
+        ])
+
+        assert rows == [
+            {"task_id": 1, "day": date(2024, 1, 15), "success": 2, "failed": 1,
+             "latency_sum": 400, "latency_max": 300},
+            {"task_id": 1, "day": date(2024, 1, 16), "success": 1, "failed": 0,
+             "latency_sum": 50, "latency_max": 50},
+        ]
+
+
+class TestRollup:
+    """Tests for maintaining and reading the rollup table."""
+
+    @pytest.mark.asyncio
+    async def test_batches_accumulate(self, session):
+        """Test that later batches add to the same day's row."""
+        await apply_execution_logs(session, [make_values(datetime(2024, 1, 15, 1), latency_ms=100)])
+        await apply_execution_logs(session, [
+            make_values(datetime(2024, 1, 15, 2), latency_ms=700),
+            make_values(datetime(2024, 1, 15, 3), status="failed"),
+        ])
+        await session.commit()
+
+        rows = await load_rows(session)
+        assert len(rows) == 1
+        assert (rows[0].success, rows[0].failed) == (2, 1)
+        assert (rows[0].latency_sum, rows[0].latency_max) == (800, 700)
+
+    @pytest.mark.asyncio
+    async def test_totals(self, session):
+        """Test day-range and all-time totals."""
+        await apply_execution_logs(session, [
+            make_values(datetime(2024, 1, 10, 1)),
+            make_values(datetime(2024, 1, 15, 1)),
+            make_values(datetime(2024, 1, 15, 2), status="failed"),
+        ])
+        await session.commit()
+
+        assert await get_day_totals(session, date(2024, 1, 15)) == (1, 1)
+        assert await get_day_totals(session, date(2024, 1, 16), task_id=1) == (0, 0)
+        assert await get_task_totals(session, 1) == (2, 1)
+
+    @pytest.mark.asyncio
+    async def test_rebuild_matches_logs(self, session):
+        """Test that a rebuild recomputes counts from raw logs."""
+        session.add_all([
+            ExecutionLog(task_id=1, executed_at=datetime(2024, 1, 15, 1), status="success"),
+            ExecutionLog(task_id=1, executed_at=datetime(2024, 1, 15, 20), status="failed"),
+        ])
+        session.add(ExecutionStatsDaily(
+            task_id=1, day=date(2000, 1, 1), success=5, failed=0, latency_sum=0, latency_max=0,
+        ))
+        await session.commit()
+
+        written = await rebuild_daily_stats(session)
+
+        rows = await load_rows(session)
+        assert written == 2
+        assert [(row.day, row.success, row.failed) for row in rows] == [
+            (date(2024, 1, 15), 1, 0),
+            (date(2024, 1, 16), 0, 1),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_rebuild_includes_latency(self, session):
+        """Test that a rebuild restores latency aggregates and histograms."""
+        session.add_all([
+            ExecutionLog(task_id=1, executed_at=datetime(2024, 1, 15, 1), status="success",
+                         latency_ms=100, connect_ms=20, ttfb_ms=80),
+            ExecutionLog(task_id=1, executed_at=datetime(2024, 1, 15, 2), status="success",
+                         latency_ms=300, connect_ms=0, ttfb_ms=250,
+                         scheduled_at=datetime(2024, 1, 15, 1, 59, 58)),
+        ])
+        await session.commit()
+
+        await rebuild_daily_stats(session)
+
+        rows = await load_rows(session)
+        histograms = await get_latency_histograms(session, [1], date(2024, 1, 1))
+        assert (rows[0].latency_sum, rows[0].latency_max) == (400, 300)
+        assert {metric: histogram.count for metric, histogram in histograms.items()} == {
+            "total": 2, "connect": 2, "ttfb": 2, "lag": 1,
+        }
+        assert histograms["lag"].quantile(0.5) == pytest.approx(2000, rel=0.01)
+
+
+class TestLatencyHistograms:
+    """Tests for the daily latency histogram rollup."""
+
+    @pytest.mark.asyncio
+    async def test_batches_merge_into_buckets(self, session):
+        """Test that repeated latencies add to the same bucket row."""
+        for _ in range(2):
+            await apply_execution_logs(session, [
+                make_values(datetime(2024, 1, 15, 1), latency_ms=100),
+                make_values(datetime(2024, 1, 15, 2), latency_ms=100),
+            ])
+        await session.commit()
+
+        rows = (await session.execute(
+            select(ExecutionLatencyDaily).where(ExecutionLatencyDaily.metric == "total")
+        )).scalars().all()
+        assert len(rows) == 1
+        assert rows[0].count == 4
+
+    @pytest.mark.asyncio
+    async def test_window_percentiles(self, session):
+        """Test percentiles over a window of days, older days excluded."""
+        await apply_execution_logs(session, [
+            make_values(datetime(2024, 1, 10, 1), latency_ms=5000),
+            *[make_values(datetime(2024, 1, 15, 1), latency_ms=ms) for ms in range(1, 101)],
+        ])
+        await session.commit()
+
+        histograms = await get_latency_histograms(session, [1], date(2024, 1, 15))
+        summary = histograms["total"].summary()
+
+        assert summary["count"] == 100
+        assert 49 <= summary["p50"] <= 51
+        assert 98 <= summary["p99"] <= 100
@@ -0,0 +1,98 @@
+"""Tests for the task snapshot cache."""
+
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.models import Task
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Clear the snapshot cache around each test."""
+    from app.services.task_cache import clear_snapshots
+    clear_snapshots()
+    yield
+    clear_snapshots()
+
+
+@pytest.fixture
+def task():
+    """Create a mock enabled task."""
+    task = MagicMock(spec=Task)
+    task.id = 1
+    task.name = "Test Task"
+    task.api_endpoint = "https://api.openai.com/v1/chat/completions"
+    task.api_key = "encrypted_key"
+    task.api_key_fingerprint = None
+    task.rate_limit_per_minute = None
+    task.model = "gpt-4"
+    task.message_content = "Hello"
+    task.enabled = True
+    task.updated_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    return task
+
+
+class TestTaskSnapshot:
+    """Tests for the TaskSnapshot structure."""
+
+    def test_from_task_copies_fields(self, task):
+        """Test that snapshots copy the execution fields."""
+        from app.services.task_cache import TaskSnapshot
+
+        snapshot = TaskSnapshot.from_task(task)
+
+        assert snapshot.id == 1
+        assert snapshot.api_endpoint == task.api_endpoint
+        assert snapshot.api_key == "encrypted_key"
+        assert snapshot.model == "gpt-4"
+        assert snapshot.updated_at == task.updated_at
+
+    def test_uses_slots(self, task):
+        """Test that snapshots carry no per-instance __dict__."""
+        from app.services.task_cache import TaskSnapshot
+
+        snapshot = TaskSnapshot.from_task(task)
+
+        assert not hasattr(snapshot, "__dict__")
+
+
+class TestSnapshotCache:
+    """Tests for cache upsert and eviction."""
+
+    def test_upsert_and_get(self, task):
+        """Test that enabled tasks are cached."""
+        from app.services.task_cache import get_snapshot, upsert_snapshot
+
+        upsert_snapshot(task)
+
+        assert get_snapshot(1).name == "Test Task"
+
+    def test_upsert_disabled_task_evicts(self, task):
+        """Test that disabled tasks are evicted."""
+        from app.services.task_cache import get_snapshot, upsert_snapshot
+
+        upsert_snapshot(task)
+        task.enabled = False
+        upsert_snapshot(task)
+
+        assert get_snapshot(1) is None
+
+    def test_remove_snapshot(self, task):
+        """Test removing a cached task."""
+        from app.services.task_cache import get_snapshot, remove_snapshot, upsert_snapshot
+
+        upsert_snapshot(task)
+        remove_snapshot(1)
+        remove_snapshot(1)  # Removing twice is harmless
+
+        assert get_snapshot(1) is None
+
+    def test_get_cached_versions(self, task):
+        """Test that cached versions expose updated_at per task."""
+        from app.services.task_cache import get_cached_versions, upsert_snapshot
+
+        upsert_snapshot(task)
+
+        assert get_cached_versions() == {1: task.updated_at}
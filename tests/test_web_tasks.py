@@ -3,6 +3,8 @@
 Tests server-side rendered pages and form submissions.
 """
 
+import re
+
 import pytest
 import pytest_asyncio
 from httpx import AsyncClient, ASGITransport
@@ -11,7 +13,7 @@ from datetime import datetime, timezone
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 
 from app.main import app
-from app.database import get_session, Base
+from app.database import get_read_session, get_session, Base
 from app.models import Task, ExecutionLog
 
 
@@ -58,6 +60,7 @@ async def client(test_session):
         yield test_session
 
     app.dependency_overrides[get_session] = override_get_session
+    app.dependency_overrides[get_read_session] = override_get_session
 
     async with AsyncClient(
         transport=ASGITransport(app=app),
@@ -93,6 +96,23 @@ async def sample_task(test_session):
     return task
 
 
+async def record_logs(session, logs):
+    """Write logs through the log writer path so task summaries and daily stats follow."""
+    from app.services.log_writer import apply_execution_logs
+
+    await apply_execution_logs(session, [
+        {
+            "task_id": log.task_id,
+            "executed_at": log.executed_at,
+            "status": log.status,
+            "response_summary": log.response_summary,
+            "error_message": log.error_message,
+        }
+        for log in logs
+    ])
+    await session.commit()
+
+
 class TestListTasksPage:
     """Tests for the task list page."""
 
@@ -115,17 +135,39 @@ class TestListTasksPage:
         assert "Sample Task" in response.text
         assert "60" in response.text  # interval_minutes
 
+    @pytest.mark.asyncio
+    async def test_list_tasks_shows_fire_offset(self, client, test_session):
+        """Test that fixed_time tasks show their effective jitter offset."""
+        from app.scheduler import get_fire_offset
+        from app.utils.security import encrypt_api_key
+
+        task = Task(
+            name="Jittered Task",
+            api_endpoint="https://api.openai.com/v1/chat/completions",
+            api_key=encrypt_api_key("sk-sample1234567890"),
+            schedule_type="fixed_time",
+            fixed_time="09:00",
+            jitter_seconds=600,
+            message_content="Hello AI",
+            model="gemini-claude-sonnet-4-5",
+            enabled=True,
+        )
+        test_session.add(task)
+        await test_session.commit()
+        await test_session.refresh(task)
+
+        response = await client.get("/")
+
+        assert response.status_code == 200
+        assert f"(+{get_fire_offset(task)}s)" in response.text
+
     @pytest.mark.asyncio
     async def test_list_tasks_shows_last_execution_time(self, client, sample_task, test_session):
         """Test that last execution time is displayed in China timezone (UTC+8)."""
-        # Create execution log (UTC time: 2024-01-15 10:30)
-        log = ExecutionLog(
-            task_id=sample_task.id,
-            executed_at=datetime(2024, 1, 15, 10, 30, tzinfo=timezone.utc),
-            status="success",
-            response_summary="Test response",
-        )
-        test_session.add(log)
+        # Last execution as recorded by the log writer (UTC time: 2024-01-15 10:30)
+        sample_task.last_executed_at = datetime(2024, 1, 15, 10, 30)
+        sample_task.last_status = "success"
+        sample_task.last_latency_ms = 321
         await test_session.commit()
 
         response = await client.get("/")
@@ -133,18 +175,14 @@ class TestListTasksPage:
         assert response.status_code == 200
         # UTC 10:30 + 8 hours = China time 18:30
         assert "2024-01-15 18:30" in response.text
+        assert "(321ms)" in response.text
 
     @pytest.mark.asyncio
     async def test_list_tasks_cross_day_boundary_timezone(self, client, sample_task, test_session):
         """Test timezone conversion across day boundary (UTC previous day -> China current day)."""
         # UTC 2024-01-14 17:00 = China 2024-01-15 01:00 (crosses midnight)
-        log = ExecutionLog(
-            task_id=sample_task.id,
-            executed_at=datetime(2024, 1, 14, 17, 0, tzinfo=timezone.utc),
-            status="success",
-            response_summary="Cross-day test",
-        )
-        test_session.add(log)
+        sample_task.last_executed_at = datetime(2024, 1, 14, 17, 0)
+        sample_task.last_status = "success"
         await test_session.commit()
 
         response = await client.get("/")
@@ -153,6 +191,20 @@ class TestListTasksPage:
         # UTC 2024-01-14 17:00 + 8 hours = China 2024-01-15 01:00
         assert "2024-01-15 01:00" in response.text
 
+    @pytest.mark.asyncio
+    async def test_list_tasks_shows_failure_streak(self, client, sample_task, test_session):
+        """Test that repeated failures are highlighted with their count."""
+        sample_task.last_executed_at = datetime(2024, 1, 15, 10, 30)
+        sample_task.last_status = "failed"
+        sample_task.consecutive_failures = 3
+        await test_session.commit()
+
+        response = await client.get("/")
+
+        assert response.status_code == 200
+        assert "row-warning" in response.text
+        assert "连续 3 次" in response.text
+
     @pytest.mark.asyncio
     async def test_list_tasks_shows_message(self, client):
         """Test that flash messages are displayed."""
@@ -204,6 +256,58 @@ class TestNewTaskForm:
         assert len(tasks) == 1
         assert tasks[0].name == "New Task"
 
+    @pytest.mark.asyncio
+    async def test_create_task_with_rate_limit(self, client, test_session):
+        """Test that the per-task rate limit and key fingerprint are stored."""
+        response = await client.post(
+            "/tasks/new",
+            data={
+                "name": "Limited Task",
+                "api_endpoint": "https://api.openai.com/v1/chat/completions",
+                "api_key": "sk-test1234567890abcdef",
+                "schedule_type": "interval",
+                "interval_minutes": "60",
+                "message_content": "Hello AI",
+                "model": "gemini-claude-sonnet-4-5",
+                "rate_limit_per_minute": "30",
+                "enabled": "true",
+            },
+            follow_redirects=False,
+        )
+
+        assert response.status_code == 303
+
+        from sqlalchemy import select
+        task = (await test_session.execute(select(Task))).scalar_one()
+        assert task.rate_limit_per_minute == 30
+        assert task.api_key_fingerprint is not None
+        assert "sk-test" not in task.api_key_fingerprint
+
+    @pytest.mark.asyncio
+    async def test_create_task_with_empty_rate_limit(self, client, test_session):
+        """Test that an empty rate limit field falls back to the global default."""
+        response = await client.post(
+            "/tasks/new",
+            data={
+                "name": "Default Limit Task",
+                "api_endpoint": "https://api.openai.com/v1/chat/completions",
+                "api_key": "sk-test1234567890abcdef",
+                "schedule_type": "interval",
+                "interval_minutes": "60",
+                "message_content": "Hello AI",
+                "model": "gemini-claude-sonnet-4-5",
+                "rate_limit_per_minute": "",
+                "enabled": "true",
+            },
+            follow_redirects=False,
+        )
+
+        assert response.status_code == 303
+
+        from sqlalchemy import select
+        task = (await test_session.execute(select(Task))).scalar_one()
+        assert task.rate_limit_per_minute is None
+
     @pytest.mark.asyncio
     async def test_create_task_validation_error(self, client):
         """Test that validation errors are displayed."""
@@ -591,6 +695,30 @@ class TestLogsPage:
         assert "失败" in response.text
         assert "Connection timeout" in response.text
 
+    @pytest.mark.asyncio
+    async def test_logs_page_renders_timing_waterfall(self, client, sample_task, test_session):
+        """Test that the phase breakdown and scheduling lag are shown."""
+        log = ExecutionLog(
+            task_id=sample_task.id,
+            executed_at=datetime(2024, 1, 15, 10, 30, 2, tzinfo=timezone.utc),
+            scheduled_at=datetime(2024, 1, 15, 10, 30, tzinfo=timezone.utc),
+            status="success",
+            response_summary="Test response",
+            latency_ms=400,
+            timings={"decrypt": 100, "ttfb": 250, "body": 50},
+        )
+        test_session.add(log)
+        await test_session.commit()
+
+        response = await client.get(f"/tasks/{sample_task.id}/logs")
+
+        assert response.status_code == 200
+        assert "阶段耗时" in response.text
+        assert "调度延迟 2000ms" in response.text
+        # Bars start where the previous phase ended
+        assert "margin-left: 25.0%; width: 62.5%;" in response.text
+        assert "margin-left: 87.5%; width: 12.5%;" in response.text
+
     @pytest.mark.asyncio
     async def test_logs_page_order_descending(self, client, sample_task, test_session):
         """Test that logs are displayed in descending order."""
@@ -677,8 +805,7 @@ class TestDashboardStats:
             response_summary="Yesterday",
         )
 
-        test_session.add_all([log_today1, log_today2, log_yesterday])
-        await test_session.commit()
+        await record_logs(test_session, [log_today1, log_today2, log_yesterday])
 
         response = await client.get("/")
 
@@ -700,8 +827,7 @@ class TestDashboardStats:
             ExecutionLog(task_id=sample_task.id, executed_at=today_start.replace(hour=11), status="success", response_summary="OK"),
             ExecutionLog(task_id=sample_task.id, executed_at=today_start.replace(hour=12), status="failed", error_message="Err"),
         ]
-        test_session.add_all(logs)
-        await test_session.commit()
+        await record_logs(test_session, logs)
 
         response = await client.get("/")
 
@@ -761,8 +887,7 @@ class TestDashboardStats:
             status="success",
             response_summary="Midnight",
         )
-        test_session.add(log_midnight)
-        await test_session.commit()
+        await record_logs(test_session, [log_midnight])
 
         response = await client.get("/")
 
@@ -780,14 +905,38 @@ class TestDashboardStats:
             ExecutionLog(task_id=sample_task.id, executed_at=today_start.replace(hour=9), status="failed", error_message="Err"),
             ExecutionLog(task_id=sample_task.id, executed_at=today_start.replace(hour=10), status="failed", error_message="Err"),
         ]
-        test_session.add_all(logs)
-        await test_session.commit()
+        await record_logs(test_session, logs)
 
         response = await client.get("/")
 
         assert response.status_code == 200
         assert "0%" in response.text
 
+    @pytest.mark.asyncio
+    async def test_dashboard_stats_queries_in_turn(self, sample_task, test_session):
+        """Test that the dashboard queries do not overlap on one session."""
+        from unittest.mock import patch
+
+        from app.web.tasks import get_dashboard_stats
+
+        in_flight = 0
+        execute = test_session.execute
+
+        async def exclusive_execute(*args, **kwargs):
+            nonlocal in_flight
+            assert in_flight == 0, "concurrent operations on one AsyncSession"
+            in_flight += 1
+            try:
+                return await execute(*args, **kwargs)
+            finally:
+                in_flight -= 1
+
+        with patch.object(test_session, "execute", side_effect=exclusive_execute):
+            result = await get_dashboard_stats(test_session)
+
+        assert result["total_tasks"] == 1
+        assert result["today_success_rate"] == "--"
+
 
 class TestTaskLastExecutionStatus:
     """Tests for task last execution status and schedule formatting (Story 3.3)."""
@@ -801,8 +950,7 @@ class TestTaskLastExecutionStatus:
             status="success",
             response_summary="OK",
         )
-        test_session.add(log)
-        await test_session.commit()
+        await record_logs(test_session, [log])
 
         response = await client.get("/")
 
@@ -818,8 +966,7 @@ class TestTaskLastExecutionStatus:
             status="failed",
             error_message="Error",
         )
-        test_session.add(log)
-        await test_session.commit()
+        await record_logs(test_session, [log])
 
         response = await client.get("/")
 
@@ -843,8 +990,7 @@ class TestTaskLastExecutionStatus:
             status="failed",
             error_message="Error",
         )
-        test_session.add(log)
-        await test_session.commit()
+        await record_logs(test_session, [log])
 
         response = await client.get("/")
 
@@ -929,8 +1075,7 @@ class TestTaskLastExecutionStatus:
             status="success",
             response_summary="OK",
         )
-        test_session.add_all([old_log, new_log])
-        await test_session.commit()
+        await record_logs(test_session, [old_log, new_log])
 
         response = await client.get("/")
 
@@ -1032,8 +1177,7 @@ class TestLogsFilteringAndPagination:
                 response_summary=f"Log{i}",
             )
             logs.append(log)
-        test_session.add_all(logs)
-        await test_session.commit()
+        await record_logs(test_session, logs)
 
         response = await client.get(f"/tasks/{sample_task.id}/logs")
 
@@ -1054,13 +1198,35 @@ class TestLogsFilteringAndPagination:
                 response_summary=f"Log{i:02d}",
             )
             logs.append(log)
-        test_session.add_all(logs)
-        await test_session.commit()
+        await record_logs(test_session, logs)
+
+        first = await client.get(f"/tasks/{sample_task.id}/logs")
+        next_link = re.search(r'href="\?cursor=([^&"]+)[^"]*" class="page-link">下一页', first.text)
+        assert next_link is not None
 
-        response = await client.get(f"/tasks/{sample_task.id}/logs?page=2")
+        response = await client.get(f"/tasks/{sample_task.id}/logs?cursor={next_link.group(1)}")
 
         assert response.status_code == 200
         assert "第 2 / 2 页" in response.text
+        # Oldest 5 logs are on the last page
+        assert "Log00" in response.text
+        assert "Log23" not in response.text
+
+    @pytest.mark.asyncio
+    async def test_logs_invalid_cursor_shows_first_page(self, client, sample_task, test_session):
+        """Test that a malformed cursor falls back to the first page."""
+        log = ExecutionLog(
+            task_id=sample_task.id,
+            executed_at=datetime(2024, 1, 15, 10, 0, tzinfo=timezone.utc),
+            status="success",
+            response_summary="Test",
+        )
+        await record_logs(test_session, [log])
+
+        response = await client.get(f"/tasks/{sample_task.id}/logs?cursor=garbage")
+
+        assert response.status_code == 200
+        assert "Test" in response.text
 
     @pytest.mark.asyncio
     async def test_logs_pagination_preserves_filters(self, client, sample_task, test_session):
@@ -1177,8 +1343,7 @@ class TestLogsStatistics:
             status="success",
             response_summary="OK",
         )
-        test_session.add(log)
-        await test_session.commit()
+        await record_logs(test_session, [log])
 
         response = await client.get(f"/tasks/{sample_task.id}/logs")
 
@@ -1196,8 +1361,7 @@ class TestLogsStatistics:
             ExecutionLog(task_id=sample_task.id, executed_at=datetime.now(timezone.utc), status="success", response_summary="OK"),
             ExecutionLog(task_id=sample_task.id, executed_at=datetime.now(timezone.utc), status="failed", error_message="Err"),
         ]
-        test_session.add_all(logs)
-        await test_session.commit()
+        await record_logs(test_session, logs)
 
         response = await client.get(f"/tasks/{sample_task.id}/logs")
 
@@ -1223,8 +1387,7 @@ class TestLogsStatistics:
             status="success",
             response_summary="Old",
         )
-        test_session.add_all(logs + [old_log])
-        await test_session.commit()
+        await record_logs(test_session, logs + [old_log])
 
         response = await client.get(f"/tasks/{sample_task.id}/logs")
 
@@ -1348,6 +1511,9 @@ class TestImmediateExecution:
     async def test_update_interval_task_executes_immediately(self, client, sample_task, test_session):
         """Test that updating an interval task executes it immediately (AC #3)."""
         from unittest.mock import patch, AsyncMock
+        import asyncio
+
+        from app.scheduler import _pending_immediate_tasks
 
         # Ensure sample_task is interval and enabled
         sample_task.schedule_type = "interval"
@@ -1355,7 +1521,8 @@ class TestImmediateExecution:
         sample_task.enabled = True
         await test_session.commit()
 
-        with patch("asyncio.create_task") as mock_create_task:
+        pending_before = set(_pending_immediate_tasks)
+        with patch("app.scheduler.execute_task", new_callable=AsyncMock) as mock_execute:
             response = await client.post(
                 f"/tasks/{sample_task.id}/edit",
                 data={
@@ -1373,6 +1540,10 @@ class TestImmediateExecution:
 
             assert response.status_code == 303
 
-            # Verify execute_task was called immediately (AC #3)
-            mock_create_task.assert_called_once()
+            # Verify execute_task was called immediately (AC #3); it runs on
+            # the loop as a tracked task, not through asyncio.create_task
+            started = _pending_immediate_tasks - pending_before
+            assert len(started) == 1
+            await asyncio.gather(*started)
+            mock_execute.assert_awaited_once_with(sample_task.id, immediate=True)
 